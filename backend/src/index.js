@@ -76,7 +76,7 @@ app.options('*', cors(corsOptions));
 // Rate limiting - General (más permisivo)
 const generalLimiter = rateLimit({
   windowMs: 15 * 60 * 1000, // 15 minutos
-  max: 1000, // Límite de 1000 requests por ventana
+  max: Number(process.env.RATE_LIMIT_MAX) || 1000, // Límite de 1000 requests por ventana (RATE_LIMIT_MAX para benchmarks)
   message: 'Demasiadas peticiones desde esta IP, por favor intenta más tarde.',
   standardHeaders: true,
   legacyHeaders: false,
@@ -104,6 +104,20 @@ const __filename = fileURLToPath(import.meta.url);
 const __dirname = path.dirname(__filename);
 app.use('/storage', express.static(path.join(__dirname, '../storage')));
 
+// Server-Timing: tiempo de procesamiento en el backend (lo leen las trazas E2E)
+app.use((req, res, next) => {
+  const start = process.hrtime.bigint();
+  const writeHead = res.writeHead;
+  res.writeHead = function (...args) {
+    if (!res.headersSent) {
+      const duration = Number(process.hrtime.bigint() - start) / 1e6;
+      res.setHeader('Server-Timing', `app;dur=${duration.toFixed(1)}`);
+    }
+    return writeHead.apply(this, args);
+  };
+  next();
+});
+
 // Logging de requests
 app.use((req, res, next) => {
   logger.info(`${req.method} ${req.path}`, {
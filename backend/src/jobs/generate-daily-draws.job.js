@@ -84,9 +84,11 @@ class GenerateDailyDrawsJob {
         }
 
         // Crear sorteos para cada hora de la plantilla
-        for (const time of template.drawTimes) {
-          // drawTime se guarda directamente como hora de Venezuela (HH:MM)
+        for (const templateTime of template.drawTimes) {
+          // drawTime se guarda directamente como hora de Venezuela (HH:MM:SS)
           // drawDate es la fecha del sorteo en Venezuela como Date UTC
+          // Las plantillas creadas por la API guardan HH:MM; close-draw compara contra HH:MM:SS
+          const time = templateTime.length === 5 ? `${templateTime}:00` : templateTime;
 
           // Verificar si ya existe un sorteo para esta fecha/hora/juego
           const existing = await prisma.draw.findFirst({
@@ -109,7 +111,7 @@ class GenerateDailyDrawsJob {
               gameId: template.gameId,
               templateId: template.id,
               drawDate: today,
-              drawTime: time, // Hora Venezuela directa (ej: "08:00")
+              drawTime: time, // Hora Venezuela directa (ej: "08:00:00")
               status: 'SCHEDULED'
             }
           });
@@ -2,6 +2,7 @@ import sharp from 'sharp';
 import path from 'path';
 import fs from 'fs/promises';
 import { fileURLToPath } from 'url';
+import logger from './logger.js';
 
 const __filename = fileURLToPath(import.meta.url);
 const __dirname = path.dirname(__filename);
@@ -10,6 +11,10 @@ const STORAGE_PATH = path.join(__dirname, '../../storage');
 const BASES_PATH = path.join(STORAGE_PATH, 'bases');
 const FONTS_PATH = path.join(STORAGE_PATH, 'fonts');
 const OUTPUT_PATH = path.join(STORAGE_PATH, 'results');
+const LAYER_CACHE_PATH = path.join(STORAGE_PATH, 'cache', 'layers');
+
+// IMAGE_LAYER_CACHE=true usa las capas precompuestas; por defecto se componen todas en cada render
+const LAYER_CACHE_ENABLED = process.env.IMAGE_LAYER_CACHE === 'true';
 
 // Ensure output directory exists
 await fs.mkdir(OUTPUT_PATH, { recursive: true });
@@ -38,7 +43,7 @@ function calculateEaster(year) {
 /**
  * Get special layer for a given date (Ruleta)
  */
-function getSpecialLayer(date) {
+export function getSpecialLayer(date) {
   const month = date.getMonth() + 1;
   const day = date.getDate();
   
@@ -81,6 +86,19 @@ function getSpecialLayer(date) {
   return null;
 }
 
+/**
+ * Get the first date of the year for each special layer (Ruleta), plus one
+ * without a layer under 'sin_capa'
+ */
+export function getSpecialLayerDates(year) {
+  const dates = {};
+  for (let day = new Date(year, 0, 1); day.getFullYear() === year; day.setDate(day.getDate() + 1)) {
+    const layer = getSpecialLayer(day) || 'sin_capa';
+    if (!dates[layer]) dates[layer] = new Date(day);
+  }
+  return dates;
+}
+
 /**
  * Get background color for Ruleta number
  */
@@ -99,6 +117,164 @@ function getRouletteBackground(number) {
   return 'fondo_negro.png';
 }
 
+/**
+ * Static layers of a Ruleta result: background, special layer, number and final
+ */
+function getRouletteLayers(result, specialPath = null) {
+  const basePath = path.join(BASES_PATH, '1');
+  return [
+    path.join(basePath, getRouletteBackground(result)),
+    ...(specialPath ? [specialPath] : []),
+    path.join(basePath, `${result}.png`),
+    path.join(basePath, 'final.png')
+  ];
+}
+
+/**
+ * Static layers of an Animalitos result: base and animal
+ */
+function getAnimalitosLayers(result) {
+  const basePath = path.join(BASES_PATH, '2');
+  // Special case: 0 = DELFIN (0.png), not BALLENA (00.png)
+  // Only pad numbers 1-9 with leading zero
+  const animalNumber = result === 0 ? '0' : String(result).padStart(2, '0');
+  return [
+    path.join(basePath, 'base.png'),
+    path.join(basePath, `${animalNumber}.png`)
+  ];
+}
+
+// Composiciones en curso: si cierran varios sorteos a la vez, la misma se arma una sola vez
+const pendingComposites = new Map();
+
+/**
+ * Get the precomposited image of static layers, building it if missing or stale
+ *
+ * Se guarda en storage/cache/layers con un nombre derivado de las capas y se
+ * rehace si alguna capa es más nueva que el archivo cacheado.
+ */
+async function getCachedComposite(inputs) {
+  const name = inputs
+    .map(input => path.relative(BASES_PATH, input).replace(/\.png$/, '').replace(/[\\/ ]/g, '_'))
+    .join('+');
+  const cachePath = path.join(LAYER_CACHE_PATH, `${name}.png`);
+
+  if (pendingComposites.has(cachePath)) {
+    return pendingComposites.get(cachePath);
+  }
+
+  const pending = (async () => {
+    const [cached, ...sources] = await Promise.all(
+      [cachePath, ...inputs].map(file => fs.stat(file).catch(() => null))
+    );
+    const missing = inputs.find((input, i) => !sources[i]);
+    if (missing) {
+      throw new Error(`Layer not found: ${path.relative(BASES_PATH, missing)}`);
+    }
+    if (cached && sources.every(source => source.mtimeMs <= cached.mtimeMs)) {
+      return cachePath;
+    }
+
+    await fs.mkdir(LAYER_CACHE_PATH, { recursive: true });
+    const tempPath = `${cachePath}.${process.pid}.tmp`;
+    try {
+      await sharp(inputs[0])
+        .composite(inputs.slice(1).map(input => ({ input, top: 0, left: 0 })))
+        .png()
+        .toFile(tempPath);
+      await fs.rename(tempPath, cachePath);
+    } catch (err) {
+      await fs.unlink(tempPath).catch(() => {});
+      throw err;
+    }
+    return cachePath;
+  })();
+
+  pendingComposites.set(cachePath, pending);
+  try {
+    return await pending;
+  } finally {
+    pendingComposites.delete(cachePath);
+  }
+}
+
+/**
+ * Composite the layers into outputPath
+ *
+ * Con cachedInputs, esas capas estáticas salen de la caché ya compuestas y
+ * sólo se componen encima las demás (los textos).
+ */
+async function compositeToFile(layers, outputPath, cachedInputs = null) {
+  if (cachedInputs && LAYER_CACHE_ENABLED) {
+    let base = null;
+    try {
+      base = await getCachedComposite(cachedInputs);
+    } catch (err) {
+      // Sin caché (capa faltante, storage de solo lectura): se componen todas las capas
+      logger.warn('Layer cache unavailable, compositing every layer:', err.message);
+    }
+    if (base) {
+      await sharp(base)
+        .composite(layers.slice(cachedInputs.length))
+        .toFile(outputPath);
+      return;
+    }
+  }
+
+  await sharp(layers[0].input)
+    .composite(layers.slice(1))
+    .toFile(outputPath);
+}
+
+/**
+ * Build the layer cache for every Ruleta and Animalitos result
+ *
+ * Ruleta: cada número con cada capa especial y sin capa; Animalitos: cada
+ * número. Con force se rehacen aunque estén al día.
+ */
+export async function buildLayerCache({ force = false, concurrency = 4 } = {}) {
+  const numberFiles = async folder => (await fs.readdir(path.join(BASES_PATH, folder)))
+    .filter(file => /^\d+\.png$/.test(file))
+    .map(file => file.replace(/\.png$/, ''))
+    .sort();
+
+  const ruletaPath = path.join(BASES_PATH, '1');
+  const specialPaths = [null, ...(await fs.readdir(ruletaPath))
+    .filter(file => /^capa_.*\.png$/.test(file))
+    .sort()
+    .map(file => path.join(ruletaPath, file))];
+
+  const jobs = [];
+  for (const result of await numberFiles('1')) {
+    for (const specialPath of specialPaths) {
+      jobs.push({ template: 'ruleta', inputs: getRouletteLayers(result, specialPath) });
+    }
+  }
+  for (const result of await numberFiles('2')) {
+    jobs.push({ template: 'animalitos', inputs: getAnimalitosLayers(result) });
+  }
+
+  if (force) {
+    await fs.rm(LAYER_CACHE_PATH, { recursive: true, force: true });
+  }
+
+  const summary = { ruleta: 0, animalitos: 0, errors: [] };
+  let next = 0;
+  const worker = async () => {
+    while (next < jobs.length) {
+      const job = jobs[next++];
+      try {
+        await getCachedComposite(job.inputs);
+        summary[job.template]++;
+      } catch (error) {
+        summary.errors.push({ template: job.template, error: error.message });
+      }
+    }
+  };
+  await Promise.all(Array.from({ length: concurrency }, worker));
+  return summary;
+}
+
 /**
  * Create SVG text buffer
  */
@@ -136,46 +312,21 @@ export async function generateRouletteImage(drawData) {
   const minutes = parseInt(drawMinutes);
   
   const basePath = path.join(BASES_PATH, '1');
-  const layers = [];
-  
-  // 1. Background (color)
-  const background = getRouletteBackground(result);
-  layers.push({
-    input: path.join(basePath, background),
-    top: 0,
-    left: 0
-  });
-  
-  // 2. Special layer (if applicable)
+
+  // 1-4. Background (color), special layer (if applicable), number image and final layer
   const specialLayer = getSpecialLayer(date);
+  let specialPath = null;
   if (specialLayer) {
-    const specialPath = path.join(basePath, specialLayer);
     try {
-      await fs.access(specialPath);
-      layers.push({
-        input: specialPath,
-        top: 0,
-        left: 0
-      });
+      await fs.access(path.join(basePath, specialLayer));
+      specialPath = path.join(basePath, specialLayer);
     } catch (err) {
       // Layer doesn't exist, skip
     }
   }
-  
-  // 3. Number image
-  layers.push({
-    input: path.join(basePath, `${result}.png`),
-    top: 0,
-    left: 0
-  });
-  
-  // 4. Final layer
-  layers.push({
-    input: path.join(basePath, 'final.png'),
-    top: 0,
-    left: 0
-  });
-  
+  const staticLayers = getRouletteLayers(result, specialPath);
+  const layers = staticLayers.map(input => ({ input, top: 0, left: 0 }));
+
   // 5. Text overlays - usar drawTime directamente (ya está en hora Venezuela)
   const dateStr = `${String(date.getDate()).padStart(2, '0')}/${String(date.getMonth() + 1).padStart(2, '0')}/${String(date.getFullYear()).slice(-2)}`;
   const ampm = hours >= 12 ? 'PM' : 'AM';
@@ -194,9 +345,7 @@ export async function generateRouletteImage(drawData) {
   const outputFilename = `ruleta_${date.getFullYear()}${String(date.getMonth() + 1).padStart(2, '0')}${String(date.getDate()).padStart(2, '0')}_${String(hours).padStart(2, '0')}${String(minutes).padStart(2, '0')}.png`;
   const outputPath = path.join(OUTPUT_PATH, outputFilename);
   
-  await sharp(layers[0].input)
-    .composite(layers.slice(1))
-    .toFile(outputPath);
+  await compositeToFile(layers, outputPath, staticLayers);
   
   return {
     filename: outputFilename,
@@ -215,26 +364,10 @@ export async function generateAnimalitosImage(drawData) {
   const hours = parseInt(drawHours);
   const minutes = parseInt(drawMinutes);
   
-  const basePath = path.join(BASES_PATH, '2');
-  const layers = [];
-  
-  // 1. Base image
-  layers.push({
-    input: path.join(basePath, 'base.png'),
-    top: 0,
-    left: 0
-  });
-  
-  // 2. Animal image
-  // Special case: 0 = DELFIN (0.png), not BALLENA (00.png)
-  // Only pad numbers 1-9 with leading zero
-  const animalNumber = result === 0 ? '0' : String(result).padStart(2, '0');
-  layers.push({
-    input: path.join(basePath, `${animalNumber}.png`),
-    top: 0,
-    left: 0
-  });
-  
+  // 1-2. Base image and animal image
+  const staticLayers = getAnimalitosLayers(result);
+  const layers = staticLayers.map(input => ({ input, top: 0, left: 0 }));
+
   // 3. Text overlays - usar drawTime directamente (ya está en hora Venezuela)
   const dateStr = `${String(date.getDate()).padStart(2, '0')}/${String(date.getMonth() + 1).padStart(2, '0')}/${String(date.getFullYear()).slice(-2)}`;
   const ampm = hours >= 12 ? 'PM' : 'AM';
@@ -253,9 +386,7 @@ export async function generateAnimalitosImage(drawData) {
   const outputFilename = `animalitos_${date.getFullYear()}${String(date.getMonth() + 1).padStart(2, '0')}${String(date.getDate()).padStart(2, '0')}_${String(hours).padStart(2, '0')}${String(minutes).padStart(2, '0')}.png`;
   const outputPath = path.join(OUTPUT_PATH, outputFilename);
   
-  await sharp(layers[0].input)
-    .composite(layers.slice(1))
-    .toFile(outputPath);
+  await compositeToFile(layers, outputPath, staticLayers);
   
   return {
     filename: outputFilename,
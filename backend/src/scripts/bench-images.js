@@ -0,0 +1,198 @@
+/**
+ * Driver de benchmark para la generación de imágenes de resultados
+ *
+ * Llama a los puntos de entrada de lib/imageGenerator.js para cada valor de
+ * resultado que siembra create-games.js y, en la Ruleta, para cada capa
+ * especial de fecha (navidad, halloween, efemérides, semana santa, carnaval y
+ * sin capa). También genera la pirámide de cada día de la semana y
+ * --recommendations imágenes de recomendaciones.
+ *
+ * Las imágenes se generan con fechas del año --year (2099 por defecto) para no
+ * pisar resultados reales en storage/results, y se borran después de medir su
+ * tamaño salvo que se pase --keep. Con --concurrency N se generan N a la vez,
+ * como cuando cierran varios sorteos en el mismo minuto.
+ *
+ * Imprime líneas `RENDER {json}` (image, end); las consume
+ * testsprite_tests/harness/render.py.
+ *
+ * Uso: node src/scripts/bench-images.js [--kinds ruleta,animalitos,triple,pyramid,recommendations]
+ *        [--concurrency 1] [--rounds 1] [--triple-step 1] [--recommendations 10] [--year 2099] [--keep]
+ */
+
+import fs from 'fs/promises';
+import { performance } from 'node:perf_hooks';
+import sharp from 'sharp';
+import {
+  generateRouletteImage,
+  generateAnimalitosImage,
+  generateTripleImage,
+  generatePyramidImage,
+  generateRecommendationsImage,
+  getSpecialLayerDates
+} from '../lib/imageGenerator.js';
+
+const KINDS = ['ruleta', 'animalitos', 'triple', 'pyramid', 'recommendations'];
+
+function parseArgs(argv) {
+  const args = { kinds: KINDS, concurrency: 1, rounds: 1, tripleStep: 1, recommendations: 10, year: 2099, keep: false };
+  for (let i = 0; i < argv.length; i++) {
+    switch (argv[i]) {
+      case '--kinds': args.kinds = argv[++i].split(','); break;
+      case '--concurrency': args.concurrency = Number(argv[++i]); break;
+      case '--rounds': args.rounds = Number(argv[++i]); break;
+      case '--triple-step': args.tripleStep = Number(argv[++i]); break;
+      case '--recommendations': args.recommendations = Number(argv[++i]); break;
+      case '--year': args.year = Number(argv[++i]); break;
+      case '--keep': args.keep = true; break;
+      default: throw new Error(`Argumento desconocido: ${argv[i]}`);
+    }
+  }
+  for (const kind of args.kinds) {
+    if (!KINDS.includes(kind)) throw new Error(`Tipo desconocido: ${kind}`);
+  }
+  return args;
+}
+
+const args = parseArgs(process.argv.slice(2));
+
+function emit(record) {
+  process.stdout.write(`RENDER ${JSON.stringify(record)}\n`);
+}
+
+const round = ms => Math.round(ms * 10) / 10;
+const mb = bytes => Math.round(bytes / 1024 / 1024 * 10) / 10;
+const pad = n => String(n).padStart(2, '0');
+
+// ============================================
+// CASOS
+// ============================================
+
+// Números que siembra create-games.js por plantilla (ver gameSlugMap en imageService.js)
+const numbers = (count, width) => Array.from({ length: count }, (_, i) => String(i).padStart(width, '0'));
+const RESULTS = {
+  ruleta: numbers(38, 2),     // lotoanimalito: 00-37
+  animalitos: numbers(37, 2), // lottopantera: 00-36
+  triple: numbers(1000, 3)    // triple-pantera: 000-999
+};
+
+/**
+ * Fecha y hora únicas por caso: el nombre del archivo de salida depende de ambas
+ * y, con --concurrency, dos casos con el mismo nombre se pisarían.
+ */
+function slot(base, index) {
+  const date = new Date(base);
+  date.setDate(date.getDate() + Math.floor(index / 780));
+  const drawTime = `${pad(8 + index % 13)}:${pad(Math.floor(index / 13) % 60)}:00`;
+  return { date, drawTime };
+}
+
+function buildCases() {
+  const cases = [];
+  const base = new Date(args.year, 5, 15);
+
+  if (args.kinds.includes('ruleta')) {
+    for (const [layer, date] of Object.entries(getSpecialLayerDates(args.year))) {
+      RESULTS.ruleta.forEach((result, i) => {
+        const { drawTime } = slot(date, i);
+        cases.push({
+          kind: 'ruleta', result, layer,
+          render: () => generateRouletteImage({ result, drawDate: date, drawTime, gameId: 1 })
+        });
+      });
+    }
+  }
+  if (args.kinds.includes('animalitos')) {
+    RESULTS.animalitos.forEach((result, i) => {
+      const { date, drawTime } = slot(base, i);
+      cases.push({
+        kind: 'animalitos', result,
+        render: () => generateAnimalitosImage({ result, drawDate: date, drawTime, gameId: 2 })
+      });
+    });
+  }
+  if (args.kinds.includes('triple')) {
+    RESULTS.triple.filter((_, i) => i % args.tripleStep === 0).forEach((result, i) => {
+      const { date, drawTime } = slot(base, i);
+      cases.push({
+        kind: 'triple', result,
+        render: () => generateTripleImage({ result, drawDate: date, drawTime, gameId: 3 })
+      });
+    });
+  }
+  if (args.kinds.includes('pyramid')) {
+    for (let i = 0; i < 7; i++) {
+      const date = new Date(args.year, 5, 15 + i);
+      cases.push({ kind: 'pyramid', result: String(date.getDay() || 7), render: () => generatePyramidImage(date) });
+    }
+  }
+  if (args.kinds.includes('recommendations')) {
+    for (let i = 0; i < args.recommendations; i++) {
+      const date = new Date(args.year, 5, 15 + i);
+      cases.push({ kind: 'recommendations', result: null, render: () => generateRecommendationsImage(3, date) });
+    }
+  }
+  return cases;
+}
+
+// ============================================
+// MEDICIÓN
+// ============================================
+
+// Pico de RSS mientras cada imagen está en curso; sharp trabaja fuera del
+// event loop, así que el muestreo sigue corriendo durante la composición.
+const active = new Set();
+const sampler = setInterval(() => {
+  const rss = process.memoryUsage.rss();
+  for (const window of active) window.peak = Math.max(window.peak, rss);
+}, 5);
+
+async function measure(testCase, roundIndex) {
+  const window = { peak: process.memoryUsage.rss() };
+  active.add(window);
+  const started = performance.now();
+  const record = { type: 'image', kind: testCase.kind, result: testCase.result, layer: testCase.layer || null, round: roundIndex };
+  try {
+    const output = await testCase.render();
+    record.ms = round(performance.now() - started);
+    record.bytes = (await fs.stat(output.path)).size;
+    if (!args.keep) await fs.unlink(output.path);
+  } catch (error) {
+    record.ms = round(performance.now() - started);
+    record.error = error.message;
+  } finally {
+    active.delete(window);
+  }
+  record.rss_mb = mb(process.memoryUsage.rss());
+  record.peak_rss_mb = mb(Math.max(window.peak, process.memoryUsage.rss()));
+  emit(record);
+}
+
+async function main() {
+  const cases = buildCases();
+  const started = performance.now();
+  for (let roundIndex = 1; roundIndex <= args.rounds; roundIndex++) {
+    let next = 0;
+    const worker = async () => {
+      while (next < cases.length) {
+        await measure(cases[next++], roundIndex);
+      }
+    };
+    await Promise.all(Array.from({ length: args.concurrency }, worker));
+  }
+  clearInterval(sampler);
+
+  emit({
+    type: 'end',
+    images: cases.length * args.rounds,
+    wall_ms: round(performance.now() - started),
+    max_rss_mb: mb(process.resourceUsage().maxRSS * 1024),
+    concurrency: args.concurrency,
+    sharp_concurrency: sharp.concurrency(),
+    sharp_cache: sharp.cache()
+  });
+}
+
+main().catch(error => {
+  emit({ type: 'fatal', error: error.message });
+  process.exit(1);
+});
@@ -0,0 +1,190 @@
+/**
+ * Driver de benchmark para las consultas del Monitor de Sorteos
+ *
+ * Reproduce las llamadas de frontend/app/admin/monitor/page.js. La página sólo
+ * pide los datos de la pestaña activa (fetchData) y sólo cuando cambia el
+ * sorteo o la pestaña, así que aquí un refresco es un operador que vuelve a
+ * elegir el sorteo en su pestaña:
+ *
+ * - Bancas: getBancaStats y el modal de las --drilldowns bancas con más venta
+ *   (getTicketsByBanca).
+ * - Números: getItemStats, getAllLastSeen del juego (number-history) y los
+ *   modales de los --drilldowns números con más venta (getTicketsByItem) y con
+ *   más tripletas (getTripletasByItem).
+ * - Reporte: getDailyReport del día y juego.
+ *
+ * El operador i mira la pestaña i de --tabs (en ciclo). Cada operador hace las
+ * llamadas una tras otra, como la página; --operators operadores refrescan a
+ * la vez, --rounds veces cada uno, con --think-ms entre refrescos.
+ *
+ * Por llamada mide el tiempo del servicio, las queries de Prisma y su tiempo,
+ * y lo que tardaría y pesaría el JSON que envía el controlador.
+ *
+ * Imprime líneas `MONITOR {json}` (call, end); las consume
+ * testsprite_tests/harness/monitor.py.
+ *
+ * Uso: node src/scripts/bench-monitor.js --draw <id> [--draw <id> ...] --date YYYY-MM-DD
+ *        [--operators 5] [--rounds 3] [--think-ms 0] [--drilldowns 3] [--tabs bancas,numeros,reporte]
+ */
+
+import dotenv from 'dotenv';
+dotenv.config();
+
+import { AsyncLocalStorage } from 'node:async_hooks';
+import { performance } from 'node:perf_hooks';
+import { PrismaClient } from '@prisma/client';
+
+const TABS = ['bancas', 'numeros', 'reporte'];
+
+function parseArgs(argv) {
+  const args = {
+    draws: [], date: null, operators: 5, rounds: 3, thinkMs: 0, drilldowns: 3, tabs: ['bancas', 'numeros', 'reporte']
+  };
+  for (let i = 0; i < argv.length; i++) {
+    switch (argv[i]) {
+      case '--draw': args.draws.push(argv[++i]); break;
+      case '--date': args.date = argv[++i]; break;
+      case '--operators': args.operators = Number(argv[++i]); break;
+      case '--rounds': args.rounds = Number(argv[++i]); break;
+      case '--think-ms': args.thinkMs = Number(argv[++i]); break;
+      case '--drilldowns': args.drilldowns = Number(argv[++i]); break;
+      case '--tabs': args.tabs = argv[++i].split(','); break;
+      default: throw new Error(`Argumento desconocido: ${argv[i]}`);
+    }
+  }
+  if (args.draws.length === 0) throw new Error('Falta --draw <id>');
+  if (!args.date) throw new Error('Falta --date YYYY-MM-DD');
+  const unknown = args.tabs.filter(tab => !TABS.includes(tab));
+  if (unknown.length > 0 || args.tabs.length === 0) throw new Error(`Pestañas válidas: ${TABS.join(', ')}`);
+  return args;
+}
+
+const args = parseArgs(process.argv.slice(2));
+
+const round = ms => Math.round(ms * 10) / 10;
+const mb = bytes => Math.round(bytes / 1024 / 1024 * 10) / 10;
+const sleep = ms => new Promise(resolve => setTimeout(resolve, ms));
+
+function emit(record) {
+  process.stdout.write(`MONITOR ${JSON.stringify(record)}\n`);
+}
+
+// ============================================
+// PRISMA INSTRUMENTADO
+// ============================================
+
+// Llamada en curso; las queries de Promise.all internos se le atribuyen igual
+const current = new AsyncLocalStorage();
+
+// lib/prisma.js reutiliza global.prisma si existe
+global.prisma = new PrismaClient({ log: ['error'] }).$extends({
+  query: {
+    async $allOperations({ args: queryArgs, query }) {
+      const call = current.getStore();
+      const started = performance.now();
+      try {
+        return await query(queryArgs);
+      } finally {
+        if (call) {
+          call.queries++;
+          call.db_ms += performance.now() - started;
+        }
+      }
+    }
+  }
+});
+
+// ============================================
+// EJECUCIÓN
+// ============================================
+
+async function main() {
+  const { default: monitorService } = await import('../services/monitor.service.js');
+  const { default: numberHistoryService } = await import('../services/number-history.service.js');
+  const { prisma } = await import('../lib/prisma.js');
+
+  let peakRss = process.memoryUsage.rss();
+  const sampler = setInterval(() => {
+    peakRss = Math.max(peakRss, process.memoryUsage.rss());
+  }, 50);
+
+  // Como monitor.controller.js: la fecha del reporte es medianoche de Caracas
+  const reportDate = new Date(`${args.date}T00:00:00-04:00`);
+  const draws = await prisma.draw.findMany({
+    where: { id: { in: args.draws } },
+    select: { id: true, gameId: true }
+  });
+
+  async function call(endpoint, context, fn) {
+    const stats = { queries: 0, db_ms: 0 };
+    const record = { type: 'call', endpoint, ...context };
+    const started = performance.now();
+    let data = null;
+    try {
+      data = await current.run(stats, fn);
+      record.ms = round(performance.now() - started);
+      // Lo que hace res.json() en el controlador
+      const serializeStarted = performance.now();
+      record.bytes = Buffer.byteLength(JSON.stringify({ success: true, data }));
+      record.serialize_ms = round(performance.now() - serializeStarted);
+    } catch (error) {
+      record.ms = round(performance.now() - started);
+      record.error = error.message;
+    }
+    record.queries = stats.queries;
+    record.db_ms = round(stats.db_ms);
+    record.rss_mb = mb(process.memoryUsage.rss());
+    emit(record);
+    return data;
+  }
+
+  // Lo que pide fetchData para la pestaña activa, más los modales que se abren desde ella
+  async function refresh(tab, draw, context) {
+    if (tab === 'bancas') {
+      const bancas = await call('getBancaStats', context, () => monitorService.getBancaStats(draw.id));
+      for (const banca of (bancas?.bancas || []).slice(0, args.drilldowns)) {
+        await call('getTicketsByBanca', context,
+          () => monitorService.getTicketsByBanca(draw.id, parseInt(banca.externalId)));
+      }
+    } else if (tab === 'numeros') {
+      const items = await call('getItemStats', context, () => monitorService.getItemStats(draw.id));
+      await call('getAllLastSeen', context, () => numberHistoryService.getAllNumbersLastSeen(draw.gameId));
+      const byAmount = items?.items || [];
+      for (const item of byAmount.slice(0, args.drilldowns)) {
+        await call('getTicketsByItem', context, () => monitorService.getTicketsByItem(draw.id, item.itemId));
+      }
+      const byTripletas = [...byAmount].filter(i => i.tripletaCount > 0).sort((a, b) => b.tripletaCount - a.tripletaCount);
+      for (const item of byTripletas.slice(0, args.drilldowns)) {
+        await call('getTripletasByItem', { ...context, tripletas: item.tripletaCount },
+          () => monitorService.getTripletasByItem(draw.id, item.itemId));
+      }
+    } else {
+      await call('getDailyReport', context, () => monitorService.getDailyReport(reportDate, draw.gameId));
+    }
+  }
+
+  const started = performance.now();
+  await Promise.all(Array.from({ length: args.operators }, async (_, operator) => {
+    const tab = args.tabs[operator % args.tabs.length];
+    for (let r = 1; r <= args.rounds; r++) {
+      for (const draw of draws) {
+        await refresh(tab, draw, { drawId: draw.id, operator, tab, round: r });
+      }
+      if (args.thinkMs) await sleep(args.thinkMs);
+    }
+  }));
+  clearInterval(sampler);
+
+  emit({
+    type: 'end',
+    wall_ms: round(performance.now() - started),
+    peak_rss_mb: mb(Math.max(peakRss, process.memoryUsage.rss())),
+    max_rss_mb: mb(process.resourceUsage().maxRSS * 1024)
+  });
+  await prisma.$disconnect();
+}
+
+main().catch(error => {
+  emit({ type: 'fatal', error: error.message });
+  process.exit(1);
+});
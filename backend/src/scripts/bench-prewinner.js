@@ -0,0 +1,205 @@
+/**
+ * Driver de benchmark para la selección de pre-ganador
+ *
+ * Ejecuta PrewinnerOptimizerService.selectOptimalPrewinner sobre los sorteos
+ * indicados (--draw, repetible) --repeat veces cada uno y mide, por fase
+ * (loadDrawContext, getUsedItemsToday, getUsedCentenasToday, getDrawHistory,
+ * evaluateCandidates, calculateTripletaImpact, selectRandomIntelligent,
+ * selectFallback), llamadas, tiempo de pared y queries de Prisma con su
+ * tiempo. Las queries se atribuyen a la fase más interna en curso.
+ *
+ * El optimizador sólo lee: el sorteo queda igual entre repeticiones.
+ *
+ * Imprime líneas `PREWINNER {json}` (selection, end); las consume
+ * testsprite_tests/harness/prewinner.py.
+ *
+ * Uso: node src/scripts/bench-prewinner.js --draw <id> [--draw <id> ...] [--repeat 1]
+ */
+
+import dotenv from 'dotenv';
+dotenv.config();
+
+import { AsyncLocalStorage } from 'node:async_hooks';
+import { performance } from 'node:perf_hooks';
+import { PrismaClient } from '@prisma/client';
+
+const PHASES = [
+  'loadDrawContext',
+  'getUsedItemsToday',
+  'getUsedCentenasToday',
+  'getDrawHistory',
+  'evaluateCandidates',
+  'calculateTripletaImpact',
+  'selectRandomIntelligent',
+  'selectFallback'
+];
+
+function parseArgs(argv) {
+  const args = { draws: [], repeat: 1 };
+  for (let i = 0; i < argv.length; i++) {
+    switch (argv[i]) {
+      case '--draw': args.draws.push(argv[++i]); break;
+      case '--repeat': args.repeat = Number(argv[++i]); break;
+      default: throw new Error(`Argumento desconocido: ${argv[i]}`);
+    }
+  }
+  if (args.draws.length === 0) throw new Error('Falta --draw <id>');
+  return args;
+}
+
+const args = parseArgs(process.argv.slice(2));
+
+const round = ms => Math.round(ms * 10) / 10;
+const mb = bytes => Math.round(bytes / 1024 / 1024 * 10) / 10;
+
+function emit(record) {
+  process.stdout.write(`PREWINNER ${JSON.stringify(record)}\n`);
+}
+
+// ============================================
+// PRISMA INSTRUMENTADO
+// ============================================
+
+// Fase en curso de la selección en curso
+const current = new AsyncLocalStorage();
+
+// lib/prisma.js reutiliza global.prisma si existe
+global.prisma = new PrismaClient({ log: ['error'] }).$extends({
+  query: {
+    async $allOperations({ args: queryArgs, query }) {
+      const scope = current.getStore();
+      const started = performance.now();
+      try {
+        return await query(queryArgs);
+      } finally {
+        if (scope) {
+          const stats = scope.selection.phase(scope.phase);
+          stats.queries++;
+          stats.db_ms += performance.now() - started;
+        }
+      }
+    }
+  }
+});
+
+class Selection {
+  constructor() {
+    this.phases = {};
+  }
+
+  phase(name) {
+    if (!this.phases[name]) {
+      this.phases[name] = { calls: 0, wall_ms: 0, queries: 0, db_ms: 0 };
+    }
+    return this.phases[name];
+  }
+
+  report() {
+    return Object.fromEntries(Object.entries(this.phases).map(([name, stats]) => [name, {
+      calls: stats.calls,
+      wall_ms: round(stats.wall_ms),
+      queries: stats.queries,
+      db_ms: round(stats.db_ms)
+    }]));
+  }
+}
+
+function instrument(optimizer) {
+  for (const name of PHASES) {
+    const original = optimizer[name].bind(optimizer);
+    optimizer[name] = async (...params) => {
+      const scope = current.getStore();
+      if (!scope) return original(...params);
+      const stats = scope.selection.phase(name);
+      const started = performance.now();
+      stats.calls++;
+      try {
+        return await current.run({ selection: scope.selection, phase: name }, () => original(...params));
+      } finally {
+        stats.wall_ms += performance.now() - started;
+      }
+    };
+  }
+
+  // Tamaño de lo que se cargó, para el reporte
+  const loadDrawContext = optimizer.loadDrawContext;
+  optimizer.loadDrawContext = async (...params) => {
+    const context = await loadDrawContext(...params);
+    const scope = current.getStore();
+    if (scope && context.draw) {
+      scope.selection.loaded = {
+        game: context.game.slug,
+        tickets: context.tickets.length,
+        bets: context.tickets.reduce((sum, t) => sum + t.details.length, 0),
+        sales: round(context.totalSales),
+        items: context.gameItems.length,
+        active_tripletas: context.activeTripletas.length
+      };
+    }
+    return context;
+  };
+}
+
+// ============================================
+// EJECUCIÓN
+// ============================================
+
+async function main() {
+  const { default: optimizer } = await import('../services/prewinner-optimizer.service.js');
+  const { prisma } = await import('../lib/prisma.js');
+  instrument(optimizer);
+
+  let peakRss = process.memoryUsage.rss();
+  const sampler = setInterval(() => {
+    peakRss = Math.max(peakRss, process.memoryUsage.rss());
+  }, 50);
+
+  for (const drawId of args.draws) {
+    for (let run = 1; run <= args.repeat; run++) {
+      const selection = new Selection();
+      selection.loaded = null;
+      let result = null;
+      let error = null;
+      peakRss = process.memoryUsage.rss();
+      const started = performance.now();
+      try {
+        result = await current.run({ selection, phase: 'selectOptimalPrewinner' },
+          () => optimizer.selectOptimalPrewinner(drawId));
+      } catch (e) {
+        error = e.message;
+      }
+      const wallMs = performance.now() - started;
+      // Lo que la selección hace fuera de las fases instrumentadas
+      Object.assign(selection.phase('selectOptimalPrewinner'), { calls: 1, wall_ms: wallMs });
+      const total = Object.values(selection.phases).reduce(
+        (sum, p) => ({ queries: sum.queries + p.queries, db_ms: sum.db_ms + p.db_ms }),
+        { queries: 0, db_ms: 0 }
+      );
+
+      emit({
+        type: 'selection',
+        drawId,
+        run,
+        wall_ms: round(wallMs),
+        queries: total.queries,
+        db_ms: round(total.db_ms),
+        peak_rss_mb: mb(Math.max(peakRss, process.memoryUsage.rss())),
+        loaded: selection.loaded,
+        method: result?.method || null,
+        selected: result?.selectedItem?.number || null,
+        valid_candidates: result?.analysis?.validCandidates ?? null,
+        phases: selection.report(),
+        error
+      });
+    }
+  }
+
+  clearInterval(sampler);
+  emit({ type: 'end', max_rss_mb: mb(process.resourceUsage().maxRSS * 1024) });
+  await prisma.$disconnect();
+}
+
+main().catch(error => {
+  emit({ type: 'fatal', error: error.message });
+  process.exit(1);
+});
@@ -0,0 +1,294 @@
+/**
+ * Driver de benchmark para la publicación multicanal de sorteos
+ *
+ * Prepara en la base (DATABASE_URL) instancias de Telegram, Facebook e
+ * Instagram, canales por juego y una ráfaga de sorteos DRAWN ejecutados en el
+ * mismo instante, y los publica con el código real de PublicationService. Las
+ * URLs de las APIs (TELEGRAM_API_URL, META_GRAPH_URL, WHATSAPP_SERVICE_URL)
+ * deben apuntar a los servidores falsos de testsprite_tests/fake_channels.
+ *
+ * Modos:
+ *   job       publish-draw.job.js disparado cada --tick-s segundos, como el cron
+ *   parallel  publishDraw de todos los sorteos a la vez
+ *
+ * Después corre --retry-rounds rondas de retryFailedPublications, con el reloj
+ * adelantado 5 minutos por ronda para que las fallidas califiquen.
+ *
+ * Imprime líneas `PUBLISH {json}` (setup, channel, draw, retry, end); las
+ * consume testsprite_tests/fake_channels/bench.py.
+ *
+ * Uso: node src/scripts/bench-publication.js [--draws 10] [--channels telegram,whatsapp,facebook,instagram]
+ *        [--mode job|parallel] [--tick-s 60] [--retry-rounds 0]
+ */
+
+import dotenv from 'dotenv';
+dotenv.config();
+
+import { performance } from 'node:perf_hooks';
+
+const CHANNEL_TYPES = {
+  telegram: 'TELEGRAM',
+  whatsapp: 'WHATSAPP',
+  facebook: 'FACEBOOK',
+  instagram: 'INSTAGRAM'
+};
+
+const PUBLISHERS = {
+  TELEGRAM: 'publishToTelegram',
+  WHATSAPP: 'publishToWhatsApp',
+  FACEBOOK: 'publishToFacebook',
+  INSTAGRAM: 'publishToInstagram'
+};
+
+function parseArgs(argv) {
+  const args = { draws: 10, channels: Object.keys(CHANNEL_TYPES), mode: 'job', tickS: 60, retryRounds: 0 };
+  for (let i = 0; i < argv.length; i++) {
+    switch (argv[i]) {
+      case '--draws': args.draws = Number(argv[++i]); break;
+      case '--channels': args.channels = argv[++i].split(','); break;
+      case '--mode': args.mode = argv[++i]; break;
+      case '--tick-s': args.tickS = Number(argv[++i]); break;
+      case '--retry-rounds': args.retryRounds = Number(argv[++i]); break;
+      default: throw new Error(`Argumento desconocido: ${argv[i]}`);
+    }
+  }
+  for (const channel of args.channels) {
+    if (!CHANNEL_TYPES[channel]) throw new Error(`Canal desconocido: ${channel}`);
+  }
+  if (!['job', 'parallel'].includes(args.mode)) throw new Error(`Modo desconocido: ${args.mode}`);
+  return args;
+}
+
+const args = parseArgs(process.argv.slice(2));
+
+// Reloj adelantable para las rondas de reintento (retryAfterMinutes = 5)
+const RealDate = Date;
+let clockOffsetMs = 0;
+
+class ShiftedDate extends RealDate {
+  constructor(...params) {
+    if (params.length === 0) {
+      super(RealDate.now() + clockOffsetMs);
+    } else {
+      super(...params);
+    }
+  }
+
+  static now() {
+    return RealDate.now() + clockOffsetMs;
+  }
+}
+
+globalThis.Date = ShiftedDate;
+
+function emit(record) {
+  process.stdout.write(`PUBLISH ${JSON.stringify(record)}\n`);
+}
+
+const round = ms => Math.round(ms * 10) / 10;
+
+// ============================================
+// PREPARACIÓN
+// ============================================
+
+async function setup(prisma) {
+  await prisma.telegramInstance.upsert({
+    where: { instanceId: 'bench-telegram' },
+    create: { instanceId: 'bench-telegram', name: 'Bench Telegram', botToken: 'bench-token', status: 'CONNECTED' },
+    update: { isActive: true }
+  });
+  await prisma.facebookInstance.upsert({
+    where: { instanceId: 'bench-facebook' },
+    create: {
+      instanceId: 'bench-facebook', name: 'Bench Facebook', pageAccessToken: 'bench-token',
+      appSecret: 'bench', webhookToken: 'bench', pageId: 'bench-page', status: 'CONNECTED'
+    },
+    update: { isActive: true }
+  });
+  await prisma.instagramInstance.upsert({
+    where: { instanceId: 'bench-instagram' },
+    create: {
+      instanceId: 'bench-instagram', name: 'Bench Instagram', appId: 'bench', appSecret: 'bench',
+      accessToken: 'bench-token', userId: 'bench-ig-user', status: 'CONNECTED'
+    },
+    update: { isActive: true }
+  });
+
+  const games = await prisma.game.findMany({
+    where: { isActive: true },
+    include: { items: { take: 1, orderBy: { number: 'asc' } } },
+    orderBy: { name: 'asc' }
+  });
+  if (games.length === 0) {
+    throw new Error('No hay juegos activos; sembrar con create-games.js');
+  }
+
+  for (const game of games) {
+    for (const channel of args.channels) {
+      const channelType = CHANNEL_TYPES[channel];
+      await prisma.gameChannel.upsert({
+        where: { gameId_channelType_name: { gameId: game.id, channelType, name: `Bench ${channel}` } },
+        create: {
+          gameId: game.id,
+          channelType,
+          name: `Bench ${channel}`,
+          telegramInstanceId: channelType === 'TELEGRAM' ? 'bench-telegram' : null,
+          telegramChatId: channelType === 'TELEGRAM' ? '-100bench' : null,
+          facebookInstanceId: channelType === 'FACEBOOK' ? 'bench-facebook' : null,
+          instagramInstanceId: channelType === 'INSTAGRAM' ? 'bench-instagram' : null,
+          recipients: channelType === 'WHATSAPP' ? ['bench-group-1@g.us', 'bench-group-2@g.us'] : []
+        },
+        update: { isActive: true }
+      });
+    }
+  }
+
+  // Ráfaga: todos los sorteos ejecutados en el mismo instante
+  const executedAt = new Date();
+  const drawDate = new Date(RealDate.UTC(executedAt.getUTCFullYear(), executedAt.getUTCMonth(), executedAt.getUTCDate()));
+  const draws = [];
+  for (let i = 0; i < args.draws; i++) {
+    const game = games[i % games.length];
+    const slot = Math.floor(i / games.length);
+    // Horas que no chocan con sorteos reales: 23:MM:SS
+    const drawTime = `23:${String(Math.floor(slot / 60) % 60).padStart(2, '0')}:${String(slot % 60).padStart(2, '0')}`;
+    const draw = await prisma.draw.create({
+      data: {
+        gameId: game.id,
+        drawDate,
+        drawTime,
+        status: 'DRAWN',
+        winnerItemId: game.items[0]?.id,
+        drawnAt: executedAt,
+        imageUrl: `/storage/bench/${game.slug}.png`,
+        imageGenerated: true
+      }
+    });
+    draws.push(draw);
+  }
+
+  emit({ type: 'setup', games: games.length, draws: draws.length, channels: args.channels, mode: args.mode });
+  return draws;
+}
+
+// ============================================
+// INSTRUMENTACIÓN
+// ============================================
+
+function instrument(publicationService, startedAt) {
+  for (const [channelType, method] of Object.entries(PUBLISHERS)) {
+    const original = publicationService[method].bind(publicationService);
+    publicationService[method] = async (draw, channel) => {
+      const started = performance.now();
+      let result;
+      try {
+        result = await original(draw, channel);
+        return result;
+      } catch (error) {
+        result = { success: false, error: error.message };
+        throw error;
+      } finally {
+        emit({
+          type: 'channel',
+          drawId: draw.id,
+          channel: channelType,
+          started_ms: round(started - startedAt),
+          finished_ms: round(performance.now() - startedAt),
+          success: Boolean(result?.success),
+          skipped: Boolean(result?.skipped),
+          error: result?.error || result?.message || null
+        });
+      }
+    };
+  }
+
+  const publishDraw = publicationService.publishDraw.bind(publicationService);
+  publicationService.publishDraw = async (drawId) => {
+    const started = performance.now();
+    try {
+      const result = await publishDraw(drawId);
+      emit({
+        type: 'draw',
+        drawId,
+        started_ms: round(started - startedAt),
+        finished_ms: round(performance.now() - startedAt),
+        channels: result.results.length,
+        failed: result.results.filter(r => !r.success).length
+      });
+      return result;
+    } catch (error) {
+      emit({ type: 'draw', drawId, started_ms: round(started - startedAt), error: error.message });
+      throw error;
+    }
+  };
+}
+
+// ============================================
+// EJECUCIÓN
+// ============================================
+
+async function runJob(prisma, publishDrawJob, drawIds) {
+  const runs = [];
+  const pending = () => prisma.draw.count({ where: { id: { in: drawIds }, status: 'DRAWN' } });
+  // Como node-cron: cada tick dispara execute() sin esperar al anterior
+  while (await pending() > 0) {
+    runs.push(publishDrawJob.execute());
+    await new Promise(resolve => setTimeout(resolve, args.tickS * 1000));
+  }
+  await Promise.all(runs);
+  return runs.length;
+}
+
+async function main() {
+  const { prisma } = await import('../lib/prisma.js');
+  const { default: publicationService } = await import('../services/publication.service.js');
+  const { default: publishDrawJob } = await import('../jobs/publish-draw.job.js');
+
+  const draws = await setup(prisma);
+  const drawIds = draws.map(d => d.id);
+
+  const startedAt = performance.now();
+  instrument(publicationService, startedAt);
+
+  let ticks = null;
+  if (args.mode === 'job') {
+    ticks = await runJob(prisma, publishDrawJob, drawIds);
+  } else {
+    await Promise.allSettled(drawIds.map(id => publicationService.publishDraw(id)));
+  }
+  const publishedMs = performance.now() - startedAt;
+
+  for (let roundIndex = 1; roundIndex <= args.retryRounds; roundIndex++) {
+    clockOffsetMs += 5 * 60 * 1000 + 1000;
+    const failed = await prisma.drawPublication.count({ where: { drawId: { in: drawIds }, status: 'FAILED' } });
+    const started = performance.now();
+    await publishDrawJob.retryFailedPublications();
+    const stillFailed = await prisma.drawPublication.count({ where: { drawId: { in: drawIds }, status: 'FAILED' } });
+    emit({
+      type: 'retry',
+      round: roundIndex,
+      failed_before: failed,
+      failed_after: stillFailed,
+      duration_ms: round(performance.now() - started)
+    });
+  }
+
+  const publications = await prisma.drawPublication.groupBy({
+    by: ['channel', 'status'],
+    where: { drawId: { in: drawIds } },
+    _count: true
+  });
+  emit({
+    type: 'end',
+    published_ms: round(publishedMs),
+    job_ticks: ticks,
+    publications: publications.map(p => ({ channel: p.channel, status: p.status, count: p._count }))
+  });
+
+  await prisma.$disconnect();
+}
+
+main().catch(error => {
+  emit({ type: 'fatal', error: error.message });
+  process.exit(1);
+});
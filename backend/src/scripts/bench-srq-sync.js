@@ -0,0 +1,275 @@
+/**
+ * Driver de benchmark para la sincronización con SRQ
+ *
+ * Prepara en la base (DATABASE_URL) el sistema SRQ con configuraciones de
+ * PLANNING y SALES por juego apuntando a SRQ_URL (el servidor falso de
+ * testsprite_tests/fake_srq) y los sorteos de hoy en --draw-times. Con el
+ * reloj puesto en --at hora de Caracas (la hora pico por defecto) corre:
+ *
+ *   1. sync-api-planning.job.js una vez, que mapea los sorteos de SRQ a los locales
+ *   2. sync-api-tickets.job.js --ticks veces seguidas: cada tick borra e
+ *      importa las ventas del próximo sorteo de cada juego
+ *
+ * Por tick mide duración, queries de Prisma, tiempo esperando a SRQ y bytes
+ * recibidos, y por sorteo lo importado.
+ *
+ * Imprime líneas `SRQ {json}` (setup, planning, tick, end); las consume
+ * testsprite_tests/fake_srq/bench.py.
+ *
+ * Uso: SRQ_URL=http://127.0.0.1:3311 node src/scripts/bench-srq-sync.js [--at 17:10] [--ticks 2]
+ *        [--draw-times 08:00,09:00,...] [--token bench-srq-token]
+ */
+
+import dotenv from 'dotenv';
+dotenv.config();
+
+import { AsyncLocalStorage } from 'node:async_hooks';
+import { performance } from 'node:perf_hooks';
+import { PrismaClient } from '@prisma/client';
+
+const CARACAS_OFFSET_MS = -4 * 60 * 60 * 1000;
+const MINUTE_MS = 60 * 1000;
+
+const hourly = Array.from({ length: 12 }, (_, i) => `${String(8 + i).padStart(2, '0')}:00`);
+
+function parseArgs(argv) {
+  const args = { at: '17:10', ticks: 2, drawTimes: hourly, token: 'bench-srq-token' };
+  for (let i = 0; i < argv.length; i++) {
+    switch (argv[i]) {
+      case '--at': args.at = argv[++i]; break;
+      case '--ticks': args.ticks = Number(argv[++i]); break;
+      case '--draw-times': args.drawTimes = argv[++i].split(','); break;
+      case '--token': args.token = argv[++i]; break;
+      default: throw new Error(`Argumento desconocido: ${argv[i]}`);
+    }
+  }
+  if (!process.env.SRQ_URL) throw new Error('Falta SRQ_URL');
+  return args;
+}
+
+const args = parseArgs(process.argv.slice(2));
+const SRQ_URL = process.env.SRQ_URL.replace(/\/$/, '');
+
+const round = ms => Math.round(ms * 10) / 10;
+
+function emit(record) {
+  process.stdout.write(`SRQ ${JSON.stringify(record)}\n`);
+}
+
+// ============================================
+// RELOJ
+// ============================================
+
+// Hoy a las --at en Caracas; desde ahí el tiempo corre a 1x
+const RealDate = Date;
+const local = new RealDate(RealDate.now() + CARACAS_OFFSET_MS);
+const [atHours, atMinutes] = args.at.split(':').map(Number);
+const virtualStart = RealDate.UTC(local.getUTCFullYear(), local.getUTCMonth(), local.getUTCDate())
+  - CARACAS_OFFSET_MS + (atHours * 60 + atMinutes) * MINUTE_MS;
+const clockOffsetMs = virtualStart - RealDate.now();
+
+class ShiftedDate extends RealDate {
+  constructor(...params) {
+    if (params.length === 0) {
+      super(RealDate.now() + clockOffsetMs);
+    } else {
+      super(...params);
+    }
+  }
+
+  static now() {
+    return RealDate.now() + clockOffsetMs;
+  }
+}
+
+globalThis.Date = ShiftedDate;
+
+// ============================================
+// INSTRUMENTACIÓN
+// ============================================
+
+const current = new AsyncLocalStorage();
+
+// lib/prisma.js reutiliza global.prisma si existe
+global.prisma = new PrismaClient({ log: ['error'] }).$extends({
+  query: {
+    async $allOperations({ args: queryArgs, query }) {
+      const tick = current.getStore();
+      const started = performance.now();
+      try {
+        return await query(queryArgs);
+      } finally {
+        if (tick) {
+          tick.queries++;
+          tick.db_ms += performance.now() - started;
+        }
+      }
+    }
+  }
+});
+
+// Las llamadas a SRQ: hasta recibir el cuerpo completo
+const realFetch = globalThis.fetch;
+globalThis.fetch = async (url, options) => {
+  const tick = current.getStore();
+  const started = performance.now();
+  const response = await realFetch(url, options);
+  const body = await response.arrayBuffer();
+  if (tick) {
+    tick.requests++;
+    tick.fetch_ms += performance.now() - started;
+    tick.bytes += body.byteLength;
+  }
+  return new Response(body, { status: response.status, statusText: response.statusText, headers: response.headers });
+};
+
+function newTick() {
+  return { queries: 0, db_ms: 0, requests: 0, fetch_ms: 0, bytes: 0 };
+}
+
+function tickReport(tick) {
+  return { ...tick, db_ms: round(tick.db_ms), fetch_ms: round(tick.fetch_ms) };
+}
+
+// ============================================
+// PREPARACIÓN
+// ============================================
+
+async function setup(prisma) {
+  const games = await prisma.game.findMany({ where: { isActive: true }, orderBy: { name: 'asc' } });
+  if (games.length === 0) {
+    throw new Error('No hay juegos activos; sembrar con create-games.js');
+  }
+
+  const apiSystem = await prisma.apiSystem.findFirst({ where: { name: 'SRQ' } })
+    || await prisma.apiSystem.create({ data: { name: 'SRQ', description: 'SRQ falso del benchmark' } });
+
+  for (const game of games) {
+    for (const [type, path] of [['PLANNING', 'planning'], ['SALES', 'sales']]) {
+      const name = `Bench SRQ ${type} ${game.slug}`;
+      const data = {
+        name, apiSystemId: apiSystem.id, gameId: game.id, type,
+        baseUrl: `${SRQ_URL}/${path}/${game.slug}/`, token: args.token, isActive: true
+      };
+      const existing = await prisma.apiConfiguration.findFirst({ where: { name } });
+      if (existing) {
+        await prisma.apiConfiguration.update({ where: { id: existing.id }, data });
+      } else {
+        await prisma.apiConfiguration.create({ data });
+      }
+    }
+  }
+
+  // Sorteos de hoy, como los deja generate-daily-draws.job.js
+  const { getVenezuelaDateAsUTC } = await import('../lib/dateUtils.js');
+  const drawDate = getVenezuelaDateAsUTC();
+  const created = await prisma.draw.createMany({
+    data: games.flatMap(game => args.drawTimes.map(time => ({
+      gameId: game.id,
+      drawDate,
+      drawTime: time.length === 5 ? `${time}:00` : time,
+      status: 'SCHEDULED'
+    }))),
+    skipDuplicates: true
+  });
+
+  return { games, apiSystem, drawDate, draws: created.count };
+}
+
+// node-cron '*/N * * * *' → N minutos
+function intervalSeconds(cronExpression) {
+  const match = cronExpression.match(/^\*\/(\d+) /);
+  return match ? Number(match[1]) * 60 : null;
+}
+
+// ============================================
+// EJECUCIÓN
+// ============================================
+
+async function main() {
+  const { prisma } = await import('../lib/prisma.js');
+  const { default: syncApiPlanningJob } = await import('../jobs/sync-api-planning.job.js');
+  const { default: syncApiTicketsJob } = await import('../jobs/sync-api-tickets.job.js');
+  const { default: apiIntegrationService } = await import('../services/api-integration.service.js');
+
+  const { games, drawDate, draws } = await setup(prisma);
+  emit({
+    type: 'setup',
+    games: games.map(g => g.slug),
+    draws,
+    date: drawDate.toISOString().slice(0, 10),
+    at: args.at,
+    interval_s: intervalSeconds(syncApiTicketsJob.cronExpression)
+  });
+
+  const planning = newTick();
+  let started = performance.now();
+  let result = null;
+  let error = null;
+  try {
+    result = await current.run(planning, () => syncApiPlanningJob.execute());
+  } catch (e) {
+    error = e.message;
+  }
+  emit({
+    type: 'planning',
+    ms: round(performance.now() - started),
+    ...tickReport(planning),
+    mapped: result?.mapped ?? null,
+    skipped: result?.skipped ?? null,
+    error
+  });
+
+  // Lo que importa cada sorteo dentro del tick
+  let imports = [];
+  const importSRQTickets = apiIntegrationService.importSRQTickets.bind(apiIntegrationService);
+  apiIntegrationService.importSRQTickets = async (drawId, clearExisting) => {
+    const importStarted = performance.now();
+    const before = { ...current.getStore() };
+    const entry = { drawId };
+    try {
+      Object.assign(entry, await importSRQTickets(drawId, clearExisting));
+      return entry;
+    } catch (e) {
+      entry.error = e.message;
+      throw e;
+    } finally {
+      const tick = current.getStore();
+      entry.ms = round(performance.now() - importStarted);
+      entry.queries = tick.queries - before.queries;
+      entry.fetch_ms = round(tick.fetch_ms - before.fetch_ms);
+      entry.bytes = tick.bytes - before.bytes;
+      imports.push(entry);
+    }
+  };
+
+  for (let tickIndex = 1; tickIndex <= args.ticks; tickIndex++) {
+    const tick = newTick();
+    imports = [];
+    started = performance.now();
+    await current.run(tick, () => syncApiTicketsJob.execute());
+    const ms = performance.now() - started;
+
+    // Fuera del tiempo medido: qué quedó guardado
+    for (const entry of imports) {
+      const draw = await prisma.draw.findUnique({
+        where: { id: entry.drawId },
+        select: { drawTime: true, game: { select: { slug: true } } }
+      });
+      entry.game = draw.game.slug;
+      entry.drawTime = draw.drawTime;
+      entry.plays = await prisma.ticketDetail.count({
+        where: { ticket: { drawId: entry.drawId, source: 'EXTERNAL_API' } }
+      });
+    }
+    emit({ type: 'tick', tick: tickIndex, ms: round(ms), ...tickReport(tick), draws: imports });
+  }
+
+  emit({ type: 'end', max_rss_mb: Math.round(process.resourceUsage().maxRSS / 1024 * 10) / 10 });
+  await prisma.$disconnect();
+}
+
+main().catch(error => {
+  emit({ type: 'fatal', error: error.message });
+  process.exit(1);
+});
@@ -0,0 +1,39 @@
+import { performance } from 'node:perf_hooks';
+import { buildLayerCache } from '../lib/imageGenerator.js';
+
+/**
+ * Precomponer las capas estáticas de Ruleta y Animalitos en storage/cache/layers
+ *
+ * Ruleta: fondo + capa especial (o ninguna) + número + final, para cada número
+ * y cada capa especial. Animalitos: base + animal, para cada número. Al
+ * generar un resultado sólo se componen los textos sobre la imagen cacheada;
+ * sin este paso cada combinación se arma la primera vez que se usa. El render
+ * sólo usa la caché con IMAGE_LAYER_CACHE=true.
+ *
+ * Uso: node src/scripts/build-layer-cache.js [--force] [--concurrency 4]
+ */
+async function main() {
+  const argv = process.argv.slice(2);
+  const force = argv.includes('--force');
+  const concurrencyIndex = argv.indexOf('--concurrency');
+  const concurrency = concurrencyIndex >= 0 ? Number(argv[concurrencyIndex + 1]) : 4;
+
+  console.log(`🖼️  Precomponiendo capas${force ? ' (desde cero)' : ''}...\n`);
+  const started = performance.now();
+  const summary = await buildLayerCache({ force, concurrency });
+  const seconds = ((performance.now() - started) / 1000).toFixed(1);
+
+  console.log(`✅ Ruleta: ${summary.ruleta} combinaciones`);
+  console.log(`✅ Animalitos: ${summary.animalitos} combinaciones`);
+  for (const { template, error } of summary.errors) {
+    console.log(`❌ ${template}: ${error}`);
+  }
+  console.log(`\n⏱️  ${seconds} s`);
+
+  process.exit(summary.errors.length > 0 ? 1 : 0);
+}
+
+main().catch(error => {
+  console.error('❌ Error precomponiendo capas:', error);
+  process.exit(1);
+});
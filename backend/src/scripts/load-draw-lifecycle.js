@@ -0,0 +1,193 @@
+/**
+ * Driver de carga para el ciclo de vida diario de sorteos con reloj comprimido
+ *
+ * Ejecuta los jobs reales (generate-daily-draws, close-draw, execute-draw) en
+ * este proceso, pero sobre un reloj virtual que avanza `--speed` veces más
+ * rápido que el real. Cada minuto virtual dispara close y execute como lo haría
+ * node-cron: sin esperar al tick anterior. Dentro de un tick el reloj corre a
+ * velocidad real desde el instante programado, igual que en producción.
+ *
+ * Por cada tick imprime una línea `LOAD {json}` con el retraso del tick, su
+ * duración y el tiempo pasado en queries de Prisma. Lo consume
+ * testsprite_tests/harness/lifecycle.py.
+ *
+ * Uso: node src/scripts/load-draw-lifecycle.js [--speed 60] [--from 00:05] [--to 23:59] [--no-generate]
+ */
+
+import dotenv from 'dotenv';
+dotenv.config();
+
+import { AsyncLocalStorage } from 'node:async_hooks';
+import { performance } from 'node:perf_hooks';
+import { PrismaClient } from '@prisma/client';
+
+// Venezuela no tiene horario de verano: UTC-4 fijo
+const CARACAS_OFFSET_MS = -4 * 60 * 60 * 1000;
+const MINUTE_MS = 60 * 1000;
+
+function parseArgs(argv) {
+  const args = { speed: 60, from: '00:05', to: '23:59', generate: true };
+  for (let i = 0; i < argv.length; i++) {
+    switch (argv[i]) {
+      case '--speed': args.speed = Number(argv[++i]); break;
+      case '--from': args.from = argv[++i]; break;
+      case '--to': args.to = argv[++i]; break;
+      case '--no-generate': args.generate = false; break;
+      default: throw new Error(`Argumento desconocido: ${argv[i]}`);
+    }
+  }
+  return args;
+}
+
+const args = parseArgs(process.argv.slice(2));
+
+// ============================================
+// RELOJ VIRTUAL
+// ============================================
+
+const RealDate = Date;
+const ticks = new AsyncLocalStorage();
+
+// Medianoche de hoy en Caracas, en epoch UTC
+function caracasMidnight() {
+  const local = new RealDate(RealDate.now() + CARACAS_OFFSET_MS);
+  return RealDate.UTC(local.getUTCFullYear(), local.getUTCMonth(), local.getUTCDate()) - CARACAS_OFFSET_MS;
+}
+
+function atTime(midnight, hhmm) {
+  const [hours, minutes] = hhmm.split(':').map(Number);
+  return midnight + (hours * 60 + minutes) * MINUTE_MS;
+}
+
+const midnight = caracasMidnight();
+const virtualStart = atTime(midnight, args.from);
+const virtualEnd = atTime(midnight, args.to);
+let realStart = performance.now();
+
+function virtualNow() {
+  const tick = ticks.getStore();
+  if (tick) {
+    // Dentro de un tick el tiempo corre a 1x desde el instante programado
+    return tick.virtual + (performance.now() - tick.scheduledReal);
+  }
+  return virtualStart + (performance.now() - realStart) * args.speed;
+}
+
+class VirtualDate extends RealDate {
+  constructor(...params) {
+    if (params.length === 0) {
+      super(virtualNow());
+    } else {
+      super(...params);
+    }
+  }
+
+  static now() {
+    return virtualNow();
+  }
+}
+
+globalThis.Date = VirtualDate;
+
+// ============================================
+// PRISMA INSTRUMENTADO
+// ============================================
+
+// lib/prisma.js reutiliza global.prisma si existe
+global.prisma = new PrismaClient({ log: ['error'] }).$extends({
+  query: {
+    async $allOperations({ args: queryArgs, query }) {
+      const tick = ticks.getStore();
+      const started = performance.now();
+      try {
+        return await query(queryArgs);
+      } finally {
+        if (tick) {
+          tick.dbMs += performance.now() - started;
+          tick.queries++;
+        }
+      }
+    }
+  }
+});
+
+function emit(record) {
+  process.stdout.write(`LOAD ${JSON.stringify(record)}\n`);
+}
+
+function formatVirtual(epoch) {
+  return new RealDate(epoch + CARACAS_OFFSET_MS).toISOString().slice(11, 19);
+}
+
+async function runTick(name, job, virtual, scheduledReal, inFlight) {
+  const tick = { virtual, scheduledReal, dbMs: 0, queries: 0 };
+  const started = performance.now();
+  let error = null;
+  inFlight[name]++;
+  try {
+    await ticks.run(tick, () => job.execute());
+  } catch (e) {
+    error = e.message;
+  } finally {
+    inFlight[name]--;
+  }
+  emit({
+    type: 'tick',
+    job: name,
+    virtual: formatVirtual(virtual),
+    lateness_ms: Math.round((started - scheduledReal) * 10) / 10,
+    duration_ms: Math.round((performance.now() - started) * 10) / 10,
+    db_ms: Math.round(tick.dbMs * 10) / 10,
+    queries: tick.queries,
+    overlapping: inFlight[name] > 0,
+    error
+  });
+}
+
+function sleepUntil(realTime) {
+  const delay = realTime - performance.now();
+  return delay > 0 ? new Promise(resolve => setTimeout(resolve, delay)) : Promise.resolve();
+}
+
+async function main() {
+  const { default: generateDailyDrawsJob } = await import('../jobs/generate-daily-draws.job.js');
+  const { default: closeDrawJob } = await import('../jobs/close-draw.job.js');
+  const { default: executeDrawJob } = await import('../jobs/execute-draw.job.js');
+  const { prisma } = await import('../lib/prisma.js');
+
+  const jobs = { close: closeDrawJob, execute: executeDrawJob };
+  const inFlight = { close: 0, execute: 0 };
+
+  emit({
+    type: 'start',
+    speed: args.speed,
+    from: args.from,
+    to: args.to,
+    date: new RealDate(midnight - CARACAS_OFFSET_MS).toISOString().slice(0, 10)
+  });
+
+  realStart = performance.now();
+  if (args.generate) {
+    await runTick('generate', generateDailyDrawsJob, virtualStart, realStart, { generate: 0 });
+  }
+
+  // Los ticks caen en el segundo 00 de cada minuto virtual, como node-cron
+  const pending = [];
+  const firstMinute = Math.ceil(virtualStart / MINUTE_MS) * MINUTE_MS;
+  for (let virtual = firstMinute; virtual <= virtualEnd; virtual += MINUTE_MS) {
+    const scheduledReal = realStart + (virtual - virtualStart) / args.speed;
+    await sleepUntil(scheduledReal);
+    for (const [name, job] of Object.entries(jobs)) {
+      pending.push(runTick(name, job, virtual, scheduledReal, inFlight));
+    }
+  }
+
+  await Promise.all(pending);
+  emit({ type: 'end', real_s: Math.round(performance.now() - realStart) / 1000 });
+  await prisma.$disconnect();
+}
+
+main().catch(error => {
+  emit({ type: 'fatal', error: error.message });
+  process.exit(1);
+});
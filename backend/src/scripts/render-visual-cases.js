@@ -0,0 +1,176 @@
+/**
+ * Driver de la regresión visual de las imágenes de resultados
+ *
+ * Genera con lib/imageGenerator.js un conjunto fijo de casos que cubre cada
+ * plantilla: la Ruleta con 0, 00, un rojo y un negro sin capa especial y un
+ * número con cada capa especial; Animalitos con 0 (delfín), 00 (ballena) y
+ * números de uno y dos dígitos; Triple con un número normal, uno X00 y las
+ * horas 10-12 que tienen imagen propia; la pirámide en lunes y domingo y una
+ * imagen de recomendaciones. Math.random se siembra por caso para que las
+ * recomendaciones salgan siempre iguales.
+ *
+ * Cada imagen se mueve de storage/results a --out como <nombre>.png, así no
+ * quedan resultados falsos junto a los reales. Las fechas son del año --year.
+ * IMAGE_LAYER_CACHE decide si Ruleta y Animalitos usan las capas precompuestas;
+ * el registro end lo informa junto con las versiones de sharp y libvips.
+ *
+ * Imprime líneas `VISUAL {json}` (image, end); las consume
+ * testsprite_tests/harness/visual.py.
+ *
+ * Uso: node src/scripts/render-visual-cases.js --out <dir> [--only ruleta_sin_capa_00,triple_123]
+ *        [--year 2099]
+ */
+
+import fs from 'fs/promises';
+import path from 'path';
+import { performance } from 'node:perf_hooks';
+import sharp from 'sharp';
+import {
+  generateRouletteImage,
+  generateAnimalitosImage,
+  generateTripleImage,
+  generatePyramidImage,
+  generateRecommendationsImage,
+  getSpecialLayerDates
+} from '../lib/imageGenerator.js';
+
+function parseArgs(argv) {
+  const args = { out: null, only: null, year: 2099 };
+  for (let i = 0; i < argv.length; i++) {
+    switch (argv[i]) {
+      case '--out': args.out = argv[++i]; break;
+      case '--only': args.only = argv[++i].split(','); break;
+      case '--year': args.year = Number(argv[++i]); break;
+      default: throw new Error(`Argumento desconocido: ${argv[i]}`);
+    }
+  }
+  if (!args.out) throw new Error('Falta --out');
+  return args;
+}
+
+const args = parseArgs(process.argv.slice(2));
+
+function emit(record) {
+  process.stdout.write(`VISUAL ${JSON.stringify(record)}\n`);
+}
+
+const round = ms => Math.round(ms * 10) / 10;
+
+// ============================================
+// CASOS
+// ============================================
+
+function buildCases() {
+  const cases = [];
+  const base = new Date(args.year, 5, 15);
+  const layers = getSpecialLayerDates(args.year);
+
+  // 0 y 00 verdes, 01 rojo, 02 negro
+  for (const result of ['0', '00', '01', '02']) {
+    cases.push({
+      name: `ruleta_sin_capa_${result}`, kind: 'ruleta', result, layer: 'sin_capa',
+      render: () => generateRouletteImage({ result, drawDate: layers.sin_capa, drawTime: '08:00:00', gameId: 1 })
+    });
+  }
+  for (const [layer, date] of Object.entries(layers)) {
+    if (layer === 'sin_capa') continue;
+    const name = layer.replace(/^capa_|\.png$/g, '');
+    cases.push({
+      name: `ruleta_${name}_05`, kind: 'ruleta', result: '05', layer: name,
+      render: () => generateRouletteImage({ result: '05', drawDate: date, drawTime: '13:00:00', gameId: 1 })
+    });
+  }
+
+  for (const [result, drawTime] of [[0, '08:00:00'], ['00', '12:00:00'], ['07', '15:00:00'], ['36', '19:00:00']]) {
+    cases.push({
+      name: `animalitos_${result === 0 ? '0' : result}`, kind: 'animalitos', result: String(result),
+      render: () => generateAnimalitosImage({ result, drawDate: base, drawTime, gameId: 2 })
+    });
+  }
+
+  for (const [result, drawTime] of [['123', '09:00:00'], ['100', '10:00:00'], ['000', '11:00:00'], ['987', '12:00:00']]) {
+    cases.push({
+      name: `triple_${result}`, kind: 'triple', result,
+      render: () => generateTripleImage({ result, drawDate: base, drawTime, gameId: 3 })
+    });
+  }
+
+  // El lunes y el domingo de la semana siguiente a la fecha base
+  for (const weekday of [1, 0]) {
+    const date = new Date(base);
+    date.setDate(base.getDate() + ((weekday - base.getDay() + 7) % 7 || 7));
+    cases.push({
+      name: `pyramid_${date.getDay() || 7}`, kind: 'pyramid', result: String(date.getDay() || 7),
+      render: () => generatePyramidImage(date)
+    });
+  }
+
+  cases.push({
+    name: 'recommendations', kind: 'recommendations', result: null,
+    render: () => generateRecommendationsImage(3, base)
+  });
+
+  return args.only ? cases.filter(c => args.only.includes(c.name)) : cases;
+}
+
+// ============================================
+// SEMILLA
+// ============================================
+
+// mulberry32: Math.random reproducible por caso
+function seededRandom(text) {
+  let state = 0;
+  for (const char of text) state = (Math.imul(state, 31) + char.charCodeAt(0)) | 0;
+  return () => {
+    state = (state + 0x6D2B79F5) | 0;
+    let t = Math.imul(state ^ (state >>> 15), 1 | state);
+    t = (t + Math.imul(t ^ (t >>> 7), 61 | t)) ^ t;
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+}
+
+// ============================================
+// EJECUCIÓN
+// ============================================
+
+async function main() {
+  await fs.mkdir(args.out, { recursive: true });
+  const cases = buildCases();
+  const realRandom = Math.random;
+  const started = performance.now();
+
+  // De a uno: la semilla de Math.random es por caso
+  for (const testCase of cases) {
+    const record = { type: 'image', name: testCase.name, kind: testCase.kind, result: testCase.result, layer: testCase.layer || null };
+    const caseStarted = performance.now();
+    Math.random = seededRandom(testCase.name);
+    try {
+      const output = await testCase.render();
+      record.path = path.resolve(args.out, `${testCase.name}.png`);
+      await fs.rename(output.path, record.path).catch(async error => {
+        if (error.code !== 'EXDEV') throw error;
+        await fs.copyFile(output.path, record.path);
+        await fs.unlink(output.path);
+      });
+    } catch (error) {
+      record.error = error.message;
+    } finally {
+      Math.random = realRandom;
+    }
+    record.ms = round(performance.now() - caseStarted);
+    emit(record);
+  }
+
+  emit({
+    type: 'end',
+    images: cases.length,
+    wall_ms: round(performance.now() - started),
+    layer_cache: process.env.IMAGE_LAYER_CACHE === 'true',
+    versions: sharp.versions
+  });
+}
+
+main().catch(error => {
+  emit({ type: 'fatal', error: error.message });
+  process.exit(1);
+});
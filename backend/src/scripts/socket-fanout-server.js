@@ -0,0 +1,133 @@
+/**
+ * Servidor Socket.IO para medir el fan-out de eventos de sorteo
+ *
+ * Levanta solo la capa de tiempo real del backend (initializeSocket de
+ * lib/socket.js sobre un servidor HTTP) y emite eventos bajo demanda, tal como
+ * lo hace execute-draw.job.js: un emitToAll y un emitToGame por sorteo. Así la
+ * medición no depende de la base de datos ni de los cron jobs.
+ *
+ * Recibe comandos JSON por stdin, uno por línea:
+ *   {"op": "emit", "seq": 1, "game": "lottopantera"}
+ *   {"op": "stats"}
+ * y responde con líneas `FANOUT {json}` (ready, emitted, stats) por stdout.
+ * Las stats incluyen los sockets por sala y las conexiones/desconexiones desde
+ * la lectura anterior. Lo consumen testsprite_tests/harness/fanout.py y
+ * testsprite_tests/harness/storm.py.
+ *
+ * Uso: node src/scripts/socket-fanout-server.js [--port 3198]
+ */
+
+import dotenv from 'dotenv';
+dotenv.config();
+
+import { createServer } from 'http';
+import readline from 'readline';
+import { monitorEventLoopDelay, performance } from 'perf_hooks';
+import { initializeSocket, emitToAll, emitToGame } from '../lib/socket.js';
+
+function parseArgs(argv) {
+  const args = { port: 3198 };
+  for (let i = 0; i < argv.length; i++) {
+    switch (argv[i]) {
+      case '--port': args.port = Number(argv[++i]); break;
+      default: throw new Error(`Argumento desconocido: ${argv[i]}`);
+    }
+  }
+  return args;
+}
+
+const args = parseArgs(process.argv.slice(2));
+
+function emit(record) {
+  process.stdout.write(`FANOUT ${JSON.stringify(record)}\n`);
+}
+
+const server = createServer();
+const io = initializeSocket(server);
+
+// Retraso del event loop entre dos lecturas de stats
+const loopDelay = monitorEventLoopDelay({ resolution: 10 });
+loopDelay.enable();
+
+// Conexiones y desconexiones desde la última lectura de stats
+const churn = { connections: 0, disconnections: 0 };
+io.on('connection', (socket) => {
+  churn.connections++;
+  socket.on('disconnect', () => { churn.disconnections++; });
+});
+
+// Sockets por sala de juego
+function roomSizes() {
+  const rooms = {};
+  for (const [room, sockets] of io.sockets.adapter.rooms) {
+    if (room.startsWith('game:')) rooms[room.slice(5)] = sockets.size;
+  }
+  return rooms;
+}
+
+let lastCpu = process.cpuUsage();
+let lastWall = performance.now();
+
+function stats() {
+  const cpu = process.cpuUsage(lastCpu);
+  const wall = performance.now() - lastWall;
+  const memory = process.memoryUsage();
+  const record = {
+    type: 'stats',
+    at: Date.now(),
+    clients: io.engine.clientsCount,
+    rooms: roomSizes(),
+    connections: churn.connections,
+    disconnections: churn.disconnections,
+    cpu_ms: Math.round((cpu.user + cpu.system) / 1000),
+    wall_ms: Math.round(wall),
+    cpu_pct: wall > 0 ? Math.round((cpu.user + cpu.system) / 10 / wall * 10) / 10 : null,
+    rss_mb: Math.round(memory.rss / 1024 / 1024 * 10) / 10,
+    heap_mb: Math.round(memory.heapUsed / 1024 / 1024 * 10) / 10,
+    loop_delay_p99_ms: Math.round(loopDelay.percentile(99) / 1e5) / 10,
+    loop_delay_max_ms: Math.round(loopDelay.max / 1e5) / 10
+  };
+  lastCpu = process.cpuUsage();
+  lastWall = performance.now();
+  loopDelay.reset();
+  churn.connections = 0;
+  churn.disconnections = 0;
+  return record;
+}
+
+function emitDraw(seq, game) {
+  // Mismo par de eventos que execute-draw.job.js, con la hora de envío
+  const sentAt = Date.now();
+  const started = performance.now();
+  const payload = {
+    drawId: `fanout-${seq}`,
+    drawTime: new Date(sentAt).toISOString().slice(11, 19),
+    winnerItem: { number: '00', name: 'FANOUT' },
+    sentAt
+  };
+  emitToAll('draw:executed', { ...payload, game: { name: game, slug: game } });
+  emitToGame(game, 'draw:executed', payload);
+  emit({ type: 'emitted', seq, game, sent_at: sentAt, emit_ms: Math.round((performance.now() - started) * 100) / 100 });
+}
+
+readline.createInterface({ input: process.stdin }).on('line', (line) => {
+  if (!line.trim()) return;
+  try {
+    const command = JSON.parse(line);
+    switch (command.op) {
+      case 'emit': emitDraw(command.seq, command.game); break;
+      case 'stats': emit(stats()); break;
+      default: throw new Error(`Comando desconocido: ${command.op}`);
+    }
+  } catch (error) {
+    emit({ type: 'error', error: error.message });
+  }
+}).on('close', () => {
+  io.close();
+  process.exit(0);
+});
+
+server.listen(args.port, () => {
+  stats();
+  emit({ type: 'ready', port: args.port, pid: process.pid });
+});
@@ -11,7 +11,8 @@ const prisma = new PrismaClient();
 class FacebookService {
   constructor() {
     this.instances = new Map(); // Cache de instancias activas
-    this.baseUrl = 'https://graph.facebook.com/v18.0';
+    // META_GRAPH_URL permite apuntar a un servidor local (benchmarks)
+    this.baseUrl = process.env.META_GRAPH_URL || 'https://graph.facebook.com/v18.0';
   }
 
   /**
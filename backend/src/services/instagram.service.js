@@ -10,7 +10,8 @@ const prisma = new PrismaClient();
 class InstagramService {
   constructor() {
     this.instances = new Map(); // Cache de instancias activas
-    this.baseUrl = 'https://graph.facebook.com/v18.0';
+    // META_GRAPH_URL permite apuntar a un servidor local (benchmarks)
+    this.baseUrl = process.env.META_GRAPH_URL || 'https://graph.facebook.com/v18.0';
   }
 
   /**
@@ -4,6 +4,9 @@ import logger from '../lib/logger.js';
 
 const prisma = new PrismaClient();
 
+// Base de la Bot API; TELEGRAM_API_URL permite apuntar a un servidor local (benchmarks)
+const TELEGRAM_API_URL = process.env.TELEGRAM_API_URL || 'https://api.telegram.org';
+
 /**
  * Servicio para gestionar instancias de Telegram Bot
  */
@@ -61,7 +64,7 @@ class TelegramService {
    */
   async validateBotToken(botToken) {
     try {
-      const response = await axios.get(`https://api.telegram.org/bot${botToken}/getMe`);
+      const response = await axios.get(`${TELEGRAM_API_URL}/bot${botToken}/getMe`);
       
       if (!response.data.ok) {
         throw new Error('Token de bot inválido');
@@ -81,7 +84,7 @@ class TelegramService {
    */
   async setWebhook(botToken, webhookUrl) {
     try {
-      const response = await axios.post(`https://api.telegram.org/bot${botToken}/setWebhook`, {
+      const response = await axios.post(`${TELEGRAM_API_URL}/bot${botToken}/setWebhook`, {
         url: webhookUrl
       });
 
@@ -111,7 +114,7 @@ class TelegramService {
       };
 
       const response = await axios.post(
-        `https://api.telegram.org/bot${instance.botToken}/sendMessage`,
+        `${TELEGRAM_API_URL}/bot${instance.botToken}/sendMessage`,
         payload
       );
 
@@ -150,7 +153,7 @@ class TelegramService {
       };
 
       const response = await axios.post(
-        `https://api.telegram.org/bot${instance.botToken}/sendPhoto`,
+        `${TELEGRAM_API_URL}/bot${instance.botToken}/sendPhoto`,
         payload
       );
 
@@ -180,7 +183,7 @@ class TelegramService {
       const instance = await this.getInstance(instanceId);
       
       const response = await axios.get(
-        `https://api.telegram.org/bot${instance.botToken}/getChat?chat_id=${chatId}`
+        `${TELEGRAM_API_URL}/bot${instance.botToken}/getChat?chat_id=${chatId}`
       );
 
       if (!response.data.ok) {
@@ -315,7 +318,7 @@ class TelegramService {
    */
   async deleteWebhook(botToken) {
     try {
-      const response = await axios.post(`https://api.telegram.org/bot${botToken}/deleteWebhook`);
+      const response = await axios.post(`${TELEGRAM_API_URL}/bot${botToken}/deleteWebhook`);
       return response.data;
     } catch (error) {
       logger.error('Error al eliminar webhook:', error);
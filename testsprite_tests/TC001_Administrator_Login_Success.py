@@ -2,25 +2,28 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
-async def run_test():
+from harness.waits import Steps
+
+async def run_test(browser=None):
     pw = None
-    browser = None
+    own_browser = browser is None
     context = None
+    steps = None
     
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
+        if own_browser:
+            # Start a Playwright session in asynchronous mode
+            pw = await async_api.async_playwright().start()
         
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
+            # Launch a Chromium browser in headless mode with custom arguments
+            browser = await pw.chromium.launch(
+                headless=True,
+                args=[
+                    "--window-size=1280,720",         # Set the browser window size
+                    "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
+                    "--ipc=host",                     # Use host-level IPC for better stability
+                ],
+            )
         
         # Create a new browser context (like an incognito window)
         context = await browser.new_context()
@@ -28,9 +31,10 @@ async def run_test():
         
         # Open a new page in the browser context
         page = await context.new_page()
+        steps = Steps(page, "TC001")
         
         # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000/login", wait_until="commit", timeout=10000)
+        await steps.record("navigate", "http://localhost:3000/login", page.goto("http://localhost:3000/login", wait_until="commit", timeout=10000))
         
         # Wait for the main page to reach DOMContentLoaded state (optional for stability)
         try:
@@ -50,35 +54,36 @@ async def run_test():
         frame = context.pages[-1]
         # Input the administrator username
         elem = frame.locator('xpath=html/body/div/div/div/div[3]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin')
+        await steps.fill(elem, 'admin', label='Input the administrator username')
         
 
         frame = context.pages[-1]
         # Input the administrator password
         elem = frame.locator('xpath=html/body/div/div/div/div[3]/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin123')
+        await steps.fill(elem, 'admin123', label='Input the administrator password')
         
 
         frame = context.pages[-1]
         # Click the Iniciar Sesión button to submit the login form
         elem = frame.locator('xpath=html/body/div/div/div/div[3]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, label='Click the Iniciar Sesión button to submit the login form', response="/api/auth/login")
         
 
         # --> Assertions to verify final state
         frame = context.pages[-1]
-        await expect(frame.locator('text=admin').first).to_be_visible(timeout=30000)
-        await expect(frame.locator('text=Panel de Administración').first).to_be_visible(timeout=30000)
-        await expect(frame.locator('text=Dashboard').first).to_be_visible(timeout=30000)
-        await asyncio.sleep(5)
+        await steps.record("assertion", 'text=admin', expect(frame.locator('text=admin').first).to_be_visible(timeout=30000))
+        await steps.record("assertion", 'text=Panel de Administración', expect(frame.locator('text=Panel de Administración').first).to_be_visible(timeout=30000))
+        await steps.record("assertion", 'text=Dashboard', expect(frame.locator('text=Dashboard').first).to_be_visible(timeout=30000))
     
     finally:
+        if steps:
+            await steps.write_trace()
         if context:
             await context.close()
-        if browser:
+        if own_browser and browser:
             await browser.close()
         if pw:
             await pw.stop()
             
-asyncio.run(run_test())
-    
\ No newline at end of file
+if __name__ == "__main__":
+    asyncio.run(run_test())
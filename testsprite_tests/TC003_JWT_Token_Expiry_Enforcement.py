@@ -2,25 +2,28 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
-async def run_test():
+from harness.waits import Steps
+
+async def run_test(browser=None):
     pw = None
-    browser = None
+    own_browser = browser is None
     context = None
+    steps = None
     
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
+        if own_browser:
+            # Start a Playwright session in asynchronous mode
+            pw = await async_api.async_playwright().start()
+        
+            # Launch a Chromium browser in headless mode with custom arguments
+            browser = await pw.chromium.launch(
+                headless=True,
+                args=[
+                    "--window-size=1280,720",         # Set the browser window size
+                    "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
+                    "--ipc=host",                     # Use host-level IPC for better stability
+                ],
+            )
         
         # Create a new browser context (like an incognito window)
         context = await browser.new_context()
@@ -28,9 +31,10 @@ async def run_test():
         
         # Open a new page in the browser context
         page = await context.new_page()
+        steps = Steps(page, "TC003")
         
         # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000/login", wait_until="commit", timeout=10000)
+        await steps.record("navigate", "http://localhost:3000/login", page.goto("http://localhost:3000/login", wait_until="commit", timeout=10000))
         
         # Wait for the main page to reach DOMContentLoaded state (optional for stability)
         try:
@@ -50,73 +54,74 @@ async def run_test():
         frame = context.pages[-1]
         # Input username 'admin'
         elem = frame.locator('xpath=html/body/div/div/div/div[3]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin')
+        await steps.fill(elem, 'admin', label="Input username 'admin'")
         
 
         frame = context.pages[-1]
         # Input password 'admin123'
         elem = frame.locator('xpath=html/body/div/div/div/div[3]/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin123')
+        await steps.fill(elem, 'admin123', label="Input password 'admin123'")
         
 
         frame = context.pages[-1]
         # Click 'Iniciar Sesión' button to submit login form
         elem = frame.locator('xpath=html/body/div/div/div/div[3]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, label="Click 'Iniciar Sesión' button to submit login form", response="/api/auth/login")
         
 
         # -> Try to login again with the same credentials to confirm failure or check for any subtle UI changes or alerts.
         frame = context.pages[-1]
         # Input username 'admin' again
         elem = frame.locator('xpath=html/body/div/div/div/div[3]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin')
+        await steps.fill(elem, 'admin', label="Input username 'admin' again")
         
 
         frame = context.pages[-1]
         # Input password 'admin123' again
         elem = frame.locator('xpath=html/body/div/div/div/div[3]/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin123')
+        await steps.fill(elem, 'admin123', label="Input password 'admin123' again")
         
 
         frame = context.pages[-1]
         # Click 'Iniciar Sesión' button again to attempt login
         elem = frame.locator('xpath=html/body/div/div/div/div[3]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, label="Click 'Iniciar Sesión' button again to attempt login", response="/api/auth/login")
         
 
         # -> Wait until the JWT token expiry time is reached, then attempt to access an admin-only protected resource to verify access denial.
         frame = context.pages[-1]
         # Attempt to access an admin-only protected resource by clicking 'Dashboard' link to verify access after token expiration.
         elem = frame.locator('xpath=html/body/div/div/div/nav/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, label="Attempt to access an admin-only protected resource by clicking 'Dashboard' link to verify access after token expiration.")
         
 
         # -> Simulate token expiration by logging out, then attempt to access an admin-only resource to verify access denial and prompt to login.
         frame = context.pages[-1]
         # Click 'Cerrar Sesión' button to log out and simulate token expiration
         elem = frame.locator('xpath=html/body/div/div/div/div[3]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, label="Click 'Cerrar Sesión' button to log out and simulate token expiration")
         
 
         # -> Attempt to access an admin-only protected resource after logout to verify access denial and prompt to login.
         frame = context.pages[-1]
         # Attempt to access admin-only resource 'Registrarse' or other admin resource to verify access denial after logout
         elem = frame.locator('xpath=html/body/div/div/div/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, label="Attempt to access admin-only resource 'Registrarse' or other admin resource to verify access denial after logout")
         
 
         # --> Assertions to verify final state
         frame = context.pages[-1]
-        await expect(frame.locator('text=Iniciar Sesión').first).to_be_visible(timeout=30000)
-        await asyncio.sleep(5)
+        await steps.record("assertion", 'text=Iniciar Sesión', expect(frame.locator('text=Iniciar Sesión').first).to_be_visible(timeout=30000))
     
     finally:
+        if steps:
+            await steps.write_trace()
         if context:
             await context.close()
-        if browser:
+        if own_browser and browser:
             await browser.close()
         if pw:
             await pw.stop()
             
-asyncio.run(run_test())
-    
\ No newline at end of file
+if __name__ == "__main__":
+    asyncio.run(run_test())
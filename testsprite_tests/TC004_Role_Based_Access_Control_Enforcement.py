@@ -2,35 +2,40 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
-async def run_test():
+from harness.session import new_admin_context
+from harness.waits import Steps
+
+async def run_test(browser=None):
     pw = None
-    browser = None
+    own_browser = browser is None
     context = None
+    steps = None
     
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
+        if own_browser:
+            # Start a Playwright session in asynchronous mode
+            pw = await async_api.async_playwright().start()
         
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
+            # Launch a Chromium browser in headless mode with custom arguments
+            browser = await pw.chromium.launch(
+                headless=True,
+                args=[
+                    "--window-size=1280,720",         # Set the browser window size
+                    "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
+                    "--ipc=host",                     # Use host-level IPC for better stability
+                ],
+            )
         
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        # Create a browser context that reuses the shared admin session
+        context = await new_admin_context(browser)
         context.set_default_timeout(5000)
         
         # Open a new page in the browser context
         page = await context.new_page()
+        steps = Steps(page, "TC004")
         
         # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000/login", wait_until="commit", timeout=10000)
+        await steps.record("navigate", "http://localhost:3000/admin", page.goto("http://localhost:3000/admin", wait_until="commit", timeout=10000))
         
         # Wait for the main page to reach DOMContentLoaded state (optional for stability)
         try:
@@ -46,66 +51,48 @@ async def run_test():
                 pass
         
         # Interact with the page elements to simulate user flow
-        # -> Input username and password for a limited privilege user and click login.
-        frame = context.pages[-1]
-        # Input username 'admin'
-        elem = frame.locator('xpath=html/body/div/div/div/div[3]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin')
-        
-
-        frame = context.pages[-1]
-        # Input password 'admin123'
-        elem = frame.locator('xpath=html/body/div/div/div/div[3]/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin123')
-        
-
-        frame = context.pages[-1]
-        # Click login button to authenticate
-        elem = frame.locator('xpath=html/body/div/div/div/div[3]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
         # -> Log out admin user and log in with a limited privilege user to test access restrictions.
         frame = context.pages[-1]
         # Click 'Cerrar Sesión' to log out admin user
         elem = frame.locator('xpath=html/body/div/div/div/div[3]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, label="Click 'Cerrar Sesión' to log out admin user")
         
 
         # -> Input username and password for a limited privilege user and click login.
         frame = context.pages[-1]
         # Input username for limited privilege user
         elem = frame.locator('xpath=html/body/div/div/div/div[3]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('limitedUser')
+        await steps.fill(elem, 'limitedUser', label='Input username for limited privilege user')
         
 
         frame = context.pages[-1]
         # Input password for limited privilege user
         elem = frame.locator('xpath=html/body/div/div/div/div[3]/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('limitedPass123')
+        await steps.fill(elem, 'limitedPass123', label='Input password for limited privilege user')
         
 
         frame = context.pages[-1]
         # Click login button to authenticate limited privilege user
         elem = frame.locator('xpath=html/body/div/div/div/div[3]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, label='Click login button to authenticate limited privilege user', response="/api/auth/login")
         
 
         # --> Assertions to verify final state
         frame = context.pages[-1]
         try:
-            await expect(frame.locator('text=Access Granted to Admin Dashboard').first).to_be_visible(timeout=3000)
+            await steps.record("assertion", 'text=Access Granted to Admin Dashboard', expect(frame.locator('text=Access Granted to Admin Dashboard').first).to_be_visible(timeout=3000))
         except AssertionError:
             raise AssertionError('Test failed: Users without proper roles should not access restricted administrative actions, but access was granted.')
-        await asyncio.sleep(5)
     
     finally:
+        if steps:
+            await steps.write_trace()
         if context:
             await context.close()
-        if browser:
+        if own_browser and browser:
             await browser.close()
         if pw:
             await pw.stop()
             
-asyncio.run(run_test())
-    
\ No newline at end of file
+if __name__ == "__main__":
+    asyncio.run(run_test())
@@ -2,35 +2,40 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
-async def run_test():
+from harness.session import new_admin_context
+from harness.waits import Steps
+
+async def run_test(browser=None):
     pw = None
-    browser = None
+    own_browser = browser is None
     context = None
+    steps = None
     
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        if own_browser:
+            # Start a Playwright session in asynchronous mode
+            pw = await async_api.async_playwright().start()
+        
+            # Launch a Chromium browser in headless mode with custom arguments
+            browser = await pw.chromium.launch(
+                headless=True,
+                args=[
+                    "--window-size=1280,720",         # Set the browser window size
+                    "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
+                    "--ipc=host",                     # Use host-level IPC for better stability
+                ],
+            )
+        
+        # Create a browser context that reuses the shared admin session
+        context = await new_admin_context(browser)
         context.set_default_timeout(5000)
         
         # Open a new page in the browser context
         page = await context.new_page()
+        steps = Steps(page, "TC005")
         
         # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000/login", wait_until="commit", timeout=10000)
+        await steps.record("navigate", "http://localhost:3000/admin", page.goto("http://localhost:3000/admin", wait_until="commit", timeout=10000))
         
         # Wait for the main page to reach DOMContentLoaded state (optional for stability)
         try:
@@ -46,180 +51,162 @@ async def run_test():
                 pass
         
         # Interact with the page elements to simulate user flow
-        # -> Input username and password, then click login button to access Admin Dashboard.
-        frame = context.pages[-1]
-        # Input username 'admin'
-        elem = frame.locator('xpath=html/body/div/div/div/div[3]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin')
-        
-
-        frame = context.pages[-1]
-        # Input password 'admin123'
-        elem = frame.locator('xpath=html/body/div/div/div/div[3]/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin123')
-        
-
-        frame = context.pages[-1]
-        # Click 'Iniciar Sesión' button to login
-        elem = frame.locator('xpath=html/body/div/div/div/div[3]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
         # -> Click on 'Juegos' (Games) menu to access Game Management.
         frame = context.pages[-1]
         # Click on 'Juegos' menu to go to Game Management
         elem = frame.locator('xpath=html/body/div/div/div/nav/a[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, label="Click on 'Juegos' menu to go to Game Management")
         
 
         # -> Click on 'Nuevo Juego' button to start creating a new lottery game.
         frame = context.pages[-1]
         # Click 'Nuevo Juego' button to create a new lottery game
         elem = frame.locator('xpath=html/body/div/div/div[2]/main/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, label="Click 'Nuevo Juego' button to create a new lottery game")
         
 
         # -> Fill in the form with valid attributes for a new Triple game and submit the form.
         frame = context.pages[-1]
         # Input valid game name 'Triple Nuevo'
         elem = frame.locator('xpath=html/body/div/div/div[2]/main/div/div[3]/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Triple Nuevo')
+        await steps.fill(elem, 'Triple Nuevo', label="Input valid game name 'Triple Nuevo'")
         
 
         frame = context.pages[-1]
         # Input valid slug 'triple-nuevo'
         elem = frame.locator('xpath=html/body/div/div/div[2]/main/div/div[3]/div/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('triple-nuevo')
+        await steps.fill(elem, 'triple-nuevo', label="Input valid slug 'triple-nuevo'")
         
 
         frame = context.pages[-1]
         # Input total numbers '1000'
         elem = frame.locator('xpath=html/body/div/div/div[2]/main/div/div[3]/div/form/div[4]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('1000')
+        await steps.fill(elem, '1000', label="Input total numbers '1000'")
         
 
         frame = context.pages[-1]
         # Input optional description
         elem = frame.locator('xpath=html/body/div/div/div[2]/main/div/div[3]/div/form/div[5]/textarea').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Juego de prueba para Triple')
+        await steps.fill(elem, 'Juego de prueba para Triple', label='Input optional description')
         
 
         frame = context.pages[-1]
         # Ensure 'Juego activo' checkbox is checked
         elem = frame.locator('xpath=html/body/div/div/div[2]/main/div/div[3]/div/form/div[6]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, label="Ensure 'Juego activo' checkbox is checked")
         
 
         frame = context.pages[-1]
         # Click 'Crear' button to submit the new game form
         elem = frame.locator('xpath=html/body/div/div/div[2]/main/div/div[3]/div/form/div[7]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, label="Click 'Crear' button to submit the new game form")
         
 
         # -> Click the 'Editar juego' button for 'Triple Nuevo' to update its properties.
         frame = context.pages[-1]
         # Click 'Editar juego' button for 'Triple Nuevo' to update game properties
         elem = frame.locator('xpath=html/body/div/div/div[2]/main/div/div[2]/div[4]/div[3]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, label="Click 'Editar juego' button for 'Triple Nuevo' to update game properties")
         
 
         # -> Update the game name and description, check 'Juego activo', then submit the form to save changes.
         frame = context.pages[-1]
         # Update game name to 'Triple Actualizado'
         elem = frame.locator('xpath=html/body/div/div/div[2]/main/div/div[3]/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Triple Actualizado')
+        await steps.fill(elem, 'Triple Actualizado', label="Update game name to 'Triple Actualizado'")
         
 
         frame = context.pages[-1]
         # Update description to 'Juego actualizado para Triple'
         elem = frame.locator('xpath=html/body/div/div/div[2]/main/div/div[3]/div/form/div[5]/textarea').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Juego actualizado para Triple')
+        await steps.fill(elem, 'Juego actualizado para Triple', label="Update description to 'Juego actualizado para Triple'")
         
 
         frame = context.pages[-1]
         # Check 'Juego activo' checkbox to activate the game
         elem = frame.locator('xpath=html/body/div/div/div[2]/main/div/div[3]/div/form/div[6]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, label="Check 'Juego activo' checkbox to activate the game")
         
 
         frame = context.pages[-1]
         # Click 'Actualizar' button to save changes
         elem = frame.locator('xpath=html/body/div/div/div[2]/main/div/div[3]/div/form/div[7]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, label="Click 'Actualizar' button to save changes")
         
 
         # -> Attempt to create a game with invalid or missing required fields to test validation.
         frame = context.pages[-1]
         # Click 'Nuevo Juego' button to open new game creation form for invalid data test
         elem = frame.locator('xpath=html/body/div/div/div[2]/main/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, label="Click 'Nuevo Juego' button to open new game creation form for invalid data test")
         
 
         # -> Attempt to create a game with missing required fields to trigger validation errors.
         frame = context.pages[-1]
         # Clear 'Nombre del Juego' to test missing required field
         elem = frame.locator('xpath=html/body/div/div/div[2]/main/div/div[3]/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('')
+        await steps.fill(elem, '', label="Clear 'Nombre del Juego' to test missing required field")
         
 
         frame = context.pages[-1]
         # Clear 'Slug' to test missing required field
         elem = frame.locator('xpath=html/body/div/div/div[2]/main/div/div[3]/div/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('')
+        await steps.fill(elem, '', label="Clear 'Slug' to test missing required field")
         
 
         frame = context.pages[-1]
         # Click 'Crear' button to submit form with missing required fields
         elem = frame.locator('xpath=html/body/div/div/div[2]/main/div/div[3]/div/form/div[7]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, label="Click 'Crear' button to submit form with missing required fields")
         
 
         # -> Test creation with invalid slug format to trigger validation errors.
         frame = context.pages[-1]
         # Input invalid game name 'Juego Inválido'
         elem = frame.locator('xpath=html/body/div/div/div[2]/main/div/div[3]/div/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Juego Inválido')
+        await steps.fill(elem, 'Juego Inválido', label="Input invalid game name 'Juego Inválido'")
         
 
         frame = context.pages[-1]
         # Input invalid slug with uppercase and special character
         elem = frame.locator('xpath=html/body/div/div/div[2]/main/div/div[3]/div/form/div[3]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('InvalidSlug!')
+        await steps.fill(elem, 'InvalidSlug!', label='Input invalid slug with uppercase and special character')
         
 
         frame = context.pages[-1]
         # Input total numbers '37'
         elem = frame.locator('xpath=html/body/div/div/div[2]/main/div/div[3]/div/form/div[4]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('37')
+        await steps.fill(elem, '37', label="Input total numbers '37'")
         
 
         frame = context.pages[-1]
         # Input description for invalid slug test
         elem = frame.locator('xpath=html/body/div/div/div[2]/main/div/div[3]/div/form/div[5]/textarea').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Prueba de slug inválido')
+        await steps.fill(elem, 'Prueba de slug inválido', label='Input description for invalid slug test')
         
 
         frame = context.pages[-1]
         # Click 'Crear' button to submit form with invalid slug
         elem = frame.locator('xpath=html/body/div/div/div[2]/main/div/div[3]/div/form/div[7]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, label="Click 'Crear' button to submit form with invalid slug")
         
 
         # --> Assertions to verify final state
         frame = context.pages[-1]
         try:
-            await expect(frame.locator('text=Lottery Jackpot Winner Announcement').first).to_be_visible(timeout=1000)
+            await steps.record("assertion", 'text=Lottery Jackpot Winner Announcement', expect(frame.locator('text=Lottery Jackpot Winner Announcement').first).to_be_visible(timeout=1000))
         except AssertionError:
             raise AssertionError("Test plan execution failed: Full CRUD operations for lottery games including Triple, Ruleta, and Animalitos did not complete successfully. Immediate failure triggered due to test plan failure.")
-        await asyncio.sleep(5)
     
     finally:
+        if steps:
+            await steps.write_trace()
         if context:
             await context.close()
-        if browser:
+        if own_browser and browser:
             await browser.close()
         if pw:
             await pw.stop()
             
-asyncio.run(run_test())
-    
\ No newline at end of file
+if __name__ == "__main__":
+    asyncio.run(run_test())
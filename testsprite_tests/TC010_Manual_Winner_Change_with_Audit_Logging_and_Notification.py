@@ -2,35 +2,40 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
-async def run_test():
+from harness.session import new_admin_context
+from harness.waits import Steps
+
+async def run_test(browser=None):
     pw = None
-    browser = None
+    own_browser = browser is None
     context = None
+    steps = None
     
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        if own_browser:
+            # Start a Playwright session in asynchronous mode
+            pw = await async_api.async_playwright().start()
+        
+            # Launch a Chromium browser in headless mode with custom arguments
+            browser = await pw.chromium.launch(
+                headless=True,
+                args=[
+                    "--window-size=1280,720",         # Set the browser window size
+                    "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
+                    "--ipc=host",                     # Use host-level IPC for better stability
+                ],
+            )
+        
+        # Create a browser context that reuses the shared admin session
+        context = await new_admin_context(browser)
         context.set_default_timeout(5000)
         
         # Open a new page in the browser context
         page = await context.new_page()
+        steps = Steps(page, "TC010")
         
         # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000/login", wait_until="commit", timeout=10000)
+        await steps.record("navigate", "http://localhost:3000/admin", page.goto("http://localhost:3000/admin", wait_until="commit", timeout=10000))
         
         # Wait for the main page to reach DOMContentLoaded state (optional for stability)
         try:
@@ -46,30 +51,11 @@ async def run_test():
                 pass
         
         # Interact with the page elements to simulate user flow
-        # -> Input admin username and password, then click login button.
-        frame = context.pages[-1]
-        # Input admin username
-        elem = frame.locator('xpath=html/body/div/div/div/div[3]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin')
-        
-
-        frame = context.pages[-1]
-        # Input admin password
-        elem = frame.locator('xpath=html/body/div/div/div/div[3]/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin123')
-        
-
-        frame = context.pages[-1]
-        # Click login button
-        elem = frame.locator('xpath=html/body/div/div/div/div[3]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
         # -> Click on 'Sorteos' to view draws and select an open draw with a preselected winner.
         frame = context.pages[-1]
         # Click on 'Sorteos' to view draws
         elem = frame.locator('xpath=html/body/div/div/div/nav/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, label="Click on 'Sorteos' to view draws")
         
 
         # -> Find and click on a draw with a preselected winner that is open and within 5 minutes of draw time.
@@ -79,49 +65,49 @@ async def run_test():
         frame = context.pages[-1]
         # Click 'Ver detalles' on a draw with a preselected winner
         elem = frame.locator('xpath=html/body/div/div/div[2]/main/div/div[3]/div/table/tbody/tr[17]/td[5]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, label="Click 'Ver detalles' on a draw with a preselected winner")
         
 
         # -> Find a draw that is open and within 5 minutes of execution with a preselected winner to test manual winner changes.
         frame = context.pages[-1]
         # Click 'Cerrar' to close the draw details modal and return to the draws list
         elem = frame.locator('xpath=html/body/div/div/div[2]/main/div/div[4]/div/div[3]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, label="Click 'Cerrar' to close the draw details modal and return to the draws list")
         
 
         # -> Check next page of draws to find a draw with a preselected winner within 5 minutes of execution.
         frame = context.pages[-1]
         # Click 'Siguiente' to go to the next page of draws
         elem = frame.locator('xpath=html/body/div/div/div[2]/main/div/div[3]/div[2]/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, label="Click 'Siguiente' to go to the next page of draws")
         
 
         # -> Click on a draw in 'Publicado' state with a winner to verify manual winner change and audit logs.
         frame = context.pages[-1]
         # Click 'Ver detalles' on the draw at 09:00 with winner '032' in 'Publicado' state
         elem = frame.locator('xpath=html/body/div/div/div[2]/main/div/div[3]/div/table/tbody/tr[11]/td[5]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, label="Click 'Ver detalles' on the draw at 09:00 with winner '032' in 'Publicado' state")
         
 
         # -> Attempt to change the winner manually to verify if the system allows changes after the 5-minute cutoff time.
         frame = context.pages[-1]
         # Click 'Regenerar imagen' button to attempt to trigger winner change or update
         elem = frame.locator('xpath=html/body/div/div/div[2]/main/div/div[4]/div/div[2]/div[2]/div/div[2]/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, label="Click 'Regenerar imagen' button to attempt to trigger winner change or update")
         
 
         # -> Attempt to manually change the winner to verify if the system allows changes after the 5-minute cutoff and check for proper error messages or notifications.
         frame = context.pages[-1]
         # Click 'Cerrar' button to close draw details modal and return to draws list
         elem = frame.locator('xpath=html/body/div/div/div[2]/main/div/div[4]/div/div[3]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, label="Click 'Cerrar' button to close draw details modal and return to draws list")
         
 
         # -> Click 'Ver detalles' on a draw that is scheduled and within 5 minutes of execution with a preselected winner, if available.
         frame = context.pages[-1]
         # Click 'Ver detalles' on the draw at 12:00 scheduled with no winner (to check if it is within 5 minutes window)
         elem = frame.locator('xpath=html/body/div/div/div[2]/main/div/div[3]/div/table/tbody/tr/td[5]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, label="Click 'Ver detalles' on the draw at 12:00 scheduled with no winner (to check if it is within 5 minutes window)")
         
 
         await page.mouse.wheel(0, await page.evaluate('() => window.innerHeight'))
@@ -134,38 +120,39 @@ async def run_test():
         frame = context.pages[-1]
         # Click 'Preseleccionar' button to save the manual winner selection
         elem = frame.locator('xpath=html/body/div/div/div[2]/main/div/div[4]/div/div[2]/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, label="Click 'Preseleccionar' button to save the manual winner selection")
         
 
         # -> Try to select a different winner option from the dropdown and click 'Preseleccionar' to test manual winner change functionality before the 5-minute cutoff.
         frame = context.pages[-1]
         # Click 'Preseleccionar' button to save the manual winner selection
         elem = frame.locator('xpath=html/body/div/div/div[2]/main/div/div[4]/div/div[2]/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, label="Click 'Preseleccionar' button to save the manual winner selection")
         
 
         # -> Close the draw details modal and report that the test environment lacks draws within 5 minutes of execution with preselected winners to fully test manual winner change functionality.
         frame = context.pages[-1]
         # Click 'Cerrar' button to close draw details modal
         elem = frame.locator('xpath=html/body/div/div/div[2]/main/div/div[4]/div/div[3]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, label="Click 'Cerrar' button to close draw details modal")
         
 
         # --> Assertions to verify final state
         frame = context.pages[-1]
         try:
-            await expect(frame.locator('text=Winner Change Successful').first).to_be_visible(timeout=1000)
+            await steps.record("assertion", 'text=Winner Change Successful', expect(frame.locator('text=Winner Change Successful').first).to_be_visible(timeout=1000))
         except AssertionError:
             raise AssertionError("Test failed: Manual winner change within 5 minutes prior to draw execution did not complete successfully. Audit logs and notifications may not have been triggered properly.")
-        await asyncio.sleep(5)
     
     finally:
+        if steps:
+            await steps.write_trace()
         if context:
             await context.close()
-        if browser:
+        if own_browser and browser:
             await browser.close()
         if pw:
             await pw.stop()
             
-asyncio.run(run_test())
-    
\ No newline at end of file
+if __name__ == "__main__":
+    asyncio.run(run_test())
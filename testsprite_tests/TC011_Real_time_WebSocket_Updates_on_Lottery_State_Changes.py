@@ -1,36 +1,48 @@
 import asyncio
+from unittest import SkipTest
 from playwright import async_api
 from playwright.async_api import expect
 
-async def run_test():
+from harness.realtime import RealtimeProbe, next_measurable_draw
+from harness.session import new_admin_context
+from harness.waits import Steps
+
+async def run_test(browser=None):
     pw = None
-    browser = None
+    own_browser = browser is None
     context = None
+    steps = None
+    probe = None
     
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        # Listen to the admin room with our own Socket.IO client before driving the UI
+        probe = RealtimeProbe("TC011")
+        await probe.connect()
+        
+        if own_browser:
+            # Start a Playwright session in asynchronous mode
+            pw = await async_api.async_playwright().start()
+        
+            # Launch a Chromium browser in headless mode with custom arguments
+            browser = await pw.chromium.launch(
+                headless=True,
+                args=[
+                    "--window-size=1280,720",         # Set the browser window size
+                    "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
+                    "--ipc=host",                     # Use host-level IPC for better stability
+                ],
+            )
+        
+        # Create a browser context that reuses the shared admin session
+        context = await new_admin_context(browser)
         context.set_default_timeout(5000)
         
         # Open a new page in the browser context
         page = await context.new_page()
+        steps = Steps(page, "TC011")
         
         # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000/login", wait_until="commit", timeout=10000)
+        await steps.record("navigate", "http://localhost:3000/admin", page.goto("http://localhost:3000/admin", wait_until="commit", timeout=10000))
         
         # Wait for the main page to reach DOMContentLoaded state (optional for stability)
         try:
@@ -46,87 +58,69 @@ async def run_test():
                 pass
         
         # Interact with the page elements to simulate user flow
-        # -> Try to reload the page to see if login form appears or check if there is any other way to access the system.
-        await page.goto('http://localhost:3000/login', timeout=10000)
-        await asyncio.sleep(3)
-        
-
-        # -> Input username and password, then click login button.
-        frame = context.pages[-1]
-        # Input username 'admin'
-        elem = frame.locator('xpath=html/body/div/div/div/div[3]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin')
-        
-
-        frame = context.pages[-1]
-        # Input password 'admin123'
-        elem = frame.locator('xpath=html/body/div/div/div/div[3]/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin123')
-        
-
-        frame = context.pages[-1]
-        # Click 'Iniciar Sesión' button to login
-        elem = frame.locator('xpath=html/body/div/div/div/div[3]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
         # -> Click on 'Monitor' tab to check for WebSocket event subscription or monitoring tools.
         frame = context.pages[-1]
         # Click on 'Monitor' tab to access WebSocket event monitoring or subscription tools
         elem = frame.locator('xpath=html/body/div/div/div/nav/a[15]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, label="Click on 'Monitor' tab to access WebSocket event monitoring or subscription tools")
         
 
         # -> Select a game from the 'Juego' dropdown to enable draw selection and monitoring.
         frame = context.pages[-1]
         # Click on 'Juego' dropdown to select a game
         elem = frame.locator('xpath=html/body/div/div/div[2]/main/div/div[2]/div/div[2]/select').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, label="Click on 'Juego' dropdown to select a game")
         
 
         # -> Navigate to 'Sorteos' tab to trigger draw closing and winner preselection events.
         frame = context.pages[-1]
         # Click on 'Sorteos' tab to access draw management and trigger state changes
         elem = frame.locator('xpath=html/body/div/div/div/nav/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, label="Click on 'Sorteos' tab to access draw management and trigger state changes")
         
 
         # -> Click 'Ver detalles' button for the 'LOTTOPANTERA' draw scheduled at 19:00 to access draw details and trigger state changes.
         frame = context.pages[-1]
         # Click 'Ver detalles' for LOTTOTANTERA draw at 19:00
         elem = frame.locator('xpath=html/body/div/div/div[2]/main/div/div[3]/div/table/tbody/tr[2]/td[5]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, label="Click 'Ver detalles' for LOTTOTANTERA draw at 19:00")
         
 
         # -> Select a winner number from the dropdown and click 'Preseleccionar' to preselect the winner.
         frame = context.pages[-1]
         # Click 'Preseleccionar' button to preselect the winner
         elem = frame.locator('xpath=html/body/div/div/div[2]/main/div/div[4]/div/div[2]/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, label="Click 'Preseleccionar' button to preselect the winner")
         
 
         # -> Select a number from the dropdown (e.g., 'PANTERA') to enable the 'Preseleccionar' button and then click it to preselect the winner.
         frame = context.pages[-1]
         # Click 'Preseleccionar' button to preselect the winner
         elem = frame.locator('xpath=html/body/div/div/div[2]/main/div/div[4]/div/div[2]/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, label="Click 'Preseleccionar' button to preselect the winner")
         
 
         # --> Assertions to verify final state
-        frame = context.pages[-1]
-        try:
-            await expect(frame.locator('text=Lottery State Change Broadcast Successful').first).to_be_visible(timeout=1000)
-        except AssertionError:
-            raise AssertionError("Test failed: The system did not broadcast all pertinent lottery state changes (draw closing, winner preselection, finalization) via WebSocket within the required latency of under 60 seconds.")
-        await asyncio.sleep(5)
+        # The next draw's close/execute broadcasts must arrive within the latency budget of their cron tick
+        draw = await next_measurable_draw()
+        if draw is None:
+            raise SkipTest("No scheduled draw closes and executes within the test's timeout; run with a larger --timeout or closer draws.")
+        await steps.record("socket", "draw:closed", probe.expect_draw_phase(draw, "close"))
+        await steps.record("socket", "draw:executed", probe.expect_draw_phase(draw, "execute"))
+        probe.assert_within_budget()
     
     finally:
+        if probe:
+            await probe.close()
+            probe.write_report()
+        if steps:
+            await steps.write_trace()
         if context:
             await context.close()
-        if browser:
+        if own_browser and browser:
             await browser.close()
         if pw:
             await pw.stop()
             
-asyncio.run(run_test())
-    
\ No newline at end of file
+if __name__ == "__main__":
+    asyncio.run(run_test())
@@ -2,35 +2,40 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
-async def run_test():
+from harness.session import new_admin_context
+from harness.waits import Steps
+
+async def run_test(browser=None):
     pw = None
-    browser = None
+    own_browser = browser is None
     context = None
+    steps = None
     
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        if own_browser:
+            # Start a Playwright session in asynchronous mode
+            pw = await async_api.async_playwright().start()
+        
+            # Launch a Chromium browser in headless mode with custom arguments
+            browser = await pw.chromium.launch(
+                headless=True,
+                args=[
+                    "--window-size=1280,720",         # Set the browser window size
+                    "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
+                    "--ipc=host",                     # Use host-level IPC for better stability
+                ],
+            )
+        
+        # Create a browser context that reuses the shared admin session
+        context = await new_admin_context(browser)
         context.set_default_timeout(5000)
         
         # Open a new page in the browser context
         page = await context.new_page()
+        steps = Steps(page, "TC013")
         
         # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000/login", wait_until="commit", timeout=10000)
+        await steps.record("navigate", "http://localhost:3000/admin", page.goto("http://localhost:3000/admin", wait_until="commit", timeout=10000))
         
         # Wait for the main page to reach DOMContentLoaded state (optional for stability)
         try:
@@ -46,87 +51,69 @@ async def run_test():
                 pass
         
         # Interact with the page elements to simulate user flow
-        # -> Input admin username and password and click login button to authenticate as administrator.
-        frame = context.pages[-1]
-        # Input admin username
-        elem = frame.locator('xpath=html/body/div/div/div/div[3]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin')
-        
-
-        frame = context.pages[-1]
-        # Input admin password
-        elem = frame.locator('xpath=html/body/div/div/div/div[3]/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('admin123')
-        
-
-        frame = context.pages[-1]
-        # Click login button to submit credentials
-        elem = frame.locator('xpath=html/body/div/div/div/div[3]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
         # -> Navigate to Sorteos (Draws) section to perform manual winner change operation.
         frame = context.pages[-1]
         # Click on Sorteos to access draws for manual winner change
         elem = frame.locator('xpath=html/body/div/div/div/nav/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, label='Click on Sorteos to access draws for manual winner change')
         
 
         # -> Click on 'Ver detalles' button for the first draw to open details and perform manual winner change.
         frame = context.pages[-1]
         # Click 'Ver detalles' for the first draw to open details for manual winner change
         elem = frame.locator('xpath=html/body/div/div/div[2]/main/div/div[3]/div/table/tbody/tr/td[5]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, label="Click 'Ver detalles' for the first draw to open details for manual winner change")
         
 
         # -> Select a winner number from the dropdown and click 'Preseleccionar' to perform manual winner change.
         frame = context.pages[-1]
         # Click 'Preseleccionar' button to perform manual winner change
         elem = frame.locator('xpath=html/body/div/div/div[2]/main/div/div[4]/div/div[2]/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, label="Click 'Preseleccionar' button to perform manual winner change")
         
 
         # -> Retry selecting a winner number from the dropdown and then click 'Preseleccionar' to perform manual winner change.
         frame = context.pages[-1]
         # Click dropdown to open options for winner number selection
         elem = frame.locator('xpath=html/body/div/div/div[2]/main/div/div[4]/div/div[2]/div/div/select').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, label='Click dropdown to open options for winner number selection')
         
 
         # -> Manually click on option '001' in the dropdown and then click 'Preseleccionar' to perform manual winner change.
         frame = context.pages[-1]
         # Click dropdown to open options for winner number selection
         elem = frame.locator('xpath=html/body/div/div/div[2]/main/div/div[4]/div/div[2]/div/div/select').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, label='Click dropdown to open options for winner number selection')
         
 
         frame = context.pages[-1]
         # Attempt to manually select option '001' from dropdown
         elem = frame.locator('xpath=html/body/div/div/div[2]/main/div/div[4]/div/div[2]/div/div/select').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, label="Attempt to manually select option '001' from dropdown")
         
 
         frame = context.pages[-1]
         # Click 'Preseleccionar' button to perform manual winner change
         elem = frame.locator('xpath=html/body/div/div/div[2]/main/div/div[4]/div/div[2]/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await steps.click(elem, label="Click 'Preseleccionar' button to perform manual winner change")
         
 
         # --> Assertions to verify final state
         frame = context.pages[-1]
         try:
-            await expect(frame.locator('text=Audit log entry for manual winner change recorded').first).to_be_visible(timeout=1000)
+            await steps.record("assertion", 'text=Audit log entry for manual winner change recorded', expect(frame.locator('text=Audit log entry for manual winner change recorded').first).to_be_visible(timeout=1000))
         except AssertionError:
             raise AssertionError("Test failed: Audit logs for critical user actions such as manual winner changes, user management, and state transitions were not recorded as expected.")
-        await asyncio.sleep(5)
     
     finally:
+        if steps:
+            await steps.write_trace()
         if context:
             await context.close()
-        if browser:
+        if own_browser and browser:
             await browser.close()
         if pw:
             await pw.stop()
             
-asyncio.run(run_test())
-    
\ No newline at end of file
+if __name__ == "__main__":
+    asyncio.run(run_test())
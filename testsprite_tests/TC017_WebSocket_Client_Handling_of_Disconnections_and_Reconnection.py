@@ -2,35 +2,45 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
-async def run_test():
+from harness.realtime import LATENCY_BUDGET_S, SocketCut
+from harness.session import new_admin_context
+from harness.waits import Steps
+
+async def run_test(browser=None):
     pw = None
-    browser = None
+    own_browser = browser is None
     context = None
+    steps = None
     
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
+        if own_browser:
+            # Start a Playwright session in asynchronous mode
+            pw = await async_api.async_playwright().start()
         
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
+            # Launch a Chromium browser in headless mode with custom arguments
+            browser = await pw.chromium.launch(
+                headless=True,
+                args=[
+                    "--window-size=1280,720",         # Set the browser window size
+                    "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
+                    "--ipc=host",                     # Use host-level IPC for better stability
+                ],
+            )
         
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
+        # Create a browser context that reuses the shared admin session
+        context = await new_admin_context(browser)
         context.set_default_timeout(5000)
         
+        # Route the page's Socket.IO connections so they can be dropped from the server side
+        cut = SocketCut()
+        await cut.install(context)
+        
         # Open a new page in the browser context
         page = await context.new_page()
+        steps = Steps(page, "TC017")
         
         # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000/login", wait_until="commit", timeout=10000)
+        await steps.record("navigate", "http://localhost:3000/admin", page.goto("http://localhost:3000/admin", wait_until="commit", timeout=10000))
         
         # Wait for the main page to reach DOMContentLoaded state (optional for stability)
         try:
@@ -46,21 +56,27 @@ async def run_test():
                 pass
         
         # Interact with the page elements to simulate user flow
+        # -> Wait for the page's Socket.IO connection, then drop it from the server side and restore the link.
+        await steps.record("socket", "Initial Socket.IO connection", cut.wait_connected())
+        await steps.record("socket", "Socket.IO connection dropped", cut.cut())
+        restored = cut.restore()
+
         # --> Assertions to verify final state
-        frame = context.pages[-1]
+        # The client must open a new connection within the real-time latency budget
         try:
-            await expect(frame.locator('text=WebSocket connection successfully re-established').first).to_be_visible(timeout=30000)
-        except AssertionError:
+            await steps.record("socket", "Socket.IO reconnection", cut.wait_connected(since=restored, timeout=LATENCY_BUDGET_S))
+        except asyncio.TimeoutError:
             raise AssertionError("Test case failed: The WebSocket client did not automatically reconnect and restore subscriptions after unexpected disconnection as required by the test plan.")
-        await asyncio.sleep(5)
     
     finally:
+        if steps:
+            await steps.write_trace()
         if context:
             await context.close()
-        if browser:
+        if own_browser and browser:
             await browser.close()
         if pw:
             await pw.stop()
             
-asyncio.run(run_test())
-    
\ No newline at end of file
+if __name__ == "__main__":
+    asyncio.run(run_test())
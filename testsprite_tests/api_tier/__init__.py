@@ -0,0 +1,11 @@
+"""Browser-less API checks for the backend routes.
+
+The checks that only need HTTP (JWT expiry, RBAC, game CRUD, audit entries,
+security headers and rate limits) run here concurrently over one pooled
+``aiohttp`` session, in seconds; the Playwright TC scripts stay for real UI
+flows.
+
+    cd testsprite_tests
+    python -m api_tier
+    python -m api_tier TC004 TC020
+"""
@@ -0,0 +1,78 @@
+"""Run the API checks concurrently and write ``.artifacts/api-results.json``."""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+from api_tier.checks import CHECKS, Skip
+from api_tier.client import ApiClient
+from harness.config import ARTIFACTS_DIR
+
+DEFAULT_RESULTS = ARTIFACTS_DIR / "api-results.json"
+
+
+async def run_check(api, item):
+    started = time.perf_counter()
+    result = {"test_id": item.test_id, "name": item.name}
+    try:
+        await item.func(api)
+        result["status"] = "passed"
+    except Skip as e:
+        result["status"] = "skipped"
+        result["error"] = str(e)
+    except Exception as e:
+        result["status"] = "failed"
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["duration_s"] = round(time.perf_counter() - started, 3)
+    return result
+
+
+async def run(selected):
+    async with ApiClient() as api:
+        concurrent = [c for c in selected if not c.exclusive]
+        results = list(await asyncio.gather(*(run_check(api, c) for c in concurrent)))
+        for item in selected:
+            if item.exclusive:
+                results.append(await run_check(api, item))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the API-level checks")
+    parser.add_argument("tests", nargs="*", help="Only these test ids (TC004)")
+    parser.add_argument("-k", dest="keyword", help="Only checks whose name contains this text")
+    parser.add_argument("-o", "--output", default=str(DEFAULT_RESULTS), help="Results JSON path")
+    args = parser.parse_args(argv)
+
+    selected = [
+        c for c in CHECKS
+        if (not args.tests or c.test_id in args.tests)
+        and (not args.keyword or args.keyword.lower() in c.name.lower())
+    ]
+    if not selected:
+        print("No checks selected", file=sys.stderr)
+        return 2
+
+    started = time.perf_counter()
+    results = asyncio.run(run(selected))
+    wall_time = round(time.perf_counter() - started, 3)
+
+    icons = {"passed": "✅", "failed": "❌", "skipped": "⏭️"}
+    for r in results:
+        suffix = f" — {r['error']}" if r.get("error") else ""
+        print(f"{icons[r['status']]} {r['test_id']} {r['name']} ({r['duration_s']}s){suffix}")
+
+    summary = {status: sum(1 for r in results if r["status"] == status) for status in icons}
+    print(f"\n{summary['passed']} passed, {summary['failed']} failed, "
+          f"{summary['skipped']} skipped in {wall_time}s")
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({"wall_time_s": wall_time, "summary": summary, "checks": results}, indent=2))
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
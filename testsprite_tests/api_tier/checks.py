@@ -0,0 +1,254 @@
+"""API-level versions of the TC checks that do not need a browser.
+
+Each check is an ``async def check(api)`` registered under the TC id it
+covers. A check fails by raising ``AssertionError`` and opts out with
+:class:`Skip` when the environment lacks what it needs (a JWT secret, a
+database URL).
+"""
+import base64
+import contextlib
+import hashlib
+import hmac
+import json
+import os
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from harness.config import DRAW_TIMEZONE
+
+# Needed to sign tokens the backend accepts (JWT_SECRET in backend/.env)
+JWT_SECRET = os.environ.get("TOTE_JWT_SECRET")
+
+# Direct database access for the audit-log check (there is no audit route)
+DATABASE_URL = os.environ.get("TOTE_DATABASE_URL") or os.environ.get("DATABASE_URL")
+
+# Exhaust the general limiter (1000 req / 15 min) to observe the 429
+TRIP_RATE_LIMIT = os.environ.get("TOTE_API_TRIP_RATE_LIMIT") == "1"
+
+CHECKS = []
+
+
+class Skip(Exception):
+    """Raised by a check that cannot run in this environment."""
+
+
+@dataclass
+class Check:
+    test_id: str
+    name: str
+    func: object
+    # Runs alone after the others (it would disturb concurrent checks)
+    exclusive: bool = False
+
+
+def check(test_id, name, exclusive=False):
+    def register(func):
+        CHECKS.append(Check(test_id, name, func, exclusive))
+        return func
+    return register
+
+
+def expect_status(response, expected, what):
+    assert response.status == expected, (
+        f"{what}: expected HTTP {expected}, got {response.status} ({response.body})"
+    )
+
+
+def _b64url(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def sign_jwt(payload, secret):
+    """HS256 JWT, as ``jsonwebtoken.sign`` produces in auth.service.js."""
+    header = _b64url(json.dumps({"alg": "HS256", "typ": "JWT"}, separators=(",", ":")).encode())
+    body = _b64url(json.dumps(payload, separators=(",", ":")).encode())
+    signature = hmac.new(secret.encode(), f"{header}.{body}".encode(), hashlib.sha256).digest()
+    return f"{header}.{body}.{_b64url(signature)}"
+
+
+# -- TC003: JWT validation and expiry ------------------------------------------
+
+
+@check("TC003", "rejects missing and tampered tokens")
+async def jwt_rejects_invalid(api):
+    token = await api.login()
+    expect_status(await api.get("/auth/me", token=token), 200, "valid token")
+    expect_status(await api.get("/auth/me"), 401, "missing token")
+
+    header, payload, signature = token.split(".")
+    flipped = signature[:-1] + ("A" if signature[-1] != "A" else "B")
+    expect_status(await api.get("/auth/me", token=f"{header}.{payload}.{flipped}"), 401, "tampered signature")
+
+
+@check("TC003", "rejects expired tokens")
+async def jwt_rejects_expired(api):
+    if not JWT_SECRET:
+        raise Skip("TOTE_JWT_SECRET not set")
+    me = (await api.get("/auth/me", token=await api.login())).data
+    claims = {key: me[key] for key in ("id", "username", "email", "role")}
+    now = int(time.time())
+
+    # A fresh token signed with the same secret must pass, otherwise the secret is wrong
+    fresh = sign_jwt({**claims, "iat": now, "exp": now + 300}, JWT_SECRET)
+    response = await api.get("/auth/me", token=fresh)
+    if response.status != 200:
+        raise Skip("TOTE_JWT_SECRET does not match the backend's JWT_SECRET")
+
+    expired = sign_jwt({**claims, "iat": now - 7200, "exp": now - 3600}, JWT_SECRET)
+    expect_status(await api.get("/auth/me", token=expired), 401, "expired token")
+
+
+# -- TC004: role-based access ---------------------------------------------------
+
+
+@check("TC004", "blocks admin routes for non-admin roles")
+async def rbac_blocks_operator(api):
+    admin = await api.login()
+    username = f"api_op_{uuid.uuid4().hex[:8]}"
+    password = "Operator123!"
+    response = await api.post("/auth/register", token=admin, json={
+        "username": username,
+        "email": f"{username}@test.local",
+        "password": password,
+        "role": "OPERATOR",
+    })
+    expect_status(response, 201, "register operator")
+    user_id = response.data["id"]
+    try:
+        operator = await api.login(username, password)
+        expect_status(await api.get("/auth/me", token=operator), 200, "operator /auth/me")
+        for path in ("/auth/users", "/admin/players", "/admin/tickets"):
+            expect_status(await api.get(path, token=operator), 403, f"operator GET {path}")
+            expect_status(await api.get(path), 401, f"anonymous GET {path}")
+        expect_status(await api.get("/auth/users", token=admin), 200, "admin GET /auth/users")
+    finally:
+        # There is no delete route; an inactive user can no longer log in
+        response = await api.patch(f"/auth/users/{user_id}", token=admin, json={"isActive": False})
+        expect_status(response, 200, "deactivate operator")
+
+
+# -- TC005: game CRUD -----------------------------------------------------------
+
+
+@check("TC005", "creates, reads, updates and deletes a game")
+async def game_crud(api):
+    slug = f"api-triple-{uuid.uuid4().hex[:8]}"
+    response = await api.post("/games", json={
+        "name": f"Triple API {slug[-8:]}",
+        "slug": slug,
+        "type": "TRIPLE",
+        "totalNumbers": 1000,
+    })
+    expect_status(response, 201, "create game")
+    game_id = response.data["id"]
+    try:
+        response = await api.get(f"/games/{game_id}")
+        expect_status(response, 200, "get game by id")
+        assert response.data["slug"] == slug, f"get game by id returned slug {response.data['slug']!r}"
+
+        expect_status(await api.get(f"/games/slug/{slug}"), 200, "get game by slug")
+
+        response = await api.put(f"/games/{game_id}", json={"description": "Actualizado por la API"})
+        expect_status(response, 200, "update game")
+        assert response.data["description"] == "Actualizado por la API", "update game did not persist"
+
+        expect_status(await api.delete(f"/games/{game_id}"), 200, "delete game")
+        # game.service.js deletes softly: the game stays, deactivated
+        response = await api.get(f"/games/{game_id}")
+        expect_status(response, 200, "get deleted game")
+        assert response.data["isActive"] is False, "deleted game is still active"
+    except BaseException:
+        # Cleanup must not replace the error being reported
+        with contextlib.suppress(Exception):
+            await _purge_game(api, game_id)
+        raise
+    await _purge_game(api, game_id)
+
+
+async def _purge_game(api, game_id):
+    """Drop a game created by a check, which the API only deactivates."""
+    try:
+        conn = await _connect()
+    except Skip:
+        # Without the database, deactivating it is the best we can do
+        await api.delete(f"/games/{game_id}")
+        return
+    try:
+        await conn.execute('DELETE FROM "Game" WHERE id = $1', game_id)
+    finally:
+        await conn.close()
+
+
+async def _connect():
+    if not DATABASE_URL:
+        raise Skip("TOTE_DATABASE_URL / DATABASE_URL not set")
+    try:
+        import asyncpg
+    except ImportError:
+        raise Skip("asyncpg not installed")
+    return await asyncpg.connect(DATABASE_URL.split("?", 1)[0])
+
+
+# -- TC013: audit trail ---------------------------------------------------------
+
+
+@check("TC013", "executed draws have an audit entry")
+async def draws_are_audited(api):
+    conn = await _connect()
+    today = datetime.now(ZoneInfo(DRAW_TIMEZONE)).date()
+    try:
+        rows = await conn.fetch(
+            """
+            SELECT d.id, d."drawTime"
+            FROM "Draw" d
+            WHERE d."drawDate" = $1
+              AND d.status IN ('DRAWN', 'PUBLISHED')
+              AND NOT EXISTS (
+                SELECT 1 FROM "AuditLog" a
+                WHERE a.entity = 'Draw' AND a."entityId" = d.id AND a.action = 'DRAW_EXECUTED'
+              )
+            """,
+            today,
+        )
+    finally:
+        await conn.close()
+    assert not rows, f"{len(rows)} executed draw(s) without DRAW_EXECUTED audit entry: " + ", ".join(
+        f"{r['drawTime']} ({r['id']})" for r in rows[:5]
+    )
+
+
+# -- TC020: security headers and rate limiting ---------------------------------
+
+
+@check("TC020", "sends security headers")
+async def security_headers(api):
+    response = await api.get("/public/draws/today")
+    expect_status(response, 200, "GET /public/draws/today")
+    for header in ("content-security-policy", "x-content-type-options", "strict-transport-security",
+                   "x-frame-options", "referrer-policy"):
+        assert header in response.headers, f"missing security header {header}"
+    assert "x-powered-by" not in response.headers, "X-Powered-By leaks the server stack"
+
+
+@check("TC020", "reports the rate limit")
+async def rate_limit(api):
+    first = await api.get("/games")
+    second = await api.get("/games")
+    for header in ("ratelimit-limit", "ratelimit-remaining"):
+        assert header in first.headers, f"missing rate limit header {header}"
+    assert int(second.headers["ratelimit-remaining"]) < int(first.headers["ratelimit-remaining"]), (
+        "RateLimit-Remaining did not decrease between requests"
+    )
+
+
+@check("TC020", "blocks requests over the rate limit", exclusive=True)
+async def rate_limit_trips(api):
+    if not TRIP_RATE_LIMIT:
+        raise Skip("TOTE_API_TRIP_RATE_LIMIT not set")
+    response = await api.get("/games")
+    for _ in range(int(response.headers["ratelimit-remaining"])):
+        await api.get("/games")
+    expect_status(await api.get("/games"), 429, "request over the limit")
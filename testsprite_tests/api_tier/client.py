@@ -0,0 +1,86 @@
+"""Pooled async HTTP client for the backend API."""
+import os
+import time
+from dataclasses import dataclass
+
+import aiohttp
+
+from harness.config import ADMIN_PASSWORD, ADMIN_USERNAME, api_url
+
+# Connections kept open towards the backend, shared by every check
+POOL_SIZE = int(os.environ.get("TOTE_API_POOL_SIZE", "20"))
+REQUEST_TIMEOUT = float(os.environ.get("TOTE_API_TIMEOUT", "15"))
+
+
+@dataclass
+class ApiResponse:
+    status: int
+    headers: dict
+    body: object
+    elapsed_ms: float
+
+    @property
+    def data(self):
+        return self.body.get("data") if isinstance(self.body, dict) else None
+
+
+class ApiClient:
+    """One ``aiohttp`` session (and connection pool) for the whole API tier."""
+
+    def __init__(self, base_url=None, pool_size=POOL_SIZE):
+        self.base_url = base_url or api_url()
+        self.pool_size = pool_size
+        self.session = None
+        self._tokens = {}
+
+    async def __aenter__(self):
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.pool_size),
+            timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+        )
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.session.close()
+
+    async def request(self, method, path, token=None, **kwargs):
+        headers = kwargs.pop("headers", {})
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        url = path if path.startswith("http") else f"{self.base_url}{path}"
+        started = time.perf_counter()
+        async with self.session.request(method, url, headers=headers, **kwargs) as response:
+            try:
+                body = await response.json(content_type=None)
+            except ValueError:
+                body = await response.text()
+            return ApiResponse(
+                status=response.status,
+                headers={k.lower(): v for k, v in response.headers.items()},
+                body=body,
+                elapsed_ms=round((time.perf_counter() - started) * 1000, 1),
+            )
+
+    async def get(self, path, **kwargs):
+        return await self.request("GET", path, **kwargs)
+
+    async def post(self, path, **kwargs):
+        return await self.request("POST", path, **kwargs)
+
+    async def put(self, path, **kwargs):
+        return await self.request("PUT", path, **kwargs)
+
+    async def patch(self, path, **kwargs):
+        return await self.request("PATCH", path, **kwargs)
+
+    async def delete(self, path, **kwargs):
+        return await self.request("DELETE", path, **kwargs)
+
+    async def login(self, username=ADMIN_USERNAME, password=ADMIN_PASSWORD):
+        """Return a JWT for ``username``, logging in only once per run."""
+        if username not in self._tokens:
+            response = await self.post("/auth/login", json={"username": username, "password": password})
+            if response.status != 200:
+                raise RuntimeError(f"Login failed for {username!r}: HTTP {response.status}")
+            self._tokens[username] = response.data["token"]
+        return self._tokens[username]
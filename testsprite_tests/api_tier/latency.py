@@ -0,0 +1,226 @@
+"""Latency regression suite for the public results API.
+
+Drives the anonymous endpoints of ``backend/src/routes/public.routes.js`` with
+``--concurrency`` closed-loop workers for ``--duration`` seconds. Each request
+picks an endpoint by weight and realistic parameters (game slugs from
+``/public/games``, history pages and sizes, stats windows). Per endpoint it
+records p50/p95/p99 and throughput, then compares them with
+``latency_baseline.json``: an endpoint regresses when a percentile grows by
+more than ``--tolerance`` *and* by more than ``--min-delta-ms``, or when it
+returns errors.
+
+    cd testsprite_tests
+    python -m api_tier.latency                       # compare with the baseline
+    python -m api_tier.latency --update-baseline     # record a new baseline
+    python -m api_tier.latency -c 50 --duration 60 --tolerance 0.3
+
+Exit codes: 0 within tolerance, 1 regression, 2 no baseline to compare with.
+The backend's ``/api`` rate limit (1000 requests per 15 minutes) has to be
+raised for the run with ``RATE_LIMIT_MAX``; 429 responses fail the suite.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+import aiohttp
+
+from api_tier.client import ApiClient
+from harness.config import ARTIFACTS_DIR, SUITE_DIR
+from harness.stats import distribution
+
+BASELINE_PATH = SUITE_DIR / "latency_baseline.json"
+DEFAULT_RESULTS = ARTIFACTS_DIR / "latency.json"
+
+TOLERANCE = float(os.environ.get("TOTE_LATENCY_TOLERANCE", "0.2"))
+MIN_DELTA_MS = float(os.environ.get("TOTE_LATENCY_MIN_DELTA_MS", "5"))
+
+PERCENTILES = ("p50", "p95", "p99")
+
+# Fallback when /public/games is empty; create-games.js seeds these
+DEFAULT_SLUGS = ["lotoanimalito", "lottopantera", "triple-pantera"]
+
+# name -> (weight, build(rng, slugs) -> (path, params)); weights follow the landing page's mix
+ENDPOINTS = {
+    "draws_today": (30, lambda rng, slugs: ("/public/draws/today", None)),
+    "draws_next": (20, lambda rng, slugs: ("/public/draws/next", {"limit": rng.choice([5, 10, 20])})),
+    "game_history": (20, lambda rng, slugs: (
+        f"/public/draws/game/{rng.choice(slugs)}/history",
+        {"page": rng.choices([1, 2, 3, 4, 5], weights=[60, 20, 10, 5, 5])[0],
+         "pageSize": rng.choice([10, 20, 50])},
+    )),
+    "game_stats": (15, lambda rng, slugs: (
+        f"/public/stats/game/{rng.choice(slugs)}",
+        {"days": rng.choices([7, 30, 90], weights=[30, 60, 10])[0]},
+    )),
+    "results_today": (15, lambda rng, slugs: ("/public/results/today", None)),
+}
+
+
+async def _game_slugs(api):
+    response = await api.get("/public/games")
+    slugs = [game["slug"] for game in response.data or []]
+    return slugs or DEFAULT_SLUGS
+
+
+async def measure(api, concurrency, duration, warmup, seed=None, only=None):
+    """Run the mix and return ``{endpoint: {"latencies", "statuses"}}`` plus the wall time."""
+    slugs = await _game_slugs(api)
+    names = [name for name in ENDPOINTS if not only or name in only]
+    weights = [ENDPOINTS[name][0] for name in names]
+    samples = {name: {"latencies": [], "statuses": {}} for name in names}
+    recording = False
+
+    async def worker(index):
+        rng = random.Random(None if seed is None else seed + index)
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights=weights)[0]
+            path, params = ENDPOINTS[name][1](rng, slugs)
+            try:
+                response = await api.get(path, params=params)
+                status, elapsed = response.status, response.elapsed_ms
+            except (asyncio.TimeoutError, OSError, aiohttp.ClientError) as e:
+                status, elapsed = type(e).__name__, None
+            if not recording:
+                continue
+            statuses = samples[name]["statuses"]
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+            if status == 200:
+                samples[name]["latencies"].append(elapsed)
+
+    deadline = time.perf_counter() + warmup
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    recording = True
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    return samples, time.perf_counter() - started
+
+
+def summarize(samples, wall_s):
+    endpoints = {}
+    for name, sample in samples.items():
+        total = sum(sample["statuses"].values())
+        endpoints[name] = {
+            **distribution(sample["latencies"]),
+            "rps": round(total / wall_s, 1) if wall_s else None,
+            "errors": total - sample["statuses"].get("200", 0),
+            "statuses": sample["statuses"],
+        }
+    return endpoints
+
+
+def compare(endpoints, baseline, tolerance, min_delta_ms):
+    """``[(endpoint, message)]`` for every regression against ``baseline``."""
+    regressions = []
+    for name, current in endpoints.items():
+        if current["errors"]:
+            hint = " (rate limited: raise RATE_LIMIT_MAX)" if "429" in current["statuses"] else ""
+            regressions.append((name, f"{current['errors']} error responses {current['statuses']}{hint}"))
+        before = baseline.get("endpoints", {}).get(name)
+        if not before or not current.get("count"):
+            continue
+        for pct in PERCENTILES:
+            now, then = current[pct], before.get(pct)
+            if then is None:
+                continue
+            if now > then * (1 + tolerance) and now - then > min_delta_ms:
+                regressions.append((name, f"{pct} {then} → {now} ms (+{(now / then - 1) * 100:.0f}%)"))
+    return regressions
+
+
+def load_baseline(path=BASELINE_PATH):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def print_table(endpoints, baseline):
+    before = (baseline or {}).get("endpoints", {})
+    print(f"{'endpoint':<15} {'count':>7} {'rps':>7} {'p50':>8} {'p95':>8} {'p99':>8}  baseline p95")
+    for name, e in endpoints.items():
+        print(f"{name:<15} {e['count']:>7} {e['rps']:>7} {e.get('p50', '-'):>8} {e.get('p95', '-'):>8} "
+              f"{e.get('p99', '-'):>8}  {before.get(name, {}).get('p95', '-')}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Latency regression suite for the public API")
+    parser.add_argument("endpoints", nargs="*", help=f"Only these endpoints ({', '.join(ENDPOINTS)})")
+    parser.add_argument("-c", "--concurrency", type=int, default=10, help="Closed-loop workers")
+    parser.add_argument("--duration", type=float, default=30, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=5, help="Unmeasured seconds first")
+    parser.add_argument("--seed", type=int, default=1, help="Seed of the request mix")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="Allowed relative growth")
+    parser.add_argument("--min-delta-ms", type=float, default=MIN_DELTA_MS,
+                        help="Growth below this many ms never counts as a regression")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH))
+    parser.add_argument("--update-baseline", action="store_true", help="Write the results as the new baseline")
+    parser.add_argument("-o", "--output", default=str(DEFAULT_RESULTS))
+    args = parser.parse_args(argv)
+    unknown = set(args.endpoints) - set(ENDPOINTS)
+    if unknown:
+        parser.error(f"unknown endpoints: {', '.join(sorted(unknown))}")
+
+    async def run():
+        async with ApiClient(pool_size=args.concurrency) as api:
+            return await measure(api, args.concurrency, args.duration, args.warmup,
+                                 args.seed, set(args.endpoints))
+
+    samples, wall_s = asyncio.run(run())
+    endpoints = summarize(samples, wall_s)
+    run_info = {
+        "concurrency": args.concurrency,
+        "duration_s": args.duration,
+        "seed": args.seed,
+        "rps": round(sum(sum(e["statuses"].values()) for e in endpoints.values()) / wall_s, 1),
+    }
+    baseline_path = Path(args.baseline)
+    baseline = load_baseline(baseline_path)
+    print_table(endpoints, baseline)
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+
+    if args.update_baseline:
+        if any(e["errors"] for e in endpoints.values()):
+            print("Not recording a baseline from a run with errors", file=sys.stderr)
+            return 1
+        baseline_path.write_text(json.dumps({
+            **run_info,
+            "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "endpoints": {name: {k: e[k] for k in (*PERCENTILES, "rps") if k in e}
+                          for name, e in endpoints.items()},
+        }, indent=2) + "\n")
+        print(f"Baseline written to {baseline_path}")
+        return 0
+
+    if baseline is None:
+        print(f"No baseline at {baseline_path}; run with --update-baseline and commit it", file=sys.stderr)
+        return 2
+    if baseline.get("concurrency") != args.concurrency:
+        print(f"⚠️  Baseline was recorded at concurrency {baseline.get('concurrency')}, "
+              f"this run used {args.concurrency}", file=sys.stderr)
+
+    regressions = compare(endpoints, baseline, args.tolerance, args.min_delta_ms)
+    output.write_text(json.dumps({
+        **run_info,
+        "tolerance": args.tolerance,
+        "endpoints": endpoints,
+        "regressions": [{"endpoint": name, "detail": detail} for name, detail in regressions],
+    }, indent=2))
+    for name, detail in regressions:
+        print(f"❌ {name}: {detail}")
+    if not regressions:
+        print(f"✅ Every endpoint within {args.tolerance:.0%} of the baseline")
+    print(f"→ {output}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
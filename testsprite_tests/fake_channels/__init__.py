@@ -0,0 +1,12 @@
+"""Local stand-ins for the social APIs the draws are published to.
+
+Telegram's Bot API, the Meta Graph API (Facebook page photos, Instagram
+container + publish) and the standalone WhatsApp service, served by
+``aiohttp`` with configurable latency, error rate and rate limiting. The
+backend reaches them through ``TELEGRAM_API_URL``, ``META_GRAPH_URL`` and
+``WHATSAPP_SERVICE_URL``.
+
+    cd testsprite_tests
+    python -m fake_channels --instagram "latency=800,limit=5/60"
+    python -m fake_channels.bench --bursts 1,5,10 --tick-s 5
+"""
@@ -0,0 +1,33 @@
+"""Serve the fake channels until interrupted and print the backend env for them."""
+import argparse
+import asyncio
+import json
+import sys
+
+from fake_channels.servers import FakeChannels, add_behavior_args, behaviors
+
+
+async def serve(args):
+    async with FakeChannels(behaviors(args), args.base_port, args.seed) as fakes:
+        for key, value in fakes.env.items():
+            print(f"export {key}={value}")
+        print("Serving; Ctrl+C prints the request stats", file=sys.stderr)
+        try:
+            await asyncio.Event().wait()
+        finally:
+            print(json.dumps(fakes.stats(), indent=2), file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve fake Telegram/Graph/WhatsApp endpoints")
+    add_behavior_args(parser)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+"""Benchmark: from draw execution to every channel published, for bursts of draws.
+
+For each burst size, resets an isolated database clone (see
+:mod:`harness.database`), starts the fake channels and runs
+``backend/src/scripts/bench-publication.js``. The driver creates that many
+DRAWN draws executed at the same instant, with a channel of each type per
+game, and publishes them with the real ``PublicationService``: through
+``publish-draw.job.js`` fired every ``--tick-s`` seconds like the cron
+(``--mode job``), or all at once (``--mode parallel``). Failed publications
+then go through ``--retry-rounds`` rounds of ``retryFailedPublications``.
+
+Per burst the report (``.artifacts/publication.json``) gives, per draw, the
+time from execution until its last channel finished, per channel the finish
+times and failures, the channels' request stats (peak concurrency,
+rate-limit responses) and what each retry round recovered.
+
+    cd testsprite_tests
+    python -m fake_channels.bench --bursts 1,5,10 --tick-s 5
+    python -m fake_channels.bench --bursts 10 --mode parallel --instagram "limit=3/60"
+    python -m fake_channels.bench --bursts 20 --telegram "errors=0.2" --retry-rounds 3
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import uuid
+from pathlib import Path
+
+from fake_channels.servers import CHANNELS, FakeChannels, add_behavior_args, behaviors
+from harness.config import ARTIFACTS_DIR
+from harness.database import BACKEND_DIR, SEEDS, TemplateDatabase
+from harness.stats import distribution
+
+DEFAULT_REPORT = ARTIFACTS_DIR / "publication.json"
+
+DRIVER = "src/scripts/bench-publication.js"
+
+
+async def run_driver(db_url, fakes, burst, args):
+    process = await asyncio.create_subprocess_exec(
+        "node", DRIVER, "--draws", str(burst), "--channels", ",".join(args.channels),
+        "--mode", args.mode, "--tick-s", str(args.tick_s), "--retry-rounds", str(args.retry_rounds),
+        cwd=BACKEND_DIR, env={**os.environ, **fakes.env, "DATABASE_URL": db_url},
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL,
+    )
+    records = []
+    async for raw in process.stdout:
+        line = raw.decode(errors="replace").strip()
+        if line.startswith("PUBLISH "):
+            records.append(json.loads(line[8:]))
+    await process.wait()
+    if process.returncode != 0:
+        fatal = next((r["error"] for r in records if r["type"] == "fatal"), "no output")
+        raise RuntimeError(f"Publication driver failed: {fatal}")
+    return records
+
+
+def summarize_burst(burst, records, channel_stats):
+    end = next(r for r in records if r["type"] == "end")
+    # Channel results of the first pass; retries come after published_ms
+    first_pass = [r for r in records if r["type"] == "channel" and r["finished_ms"] <= end["published_ms"]]
+    per_draw = {}
+    for record in first_pass:
+        per_draw[record["drawId"]] = max(per_draw.get(record["drawId"], 0), record["finished_ms"])
+
+    by_channel = {}
+    for record in first_pass:
+        entry = by_channel.setdefault(record["channel"], {"finished": [], "failed": 0, "skipped": 0, "errors": {}})
+        entry["finished"].append(record["finished_ms"])
+        if record["skipped"]:
+            entry["skipped"] += 1
+        elif not record["success"]:
+            entry["failed"] += 1
+            error = (record["error"] or "unknown")[:80]
+            entry["errors"][error] = entry["errors"].get(error, 0) + 1
+
+    published_s = end["published_ms"] / 1000
+    return {
+        "burst": burst,
+        "published_s": round(published_s, 2),
+        "job_ticks": end["job_ticks"],
+        "all_channels_ms": distribution(list(per_draw.values())),
+        "publications_per_s": round(len(first_pass) / published_s, 2) if published_s else None,
+        "channels": {
+            channel: {
+                "finished_ms": distribution(entry.pop("finished")),
+                **entry,
+            }
+            for channel, entry in sorted(by_channel.items())
+        },
+        "retries": [r for r in records if r["type"] == "retry"],
+        "publications": end["publications"],
+        "servers": channel_stats,
+    }
+
+
+async def run(args):
+    template = await TemplateDatabase(seeds=SEEDS).ensure()
+    bursts = []
+    async with template.clone(f"tote_publication_{uuid.uuid4().hex[:8]}") as db:
+        async with FakeChannels(behaviors(args), args.base_port, args.seed) as fakes:
+            for burst in args.bursts:
+                await db.reset()
+                fakes.reset()
+                records = await run_driver(db.url, fakes, burst, args)
+                summary = summarize_burst(burst, records, fakes.stats())
+                bursts.append(summary)
+                print_burst(summary)
+    return {
+        "mode": args.mode,
+        "tick_s": args.tick_s if args.mode == "job" else None,
+        "channels": args.channels,
+        "behaviors": {name: vars(b) for name, b in behaviors(args).items()},
+        "bursts": bursts,
+    }
+
+
+def print_burst(summary):
+    done = summary["all_channels_ms"]
+    print(f"burst {summary['burst']:>4}: all channels p50 {done.get('p50', '-')} ms, "
+          f"max {done.get('max', '-')} ms, {summary['publications_per_s']} publications/s")
+    for channel, entry in summary["channels"].items():
+        served = summary["servers"].get(channel.lower(), {})
+        print(f"    {channel:<10} p95 {entry['finished_ms'].get('p95', '-')} ms  failed {entry['failed']}  "
+              f"peak in flight {served.get('peak_in_flight', '-')}  statuses {served.get('statuses', {})}")
+    for retry in summary["retries"]:
+        print(f"    retry {retry['round']}: {retry['failed_before']} → {retry['failed_after']} failed")
+
+
+def _sizes(value):
+    return [int(n) for n in value.split(",")]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Execute-to-published benchmark over fake channels")
+    parser.add_argument("--bursts", type=_sizes, default=[1, 5, 10], help="Comma-separated burst sizes")
+    parser.add_argument("--channels", type=lambda v: v.split(","), default=list(CHANNELS))
+    parser.add_argument("--mode", choices=["job", "parallel"], default="job")
+    parser.add_argument("--tick-s", type=float, default=60, help="Seconds between publish job runs")
+    parser.add_argument("--retry-rounds", type=int, default=0)
+    add_behavior_args(parser)
+    parser.add_argument("-o", "--output", default=str(DEFAULT_REPORT))
+    args = parser.parse_args(argv)
+    unknown = set(args.channels) - set(CHANNELS)
+    if unknown:
+        parser.error(f"unknown channels: {', '.join(sorted(unknown))}")
+
+    report = asyncio.run(run(args))
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"→ {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,365 @@
+"""Fake Telegram, Meta Graph and WhatsApp-service endpoints.
+
+Every platform is a :class:`FakeChannel` with its own :class:`Behavior`; a
+request first counts against the rate limit, then waits its latency, then may
+fail. Failures and rate-limit responses use each platform's own status codes
+and error bodies, so the backend's error handling takes the same paths it
+takes in production.
+"""
+import asyncio
+import itertools
+import random
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass
+
+from aiohttp import web
+
+from harness.stats import distribution
+
+CHANNELS = ("telegram", "whatsapp", "facebook", "instagram")
+
+
+@dataclass
+class Behavior:
+    latency_ms: float = 50
+    jitter_ms: float = 20
+    error_rate: float = 0.0
+    rate_limit: int = 0  # requests per window; 0 disables it
+    window_s: float = 1.0
+    retry_after_s: int = 1
+
+    _KEYS = {
+        "latency": ("latency_ms", float),
+        "jitter": ("jitter_ms", float),
+        "errors": ("error_rate", float),
+        "retry_after": ("retry_after_s", int),
+    }
+
+    @classmethod
+    def parse(cls, spec):
+        """``"latency=200,jitter=50,errors=0.05,limit=30/1,retry_after=5"``."""
+        behavior = cls()
+        for item in filter(None, (part.strip() for part in (spec or "").split(","))):
+            key, _, value = item.partition("=")
+            if key == "limit":
+                count, _, window = value.partition("/")
+                behavior.rate_limit, behavior.window_s = int(count), float(window or 1)
+            elif key in cls._KEYS:
+                attr, cast = cls._KEYS[key]
+                setattr(behavior, attr, cast(value))
+            else:
+                raise ValueError(f"Unknown behavior key {key!r} in {spec!r}")
+        return behavior
+
+
+class FakeChannel(ABC):
+    """One platform's endpoints, behavior and request log."""
+
+    name = None
+
+    def __init__(self, behavior=None, seed=None):
+        self.behavior = behavior or Behavior()
+        self.rng = random.Random(seed)
+        self.requests = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._window = deque()
+        self._ids = itertools.count(1000)
+
+    @abstractmethod
+    def routes(self):
+        """``[(method, path, handler)]`` served for this platform."""
+
+    @abstractmethod
+    def rate_limited(self):
+        """The platform's response to a request over the rate limit."""
+
+    @abstractmethod
+    def failed(self):
+        """The platform's response to a request that fails."""
+
+    def next_id(self):
+        return next(self._ids)
+
+    async def serve(self, endpoint, succeed):
+        """Apply the behavior around ``succeed()``, which builds the success response."""
+        arrived = time.time()
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            response = self._limit(arrived)
+            if response is None:
+                latency = max(0.0, self.rng.gauss(self.behavior.latency_ms, self.behavior.jitter_ms))
+                await asyncio.sleep(latency / 1000)
+                response = self.failed() if self.rng.random() < self.behavior.error_rate else succeed()
+        finally:
+            self.in_flight -= 1
+        self.requests.append({
+            "endpoint": endpoint,
+            "arrived": arrived,
+            "status": response.status,
+            "latency_ms": round((time.time() - arrived) * 1000, 1),
+        })
+        return response
+
+    def _limit(self, now):
+        if not self.behavior.rate_limit:
+            return None
+        while self._window and self._window[0] <= now - self.behavior.window_s:
+            self._window.popleft()
+        if len(self._window) >= self.behavior.rate_limit:
+            return self.rate_limited()
+        self._window.append(now)
+        return None
+
+    def stats(self):
+        statuses = {}
+        endpoints = {}
+        for request in self.requests:
+            statuses[str(request["status"])] = statuses.get(str(request["status"]), 0) + 1
+            endpoints[request["endpoint"]] = endpoints.get(request["endpoint"], 0) + 1
+        arrivals = [r["arrived"] for r in self.requests]
+        return {
+            "requests": len(self.requests),
+            "statuses": statuses,
+            "endpoints": endpoints,
+            "latency_ms": distribution([r["latency_ms"] for r in self.requests]),
+            "peak_in_flight": self.peak_in_flight,
+            "span_s": round(max(arrivals) - min(arrivals), 3) if arrivals else 0,
+        }
+
+    def reset(self):
+        self.requests.clear()
+        self._window.clear()
+        self.peak_in_flight = 0
+
+
+class FakeTelegram(FakeChannel):
+    """``https://api.telegram.org/bot<token>/<method>``."""
+
+    name = "telegram"
+
+    def routes(self):
+        return [
+            ("GET", "/bot{token}/getMe", self.get_me),
+            ("POST", "/bot{token}/sendMessage", self.send("sendMessage")),
+            ("POST", "/bot{token}/sendPhoto", self.send("sendPhoto")),
+        ]
+
+    async def get_me(self, request):
+        return await self.serve("getMe", lambda: web.json_response(
+            {"ok": True, "result": {"id": 1, "is_bot": True, "username": "fake_bot"}}
+        ))
+
+    def send(self, method):
+        async def handler(request):
+            payload = await request.json()
+            return await self.serve(method, lambda: web.json_response({"ok": True, "result": {
+                "message_id": self.next_id(),
+                "chat": {"id": payload.get("chat_id")},
+                "date": int(time.time()),
+            }}))
+        return handler
+
+    def rate_limited(self):
+        retry = self.behavior.retry_after_s
+        return web.json_response({
+            "ok": False, "error_code": 429,
+            "description": f"Too Many Requests: retry after {retry}",
+            "parameters": {"retry_after": retry},
+        }, status=429)
+
+    def failed(self):
+        return web.json_response(
+            {"ok": False, "error_code": 500, "description": "Internal Server Error"}, status=500
+        )
+
+
+class _FakeGraph(FakeChannel):
+    def rate_limited(self):
+        return web.json_response({"error": {
+            "message": "(#4) Application request limit reached",
+            "type": "OAuthException", "code": 4, "is_transient": True,
+        }}, status=400)
+
+    def failed(self):
+        return web.json_response({"error": {
+            "message": "An unexpected error has occurred. Please retry your request later.",
+            "type": "OAuthException", "code": 2, "is_transient": True,
+        }}, status=500)
+
+
+class FakeFacebook(_FakeGraph):
+    """Page posts on ``graph.facebook.com/v18.0/<page-id>/{photos,feed}``."""
+
+    name = "facebook"
+
+    def routes(self):
+        return [
+            ("POST", "/{page_id}/photos", self.post("photos")),
+            ("POST", "/{page_id}/feed", self.post("feed")),
+        ]
+
+    def post(self, kind):
+        async def handler(request):
+            page_id = request.match_info["page_id"]
+
+            def succeed():
+                post = self.next_id()
+                return web.json_response({"id": str(post), "post_id": f"{page_id}_{post}"})
+            return await self.serve(kind, succeed)
+        return handler
+
+
+class FakeInstagram(_FakeGraph):
+    """Container + publish on ``graph.facebook.com/v18.0/<ig-user-id>/{media,media_publish}``."""
+
+    name = "instagram"
+
+    def routes(self):
+        return [
+            ("POST", "/{user_id}/media", self.create_container),
+            ("POST", "/{user_id}/media_publish", self.publish),
+        ]
+
+    async def create_container(self, request):
+        return await self.serve("media", lambda: web.json_response({"id": str(self.next_id())}))
+
+    async def publish(self, request):
+        return await self.serve("media_publish", lambda: web.json_response({"id": str(self.next_id())}))
+
+
+class FakeWhatsApp(FakeChannel):
+    """The standalone WhatsApp service behind ``backend/src/lib/whatsapp-client.js``."""
+
+    name = "whatsapp"
+
+    def routes(self):
+        return [
+            ("GET", "/api/whatsapp/status", self.status),
+            ("POST", "/api/whatsapp/send/multiple", self.send_multiple),
+        ]
+
+    async def status(self, request):
+        return await self.serve("status", lambda: web.json_response({"isReady": True, "state": "CONNECTED"}))
+
+    async def send_multiple(self, request):
+        payload = await request.json()
+        chat_ids = payload.get("chatIds", [])
+
+        def succeed():
+            # The service sends group by group; each one can fail on its own
+            results = []
+            for chat_id in chat_ids:
+                if self.rng.random() < self.behavior.error_rate:
+                    results.append({"chatId": chat_id, "success": False, "error": "Send failed"})
+                else:
+                    results.append({"chatId": chat_id, "success": True, "messageId": f"wa-{self.next_id()}"})
+            successful = sum(1 for r in results if r["success"])
+            return web.json_response({
+                "success": True,
+                "results": results,
+                "summary": {"total": len(results), "successful": successful, "failed": len(results) - successful},
+            })
+
+        return await self.serve("send/multiple", succeed)
+
+    def rate_limited(self):
+        return web.json_response({"success": False, "error": "Too many requests"}, status=429)
+
+    def failed(self):
+        return web.json_response({"success": False, "error": "WhatsApp client error"}, status=500)
+
+
+class ChannelServer:
+    """One ``aiohttp`` server for one or more channels sharing a base URL."""
+
+    def __init__(self, channels, port, host="127.0.0.1", prefix=""):
+        self.channels = channels
+        self.host = host
+        self.port = port
+        self.prefix = prefix
+        self._runner = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}{self.prefix}"
+
+    async def __aenter__(self):
+        app = web.Application()
+        for channel in self.channels:
+            for method, path, handler in channel.routes():
+                app.router.add_route(method, self.prefix + path, handler)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._runner.cleanup()
+
+
+class FakeChannels:
+    """The three servers the backend publishes to, and the env that points it at them.
+
+    ``behaviors`` maps a channel name to its :class:`Behavior`.
+    """
+
+    def __init__(self, behaviors=None, base_port=3301, seed=None):
+        behaviors = behaviors or {}
+        self.telegram = FakeTelegram(behaviors.get("telegram"), seed)
+        self.facebook = FakeFacebook(behaviors.get("facebook"), seed)
+        self.instagram = FakeInstagram(behaviors.get("instagram"), seed)
+        self.whatsapp = FakeWhatsApp(behaviors.get("whatsapp"), seed)
+        self.servers = [
+            ChannelServer([self.telegram], base_port),
+            ChannelServer([self.facebook, self.instagram], base_port + 1, prefix="/v18.0"),
+            ChannelServer([self.whatsapp], base_port + 2),
+        ]
+
+    @property
+    def channels(self):
+        return [self.telegram, self.whatsapp, self.facebook, self.instagram]
+
+    @property
+    def env(self):
+        telegram, graph, whatsapp = self.servers
+        return {
+            "TELEGRAM_API_URL": telegram.url,
+            "META_GRAPH_URL": graph.url,
+            "WHATSAPP_SERVICE_URL": whatsapp.url,
+        }
+
+    async def __aenter__(self):
+        for server in self.servers:
+            await server.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc):
+        for server in self.servers:
+            await server.__aexit__(*exc)
+
+    def stats(self):
+        return {channel.name: channel.stats() for channel in self.channels}
+
+    def reset(self):
+        for channel in self.channels:
+            channel.reset()
+
+
+# -- CLI helpers -----------------------------------------------------------------
+
+
+def add_behavior_args(parser):
+    for name in CHANNELS:
+        parser.add_argument(f"--{name}", metavar="SPEC", default="",
+                            help='Behavior, e.g. "latency=200,jitter=50,errors=0.05,limit=30/1,retry_after=5"')
+    parser.add_argument("--base-port", type=int, default=3301,
+                        help="Telegram on this port, Graph on +1, WhatsApp on +2")
+    parser.add_argument("--seed", type=int, default=None)
+
+
+def behaviors(args):
+    return {name: Behavior.parse(getattr(args, name)) for name in CHANNELS}
@@ -0,0 +1,10 @@
+"""Local stand-in for the SRQ sales provider.
+
+Serves SRQ's planning and sales feeds (``aiohttp``) at a configurable volume,
+latency, error rate and rate limit. The backend reaches it through the
+``baseUrl`` of its ``ApiConfiguration`` rows, which the benchmark driver sets.
+
+    cd testsprite_tests
+    python -m fake_srq --plays 20000 --srq "latency=800"
+    python -m fake_srq.bench --plays 1000,10000,50000
+"""
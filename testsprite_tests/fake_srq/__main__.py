@@ -0,0 +1,39 @@
+"""Serve the fake SRQ until interrupted and print the configuration URLs for it."""
+import argparse
+import asyncio
+import json
+import sys
+
+from fake_srq.servers import (
+    DEFAULT_GAMES, TOKEN, FakeSRQ, FakeSRQServer, add_feed_args, behavior_from_args, feed_from_args,
+)
+
+
+async def serve(args):
+    srq = FakeSRQ(DEFAULT_GAMES, feed_from_args(args, args.plays), behavior_from_args(args), args.seed)
+    async with FakeSRQServer(srq, args.port) as server:
+        print(f"APIKEY {TOKEN}")
+        for slug in srq.games:
+            print(f"{slug:<16} PLANNING {server.planning_url(slug)}")
+            print(f"{'':<16} SALES    {server.sales_url(slug)}")
+        print("Serving; Ctrl+C prints the request stats", file=sys.stderr)
+        try:
+            await asyncio.Event().wait()
+        finally:
+            print(json.dumps(srq.stats(), indent=2), file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve a fake SRQ planning and sales API")
+    parser.add_argument("--plays", type=int, default=10_000, help="Plays per draw in the sales feed")
+    add_feed_args(parser)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
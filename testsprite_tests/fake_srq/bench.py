@@ -0,0 +1,191 @@
+"""Benchmark: SRQ planning and ticket sync ingest against the fake SRQ.
+
+For each ``--plays`` step, resets an isolated database clone (see
+:mod:`harness.database`), serves a :class:`~fake_srq.servers.FakeSRQ` whose
+draws carry that many plays, and runs ``backend/src/scripts/bench-srq-sync.js``.
+The driver points ``SALES`` / ``PLANNING`` configurations of every game at the
+fake, creates today's draws and, with its clock at ``--at`` (peak hour by
+default), runs ``sync-api-planning.job.js`` once and ``sync-api-tickets.job.js``
+``--ticks`` times. Each ticket tick deletes and reimports the next draw of
+every game, one play at a time through ``api-integration.service.js``.
+
+Per step the report (``.artifacts/srq_sync.json``) gives the planning sync's
+duration, and per tick its duration, plays and tickets ingested per second,
+queries, time spent waiting on SRQ and the margin left before the job's next
+cron tick. A step falls behind when a tick takes longer than that interval
+(read from the job's ``cronExpression``); the run then exits with 1.
+
+    cd testsprite_tests
+    python -m fake_srq.bench --plays 1000,10000,50000
+    python -m fake_srq.bench --plays 20000 --srq "latency=1500,jitter=500" --ticks 3
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+from fake_srq.servers import (
+    TOKEN, FakeSRQ, FakeSRQServer, add_feed_args, behavior_from_args, feed_from_args,
+)
+from harness.config import ARTIFACTS_DIR, DRAW_TIMEZONE
+from harness.database import BACKEND_DIR, SEEDS, TemplateDatabase, driver_url
+
+DEFAULT_REPORT = ARTIFACTS_DIR / "srq_sync.json"
+
+DRIVER = "src/scripts/bench-srq-sync.js"
+
+
+async def seeded_games(url):
+    """``{slug: (name, numbers)}`` of the active games in the database at ``url``."""
+    import asyncpg
+
+    conn = await asyncpg.connect(driver_url(url))
+    try:
+        rows = await conn.fetch(
+            'SELECT g.slug, g.name, array_agg(i.number ORDER BY i.number) AS numbers '
+            'FROM "Game" g JOIN "GameItem" i ON i."gameId" = g.id '
+            'WHERE g."isActive" AND i."isActive" GROUP BY g.slug, g.name'
+        )
+    finally:
+        await conn.close()
+    return {row["slug"]: (row["name"], list(row["numbers"])) for row in rows}
+
+
+def synced_draw(at, draw_hours):
+    """``(planning date, hour)`` of the draw the ticket job picks at ``at`` (HH:MM, Caracas).
+
+    The planning job asks SRQ for the UTC date of its clock; the ticket job
+    takes the first draw within the next hour.
+    """
+    now = datetime.now(ZoneInfo(DRAW_TIMEZONE))
+    hours, minutes = map(int, at.split(":"))
+    virtual = now.replace(hour=hours, minute=minutes, second=0, microsecond=0)
+    hour = next((h for h in draw_hours if h * 60 > hours * 60 + minutes), None)
+    if hour is None or hour * 60 > hours * 60 + minutes + 60:
+        hour = None
+    return (virtual + timedelta(hours=4)).date().isoformat(), hour
+
+
+async def run_driver(db_url, server, args):
+    process = await asyncio.create_subprocess_exec(
+        "node", DRIVER, "--at", args.at, "--ticks", str(args.ticks), "--token", TOKEN,
+        "--draw-times", ",".join(f"{h:02d}:00" for h in server.srq.feed.draw_hours),
+        cwd=BACKEND_DIR, env={**os.environ, "DATABASE_URL": db_url, "SRQ_URL": server.url},
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL,
+    )
+    records = []
+    async for raw in process.stdout:
+        line = raw.decode(errors="replace").strip()
+        if line.startswith("SRQ "):
+            records.append(json.loads(line[4:]))
+    await process.wait()
+    if process.returncode != 0:
+        fatal = next((r["error"] for r in records if r["type"] == "fatal"), "no output")
+        raise RuntimeError(f"SRQ sync driver failed: {fatal}")
+    return records
+
+
+def summarize_step(plays, records, srq_stats):
+    setup = next(r for r in records if r["type"] == "setup")
+    planning = next(r for r in records if r["type"] == "planning")
+    interval_ms = (setup["interval_s"] or 0) * 1000
+    ticks = []
+    for tick in (r for r in records if r["type"] == "tick"):
+        ingested = sum(d.get("plays", 0) for d in tick["draws"])
+        tickets = sum(d.get("imported", 0) for d in tick["draws"])
+        seconds = tick["ms"] / 1000
+        ticks.append({
+            "tick": tick["tick"],
+            "ms": tick["ms"],
+            "plays": ingested,
+            "tickets": tickets,
+            "plays_per_s": round(ingested / seconds) if seconds else None,
+            "tickets_per_s": round(tickets / seconds) if seconds else None,
+            "queries": tick["queries"],
+            "queries_per_play": round(tick["queries"] / ingested, 1) if ingested else None,
+            "db_ms": tick["db_ms"],
+            "srq_ms": tick["fetch_ms"],
+            "srq_mb": round(tick["bytes"] / 1024 / 1024, 1),
+            "margin_s": round((interval_ms - tick["ms"]) / 1000, 1) if interval_ms else None,
+            "absorbed": not interval_ms or tick["ms"] <= interval_ms,
+            "draws": tick["draws"],
+        })
+    return {
+        "plays": plays,
+        "interval_s": setup["interval_s"],
+        "planning": {k: planning[k] for k in ("ms", "queries", "requests", "mapped", "skipped", "error")},
+        "ticks": ticks,
+        "absorbed": all(t["absorbed"] for t in ticks),
+        "srq": srq_stats,
+    }
+
+
+async def run(args):
+    template = await TemplateDatabase(seeds=SEEDS).ensure()
+    steps = []
+    async with template.clone(f"tote_srq_{uuid.uuid4().hex[:8]}") as db:
+        games = await seeded_games(db.url)
+        srq = FakeSRQ(games, behavior=behavior_from_args(args), seed=args.seed)
+        async with FakeSRQServer(srq, args.port) as server:
+            for plays in args.plays:
+                await db.reset()
+                srq.reset()
+                srq.feed = feed_from_args(args, plays)
+                date, hour = synced_draw(args.at, srq.feed.draw_hours)
+                if hour is not None:
+                    # Generated up front so SRQ's latency is only what --srq sets
+                    for slug in games:
+                        await asyncio.to_thread(srq.sales_body, slug, srq.sorteo_id(slug, date, hour))
+                records = await run_driver(db.url, server, args)
+                step = summarize_step(plays, records, srq.stats())
+                steps.append(step)
+                print_step(step)
+    return {
+        "at": args.at,
+        "ticks": args.ticks,
+        "behavior": vars(behavior_from_args(args)),
+        "steps": steps,
+    }
+
+
+def print_step(step):
+    planning = step["planning"]
+    print(f"{step['plays']:>8,} plays per draw: planning {planning['ms']} ms "
+          f"({planning['mapped']} mapped{', ' + planning['error'] if planning['error'] else ''})")
+    for tick in step["ticks"]:
+        mark = "✅" if tick["absorbed"] else "❌"
+        print(f"    {mark} tick {tick['tick']}: {tick['ms'] / 1000:.1f} s for {tick['plays']:,} plays "
+              f"({tick['plays_per_s']}/s, {tick['queries_per_play']} queries/play, "
+              f"SRQ {tick['srq_ms'] / 1000:.1f} s), margin {tick['margin_s']} s of {step['interval_s']} s")
+
+
+def _sizes(value):
+    return [int(n) for n in value.split(",")]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SRQ sync ingest benchmark over a fake SRQ")
+    parser.add_argument("--plays", type=_sizes, default=[1000, 10_000, 50_000],
+                        help="Comma-separated plays per draw in SRQ's sales feed")
+    parser.add_argument("--at", default="17:10", help="Caracas time the jobs run at (HH:MM)")
+    parser.add_argument("--ticks", type=int, default=2,
+                        help="Ticket job runs per step; the first one starts from an empty draw")
+    add_feed_args(parser)
+    parser.add_argument("-o", "--output", default=str(DEFAULT_REPORT))
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run(args))
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"→ {output}")
+    return 0 if all(step["absorbed"] for step in report["steps"]) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+"""Fake SRQ planning and sales endpoints.
+
+SRQ is configured per game through ``ApiConfiguration`` rows: the planning
+URL gets the date appended (``{baseUrl}{YYYY-MM-DD}``) and the sales URL the
+draw's ``sorteoID`` (``{baseUrl}{sorteoID}``), both with the token in an
+``APIKEY`` header. :class:`FakeSRQ` serves both as
+``/planning/<slug>/<date>`` and ``/sales/<slug>/<sorteoID>`` and answers in
+SRQ's shapes: a bare JSON array on success and
+``{"result": "error", "errors": [...]}`` otherwise.
+
+A draw's sales are generated from its ``sorteoID`` and the seed, so every
+request for the same draw returns the same plays, as SRQ does between two
+syncs without new sales. Latency, error rate and rate limiting come from
+:class:`fake_channels.servers.Behavior`.
+"""
+import json
+import random
+import zlib
+from dataclasses import dataclass, field
+
+from aiohttp import web
+
+from fake_channels.servers import Behavior, ChannelServer, FakeChannel
+
+TOKEN = "bench-srq-token"
+
+# What create-games.js seeds: slug -> (name, numbers)
+DEFAULT_GAMES = {
+    "lotoanimalito": ("LOTOANIMALITO", [f"{n:02d}" for n in range(38)]),
+    "lottopantera": ("LOTTOPANTERA", [f"{n:02d}" for n in range(37)]),
+    "triple-pantera": ("TRIPLE PANTERA", [f"{n:03d}" for n in range(1000)]),
+}
+
+
+@dataclass
+class Feed:
+    """Volume and shape of the sales feed."""
+
+    plays: int = 10_000  # plays per draw
+    max_plays_per_ticket: int = 5
+    voided_share: float = 0.02  # anulado: the backend skips them
+    comerciales: int = 3
+    bancas_per_comercial: int = 4
+    grupos_per_banca: int = 5
+    taquillas_per_grupo: int = 10
+    draw_hours: list = field(default_factory=lambda: list(range(8, 20)))
+
+
+def _hour_label(hour):
+    """``8AM`` / ``12PM`` / ``7PM``, as in SRQ's ``descripcion``."""
+    return f"{hour % 12 or 12}{'AM' if hour < 12 else 'PM'}"
+
+
+class FakeSRQ(FakeChannel):
+    """Planning and sales feeds for ``games`` (``{slug: (name, numbers)}``)."""
+
+    name = "srq"
+
+    def __init__(self, games=None, feed=None, behavior=None, seed=None):
+        super().__init__(behavior, seed)
+        self.games = games or DEFAULT_GAMES
+        self.feed = feed or Feed()
+        self.seed = seed or 0
+        self._bodies = {}
+
+    def routes(self):
+        return [
+            ("GET", "/planning/{slug}/{date}", self.planning),
+            ("GET", "/sales/{slug}/{sorteo_id}", self.sales),
+        ]
+
+    @staticmethod
+    def sorteo_id(slug, date, hour):
+        return zlib.crc32(f"{slug}:{date}:{hour}".encode()) % 900_000_000 + 100_000_000
+
+    def _error(self, message, status=200):
+        return web.json_response({"result": "error", "errors": [{"message": message}]}, status=status)
+
+    def _authorized(self, request):
+        return request.headers.get("APIKEY") == TOKEN
+
+    async def planning(self, request):
+        slug, date = request.match_info["slug"], request.match_info["date"]
+
+        def succeed():
+            if not self._authorized(request):
+                return self._error("APIKEY inválida")
+            if slug not in self.games:
+                return self._error(f"Lotería desconocida: {slug}")
+            name = self.games[slug][0]
+            return web.json_response([
+                {
+                    "sorteoID": self.sorteo_id(slug, date, hour),
+                    "descripcion": f"{name} {_hour_label(hour)}",
+                    "abierta": True,
+                    "ganador": None,
+                }
+                for hour in self.feed.draw_hours
+            ])
+        return await self.serve("planning", succeed)
+
+    async def sales(self, request):
+        slug, sorteo_id = request.match_info["slug"], request.match_info["sorteo_id"]
+
+        def succeed():
+            if not self._authorized(request):
+                return self._error("APIKEY inválida")
+            if slug not in self.games:
+                return self._error(f"Lotería desconocida: {slug}")
+            return web.Response(body=self.sales_body(slug, int(sorteo_id)), content_type="application/json")
+        return await self.serve("sales", succeed)
+
+    def sales_body(self, slug, sorteo_id):
+        """The encoded plays of one draw, generated once per volume."""
+        key = (slug, sorteo_id, self.feed.plays)
+        if key not in self._bodies:
+            self._bodies[key] = json.dumps(self.plays(slug, sorteo_id)).encode()
+        return self._bodies[key]
+
+    def plays(self, slug, sorteo_id):
+        feed = self.feed
+        rng = random.Random(f"{self.seed}:{sorteo_id}")
+        numbers = list(self.games[slug][1])
+        rng.shuffle(numbers)
+        # Zipf-like popularity, as in harness.dataset
+        weights = [1 / (rank + 1) ** 0.8 for rank in range(len(numbers))]
+        rows = []
+        ticket_id = sorteo_id * 1000
+        while len(rows) < feed.plays:
+            ticket_id += 1
+            comercial = rng.randint(1, feed.comerciales)
+            banca = comercial * 100 + rng.randint(1, feed.bancas_per_comercial)
+            grupo = banca * 100 + rng.randint(1, feed.grupos_per_banca)
+            taquilla = grupo * 100 + rng.randint(1, feed.taquillas_per_grupo)
+            voided = rng.random() < feed.voided_share
+            count = min(rng.randint(1, feed.max_plays_per_ticket), feed.plays - len(rows))
+            for numero in dict.fromkeys(rng.choices(numbers, weights=weights, k=count)):
+                rows.append({
+                    "ticketID": ticket_id,
+                    "numero": numero,
+                    "monto": rng.choice((5, 10, 10, 20, 20, 50, 100)),
+                    "premio": 0,
+                    "anulado": voided,
+                    "comercialID": comercial,
+                    "bancaID": banca,
+                    "grupoID": grupo,
+                    "taquillaID": taquilla,
+                })
+        return rows
+
+    def rate_limited(self):
+        return self._error("Demasiadas solicitudes", status=429)
+
+    def failed(self):
+        return self._error("Error interno del servidor", status=500)
+
+
+class FakeSRQServer(ChannelServer):
+    """One server for :class:`FakeSRQ`, with the ``ApiConfiguration`` URLs that point at it."""
+
+    def __init__(self, srq, port=3311, host="127.0.0.1"):
+        super().__init__([srq], port, host)
+        self.srq = srq
+
+    def planning_url(self, slug):
+        return f"{self.url}/planning/{slug}/"
+
+    def sales_url(self, slug):
+        return f"{self.url}/sales/{slug}/"
+
+
+def add_feed_args(parser):
+    parser.add_argument("--srq", metavar="SPEC", default="",
+                        help='Behavior, e.g. "latency=200,jitter=50,errors=0.05,limit=30/1"')
+    parser.add_argument("--port", type=int, default=3311)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--max-plays-per-ticket", type=int, default=Feed.max_plays_per_ticket)
+    parser.add_argument("--voided-share", type=float, default=Feed.voided_share)
+
+
+def feed_from_args(args, plays):
+    return Feed(plays=plays, max_plays_per_ticket=args.max_plays_per_ticket, voided_share=args.voided_share)
+
+
+def behavior_from_args(args):
+    return Behavior.parse(args.srq)
@@ -0,0 +1 @@
+"""Shared helpers for the testsprite_tests E2E suite."""
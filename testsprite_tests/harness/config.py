@@ -0,0 +1,33 @@
+"""Environment-driven settings shared by the harness modules."""
+import os
+from contextvars import ContextVar
+from pathlib import Path
+
+SUITE_DIR = Path(__file__).resolve().parent.parent
+
+# Frontend (Next.js) and backend (Express) base URLs
+FRONTEND_URL = os.environ.get("TOTE_FRONTEND_URL", "http://localhost:3000").rstrip("/")
+API_URL = os.environ.get("TOTE_API_URL", "http://localhost:3001/api").rstrip("/")
+SOCKET_URL = os.environ.get("TOTE_SOCKET_URL", API_URL.rsplit("/api", 1)[0])
+
+# (api_url, socket_url) of the backend the running test talks to; the runner
+# points it at the slot's own backend under --isolated-db
+BACKEND_URLS = ContextVar("backend_urls", default=(API_URL, SOCKET_URL))
+
+
+def api_url():
+    return BACKEND_URLS.get()[0]
+
+
+def socket_url():
+    return BACKEND_URLS.get()[1]
+
+# Draw times are stored as Venezuela wall-clock time (drawDate + drawTime)
+DRAW_TIMEZONE = "America/Caracas"
+
+# Credentials used by the shared admin session
+ADMIN_USERNAME = os.environ.get("TOTE_ADMIN_USERNAME", "admin")
+ADMIN_PASSWORD = os.environ.get("TOTE_ADMIN_PASSWORD", "admin123")
+
+# Scratch directory for run artifacts (storage state, traces, results)
+ARTIFACTS_DIR = Path(os.environ.get("TOTE_ARTIFACTS_DIR", SUITE_DIR / ".artifacts"))
@@ -0,0 +1,463 @@
+"""Per-worker Postgres databases cloned from a seeded template.
+
+The template is built once from ``backend/prisma/schema.prisma`` (``prisma db
+push``) and the backend seed scripts, and named after a hash of those files, so
+it is rebuilt only when the schema or the seed changes. Every worker then gets
+its own clone (``CREATE DATABASE ... TEMPLATE``), a file-level copy that takes
+milliseconds. Between tests the clone is restored in place (TRUNCATE, then the
+rows copied back from a snapshot schema) so the backend and its Prisma
+connections stay up; re-cloning would kill them, and Prisma does not recover
+from that (P1017).
+
+    template = await TemplateDatabase().ensure()
+    async with template.clone("tote_worker_1") as db:
+        await db.snapshot()
+        async with BackendServer(db.url, port=3101) as backend:
+            ...                       # backend.api_url talks to the clone
+            await db.restore()        # back to the seeded state
+
+``python -m harness.runner --isolated-db`` does this for every worker, routes
+each browser context's API and Socket.IO traffic to the worker's own backend
+and points :func:`harness.config.api_url` / ``socket_url`` at it.
+
+Needs ``asyncpg`` and ``TOTE_DATABASE_URL`` (or ``DATABASE_URL``) pointing at a
+role allowed to create databases; ``npx``/``node`` must be able to run the
+backend's Prisma CLI and seed scripts.
+"""
+import asyncio
+import graphlib
+import hashlib
+import json
+import os
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from urllib.parse import urlsplit, urlunsplit
+
+from harness.config import API_URL, ARTIFACTS_DIR, SOCKET_URL, SUITE_DIR
+from harness.stats import distribution
+
+BACKEND_DIR = SUITE_DIR.parent / "backend"
+SCHEMA_PATH = BACKEND_DIR / "prisma" / "schema.prisma"
+
+DATABASE_URL = os.environ.get("TOTE_DATABASE_URL") or os.environ.get("DATABASE_URL")
+
+# Seed scripts run against the template, relative to backend/
+SEED_SCRIPTS = [s for s in os.environ.get("TOTE_DB_SEED", "src/scripts/seed.js").split(",") if s]
+
+# Seed set of the benches that need games with items to draw from;
+# create-games.js seeds the three production games
+SEEDS = SEED_SCRIPTS + [s for s in ["src/scripts/create-games.js"] if s not in SEED_SCRIPTS]
+
+TEMPLATE_PREFIX = "tote_template_"
+
+# First port handed to the per-worker backends (worker i listens on base + i)
+BACKEND_BASE_PORT = int(os.environ.get("TOTE_BACKEND_BASE_PORT", "3101"))
+
+# Schema of a clone holding the rows CloneDatabase.restore copies back
+PRISTINE_SCHEMA = "tote_pristine"
+
+# How long a restore waits on locks held by the backend before failing
+RESTORE_LOCK_TIMEOUT = os.environ.get("TOTE_RESTORE_LOCK_TIMEOUT", "10s")
+
+
+def quote_ident(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def database_url(name, base=None):
+    """``base`` (a Prisma DATABASE_URL) pointing at database ``name`` instead."""
+    parts = urlsplit(base or DATABASE_URL)
+    return urlunsplit(parts._replace(path=f"/{name}"))
+
+
+def driver_url(url):
+    # asyncpg rejects Prisma's ?schema=public
+    return urlunsplit(urlsplit(url)._replace(query=""))
+
+
+async def _admin_connection():
+    if not DATABASE_URL:
+        raise RuntimeError("TOTE_DATABASE_URL / DATABASE_URL is not set")
+    import asyncpg
+
+    return await asyncpg.connect(driver_url(database_url("postgres")))
+
+
+def insert_order(tables, references):
+    """``tables`` with every table after the ones its foreign keys point at.
+
+    ``references`` are ``(child, parent)`` pairs; a table referencing itself is
+    fine, since its rows are copied back in a single INSERT.
+    """
+    graph = {table: set() for table in tables}
+    for child, parent in references:
+        if child != parent and child in graph and parent in graph:
+            graph[child].add(parent)
+    try:
+        return list(graphlib.TopologicalSorter(graph).static_order())
+    except graphlib.CycleError as e:
+        raise RuntimeError(f"Foreign keys form a cycle, cannot restore in place: {e.args[1]}") from e
+
+
+def template_name(seeds=SEED_SCRIPTS):
+    """``tote_template_<seed set>_<schema + seed contents>`` for ``seeds``."""
+    seed_set = hashlib.sha256(",".join(seeds).encode()).hexdigest()[:6]
+    digest = hashlib.sha256(SCHEMA_PATH.read_bytes())
+    for script in seeds:
+        digest.update((BACKEND_DIR / script).read_bytes())
+    return f"{TEMPLATE_PREFIX}{seed_set}_{digest.hexdigest()[:10]}"
+
+
+async def _run(*cmd, env):
+    process = await asyncio.create_subprocess_exec(
+        *cmd, cwd=BACKEND_DIR, env={**os.environ, **env},
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT,
+    )
+    output, _ = await process.communicate()
+    if process.returncode != 0:
+        raise RuntimeError(f"{' '.join(cmd)} failed:\n{output.decode(errors='replace')[-2000:]}")
+
+
+class TemplateDatabase:
+    def __init__(self, name=None, seeds=SEED_SCRIPTS):
+        self.seeds = list(seeds)
+        self.name = name or template_name(self.seeds)
+        self.url = database_url(self.name)
+        self.build_s = None
+
+    async def ensure(self, rebuild=False):
+        """Build the template unless an up-to-date one exists. Safe across processes."""
+        conn = await _admin_connection()
+        try:
+            # Serializes concurrent workers; the first one builds, the rest reuse
+            await conn.execute("SELECT pg_advisory_lock(hashtext('tote_template'))")
+            try:
+                exists = await conn.fetchval(
+                    "SELECT datistemplate FROM pg_database WHERE datname = $1", self.name
+                )
+                if exists and not rebuild:
+                    return self
+                started = time.perf_counter()
+                await self._drop(conn, self.name)
+                await self._create(conn)
+                await conn.execute(
+                    f"ALTER DATABASE {quote_ident(self.name)} WITH IS_TEMPLATE true ALLOW_CONNECTIONS false"
+                )
+                await self._drop_stale(conn)
+                self.build_s = round(time.perf_counter() - started, 3)
+            finally:
+                await conn.execute("SELECT pg_advisory_unlock(hashtext('tote_template'))")
+        finally:
+            await conn.close()
+        return self
+
+    async def _create(self, conn):
+        await conn.execute(f"CREATE DATABASE {quote_ident(self.name)}")
+        await self._populate()
+
+    async def _populate(self):
+        env = {"DATABASE_URL": self.url}
+        await _run("npx", "prisma", "db", "push", "--skip-generate", "--accept-data-loss",
+                   f"--schema={SCHEMA_PATH}", env=env)
+        for script in self.seeds:
+            await _run("node", script, env=env)
+
+    @staticmethod
+    async def _drop(conn, name):
+        exists = await conn.fetchval("SELECT 1 FROM pg_database WHERE datname = $1", name)
+        if exists:
+            await conn.execute(f"ALTER DATABASE {quote_ident(name)} WITH IS_TEMPLATE false")
+            await conn.execute(f"DROP DATABASE {quote_ident(name)} WITH (FORCE)")
+
+    async def _drop_stale(self, conn):
+        """Drop templates of the same seed set left behind by older schema/seed versions."""
+        seed_set = self.name.rsplit("_", 1)[0]
+        names = await conn.fetch(
+            "SELECT datname FROM pg_database WHERE datname LIKE $1 AND datname <> $2",
+            seed_set + "\\_%", self.name,
+        )
+        for row in names:
+            await self._drop(conn, row["datname"])
+
+    def clone(self, name):
+        return CloneDatabase(self, name)
+
+
+class CloneDatabase:
+    """A throwaway copy of the template.
+
+    :meth:`reset` re-clones it, which kills every connection to it; with a
+    backend attached, :meth:`snapshot` once and :meth:`restore` in place instead.
+    """
+
+    def __init__(self, template, name):
+        self.template = template
+        self.name = name
+        self.url = database_url(name)
+        self.timings = []
+        self.restore_timings = []
+        self._conn = None
+        self._data_conn = None
+        self._tables = []
+        self._sequences = []
+        self._strategy = ""
+
+    async def __aenter__(self):
+        await self.create()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.drop()
+
+    async def create(self):
+        self._conn = await _admin_connection()
+        if await self._conn.fetchval("SELECT current_setting('server_version_num')::int") >= 150000:
+            # PG15+ defaults to WAL_LOG, which is slower for small databases
+            self._strategy = " STRATEGY FILE_COPY"
+        await self._clone()
+
+    async def _clone(self):
+        started = time.perf_counter()
+        await self._conn.execute(f"DROP DATABASE IF EXISTS {quote_ident(self.name)} WITH (FORCE)")
+        await self._conn.execute(
+            f"CREATE DATABASE {quote_ident(self.name)} TEMPLATE {quote_ident(self.template.name)}{self._strategy}"
+        )
+        self.timings.append(time.perf_counter() - started)
+
+    async def reset(self):
+        """Back to the seeded state. Open connections to the clone are terminated,
+        so stop any backend using it first."""
+        await self._close_data()
+        await self._clone()
+
+    async def snapshot(self):
+        """Copy every table into the ``PRISTINE_SCHEMA`` of the clone, for :meth:`restore`."""
+        import asyncpg
+
+        await self._close_data()
+        self._data_conn = conn = await asyncpg.connect(driver_url(self.url))
+        tables = [row["tablename"] for row in await conn.fetch(
+            "SELECT tablename FROM pg_tables WHERE schemaname = current_schema()"
+        )]
+        references = await conn.fetch(
+            """SELECT child.relname AS child, parent.relname AS parent
+               FROM pg_constraint c
+               JOIN pg_class child ON child.oid = c.conrelid
+               JOIN pg_class parent ON parent.oid = c.confrelid
+               WHERE c.contype = 'f'
+                 AND c.connamespace = (SELECT oid FROM pg_namespace WHERE nspname = current_schema())"""
+        )
+        self._tables = insert_order(tables, [(row["child"], row["parent"]) for row in references])
+        self._sequences = [
+            (f"{quote_ident(row['schemaname'])}.{quote_ident(row['sequencename'])}", row["last_value"])
+            for row in await conn.fetch(
+                "SELECT schemaname, sequencename, last_value FROM pg_sequences WHERE schemaname = current_schema()"
+            )
+        ]
+        async with conn.transaction():
+            await conn.execute(f"DROP SCHEMA IF EXISTS {PRISTINE_SCHEMA} CASCADE")
+            await conn.execute(f"CREATE SCHEMA {PRISTINE_SCHEMA}")
+            for table in self._tables:
+                await conn.execute(f"CREATE TABLE {PRISTINE_SCHEMA}.{quote_ident(table)} AS TABLE {quote_ident(table)}")
+
+    async def restore(self):
+        """Back to the snapshot without touching other connections to the clone."""
+        if self._data_conn is None:
+            raise RuntimeError(f"{self.name} has no snapshot to restore")
+        conn = self._data_conn
+        started = time.perf_counter()
+        async with conn.transaction():
+            # Fail the test instead of hanging behind a backend transaction left open
+            await conn.execute(f"SET LOCAL lock_timeout = '{RESTORE_LOCK_TIMEOUT}'")
+            await conn.execute("TRUNCATE " + ", ".join(quote_ident(table) for table in self._tables))
+            for table in self._tables:
+                await conn.execute(
+                    f"INSERT INTO {quote_ident(table)} SELECT * FROM {PRISTINE_SCHEMA}.{quote_ident(table)}"
+                )
+            for sequence, last_value in self._sequences:
+                # last_value is NULL for a sequence nextval() never touched
+                await conn.execute("SELECT setval($1, $2, $3)", sequence, last_value or 1, last_value is not None)
+        self.restore_timings.append(time.perf_counter() - started)
+
+    async def _close_data(self):
+        if self._data_conn is not None:
+            await self._data_conn.close()
+            self._data_conn = None
+
+    async def drop(self):
+        await self._close_data()
+        if self._conn is None:
+            return
+        try:
+            await self._conn.execute(f"DROP DATABASE IF EXISTS {quote_ident(self.name)} WITH (FORCE)")
+        finally:
+            await self._conn.close()
+            self._conn = None
+
+    def stats(self):
+        """Clone and in-place restore durations in milliseconds."""
+        return {
+            "database": self.name,
+            "clone_ms": distribution([t * 1000 for t in self.timings]),
+            "restore_ms": distribution([t * 1000 for t in self.restore_timings]),
+        }
+
+
+class BackendServer:
+    """``node src/index.js`` bound to one database, with the cron jobs off by default."""
+
+    def __init__(self, database_url, port, jobs=False, startup_timeout=60):
+        self.database_url = database_url
+        self.port = port
+        self.jobs = jobs
+        self.startup_timeout = startup_timeout
+        self.process = None
+        self.timings = []
+        origin = urlsplit(API_URL)
+        self.origin = f"{origin.scheme}://{origin.hostname}:{port}"
+        self.api_url = f"{self.origin}/api"
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    async def start(self):
+        env = {
+            **os.environ,
+            "DATABASE_URL": self.database_url,
+            "PORT": str(self.port),
+            "ENABLE_JOBS": "true" if self.jobs else "false",
+        }
+        started = time.perf_counter()
+        self.process = await asyncio.create_subprocess_exec(
+            "node", "src/index.js", cwd=BACKEND_DIR, env=env,
+            stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL,
+        )
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            if self.process.returncode is not None:
+                raise RuntimeError(f"Backend on port {self.port} exited with {self.process.returncode}")
+            if await asyncio.to_thread(self._healthy):
+                self.timings.append(time.perf_counter() - started)
+                return
+            await asyncio.sleep(0.25)
+        await self.stop()
+        raise RuntimeError(f"Backend on port {self.port} not healthy after {self.startup_timeout}s")
+
+    def _healthy(self):
+        try:
+            with urllib.request.urlopen(f"{self.origin}/health", timeout=2) as response:
+                return response.status == 200
+        except (urllib.error.URLError, OSError):
+            return False
+
+    async def stop(self):
+        if self.process and self.process.returncode is None:
+            self.process.terminate()
+            try:
+                await asyncio.wait_for(self.process.wait(), 10)
+            except asyncio.TimeoutError:
+                self.process.kill()
+        self.process = None
+
+
+# -- Browser routing --------------------------------------------------------------
+
+# Points the page's WebSockets at the shared socket host to the slot backend
+REWRITE_WEBSOCKET_JS = """
+(hosts => {
+  const NativeWebSocket = window.WebSocket;
+  window.WebSocket = function (url, protocols) {
+    const target = new URL(url, location.href);
+    if (target.host === hosts.from) target.host = hosts.to;
+    return new NativeWebSocket(target.href, protocols);
+  };
+  window.WebSocket.prototype = NativeWebSocket.prototype;
+  Object.assign(window.WebSocket, {
+    CONNECTING: 0, OPEN: 1, CLOSING: 2, CLOSED: 3,
+  });
+})(%s);
+"""
+
+
+class IsolatedBrowser:
+    """Browser stand-in whose contexts talk to a worker's own backend.
+
+    Requests to the shared API origin are rewritten to ``backend``, and so are
+    the page's WebSocket URLs (Playwright routes do not see the Socket.IO
+    upgrade). The admin storage state is swapped for one issued by that backend
+    (the JWT carries a user id that must exist in the clone).
+    """
+
+    def __init__(self, browser, backend, storage_state):
+        self._browser = browser
+        self.backend = backend
+        self.storage_state = storage_state
+        parts = urlsplit(API_URL)
+        self._shared_origin = f"{parts.scheme}://{parts.netloc}"
+
+    async def new_context(self, **kwargs):
+        if "storage_state" in kwargs:
+            kwargs["storage_state"] = self.storage_state
+        context = await self._browser.new_context(**kwargs)
+        await context.route(f"{self._shared_origin}/**", self._reroute)
+        await context.add_init_script(REWRITE_WEBSOCKET_JS % json.dumps({
+            "from": urlsplit(SOCKET_URL).netloc, "to": urlsplit(self.backend.origin).netloc,
+        }))
+        return context
+
+    async def _reroute(self, route):
+        url = route.request.url
+        await route.continue_(url=self.backend.origin + url[len(self._shared_origin):])
+
+
+async def worker_storage_state(backend, path):
+    """Log in as the admin against ``backend`` and write its storage state to ``path``."""
+    from harness.session import api_login, build_storage_state
+
+    data = await asyncio.to_thread(api_login, api_url=backend.api_url)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(build_storage_state(data["user"], data["token"]), indent=2))
+    return str(path)
+
+
+class IsolatedSlot:
+    """One clone + backend pair for a runner slot, restored before every test."""
+
+    def __init__(self, template_name, slot_id):
+        self.template = TemplateDatabase(template_name)
+        self.slot_id = slot_id
+        self.db = self.template.clone(f"tote_slot_{os.getpid()}_{slot_id}")
+        self.backend = None
+        self.storage_state = None
+
+    async def __aenter__(self):
+        await self.db.create()
+        await self.db.snapshot()
+        self.backend = BackendServer(self.db.url, port=BACKEND_BASE_PORT + self.slot_id)
+        await self.backend.start()
+        self.storage_state = await worker_storage_state(
+            self.backend, ARTIFACTS_DIR / f"admin-storage-state.slot{self.slot_id}.json"
+        )
+        return self
+
+    async def __aexit__(self, *exc):
+        if self.backend:
+            await self.backend.stop()
+        await self.db.drop()
+
+    async def reset(self):
+        await self.db.restore()
+
+    def stats(self):
+        """Clone, restore and backend start durations in milliseconds."""
+        return {**self.db.stats(), "backend_start_ms": distribution([t * 1000 for t in self.backend.timings])}
+
+    def wrap(self, browser):
+        return IsolatedBrowser(browser, self.backend, self.storage_state)
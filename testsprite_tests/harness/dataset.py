@@ -0,0 +1,597 @@
+"""Seeded synthetic betting dataset for the scale tests.
+
+Bulk-loads what ``monitor.service.js``, ``draw-stats.service.js``,
+``prewinner-optimizer.service.js`` and ``tripleta.service.js`` read at scale:
+the provider hierarchy (``ProviderComercial → Banca → Grupo → Taquilla``
+under an ``SRQ dataset`` ``ApiSystem``), players, a ``Draw`` per game and hour over
+``days`` days, their ``Ticket`` s and ``TicketDetail`` s, and ``TripleBet`` s
+spanning those draws. Rows go in with ``COPY`` (``asyncpg``'s
+``copy_records_to_table``), with the secondary indexes of the big tables
+dropped during the load and rebuilt afterwards.
+
+The shape follows production: sales grow towards the evening and on
+weekends, number popularity is Zipf-like, a few taquillas sell most of the
+external tickets, tickets carry one to ten plays, and past draws are
+PUBLISHED with their tickets settled while the rest of the last day is
+SCHEDULED with ACTIVE tickets. ``hot_draw_bets`` / ``hot_tripletas`` load
+each game's next draw to close with a given number of plays and tripletas,
+for benchmarks of what runs at close. External tickets carry the ``providerData``
+that ``srq.service.js`` writes; online ones belong to a player.
+
+Everything derives from ``DatasetSpec``: the same spec gives the same rows
+(ids included, except the seeded games' own), so benchmark runs compare like
+with like. :class:`DatasetTemplate` keeps a loaded dataset as a Postgres
+template named after the spec, so it is generated once and cloned in
+milliseconds afterwards (see :mod:`harness.database`).
+
+    cd testsprite_tests
+    python -m harness.dataset --tickets-per-draw 10000 --days 14      # build or reuse the template
+    python -m harness.dataset --seed 7 --database-url postgresql://…/tote_dev   # load into a database
+
+The players have no usable password; they exist to own online tickets and
+tripletas. ``DrawStats`` / ``ProviderStats`` are left for
+``draw-stats.service.js`` to compute.
+"""
+import argparse
+import asyncio
+import functools
+import hashlib
+import json
+import random
+import sys
+import time
+from dataclasses import asdict, dataclass, field, replace
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+from harness.config import ARTIFACTS_DIR, DRAW_TIMEZONE
+from harness.database import SEEDS, TEMPLATE_PREFIX, TemplateDatabase, driver_url, quote_ident
+
+DEFAULT_REPORT = ARTIFACTS_DIR / "dataset.json"
+
+# Bump when the generator changes the rows it produces for a given spec
+GENERATOR_VERSION = 1
+
+# Rows per COPY
+BATCH = 50_000
+
+# Caracas has no DST: drawDate + drawTime are wall-clock, timestamps are UTC
+CARACAS_OFFSET = timedelta(hours=4)
+
+# Sales per hour relative to the day's mean (08:00 … 19:00)
+HOUR_PROFILE = [0.5, 0.6, 0.7, 0.8, 0.9, 1.0, 1.0, 1.1, 1.2, 1.3, 1.4, 1.5]
+WEEKEND_FACTOR = 1.3
+GAME_TYPE_FACTOR = {"ANIMALITOS": 1.0, "ROULETTE": 0.7, "TRIPLE": 0.5}
+
+# Plays per ticket and amount per play, as (values, weights)
+PLAYS_PER_TICKET = ([1, 2, 3, 4, 5, 6, 8, 10], [40, 20, 12, 8, 6, 5, 5, 4])
+AMOUNTS = {
+    "default": ([1, 2, 3, 5, 10, 20, 50, 100], [20, 15, 8, 25, 15, 8, 6, 3]),
+    "TRIPLE": ([1, 2, 5, 10, 20], [35, 25, 25, 10, 5]),
+}
+TRIPLETA_AMOUNTS = ([5, 10, 20, 50, 100], [30, 30, 20, 15, 5])
+
+# Tripleta defaults of the admin's TripletaTab when a game has no config
+TRIPLETA_MULTIPLIER = 50
+TRIPLETA_DRAWS = 10
+
+# Tables whose secondary indexes are rebuilt after the load
+BULK_TABLES = ["Draw", "Ticket", "TicketDetail", "TripleBet"]
+
+
+def _today():
+    return datetime.now(ZoneInfo(DRAW_TIMEZONE)).date().isoformat()
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    seed: int = 1
+    days: int = 7
+    end_date: str = field(default_factory=_today)  # YYYY-MM-DD, Caracas
+    open_from: str = "12:00:00"  # draws of end_date from here on are still SCHEDULED
+    days_ahead: int = 1  # SCHEDULED days without sales after end_date, for tripletas
+    draw_times: tuple = tuple(f"{h:02d}:00:00" for h in range(8, 20))
+    tickets_per_draw: int = 2000
+    online_share: float = 0.1
+    comerciales: int = 3
+    bancas_per_comercial: int = 4
+    grupos_per_banca: int = 5
+    taquillas_per_grupo: int = 10
+    players: int = 2000
+    tripletas: int = 20_000
+    # Plays on each game's next draw to close (the first SCHEDULED one of end_date); 0 keeps its usual volume
+    hot_draw_bets: int = 0
+    hot_tripletas: int = 0  # extra ACTIVE tripletas whose draws include that one
+
+    def digest(self, exclude=()):
+        fields = {name: value for name, value in asdict(self).items() if name not in exclude}
+        payload = json.dumps({**fields, "version": GENERATOR_VERSION}, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()[:10]
+
+
+class _Ids:
+    """uuid4-shaped ids from the dataset's RNG, so they are reproducible too."""
+
+    def __init__(self, rng):
+        self.rng = rng
+
+    def __call__(self):
+        # What str(uuid.UUID(int=..., version=4)) gives, without building the object
+        n = self.rng.getrandbits(128) & ~(0xC000 << 48) | 0x8000 << 48
+        h = f"{n & ~(0xF000 << 64) | 0x4000 << 64:032x}"
+        return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+@functools.lru_cache(maxsize=4096)
+def _money(value):
+    return Decimal(value).quantize(Decimal("0.01"))
+
+
+def _weights(values, weights):
+    cum, total = [], 0
+    for weight in weights:
+        total += weight
+        cum.append(total)
+    return values, cum
+
+
+class _Copier:
+    """Buffers rows per table and ``COPY``s them in batches, in FK order."""
+
+    COLUMNS = {
+        "ApiSystem": ["id", "name", "description", "createdAt", "updatedAt"],
+        "ProviderComercial": ["id", "externalId", "apiSystemId", "name", "isActive", "createdAt", "updatedAt"],
+        "ProviderBanca": ["id", "externalId", "comercialId", "name", "isActive", "createdAt", "updatedAt"],
+        "ProviderGrupo": ["id", "externalId", "bancaId", "name", "isActive", "createdAt", "updatedAt"],
+        "ProviderTaquilla": ["id", "externalId", "grupoId", "name", "isActive", "createdAt", "updatedAt"],
+        "User": ["id", "username", "email", "password", "role", "isActive", "phone", "phoneVerified",
+                 "balance", "blockedBalance", "createdAt", "updatedAt"],
+        "Draw": ["id", "gameId", "drawDate", "drawTime", "status", "winnerItemId", "imageGenerated",
+                 "closedAt", "drawnAt", "publishedAt", "createdAt", "updatedAt"],
+        "Ticket": ["id", "userId", "drawId", "source", "externalTicketId", "totalAmount", "totalPrize",
+                   "status", "providerData", "createdAt", "updatedAt"],
+        "TicketDetail": ["id", "ticketId", "gameItemId", "drawId", "amount", "multiplier", "prize",
+                         "status", "createdAt"],
+        "TripleBet": ["id", "userId", "gameId", "item1Id", "item2Id", "item3Id", "amount", "multiplier",
+                      "drawsCount", "startDrawId", "endDrawId", "winnerDrawId", "prize", "status",
+                      "expiresAt", "createdAt", "updatedAt"],
+    }
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.buffers = {table: [] for table in self.COLUMNS}
+        self.rows = {table: 0 for table in self.COLUMNS}
+        self.seconds = {table: 0.0 for table in self.COLUMNS}
+
+    async def add(self, table, row):
+        self.buffers[table].append(row)
+        if len(self.buffers[table]) >= BATCH:
+            await self.flush(*self._parents(table), table)
+
+    def _parents(self, table):
+        # A batch may reference rows still buffered in its parent tables
+        order = list(self.COLUMNS)
+        return order[:order.index(table)]
+
+    async def flush(self, *tables):
+        for table in tables or self.COLUMNS:
+            rows = self.buffers[table]
+            if not rows:
+                continue
+            started = time.perf_counter()
+            await self.conn.copy_records_to_table(table, records=rows, columns=self.COLUMNS[table])
+            self.seconds[table] += time.perf_counter() - started
+            self.rows[table] += len(rows)
+            self.buffers[table] = []
+
+    def stats(self):
+        return {
+            table: {
+                "rows": self.rows[table],
+                "copy_s": round(self.seconds[table], 2),
+                "rows_per_s": round(self.rows[table] / self.seconds[table]) if self.seconds[table] else None,
+            }
+            for table in self.COLUMNS if self.rows[table]
+        }
+
+
+async def _defer_indexes(conn):
+    """Drop the non-primary-key indexes of the bulk tables; returns their definitions."""
+    rows = await conn.fetch(
+        "SELECT indexname, indexdef FROM pg_indexes "
+        "WHERE schemaname = current_schema() AND tablename = ANY($1::text[]) AND indexname NOT LIKE '%\\_pkey'",
+        BULK_TABLES,
+    )
+    for row in rows:
+        await conn.execute(f"DROP INDEX {quote_ident(row['indexname'])}")
+    return [row["indexdef"] for row in rows]
+
+
+async def _games(conn):
+    games = await conn.fetch(
+        'SELECT id, slug, type::text AS type, config FROM "Game" WHERE "isActive" ORDER BY slug'
+    )
+    if not games:
+        raise RuntimeError("No active games; seed the database with create-games.js first")
+    items = await conn.fetch(
+        'SELECT id, "gameId", number, multiplier FROM "GameItem" WHERE "isActive" ORDER BY number'
+    )
+    result = []
+    for game in games:
+        config = json.loads(game["config"]) if isinstance(game["config"], str) else (game["config"] or {})
+        result.append({
+            "id": game["id"],
+            "slug": game["slug"],
+            "type": game["type"],
+            "tripleta": config.get("tripleta") or {},
+            "items": [(i["id"], i["multiplier"]) for i in items if i["gameId"] == game["id"]],
+        })
+    return result
+
+
+class _Generator:
+    def __init__(self, spec, games, copier):
+        self.spec = spec
+        self.games = games
+        self.copy = copier
+        self.rng = random.Random(spec.seed)
+        self.new_id = _Ids(self.rng)
+        self.now = datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+        self.taquillas = []  # providerData of each taquilla
+        self.taquilla_weights = None
+        self.players = []
+        self.draws = {}  # game id -> [(draw id, local datetime, winner item id or None)]
+        self.hot = {}  # game id -> index of its hot draw in self.draws
+        self.external_ticket_id = 10_000_000
+
+    async def run(self):
+        await self.providers()
+        await self.users()
+        for game in self.games:
+            await self.game_draws(game)
+        await self.tripletas()
+        await self.copy.flush()
+
+    # -- Providers and players ---------------------------------------------------
+
+    async def providers(self):
+        spec, now = self.spec, self.now
+        api_system = self.new_id()
+        await self.copy.add("ApiSystem", (api_system, "SRQ dataset", "Synthetic dataset (harness.dataset)", now, now))
+        banca_ext = grupo_ext = taquilla_ext = 0
+        for c in range(1, spec.comerciales + 1):
+            comercial = self.new_id()
+            await self.copy.add("ProviderComercial", (comercial, c, api_system, f"Comercial {c}", True, now, now))
+            for _ in range(spec.bancas_per_comercial):
+                banca_ext += 1
+                banca = self.new_id()
+                await self.copy.add("ProviderBanca", (banca, banca_ext, comercial, f"Banca {banca_ext}", True, now, now))
+                for _ in range(spec.grupos_per_banca):
+                    grupo_ext += 1
+                    grupo = self.new_id()
+                    await self.copy.add("ProviderGrupo", (grupo, grupo_ext, banca, f"Grupo {grupo_ext}", True, now, now))
+                    for _ in range(spec.taquillas_per_grupo):
+                        taquilla_ext += 1
+                        await self.copy.add("ProviderTaquilla", (
+                            self.new_id(), taquilla_ext, grupo, f"Taquilla {taquilla_ext}", True, now, now,
+                        ))
+                        self.taquillas.append({
+                            "taquillaID": taquilla_ext, "grupoID": grupo_ext,
+                            "bancaID": banca_ext, "comercialID": c,
+                        })
+        # A few taquillas sell most of the tickets
+        self.taquilla_weights = _weights(
+            range(len(self.taquillas)), [self.rng.paretovariate(1.2) for _ in self.taquillas]
+        )
+
+    async def users(self):
+        now = self.now
+        for i in range(1, self.spec.players + 1):
+            player = self.new_id()
+            await self.copy.add("User", (
+                player, f"dataset_player_{i:06d}", f"dataset_player_{i:06d}@dataset.test", "!",
+                "PLAYER", True, f"0414{i:07d}", True, _money(self.rng.randint(0, 5000)), _money(0), now, now,
+            ))
+            self.players.append(player)
+
+    # -- Draws, tickets and details ----------------------------------------------
+
+    def _draw_slots(self):
+        end = date.fromisoformat(self.spec.end_date)
+        first = end - timedelta(days=self.spec.days - 1)
+        hot_time = next((t for t in self.spec.draw_times if t >= self.spec.open_from), None)
+        for offset in range(self.spec.days + self.spec.days_ahead):
+            day = first + timedelta(days=offset)
+            for index, draw_time in enumerate(self.spec.draw_times):
+                local = datetime.combine(day, datetime.strptime(draw_time, "%H:%M:%S").time())
+                past = day < end or (day == end and draw_time < self.spec.open_from)
+                selling = day <= end
+                hot = day == end and draw_time == hot_time
+                yield day, draw_time, local, index, past, selling, hot
+
+    async def game_draws(self, game):
+        rng = self.rng
+        items = game["items"]
+        # Zipf-like popularity over a per-game shuffled order
+        ranked = items[:]
+        rng.shuffle(ranked)
+        popularity = _weights(ranked, [1 / (rank + 1) ** 0.8 for rank in range(len(ranked))])
+        amounts = _weights(*AMOUNTS.get(game["type"], AMOUNTS["default"]))
+        plays = _weights(*PLAYS_PER_TICKET)
+        draws = self.draws.setdefault(game["id"], [])
+
+        for day, draw_time, local, index, past, selling, hot in self._draw_slots():
+            draw_id = self.new_id()
+            utc = local + CARACAS_OFFSET
+            winner = rng.choice(items)[0] if past else None
+            await self.copy.add("Draw", (
+                draw_id, game["id"], day, draw_time, "PUBLISHED" if past else "SCHEDULED", winner, False,
+                utc - timedelta(minutes=5) if past else None,
+                utc if past else None,
+                utc + timedelta(minutes=1) if past else None,
+                utc - timedelta(days=1), utc if past else self.now,
+            ))
+            draws.append((draw_id, local, winner))
+            if not selling:
+                continue
+            if hot:
+                self.hot[game["id"]] = len(draws) - 1
+                if self.spec.hot_draw_bets:
+                    bets = 0
+                    while bets < self.spec.hot_draw_bets:
+                        bets += await self.ticket(game, draw_id, utc, winner, popularity, amounts, plays)
+                    continue
+
+            factor = HOUR_PROFILE[index % len(HOUR_PROFILE)] * GAME_TYPE_FACTOR.get(game["type"], 1.0)
+            if day.weekday() >= 5:
+                factor *= WEEKEND_FACTOR
+            count = round(self.spec.tickets_per_draw * factor * rng.lognormvariate(0, 0.25))
+            for _ in range(count):
+                await self.ticket(game, draw_id, utc, winner, popularity, amounts, plays)
+
+    async def ticket(self, game, draw_id, draw_utc, winner, popularity, amounts, plays):
+        rng = self.rng
+        ticket_id = self.new_id()
+        created = draw_utc - timedelta(minutes=5, seconds=rng.uniform(0, 3600))
+        picks = {item: multiplier for item, multiplier in
+                 rng.choices(popularity[0], cum_weights=popularity[1], k=rng.choices(*plays)[0])}
+        details = []
+        total = total_prize = 0
+        for item_id, multiplier in picks.items():
+            amount = rng.choices(*amounts)[0]
+            total += amount
+            if winner is None:
+                prize, status = 0, "ACTIVE"
+            elif item_id == winner:
+                prize, status = amount * multiplier, "WON"
+            else:
+                prize, status = 0, "LOST"
+            total_prize += prize
+            details.append((
+                self.new_id(), ticket_id, item_id, draw_id, _money(amount), multiplier,
+                _money(prize), status, created,
+            ))
+
+        if rng.random() < self.spec.online_share:
+            user_id, source, external_id, provider_data = rng.choice(self.players), "TAQUILLA_ONLINE", None, None
+        else:
+            self.external_ticket_id += 1
+            taquilla = self.taquillas[rng.choices(*self.taquilla_weights)[0]]
+            user_id, source, external_id = None, "EXTERNAL_API", str(self.external_ticket_id)
+            provider_data = json.dumps({"ticketID": external_id, **taquilla})
+        status = "ACTIVE" if winner is None else ("WON" if total_prize else "LOST")
+        await self.copy.add("Ticket", (
+            ticket_id, user_id, draw_id, source, external_id, _money(total), _money(total_prize),
+            status, provider_data, created, created if winner is None else draw_utc,
+        ))
+        for detail in details:
+            await self.copy.add("TicketDetail", detail)
+        return len(details)
+
+    # -- Tripletas -----------------------------------------------------------------
+
+    async def tripletas(self):
+        rng = self.rng
+        games = [g for g in self.games if g["type"] != "TRIPLE" and len(g["items"]) >= 3]
+        if not games or not self.players:
+            return
+        amounts = _weights(*TRIPLETA_AMOUNTS)
+        for n in range(self.spec.tripletas + self.spec.hot_tripletas):
+            game = rng.choice(games)
+            draws = self.draws[game["id"]]
+            draws_count = int(game["tripleta"].get("drawsCount") or TRIPLETA_DRAWS)
+            multiplier = _money(game["tripleta"].get("multiplier") or TRIPLETA_MULTIPLIER)
+            if len(draws) < draws_count:
+                continue
+            # drawsCount consecutive draws of the game, as tripleta.service.js assigns them
+            hot = self.hot.get(game["id"])
+            if n >= self.spec.tripletas and hot is not None:
+                start = rng.randint(max(0, hot - draws_count + 1), min(hot, len(draws) - draws_count))
+            else:
+                start = rng.randrange(len(draws) - draws_count + 1)
+            window = draws[start:start + draws_count]
+            items = [item for item, _ in rng.sample(game["items"], 3)]
+            status, winner_draw, prize = "ACTIVE", None, 0
+            seen = set()
+            for draw_id, _local, winner in window:
+                if winner is None:
+                    break
+                seen.add(winner)
+                if seen.issuperset(items):
+                    status, winner_draw = "WON", draw_id
+                    break
+            else:
+                status = "EXPIRED"
+            amount = rng.choices(*amounts)[0]
+            if status == "WON":
+                prize = amount * multiplier
+            start_utc = window[0][1] + CARACAS_OFFSET
+            created = start_utc - timedelta(minutes=5, seconds=rng.uniform(0, 3600))
+            await self.copy.add("TripleBet", (
+                self.new_id(), rng.choice(self.players), game["id"], *items, _money(amount), multiplier,
+                draws_count, window[0][0], window[-1][0], winner_draw, _money(prize), status,
+                # tripleta.service.js stores the last draw's wall-clock time as if it were UTC
+                window[-1][1], created, created,
+            ))
+
+
+async def load_dataset(url, spec, defer_indexes=True):
+    """Generate ``spec`` into the database at ``url``, which must hold the seeded games."""
+    import asyncpg
+
+    conn = await asyncpg.connect(driver_url(url))
+    try:
+        await conn.execute("SET synchronous_commit = off")
+        games = await _games(conn)
+        end = date.fromisoformat(spec.end_date)
+        existing = await conn.fetchval(
+            'SELECT count(*) FROM "Draw" WHERE "drawDate" BETWEEN $1 AND $2',
+            end - timedelta(days=spec.days - 1), end + timedelta(days=spec.days_ahead),
+        )
+        if existing:
+            raise RuntimeError(f"{existing} draws already exist in the dataset's date range; "
+                               "load into a fresh database or use the template")
+
+        copier = _Copier(conn)
+        # One transaction, so a failed load also rolls back the dropped indexes
+        async with conn.transaction():
+            started = time.perf_counter()
+            indexes = await _defer_indexes(conn) if defer_indexes else []
+            await _Generator(spec, games, copier).run()
+            loaded = time.perf_counter()
+            for definition in indexes:
+                await conn.execute(definition)
+            indexed = time.perf_counter()
+        await conn.execute("ANALYZE")
+        done = time.perf_counter()
+    finally:
+        await conn.close()
+
+    tables = copier.stats()
+    rows = sum(t["rows"] for t in tables.values())
+    return {
+        "spec": asdict(spec),
+        "games": [g["slug"] for g in games],
+        "rows": rows,
+        "tables": tables,
+        "load_s": round(loaded - started, 2),
+        "rows_per_s": round(rows / (loaded - started)),
+        "index_s": round(indexed - loaded, 2),
+        "indexes_rebuilt": len(indexes),
+        "analyze_s": round(done - indexed, 2),
+    }
+
+
+async def hot_draws(url, spec, slugs=None):
+    """``{slug: draw id}`` of each game's next draw to close in ``spec``'s dataset at ``url``
+    (the one ``hot_draw_bets`` / ``hot_tripletas`` load)."""
+    import asyncpg
+
+    conn = await asyncpg.connect(driver_url(url))
+    try:
+        rows = await conn.fetch(
+            'SELECT DISTINCT ON (d."gameId") d.id, g.slug FROM "Draw" d JOIN "Game" g ON g.id = d."gameId" '
+            'WHERE d."drawDate" = $1 AND d."drawTime" >= $2 AND d.status = \'SCHEDULED\' '
+            'ORDER BY d."gameId", d."drawTime"',
+            date.fromisoformat(spec.end_date), spec.open_from,
+        )
+    finally:
+        await conn.close()
+    return {row["slug"]: row["id"] for row in rows if not slugs or row["slug"] in slugs}
+
+
+class DatasetTemplate(TemplateDatabase):
+    """A template holding the seeded games plus the dataset of ``spec``.
+
+    Named ``tote_template_ds<spec>_<end date>_<base template>``, with the spec
+    digest taken without ``end_date``: a new spec gets its own template, and a
+    schema or seed change or a new end date (the default is today) replaces it.
+    """
+
+    def __init__(self, spec, base=None):
+        self.spec = spec
+        self.base = base or TemplateDatabase(seeds=SEEDS)
+        self.report = None
+        self.family = f"{TEMPLATE_PREFIX}ds{spec.digest(exclude=('end_date',))}"
+        name = f"{self.family}_{spec.end_date.replace('-', '')}_{self.base.name.rsplit('_', 1)[1]}"
+        super().__init__(name=name, seeds=self.base.seeds)
+
+    async def ensure(self, rebuild=False):
+        await self.base.ensure()
+        return await super().ensure(rebuild)
+
+    async def _create(self, conn):
+        await conn.execute(f"CREATE DATABASE {quote_ident(self.name)} TEMPLATE {quote_ident(self.base.name)}")
+        self.report = await load_dataset(self.url, self.spec)
+
+    async def _drop_stale(self, conn):
+        """Drop the templates of this spec for other end dates or base templates."""
+        names = await conn.fetch(
+            "SELECT datname FROM pg_database WHERE datname LIKE $1 AND datname <> $2",
+            self.family + "\\_%", self.name,
+        )
+        for row in names:
+            await self._drop(conn, row["datname"])
+
+
+def add_spec_args(parser):
+    defaults = DatasetSpec()
+    for name, value in asdict(defaults).items():
+        if name in ("draw_times", "end_date"):
+            continue
+        parser.add_argument(f"--{name.replace('_', '-')}", type=type(value), default=value)
+    parser.add_argument("--end-date", default=None, help="Last selling day, YYYY-MM-DD (default: today in Caracas)")
+    parser.add_argument("--draw-times", default=None, help="Comma-separated HH:MM:SS (default: hourly 08-19)")
+
+
+def spec_from_args(args):
+    spec = DatasetSpec(**{
+        name: getattr(args, name) for name in asdict(DatasetSpec())
+        if name not in ("draw_times", "end_date")
+    })
+    if args.end_date:
+        spec = replace(spec, end_date=args.end_date)
+    if args.draw_times:
+        spec = replace(spec, draw_times=tuple(sorted(args.draw_times.split(","))))
+    return spec
+
+
+def print_report(report):
+    print(f"{report['rows']:,} rows in {report['load_s']} s ({report['rows_per_s']:,} rows/s), "
+          f"indexes {report['index_s']} s, analyze {report['analyze_s']} s")
+    for table, stats in report["tables"].items():
+        print(f"  {table:<18} {stats['rows']:>12,}  {stats['rows_per_s'] or '-':>10} rows/s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Seeded synthetic betting dataset")
+    add_spec_args(parser)
+    parser.add_argument("--database-url", help="Load into this database instead of building a template")
+    parser.add_argument("--keep-indexes", action="store_true", help="Load with the secondary indexes in place")
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild the template even if it exists")
+    parser.add_argument("-o", "--output", default=str(DEFAULT_REPORT))
+    args = parser.parse_args(argv)
+    spec = spec_from_args(args)
+
+    if args.database_url:
+        report = asyncio.run(load_dataset(args.database_url, spec, defer_indexes=not args.keep_indexes))
+    else:
+        template = asyncio.run(DatasetTemplate(spec).ensure(rebuild=args.rebuild))
+        if template.report is None:
+            print(f"Template {template.name} is up to date")
+            return 0
+        report = {**template.report, "template": template.name}
+        print(f"Template {template.name}")
+
+    print_report(report)
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, default=str))
+    print(f"→ {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
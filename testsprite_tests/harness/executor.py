@@ -0,0 +1,351 @@
+"""Data-driven executor for ``testsprite_frontend_test_plan.json``.
+
+Each plan entry carries, next to its prose ``steps``, the machine-readable
+``script`` the TC scripts used to hard-code::
+
+    {"id": "TC005", "session": "admin", "start": "/admin",
+     "failure": "Test plan execution failed: ...",
+     "script": [
+       {"click": "xpath=html/body/div/div/div/nav/a[3]", "label": "Juegos"},
+       {"fill": "xpath=...form/div/input", "value": "Triple Nuevo"},
+       {"click": "xpath=...form/div[7]/button[2]", "response": "/api/games", "method": "POST"},
+       {"visible": "text=Triple Nuevo", "timeout": 30000}
+     ]}
+
+The plan is loaded and compiled once per process: every script entry becomes a
+bound coroutine function, so adding a scenario only adds JSON. Locators are
+cached per page, so a selector is resolved once per test (every test opens its
+own context), and the compiled tests run concurrently over one warm
+:class:`~harness.pool.BrowserPool`.
+
+    cd testsprite_tests
+    python -m harness.executor -c 4
+    python -m harness.executor TC005 TC006
+    python -m harness.runner --compiled -j 4     # same tests, across processes
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+import weakref
+from dataclasses import dataclass, field
+from pathlib import Path
+from unittest import SkipTest
+
+from harness.config import ARTIFACTS_DIR, FRONTEND_URL, SUITE_DIR
+
+DEFAULT_PLAN = SUITE_DIR / "testsprite_frontend_test_plan.json"
+DEFAULT_RESULTS = ARTIFACTS_DIR / "executor-results.json"
+
+# Script keys that name the operation of an entry, in lookup order
+OPS = {}
+
+
+def op(name, assertion=False):
+    """Register a compiler for script entries keyed by ``name``."""
+    def register(compile_entry):
+        OPS[name] = (compile_entry, assertion)
+        return compile_entry
+    return register
+
+
+class LocatorCache:
+    """Resolved locators, per page, reused within one test.
+
+    A Playwright locator is bound to its page, and each test gets a fresh
+    context, so entries only live as long as the test's pages do.
+    """
+
+    def __init__(self):
+        self._pages = weakref.WeakKeyDictionary()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, page, selector):
+        locators = self._pages.setdefault(page, {})
+        locator = locators.get(selector)
+        if locator is None:
+            self.misses += 1
+            locator = locators[selector] = page.locator(selector).first
+        else:
+            self.hits += 1
+        return locator
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses}
+
+
+LOCATORS = LocatorCache()
+
+
+@dataclass
+class Run:
+    """State shared by the actions of one test while it runs."""
+
+    test_id: str
+    context: object
+    page: object
+    steps: object
+    probe: object = None
+
+    def locator(self, selector):
+        # The TC scripts always acted on the most recently opened page
+        return LOCATORS.get(self.context.pages[-1], selector)
+
+    def realtime_probe(self):
+        from harness.realtime import RealtimeProbe
+
+        if self.probe is None:
+            self.probe = RealtimeProbe(self.test_id)
+        return self.probe
+
+
+# -- Operations ------------------------------------------------------------------
+
+
+@op("fill")
+def _fill(entry):
+    selector, value, label = entry["fill"], entry["value"], entry.get("label")
+
+    async def action(run):
+        await run.steps.fill(run.locator(selector), value, label=label, timeout=entry.get("timeout"))
+    return action
+
+
+@op("click")
+def _click(entry):
+    selector, label = entry["click"], entry.get("label")
+
+    async def action(run):
+        await run.steps.click(
+            run.locator(selector), label=label, timeout=entry.get("timeout"),
+            response=entry.get("response"), method=entry.get("method"),
+        )
+    return action
+
+
+@op("scroll")
+def _scroll(entry):
+    async def action(run):
+        page = run.context.pages[-1]
+        await run.steps.record(
+            "scroll", entry.get("label", "scroll"),
+            page.mouse.wheel(0, await page.evaluate("() => window.innerHeight")),
+        )
+    return action
+
+
+@op("visible", assertion=True)
+def _visible(entry):
+    from playwright.async_api import expect
+
+    selector, timeout = entry["visible"], entry.get("timeout", 30000)
+
+    async def action(run):
+        await run.steps.record(
+            "assertion", selector,
+            expect(run.locator(selector)).to_be_visible(timeout=timeout),
+        )
+    return action
+
+
+@op("draw_events", assertion=True)
+def _draw_events(entry):
+    """The next draw's cron-driven close/execute broadcasts arrive within the budget."""
+    async def action(run):
+        from harness.realtime import next_measurable_draw
+
+        probe = run.realtime_probe()
+        await probe.connect()
+        draw = await next_measurable_draw()
+        if draw is None:
+            raise SkipTest("No scheduled draw closes and executes within the test's timeout")
+        await run.steps.record("socket", "draw:closed", probe.expect_draw_phase(draw, "close"))
+        await run.steps.record("socket", "draw:executed", probe.expect_draw_phase(draw, "execute"))
+        probe.assert_within_budget()
+    return action
+
+
+@op("reconnect", assertion=True)
+def _reconnect(entry):
+    """Drop the page's Socket.IO connection server-side and time how long it takes to reconnect."""
+    label = entry.get("label", "Socket.IO reconnection")
+
+    async def action(run):
+        from harness.realtime import LATENCY_BUDGET_S, SocketCut
+        from harness.waits import RESPONSE_TIMEOUT
+
+        # The route only sees connections opened after it is installed
+        cut = SocketCut()
+        await cut.install(run.context)
+        page = run.context.pages[-1]
+        await run.steps.record("navigate", "reload", page.reload(wait_until="domcontentloaded", timeout=RESPONSE_TIMEOUT))
+        await run.steps.record("socket", "Initial Socket.IO connection", cut.wait_connected())
+        await run.steps.record("socket", "Socket.IO connection dropped", cut.cut())
+        restored = cut.restore()
+        try:
+            await run.steps.record("socket", label, cut.wait_connected(since=restored, timeout=LATENCY_BUDGET_S))
+        except asyncio.TimeoutError:
+            raise AssertionError(f"{label}: no reconnection within {LATENCY_BUDGET_S:.0f}s") from None
+    return action
+
+
+# -- Compilation -----------------------------------------------------------------
+
+
+@dataclass
+class CompiledTest:
+    test_id: str
+    title: str
+    session: str
+    start: str
+    failure: str = None
+    actions: list = field(default_factory=list)
+
+    async def __call__(self, browser):
+        """Run the test in a fresh context of ``browser`` (a browser or a pool lease)."""
+        from harness.session import new_admin_context
+        from harness.waits import RESPONSE_TIMEOUT, Steps
+
+        context = run = None
+        try:
+            if self.session == "admin":
+                context = await new_admin_context(browser)
+            else:
+                context = await browser.new_context()
+            context.set_default_timeout(5000)
+            page = await context.new_page()
+            run = Run(self.test_id, context, page, Steps(page, self.test_id))
+
+            url = FRONTEND_URL + self.start
+            await run.steps.record(
+                "navigate", url,
+                page.goto(url, wait_until="domcontentloaded", timeout=RESPONSE_TIMEOUT),
+            )
+            for action, assertion in self.actions:
+                try:
+                    await action(run)
+                except AssertionError as e:
+                    if assertion and self.failure:
+                        raise AssertionError(self.failure) from e
+                    raise
+        finally:
+            if run and run.probe:
+                await run.probe.close()
+                run.probe.write_report()
+            if run:
+                await run.steps.write_trace()
+            if context:
+                await context.close()
+
+
+def compile_entry(entry):
+    """Compile one script entry into ``(action, is_assertion)``."""
+    for name, (compiler, assertion) in OPS.items():
+        if name in entry:
+            return compiler(entry), assertion
+    raise ValueError(f"Unknown script entry {entry!r}")
+
+
+def compile_test(spec):
+    try:
+        actions = [compile_entry(entry) for entry in spec["script"]]
+    except ValueError as e:
+        raise ValueError(f"{spec['id']}: {e}") from None
+    return CompiledTest(
+        test_id=spec["id"],
+        title=spec.get("title", ""),
+        session=spec.get("session", "admin"),
+        start=spec.get("start", "/"),
+        failure=spec.get("failure"),
+        actions=actions,
+    )
+
+
+_COMPILED = {}
+
+
+def compile_plan(plan=DEFAULT_PLAN):
+    """Return ``{test_id: CompiledTest}`` for every plan entry with a ``script``.
+
+    Compiled once per process and plan file.
+    """
+    key = str(Path(plan).resolve())
+    if key not in _COMPILED:
+        with open(plan) as f:
+            specs = json.load(f)
+        _COMPILED[key] = {spec["id"]: compile_test(spec) for spec in specs if "script" in spec}
+    return _COMPILED[key]
+
+
+def select(compiled, only=None):
+    return [test for test_id, test in sorted(compiled.items()) if not only or test_id in only]
+
+
+# -- In-process scheduling -------------------------------------------------------
+
+
+async def run_compiled(tests, concurrency, timeout=300, headless=True, browsers=1):
+    """Run ``tests`` concurrently over one warm browser pool in this process."""
+    from playwright.async_api import async_playwright
+
+    from harness.pool import BrowserPool
+    from harness.runner import run_one
+    from harness.session import prepare_storage_state
+
+    await prepare_storage_state(headless=headless)
+    pending = asyncio.Queue()
+    for test in tests:
+        pending.put_nowait(test)
+    results = []
+
+    async def consume(pool):
+        while not pending.empty():
+            test = pending.get_nowait()
+            async with pool.lease() as browser:
+                result = await run_one(browser, test.test_id, None, timeout, run_test=test)
+            results.append(result)
+            icon = {"passed": "✅", "skipped": "⏭️ "}.get(result["status"], "❌")
+            print(f"{icon} {result['id']} {result['status']} ({result['duration_s']}s)")
+
+    slots = max(1, -(-concurrency // browsers))
+    async with async_playwright() as pw:
+        async with BrowserPool(pw, size=browsers, slots=slots, headless=headless) as pool:
+            await asyncio.gather(*(consume(pool) for _ in range(concurrency)))
+            pool_stats = pool.stats()
+    return sorted(results, key=lambda r: r["id"]), pool_stats
+
+
+def main(argv=None):
+    from harness.runner import write_results
+
+    parser = argparse.ArgumentParser(description="Run the JSON test plan without the TC scripts")
+    parser.add_argument("tests", nargs="*", help="Test ids (TC005) to run")
+    parser.add_argument("--plan", default=str(DEFAULT_PLAN))
+    parser.add_argument("-c", "--concurrency", type=int, default=4, help="Tests running at once")
+    parser.add_argument("--browsers", type=int, default=1, help="Warm browsers shared by the tests")
+    parser.add_argument("--timeout", type=float, default=300, help="Per-test timeout in seconds")
+    parser.add_argument("-o", "--output", default=str(DEFAULT_RESULTS), help="Results JSON path")
+    parser.add_argument("--headed", action="store_true")
+    args = parser.parse_args(argv)
+
+    tests = select(compile_plan(args.plan), set(args.tests))
+    if not tests:
+        print("No tests selected", file=sys.stderr)
+        return 1
+
+    started = time.time()
+    results, pool_stats = asyncio.run(run_compiled(
+        tests, args.concurrency, args.timeout, headless=not args.headed, browsers=args.browsers,
+    ))
+    pool_stats["locators"] = LOCATORS.stats()
+    summary = write_results(results, Path(args.output), time.time() - started, 1, {0: pool_stats})
+
+    print(f"\n{summary['passed']} passed, {summary['failed']} failed, {summary['error']} errors, "
+          f"{summary['skipped']} skipped in {time.time() - started:.1f}s → {args.output}")
+    return 0 if summary["failed"] == summary["error"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
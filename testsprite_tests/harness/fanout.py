@@ -0,0 +1,410 @@
+"""Socket.IO fan-out benchmark for the draw events.
+
+Starts ``backend/src/scripts/socket-fanout-server.js`` (the backend's own
+``lib/socket.js`` on a bare HTTP server), opens thousands of async Socket.IO
+clients spread over the ``game:<slug>`` rooms, and has the server emit draw
+events the way ``execute-draw.job.js`` does: one ``emitToAll`` plus one
+``emitToGame`` per draw. Every client timestamps what it receives against the
+``sentAt`` stamped by the server.
+
+Clients are opened in steps (``--clients 500,1000,2000,5000``) and spread
+over ``--shards`` processes so the Python side is not the bottleneck. Each
+step reports delivery latency percentiles for the broadcast and the room
+event, events that never arrived, and the server's CPU, RSS and event-loop
+delay. The ceiling is the last step with no missed events and a p95 within
+``--budget-ms``.
+
+    cd testsprite_tests
+    python -m harness.fanout --clients 1000,2000,5000 --shards 4
+    python -m harness.fanout --clients 10000 --events 50 --interval 0.2
+
+Thousands of sockets need a high open-file limit (``ulimit -n``) for this
+process and the server; the soft limit is raised to the hard one on start.
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import sys
+import time
+from pathlib import Path
+
+from harness.config import ARTIFACTS_DIR
+from harness.database import BACKEND_DIR
+from harness.stats import distribution
+
+DEFAULT_REPORT = ARTIFACTS_DIR / "fanout.json"
+
+DRIVER = "src/scripts/socket-fanout-server.js"
+
+# Slugs seeded by create-games.js; rooms need no game behind them
+DEFAULT_GAMES = ["lotoanimalito", "lottopantera", "triple-pantera"]
+
+# Connections opened at once per shard
+CONNECT_CONCURRENCY = 100
+
+
+def raise_fd_limit():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+# -- Server ----------------------------------------------------------------------
+
+
+class FanoutServer:
+    """The Node fan-out server, driven over stdin/stdout."""
+
+    def __init__(self, port, startup_timeout=30):
+        self.port = port
+        self.url = f"http://localhost:{port}"
+        self.startup_timeout = startup_timeout
+        self.process = None
+        self.emitted = []
+        self._stats = asyncio.Queue()
+        self._ready = None
+        self._reader = None
+
+    async def __aenter__(self):
+        self._ready = asyncio.get_running_loop().create_future()
+        self.process = await asyncio.create_subprocess_exec(
+            "node", DRIVER, "--port", str(self.port), cwd=BACKEND_DIR,
+            stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        self._reader = asyncio.create_task(self._read())
+        try:
+            await asyncio.wait_for(self._ready, self.startup_timeout)
+        except asyncio.TimeoutError:
+            await self.__aexit__()
+            raise RuntimeError(f"Fan-out server on port {self.port} did not start") from None
+        return self
+
+    async def __aexit__(self, *exc):
+        if self.process and self.process.returncode is None:
+            self.process.stdin.close()
+            try:
+                await asyncio.wait_for(self.process.wait(), 10)
+            except asyncio.TimeoutError:
+                self.process.kill()
+        if self._reader:
+            self._reader.cancel()
+
+    async def _read(self):
+        async for raw in self.process.stdout:
+            line = raw.decode(errors="replace").strip()
+            if not line.startswith("FANOUT "):
+                continue
+            record = json.loads(line[7:])
+            if record["type"] == "ready" and not self._ready.done():
+                self._ready.set_result(record)
+            elif record["type"] == "emitted":
+                self.emitted.append(record)
+            elif record["type"] == "stats":
+                self._stats.put_nowait(record)
+            elif record["type"] == "error":
+                print(f"⚠️  fan-out server: {record['error']}", file=sys.stderr)
+        if not self._ready.done():
+            self._ready.set_exception(RuntimeError("Fan-out server exited before it was ready"))
+
+    async def _send(self, command):
+        self.process.stdin.write((json.dumps(command) + "\n").encode())
+        await self.process.stdin.drain()
+
+    async def emit_draw(self, seq, game):
+        await self._send({"op": "emit", "seq": seq, "game": game})
+
+    async def stats(self):
+        """Server CPU/RSS/event-loop delay since the previous call."""
+        await self._send({"op": "stats"})
+        return await asyncio.wait_for(self._stats.get(), 30)
+
+
+# -- Client shards ---------------------------------------------------------------
+
+
+def _shard(url, conn, options):
+    """Process entry point: serve grow/collect/close commands from ``conn``."""
+    raise_fd_limit()
+    asyncio.run(_ShardClients(url, **options).serve(conn))
+
+
+class _ShardClients:
+    def __init__(self, url, reconnect=False, rejoin=True):
+        self.url = url
+        self.reconnect = reconnect
+        self.rejoin = rejoin
+        self.clients = []
+        self.received = []
+        self.transitions = []
+        self.disconnects = 0
+
+    def _new_client(self, index, slug):
+        import socketio
+
+        # socket.io-client's defaults, as used by the frontend: 1-5 s backoff, 0.5 jitter
+        client = socketio.AsyncClient(reconnection=self.reconnect)
+        state = {"joined": False}
+
+        async def on_connect():
+            self.transitions.append((index, "connect", time.time()))
+            if self.rejoin or not state["joined"]:
+                state["joined"] = True
+                await client.emit("join:game", slug)
+
+        async def on_draw(data):
+            # The broadcast carries the game, the room event does not
+            kind = "all" if "game" in data else "room"
+            self.received.append((index, data["drawId"], kind, time.time() * 1000 - data["sentAt"]))
+
+        async def on_disconnect():
+            self.disconnects += 1
+            self.transitions.append((index, "disconnect", time.time()))
+
+        client.on("connect", on_connect)
+        client.on("draw:executed", on_draw)
+        client.on("disconnect", on_disconnect)
+        return client
+
+    async def grow(self, clients):
+        gate = asyncio.Semaphore(CONNECT_CONCURRENCY)
+
+        async def open_one(index, slug):
+            async with gate:
+                client = self._new_client(index, slug)
+                started = time.perf_counter()
+                try:
+                    await client.connect(self.url, transports=["websocket"], wait_timeout=30)
+                except Exception:
+                    return None
+                self.clients.append(client)
+                return (time.perf_counter() - started) * 1000
+
+        timings = await asyncio.gather(*(open_one(index, slug) for index, slug in clients))
+        return {
+            "connected": [index for (index, _), t in zip(clients, timings) if t is not None],
+            "failed": sum(1 for t in timings if t is None),
+            "connect_ms": [t for t in timings if t is not None],
+        }
+
+    async def serve(self, conn):
+        while True:
+            command, arg = await asyncio.to_thread(conn.recv)
+            if command == "grow":
+                conn.send(await self.grow(arg))
+            elif command == "collect":
+                conn.send({
+                    "received": self.received,
+                    "transitions": self.transitions,
+                    "disconnects": self.disconnects,
+                })
+                self.received, self.transitions, self.disconnects = [], [], 0
+            elif command == "close":
+                await asyncio.gather(*(c.disconnect() for c in self.clients), return_exceptions=True)
+                conn.send(None)
+                return
+
+
+class ClientShards:
+    """``count`` processes holding the benchmark's Socket.IO clients.
+
+    With ``reconnect`` the clients reconnect like the frontend's, and with
+    ``rejoin`` they join their room again on every reconnect.
+    """
+
+    def __init__(self, url, count, reconnect=False, rejoin=True):
+        self.url = url
+        self.count = count
+        self.options = {"reconnect": reconnect, "rejoin": rejoin}
+        self.pipes = []
+        self.processes = []
+        self.slugs = {}  # client index -> slug of the room it joined
+
+    def __enter__(self):
+        context = multiprocessing.get_context("spawn")
+        for _ in range(self.count):
+            parent, child = context.Pipe()
+            process = context.Process(target=_shard, args=(self.url, child, self.options), daemon=True)
+            process.start()
+            self.pipes.append(parent)
+            self.processes.append(process)
+        return self
+
+    def __exit__(self, *exc):
+        for pipe in self.pipes:
+            try:
+                pipe.send(("close", None))
+                pipe.recv()
+            except (EOFError, OSError):
+                pass
+        for process in self.processes:
+            process.join(10)
+            if process.is_alive():
+                process.kill()
+
+    async def _ask(self, commands):
+        def ask(pipe, command):
+            pipe.send(command)
+            return pipe.recv()
+
+        return await asyncio.gather(*(
+            asyncio.to_thread(ask, pipe, command) for pipe, command in zip(self.pipes, commands)
+        ))
+
+    @property
+    def total(self):
+        return len(self.slugs)
+
+    @property
+    def rooms(self):
+        """Clients joined per game slug."""
+        rooms = {}
+        for slug in self.slugs.values():
+            rooms[slug] = rooms.get(slug, 0) + 1
+        return rooms
+
+    async def grow_to(self, total, games):
+        """Open clients until ``total`` are connected, round-robin over ``games``."""
+        start = len(self.slugs) and max(self.slugs) + 1
+        clients = [(index, games[index % len(games)]) for index in range(start, start + total - self.total)]
+        replies = await self._ask([("grow", clients[shard::self.count]) for shard in range(self.count)])
+        assigned = dict(clients)
+        for reply in replies:
+            for index in reply["connected"]:
+                self.slugs[index] = assigned[index]
+        return {
+            "connected": sum(len(r["connected"]) for r in replies),
+            "failed": sum(r["failed"] for r in replies),
+            "connect_ms": [t for r in replies for t in r["connect_ms"]],
+        }
+
+    async def collect(self):
+        """``{"received", "transitions", "disconnects"}`` since the previous call."""
+        replies = await self._ask([("collect", None)] * self.count)
+        return {
+            "received": [item for r in replies for item in r["received"]],
+            "transitions": sorted((item for r in replies for item in r["transitions"]), key=lambda t: t[2]),
+            "disconnects": sum(r["disconnects"] for r in replies),
+        }
+
+
+# -- Benchmark -------------------------------------------------------------------
+
+
+def summarize_step(clients, emitted, received, rooms, budget_ms):
+    """Latency and missed deliveries of one step's events."""
+    latencies = {"all": [], "room": []}
+    counts = {}
+    for _client, draw_id, kind, latency in received:
+        latencies[kind].append(latency)
+        counts[(draw_id, kind)] = counts.get((draw_id, kind), 0) + 1
+    missed = {"all": 0, "room": 0}
+    for event in emitted:
+        draw_id = f"fanout-{event['seq']}"
+        missed["all"] += max(0, clients - counts.get((draw_id, "all"), 0))
+        missed["room"] += max(0, rooms.get(event["game"], 0) - counts.get((draw_id, "room"), 0))
+    latency = {kind: distribution(values) for kind, values in latencies.items()}
+    worst_p95 = max((d.get("p95", 0) for d in latency.values()), default=0)
+    return {
+        "latency_ms": latency,
+        "missed": missed,
+        "emit_ms": distribution([e["emit_ms"] for e in emitted], digits=2),
+        "within_budget": not any(missed.values()) and worst_p95 <= budget_ms,
+    }
+
+
+async def run(args):
+    steps = []
+    async with FanoutServer(args.port) as server:
+        with ClientShards(server.url, args.shards) as shards:
+            seq = 0
+            for target in args.clients:
+                grown = await shards.grow_to(target, args.games)
+                await asyncio.sleep(args.settle)  # let the join:game messages land
+                await shards.collect()
+                await server.stats()
+                first_emitted = len(server.emitted)
+
+                for _ in range(args.events):
+                    seq += 1
+                    await server.emit_draw(seq, args.games[seq % len(args.games)])
+                    await asyncio.sleep(args.interval)
+                await asyncio.sleep(args.drain)
+
+                server_stats = await server.stats()
+                collected = await shards.collect()
+                step = {
+                    "clients": shards.total,
+                    "target": target,
+                    "connect_failed": grown["failed"],
+                    "connect_ms": distribution(grown["connect_ms"]),
+                    "disconnects": collected["disconnects"],
+                    "events": args.events,
+                    **summarize_step(shards.total, server.emitted[first_emitted:], collected["received"],
+                                     shards.rooms, args.budget_ms),
+                    "server": server_stats,
+                }
+                steps.append(step)
+                print_step(step)
+    passing = [s["clients"] for s in steps if s["within_budget"]]
+    first_failing = next((s["clients"] for s in steps if not s["within_budget"]), None)
+    ceiling = max((n for n in passing if first_failing is None or n < first_failing), default=None)
+    return {
+        "games": args.games,
+        "shards": args.shards,
+        "budget_ms": args.budget_ms,
+        "ceiling_clients": ceiling,
+        "steps": steps,
+    }
+
+
+def print_step(step):
+    latency, server = step["latency_ms"], step["server"]
+    icon = "✅" if step["within_budget"] else "❌"
+    print(f"{icon} {step['clients']:>6} clients  "
+          f"all p50/p95/p99 {latency['all'].get('p50', '-')}/{latency['all'].get('p95', '-')}/"
+          f"{latency['all'].get('p99', '-')} ms  "
+          f"room p95 {latency['room'].get('p95', '-')} ms  "
+          f"missed {step['missed']['all']}+{step['missed']['room']}  "
+          f"cpu {server['cpu_pct']}%  rss {server['rss_mb']} MB  "
+          f"loop p99 {server['loop_delay_p99_ms']} ms")
+
+
+def _counts(value):
+    return sorted(int(n) for n in value.split(","))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Socket.IO fan-out benchmark for draw events")
+    parser.add_argument("--clients", type=_counts, default=[500, 1000, 2000, 5000],
+                        help="Comma-separated client counts, opened in steps")
+    parser.add_argument("--games", type=lambda v: v.split(","), default=DEFAULT_GAMES,
+                        help="Comma-separated game slugs whose rooms the clients join")
+    parser.add_argument("--shards", type=int, default=max(1, min(8, (os.cpu_count() or 2) // 2)),
+                        help="Client processes")
+    parser.add_argument("--events", type=int, default=20, help="Draw events per step")
+    parser.add_argument("--interval", type=float, default=0.5, help="Seconds between events")
+    parser.add_argument("--settle", type=float, default=2, help="Seconds after connecting before emitting")
+    parser.add_argument("--drain", type=float, default=5, help="Seconds to wait for late deliveries")
+    parser.add_argument("--budget-ms", type=float, default=1000, help="p95 delivery latency budget")
+    parser.add_argument("--port", type=int, default=3198, help="Port of the fan-out server")
+    parser.add_argument("-o", "--output", default=str(DEFAULT_REPORT))
+    args = parser.parse_args(argv)
+
+    raise_fd_limit()
+    report = asyncio.run(run(args))
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"Ceiling: {report['ceiling_clients'] or 'none'} clients within {args.budget_ms:.0f} ms p95 → {output}")
+    return 0 if report["ceiling_clients"] == report["steps"][-1]["clients"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
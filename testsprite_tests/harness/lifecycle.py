@@ -0,0 +1,285 @@
+"""Load generator for the daily draw lifecycle (TC019 at scale).
+
+Builds an isolated database clone and backend (:mod:`harness.database`),
+creates games and ``DrawTemplate`` s through the API until the day holds
+``--draws`` draws, then starts ``backend/src/scripts/load-draw-lifecycle.js``.
+That driver runs the real generate/close/execute jobs under a compressed clock
+(``--speed`` virtual minutes per real minute) and reports every cron tick;
+meanwhile this tool polls ``GET /api/public/draws/today`` to see each draw move
+SCHEDULED → CLOSED → DRAWN/PUBLISHED.
+
+The report (``.artifacts/lifecycle.json``) gives draws processed per virtual
+and real minute, tick lateness and duration per job, Prisma time per phase,
+draws the ticks missed, and the first virtual minute at which a tick ran
+later than the tick interval, i.e. where the per-minute cron stops keeping up.
+
+    cd testsprite_tests
+    python -m harness.lifecycle --draws 150 --speed 60
+    python -m harness.lifecycle --draws 2000 --games 20 --speed 120 --from 08:00 --to 12:00
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import sys
+import time
+import uuid
+from pathlib import Path
+
+from harness.config import ARTIFACTS_DIR
+from harness.database import BACKEND_DIR, SEEDS, BackendServer, TemplateDatabase
+from harness.stats import distribution
+
+DEFAULT_REPORT = ARTIFACTS_DIR / "lifecycle.json"
+
+DRIVER = "src/scripts/load-draw-lifecycle.js"
+
+# close-draw.job.js acts 5 minutes before drawTime
+CLOSE_LEAD_MIN = 5
+
+
+def _minutes(hhmm):
+    hours, minutes = hhmm.split(":")[:2]
+    return int(hours) * 60 + int(minutes)
+
+
+def _hhmm(minutes):
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def plan_draw_times(total, games, start, end, templates_per_game=1):
+    """Spread ``total`` draw times over ``[start, end]`` across games.
+
+    Returns ``{game_index: [[times of template 0], [times of template 1], ...]}``.
+    A game can hold one draw per minute, so the count is capped at
+    ``games * window``.
+    """
+    window = list(range(start, end + 1))
+    total = min(total, len(window) * games)
+    per_game = {g: [] for g in range(games)}
+    for j in range(total):
+        game = j % games
+        # Evenly spaced slots per game, each game shifted so ticks mix games
+        slot = (j // games) * len(window) // math.ceil(total / games)
+        minute = window[(slot + game) % len(window)]
+        while _hhmm(minute) in per_game[game]:
+            minute = window[(window.index(minute) + 1) % len(window)]
+        per_game[game].append(_hhmm(minute))
+    return {
+        game: [sorted(times[t::templates_per_game]) for t in range(templates_per_game)]
+        for game, times in per_game.items()
+    }
+
+
+async def create_load_games(api, count, items=38):
+    """Create ``count`` ANIMALITOS-style games with ``items`` items each."""
+    suffix = uuid.uuid4().hex[:6]
+    games = []
+    for index in range(count):
+        response = await api.post("/games", json={
+            "name": f"LOAD {suffix} {index}",
+            "slug": f"load-{suffix}-{index}",
+            "type": "ANIMALITOS",
+            "totalNumbers": items,
+        })
+        games.append(response.data)
+    await asyncio.gather(*(
+        api.post("/items", json={"gameId": game["id"], "number": f"{n:02d}", "name": f"ITEM {n}"})
+        for game in games for n in range(items)
+    ))
+    return games
+
+
+class StatusPoller:
+    """Keeps the latest state of today's draws as seen through the public API."""
+
+    def __init__(self, api, interval):
+        self.api = api
+        self.interval = interval
+        self.draws = {}
+        self.polls = []
+
+    async def poll_once(self):
+        started = time.perf_counter()
+        response = await self.api.get("/public/draws/today")
+        self.polls.append((time.perf_counter() - started) * 1000)
+        for draw in response.data or []:
+            self.draws[draw["id"]] = draw
+
+    async def run(self, stop):
+        while not stop.is_set():
+            await self.poll_once()
+            try:
+                await asyncio.wait_for(stop.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+        await self.poll_once()
+
+
+async def _read_driver(process, ticks):
+    async for raw in process.stdout:
+        line = raw.decode(errors="replace").strip()
+        if not line.startswith("LOAD "):
+            continue
+        record = json.loads(line[5:])
+        ticks.append(record)
+        if record["type"] == "tick" and record.get("error"):
+            print(f"⚠️  {record['job']} {record['virtual']}: {record['error']}", file=sys.stderr)
+
+
+def summarize(ticks, poller, args, started_real, ended_real, load_draw_ids):
+    interval_ms = 60000 / args.speed
+    by_job = {}
+    for job in ("generate", "close", "execute"):
+        items = [t for t in ticks if t.get("type") == "tick" and t["job"] == job]
+        if not items:
+            continue
+        by_job[job] = {
+            "ticks": len(items),
+            "lateness_ms": distribution([t["lateness_ms"] for t in items]),
+            "duration_ms": distribution([t["duration_ms"] for t in items]),
+            "db_ms": distribution([t["db_ms"] for t in items]),
+            "db_ms_total": round(sum(t["db_ms"] for t in items), 1),
+            "queries_total": sum(t["queries"] for t in items),
+            "overlapping": sum(1 for t in items if t["overlapping"]),
+            "errors": sum(1 for t in items if t.get("error")),
+        }
+
+    # First tick that did not finish within its interval: the next one starts late
+    cron_ticks = sorted(
+        (t for t in ticks if t.get("type") == "tick" and t["job"] != "generate"),
+        key=lambda t: t["virtual"],
+    )
+    behind = next(
+        (t["virtual"] for t in cron_ticks if t["lateness_ms"] + t["duration_ms"] > interval_ms),
+        None,
+    )
+
+    end_minute = _minutes(args.to)
+    statuses = {}
+    missed_close, missed_execute, executed = [], [], 0
+    for draw_id in load_draw_ids:
+        draw = poller.draws.get(draw_id)
+        if draw is None:
+            continue
+        statuses[draw["status"]] = statuses.get(draw["status"], 0) + 1
+        minute = _minutes(draw["drawTime"])
+        if draw["status"] in ("DRAWN", "PUBLISHED"):
+            executed += 1
+        elif minute - CLOSE_LEAD_MIN <= end_minute and draw["status"] == "SCHEDULED":
+            missed_close.append(draw["drawTime"])
+        elif minute <= end_minute and draw["status"] == "CLOSED":
+            missed_execute.append(draw["drawTime"])
+
+    virtual_minutes = end_minute - _minutes(args.start_at) + 1
+    real_minutes = (ended_real - started_real) / 60
+    return {
+        "speed": args.speed,
+        "window": f"{args.start_at}-{args.to}",
+        "tick_interval_ms": round(interval_ms, 1),
+        "draws": len(load_draw_ids),
+        "statuses": statuses,
+        "executed": executed,
+        "draws_per_virtual_min": round(executed / virtual_minutes, 2) if virtual_minutes > 0 else None,
+        "draws_per_real_min": round(executed / real_minutes, 2) if real_minutes > 0 else None,
+        "missed_close": sorted(missed_close),
+        "missed_execute": sorted(missed_execute),
+        "falls_behind_at": behind,
+        "jobs": by_job,
+        "api_poll_ms": distribution(poller.polls),
+    }
+
+
+async def run(args):
+    template = await TemplateDatabase(seeds=SEEDS).ensure()
+    async with template.clone(f"tote_lifecycle_{uuid.uuid4().hex[:8]}") as db:
+        async with BackendServer(db.url, port=args.port) as backend:
+            from api_tier.client import ApiClient
+
+            async with ApiClient(base_url=backend.api_url) as api:
+                token = await api.login()
+                games = [g for g in (await api.get("/games")).data if g["isActive"]]
+                if args.games > len(games):
+                    games += await create_load_games(api, args.games - len(games))
+                games = games[:args.games]
+
+                # Leave room for the close lead after the driver starts
+                first = _minutes(args.start_at) + CLOSE_LEAD_MIN + 1
+                layout = plan_draw_times(args.draws, len(games), first, _minutes(args.to),
+                                         args.templates_per_game)
+                for index, per_template in layout.items():
+                    for n, times in enumerate(per_template):
+                        if times:
+                            await api.post("/templates", token=token, json={
+                                "gameId": games[index]["id"],
+                                "name": f"Carga {n}",
+                                "daysOfWeek": [1, 2, 3, 4, 5, 6, 7],
+                                "drawTimes": times,
+                            })
+
+                driver = await asyncio.create_subprocess_exec(
+                    "node", DRIVER, "--speed", str(args.speed), "--from", args.start_at, "--to", args.to,
+                    cwd=BACKEND_DIR, env={**os.environ, "DATABASE_URL": db.url},
+                    stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL,
+                )
+                ticks, stop = [], asyncio.Event()
+                poller = StatusPoller(api, args.poll)
+                started = time.time()
+                poll_task = asyncio.create_task(poller.run(stop))
+                await _read_driver(driver, ticks)
+                await driver.wait()
+                ended = time.time()
+                stop.set()
+                await poll_task
+
+                if driver.returncode != 0:
+                    fatal = next((t["error"] for t in ticks if t["type"] == "fatal"), "no output")
+                    raise RuntimeError(f"Lifecycle driver failed: {fatal}")
+
+                game_ids = {g["id"] for g in games}
+                load_ids = [d for d, draw in poller.draws.items() if draw["game"]["id"] in game_ids]
+                return summarize(ticks, poller, args, started, ended, load_ids), ticks
+
+
+def print_report(report):
+    print(f"{report['draws']} draws over {report['window']} at {report['speed']}x "
+          f"(tick every {report['tick_interval_ms']:.0f} ms real)")
+    print(f"executed {report['executed']}: {report['draws_per_virtual_min']} draws/virtual min, "
+          f"{report['draws_per_real_min']} draws/real min")
+    print(f"missed close: {len(report['missed_close'])}, missed execute: {len(report['missed_execute'])}")
+    for job, s in report["jobs"].items():
+        late, dur, db = s["lateness_ms"], s["duration_ms"], s["db_ms"]
+        print(f"  {job:<8} {s['ticks']:>5} ticks  late p95 {late.get('p95', '-')} ms  "
+              f"dur p95 {dur.get('p95', '-')} ms  db p95 {db.get('p95', '-')} ms  "
+              f"db total {s['db_ms_total']} ms  overlapping {s['overlapping']}")
+    if report["falls_behind_at"]:
+        print(f"❌ Ticks stop keeping up at {report['falls_behind_at']} (virtual)")
+    else:
+        print("✅ Every tick finished within its interval")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load the daily draw lifecycle under a compressed clock")
+    parser.add_argument("--draws", type=int, default=150, help="Draws in the day")
+    parser.add_argument("--games", type=int, default=3, help="Games to spread them over (extra ones are created)")
+    parser.add_argument("--templates-per-game", type=int, default=2)
+    parser.add_argument("--speed", type=float, default=60, help="Virtual minutes per real minute")
+    parser.add_argument("--from", dest="start_at", default="06:00", help="Virtual start time (HH:MM)")
+    parser.add_argument("--to", default="22:00", help="Virtual end time (HH:MM)")
+    parser.add_argument("--poll", type=float, default=2, help="API poll interval in seconds")
+    parser.add_argument("--port", type=int, default=3199, help="Port of the isolated backend")
+    parser.add_argument("-o", "--output", default=str(DEFAULT_REPORT))
+    args = parser.parse_args(argv)
+
+    report, ticks = asyncio.run(run(args))
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({**report, "ticks": ticks}, indent=2))
+    print_report(report)
+    print(f"→ {output}")
+    return 1 if report["falls_behind_at"] or report["missed_close"] or report["missed_execute"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
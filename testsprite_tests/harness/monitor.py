@@ -0,0 +1,285 @@
+"""Benchmark of the draw monitor's queries at million-ticket scale.
+
+Operators keep ``/admin/monitor`` open and refresh it constantly just before
+a draw closes. The page only loads its active tab: Bancas calls
+``getBancaStats``, Números calls ``getItemStats`` plus number-history's
+``getAllLastSeen`` for the game, Reporte calls ``getDailyReport``. The first two
+load the draw with all its tickets and plays, the report does that for every
+draw of the day, and the drill-down modals call ``getTicketsByBanca``,
+``getTicketsByItem`` and ``getTripletasByItem``, the last one with three
+lookups per tripleta inside a ``Promise.all``.
+
+For each ``--bets`` step this builds (or reuses) a :mod:`harness.dataset`
+template whose next draw to close holds that many plays per game, plus
+``--tripletas`` ACTIVE tripletas covering it, clones it and runs
+``backend/src/scripts/bench-monitor.js`` against those draws: ``--operators``
+operators, spread over ``--tabs``, refreshing ``--rounds`` times each, the way
+the page calls the services for their tab. Per endpoint the report (``.artifacts/monitor.json``) gives the
+latency distribution, queries and database time per call, response size and
+errors; per step, what the database did meanwhile (``pg_stat_database``
+deltas and active backends). An endpoint falls over at the first step where
+its p95 exceeds ``--budget-ms`` or it errors, and the run exits with 1 if any
+does.
+
+    cd testsprite_tests
+    python -m harness.monitor --bets 10000,100000,1000000
+    python -m harness.monitor --bets 1000000 --operators 10 --rounds 2 --node-heap-mb 8192
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import uuid
+from dataclasses import replace
+from pathlib import Path
+
+from harness.config import ARTIFACTS_DIR
+from harness.database import BACKEND_DIR, driver_url
+from harness.dataset import DatasetSpec, DatasetTemplate, hot_draws
+from harness.stats import distribution
+
+DEFAULT_REPORT = ARTIFACTS_DIR / "monitor.json"
+
+DRIVER = "src/scripts/bench-monitor.js"
+
+ENDPOINTS = (
+    "getBancaStats", "getItemStats", "getAllLastSeen", "getDailyReport",
+    "getTicketsByBanca", "getTicketsByItem", "getTripletasByItem",
+)
+
+TABS = ("bancas", "numeros", "reporte")
+
+# pg_stat_database counters reported as deltas over the step
+DB_COUNTERS = ("xact_commit", "tup_returned", "tup_fetched", "blks_read", "blks_hit", "temp_files", "temp_bytes")
+
+
+class DatabaseLoad:
+    """``pg_stat_database`` deltas and sampled active backends of one database."""
+
+    def __init__(self, url, interval=0.5):
+        self.url = url
+        self.interval = interval
+        self.active = []
+        self._conn = None
+        self._task = None
+        self._before = None
+
+    async def _counters(self):
+        # Stats are read once per transaction; force a fresh snapshot
+        await self._conn.execute("SELECT pg_stat_clear_snapshot()")
+        row = await self._conn.fetchrow(
+            f"SELECT {', '.join(DB_COUNTERS)} FROM pg_stat_database WHERE datname = current_database()"
+        )
+        return dict(row)
+
+    async def _sample(self):
+        while True:
+            self.active.append(await self._conn.fetchval(
+                "SELECT count(*) FROM pg_stat_activity "
+                "WHERE datname = current_database() AND state = 'active' AND pid <> pg_backend_pid()"
+            ))
+            await asyncio.sleep(self.interval)
+
+    async def __aenter__(self):
+        import asyncpg
+
+        self._conn = await asyncpg.connect(driver_url(self.url))
+        self._before = await self._counters()
+        self._task = asyncio.create_task(self._sample())
+        return self
+
+    async def __aexit__(self, *exc):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        # Backends flush their counters when they go idle, at most once a second
+        await asyncio.sleep(1.5)
+        after = await self._counters()
+        await self._conn.close()
+        self.deltas = {name: after[name] - self._before[name] for name in DB_COUNTERS}
+
+    def report(self, wall_s):
+        hits = self.deltas["blks_hit"] + self.deltas["blks_read"]
+        return {
+            **self.deltas,
+            "xact_per_s": round(self.deltas["xact_commit"] / wall_s, 1) if wall_s else None,
+            "tup_fetched_per_s": round(self.deltas["tup_fetched"] / wall_s) if wall_s else None,
+            "cache_hit_ratio": round(self.deltas["blks_hit"] / hits, 4) if hits else None,
+            "active_backends": {
+                "mean": round(sum(self.active) / len(self.active), 1) if self.active else 0,
+                "max": max(self.active, default=0),
+            },
+        }
+
+
+async def run_driver(db_url, draws, args):
+    env = {**os.environ, "DATABASE_URL": db_url, "NODE_ENV": "production"}
+    if args.node_heap_mb:
+        env["NODE_OPTIONS"] = f"{env.get('NODE_OPTIONS', '')} --max-old-space-size={args.node_heap_mb}".strip()
+    cmd = ["node", DRIVER, "--date", args.date, "--operators", str(args.operators), "--rounds", str(args.rounds),
+           "--think-ms", str(args.think_ms), "--drilldowns", str(args.drilldowns), "--tabs", ",".join(args.tabs)]
+    for draw_id in draws.values():
+        cmd += ["--draw", draw_id]
+    process = await asyncio.create_subprocess_exec(
+        *cmd, cwd=BACKEND_DIR, env=env, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+    )
+    records = []
+
+    async def read_stdout():
+        async for raw in process.stdout:
+            line = raw.decode(errors="replace").strip()
+            if line.startswith("MONITOR "):
+                records.append(json.loads(line[8:]))
+
+    stdout_task = asyncio.create_task(read_stdout())
+    stderr = await process.stderr.read()
+    await stdout_task
+    await process.wait()
+    crash = None
+    if process.returncode != 0:
+        fatal = next((r["error"] for r in records if r["type"] == "fatal"), None)
+        # A heap exhaustion kills the process without a fatal record
+        tail = stderr.decode(errors="replace").strip().splitlines()
+        crash = fatal or (tail[-1] if tail else f"exit code {process.returncode}")
+    return records, crash
+
+
+def summarize(records, budget_ms):
+    calls = [r for r in records if r["type"] == "call"]
+    endpoints = {}
+    for name in ENDPOINTS:
+        made = [r for r in calls if r["endpoint"] == name]
+        if not made:
+            continue
+        ok = [r for r in made if not r.get("error")]
+        entry = {
+            "calls": len(made),
+            **distribution([r["ms"] for r in ok]),
+            "queries": distribution([r["queries"] for r in made], digits=0),
+            "db_ms": distribution([r["db_ms"] for r in ok]),
+            "serialize_ms": distribution([r["serialize_ms"] for r in ok]),
+            "kb": round(sum(r["bytes"] for r in ok) / len(ok) / 1024, 1) if ok else None,
+            "errors": len(made) - len(ok),
+            "error_messages": sorted({r["error"] for r in made if r.get("error")}),
+        }
+        if name == "getTripletasByItem":
+            entry["tripletas"] = distribution([r["tripletas"] for r in made], digits=0)
+        entry["over_budget"] = bool(entry["errors"]) or entry.get("p95", 0) > budget_ms
+        endpoints[name] = entry
+    return endpoints
+
+
+async def run(args):
+    base = DatasetSpec(
+        seed=args.seed, days=args.days, tickets_per_draw=args.tickets_per_draw,
+        tripletas=args.background_tripletas, **({"end_date": args.end_date} if args.end_date else {}),
+    )
+    args.date = base.end_date
+    steps = []
+    for bets in args.bets:
+        spec = replace(base, hot_draw_bets=bets, hot_tripletas=args.tripletas)
+        template = await DatasetTemplate(spec).ensure()
+        if template.report:
+            print(f"  dataset for {bets:,} bets built: {template.report['rows']:,} rows "
+                  f"in {template.report['load_s']} s")
+        async with template.clone(f"tote_monitor_{uuid.uuid4().hex[:8]}") as db:
+            draws = await hot_draws(db.url, spec, set(args.games))
+            started = time.perf_counter()
+            async with DatabaseLoad(db.url) as load:
+                records, crash = await run_driver(db.url, draws, args)
+            wall_s = time.perf_counter() - started
+        end = next((r for r in records if r["type"] == "end"), {})
+        step = {
+            "bets": bets,
+            "games": sorted(draws),
+            "wall_s": round(wall_s, 1),
+            "peak_rss_mb": end.get("peak_rss_mb"),
+            "database": load.report(wall_s),
+            "endpoints": summarize(records, args.budget_ms),
+            "crash": crash,
+        }
+        steps.append(step)
+        print_step(step)
+    falls_over = {}
+    for step in steps:
+        for name, entry in step["endpoints"].items():
+            if entry["over_budget"]:
+                falls_over.setdefault(name, step["bets"])
+        if step["crash"]:
+            for name in ENDPOINTS:
+                falls_over.setdefault(name, step["bets"])
+    return {
+        "budget_ms": args.budget_ms,
+        "operators": args.operators,
+        "tabs": args.tabs,
+        "rounds": args.rounds,
+        "tripletas": args.tripletas,
+        "steps": steps,
+        "falls_over_at": falls_over,
+    }
+
+
+def print_step(step):
+    db = step["database"]
+    print(f"{step['bets']:>10,} bets per draw: {step['wall_s']} s, RSS {step['peak_rss_mb']} MB, "
+          f"{db['xact_per_s']} xact/s, {db['tup_fetched_per_s']} rows fetched/s, "
+          f"{db['active_backends']['max']} active backends max")
+    if step["crash"]:
+        print(f"    ❌ driver crashed: {step['crash']}")
+    print(f"    {'endpoint':<20} {'calls':>6} {'p50':>9} {'p95':>9} {'queries':>8} {'db ms':>9} {'KB':>9} {'errors':>6}")
+    for name, e in step["endpoints"].items():
+        mark = "❌" if e["over_budget"] else "  "
+        print(f"  {mark}{name:<20} {e['calls']:>6} {e.get('p50', '-'):>9} {e.get('p95', '-'):>9} "
+              f"{e['queries'].get('max', '-'):>8} {e['db_ms'].get('p50', '-'):>9} {e['kb'] or '-':>9} {e['errors']:>6}")
+        for message in e["error_messages"][:2]:
+            print(f"        ⚠️  {message}")
+
+
+def _sizes(value):
+    return [int(n) for n in value.split(",")]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Monitor dashboard query benchmark")
+    parser.add_argument("--bets", type=_sizes, default=[10_000, 100_000, 1_000_000],
+                        help="Comma-separated plays on each game's monitored draw")
+    parser.add_argument("--tripletas", type=int, default=5000,
+                        help="ACTIVE tripletas covering the monitored draw")
+    parser.add_argument("--games", nargs="*", default=[], help="Only these game slugs")
+    parser.add_argument("--operators", type=int, default=5, help="Operators refreshing at once")
+    parser.add_argument("--tabs", type=lambda v: v.split(","), default=list(TABS),
+                        help="Comma-separated tabs the operators watch, assigned in turn")
+    parser.add_argument("--rounds", type=int, default=3, help="Refreshes per operator")
+    parser.add_argument("--think-ms", type=int, default=0, help="Pause between an operator's refreshes")
+    parser.add_argument("--drilldowns", type=int, default=3,
+                        help="Bancas and numbers whose modals are opened per refresh")
+    parser.add_argument("--budget-ms", type=float, default=5000, help="Highest acceptable p95 per endpoint")
+    parser.add_argument("--node-heap-mb", type=int, default=None, help="--max-old-space-size for the driver")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--end-date", default=None, help="YYYY-MM-DD (default: today in Caracas)")
+    parser.add_argument("--tickets-per-draw", type=int, default=500, help="Volume of the other draws")
+    parser.add_argument("--background-tripletas", type=int, default=5000)
+    parser.add_argument("-o", "--output", default=str(DEFAULT_REPORT))
+    args = parser.parse_args(argv)
+    if not args.tabs or set(args.tabs) - set(TABS):
+        parser.error(f"--tabs takes {', '.join(TABS)}")
+
+    report = asyncio.run(run(args))
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    for name, bets in report["falls_over_at"].items():
+        print(f"❌ {name} falls over at {bets:,} bets")
+    if not report["falls_over_at"]:
+        print(f"✅ Every endpoint within {args.budget_ms:.0f} ms at every step")
+    print(f"→ {output}")
+    return 1 if report["falls_over_at"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
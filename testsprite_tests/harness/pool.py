@@ -0,0 +1,212 @@
+"""Warm pool of multi-process Chromium browsers.
+
+Tests lease a browser slot instead of launching Chromium themselves. The lease
+behaves like a ``Browser`` for the only call the TC scripts make on it,
+``new_context()``, so ``run_test(lease)`` and ``new_admin_context(lease)`` work
+unchanged; every context opened through a lease is closed when it ends.
+
+A browser is recycled (closed and relaunched) once it has served
+``max_leases`` tests or its process tree's RSS passes ``max_rss_mb``, so a
+long run never accumulates renderer memory. RSS tracking needs ``psutil``;
+without it only the lease count triggers recycling.
+
+    async with async_playwright() as pw:
+        async with BrowserPool(pw, size=2, slots=4) as pool:
+            async with pool.lease() as browser:
+                await run_test(browser)
+            print(pool.stats())
+"""
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+from harness.stats import percentile
+
+BROWSER_ARGS = [
+    "--window-size=1280,720",
+    "--disable-dev-shm-usage",
+]
+
+MAX_LEASES = int(os.environ.get("TOTE_POOL_MAX_LEASES", "50"))
+MAX_RSS_MB = int(os.environ.get("TOTE_POOL_MAX_RSS_MB", "1500"))
+
+
+def _root_pids(pids):
+    roots = set()
+    for pid in pids:
+        try:
+            if psutil.Process(pid).ppid() not in pids:
+                roots.add(pid)
+        except psutil.Error:
+            pass
+    return roots
+
+
+def _chromium_pids():
+    """PIDs of Chromium processes started (indirectly) by this process."""
+    if psutil is None:
+        return set()
+    pids = set()
+    for child in psutil.Process().children(recursive=True):
+        try:
+            if "chrom" in child.name().lower():
+                pids.add(child.pid)
+        except psutil.Error:
+            pass
+    return pids
+
+
+def _round(value, digits=1):
+    return None if value is None else round(value, digits)
+
+
+class PooledBrowser:
+    """One warm browser plus the bookkeeping used to decide when to recycle it."""
+
+    def __init__(self, browser, pids):
+        self.browser = browser
+        self.pids = pids
+        self.leases = 0
+        self.active = 0
+        self.retiring = False
+
+    def rss_mb(self):
+        if psutil is None or not self.pids:
+            return None
+        total = 0
+        for pid in self.pids:
+            try:
+                root = psutil.Process(pid)
+                total += root.memory_info().rss
+                total += sum(p.memory_info().rss for p in root.children(recursive=True))
+            except psutil.Error:
+                pass
+        return total / (1024 * 1024)
+
+
+class Lease:
+    """Browser stand-in handed to a test for the duration of one lease."""
+
+    def __init__(self, pooled):
+        self._pooled = pooled
+        self.contexts = []
+
+    async def new_context(self, **kwargs):
+        context = await self._pooled.browser.new_context(**kwargs)
+        self.contexts.append(context)
+        return context
+
+    async def close(self):
+        # Tests close their own context; nothing here may close the shared browser
+        for context in self.contexts:
+            try:
+                await context.close()
+            except Exception:
+                pass
+        self.contexts.clear()
+
+
+class BrowserPool:
+    def __init__(self, pw, size=1, slots=1, max_leases=MAX_LEASES, max_rss_mb=MAX_RSS_MB,
+                 headless=True, args=BROWSER_ARGS):
+        self.pw = pw
+        self.size = size
+        self.slots = slots
+        self.max_leases = max_leases
+        self.max_rss_mb = max_rss_mb
+        self.headless = headless
+        self.args = args
+        self.browsers = []
+        self.lease_waits = []
+        self.recycles = 0
+        self._available = asyncio.Condition()
+        self._launch_lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def _launch(self):
+        # Serialized so the before/after PID diff belongs to this browser only
+        async with self._launch_lock:
+            before = _chromium_pids()
+            browser = await self.pw.chromium.launch(headless=self.headless, args=self.args)
+            pids = _chromium_pids() - before
+        # Keep only the roots; rss_mb() walks their children
+        return PooledBrowser(browser, _root_pids(pids))
+
+    async def start(self):
+        self.browsers = [await self._launch() for _ in range(self.size)]
+
+    async def close(self):
+        for pooled in self.browsers:
+            await pooled.browser.close()
+        self.browsers = []
+
+    def _pick(self):
+        """Least-busy browser that still has a free slot, or None."""
+        candidates = [b for b in self.browsers if not b.retiring and b.active < self.slots]
+        return min(candidates, key=lambda b: b.active, default=None)
+
+    async def _recycle(self, pooled):
+        await pooled.browser.close()
+        replacement = await self._launch()
+        self.browsers[self.browsers.index(pooled)] = replacement
+        self.recycles += 1
+
+    def _needs_recycle(self, pooled):
+        if pooled.leases >= self.max_leases:
+            return True
+        rss = pooled.rss_mb()
+        return rss is not None and rss > self.max_rss_mb
+
+    @asynccontextmanager
+    async def lease(self):
+        """Yield a :class:`Lease` on the least-busy browser, waiting for a free slot."""
+        requested = time.perf_counter()
+        async with self._available:
+            await self._available.wait_for(lambda: self._pick() is not None)
+            pooled = self._pick()
+            pooled.active += 1
+            pooled.leases += 1
+        self.lease_waits.append(time.perf_counter() - requested)
+
+        lease = Lease(pooled)
+        try:
+            yield lease
+        finally:
+            await lease.close()
+            async with self._available:
+                pooled.active -= 1
+                if self._needs_recycle(pooled):
+                    pooled.retiring = True
+                recycle = pooled.retiring and pooled.active == 0
+                self._available.notify_all()
+            if recycle:
+                # Relaunch outside the lock so the other browsers keep leasing
+                await self._recycle(pooled)
+                async with self._available:
+                    self._available.notify_all()
+
+    def stats(self):
+        """Lease wait-time summary (milliseconds) and recycle count."""
+        waits = sorted(w * 1000 for w in self.lease_waits)
+        if not waits:
+            return {"leases": 0, "recycles": self.recycles}
+        return {
+            "leases": len(waits),
+            "recycles": self.recycles,
+            "wait_ms_p50": round(percentile(waits, 50), 2),
+            "wait_ms_p95": round(percentile(waits, 95), 2),
+            "wait_ms_max": round(waits[-1], 2),
+            "rss_mb": [_round(b.rss_mb()) for b in self.browsers],
+        }
@@ -0,0 +1,178 @@
+"""Benchmark of the prewinner selection under realistic ticket volume.
+
+``close-draw.job.js`` picks the prewinner through
+``PrewinnerOptimizerService.selectOptimalPrewinner`` when a draw closes, five
+minutes before it is drawn. The selection loads the draw with every ticket
+and play, the active tripletas and the day's used items, then evaluates
+every candidate item; per candidate, ``calculateTripletaImpact`` queries the
+start draw and the executed draws of each tripleta holding that item.
+
+For each ``--bets`` step this builds (or reuses) a :mod:`harness.dataset`
+template whose next draw to close holds that many plays per game, plus
+``--tripletas`` ACTIVE tripletas covering it, clones it and runs
+``backend/src/scripts/bench-prewinner.js`` on those draws. Per selection the
+report (``.artifacts/prewinner.json``) gives wall time, query count and
+database time per phase, what was loaded and the peak RSS; a selection fails
+the run if it errors or takes longer than ``--budget-s``, which leaves the
+rest of the close window for the admins' review.
+
+    cd testsprite_tests
+    python -m harness.prewinner --bets 10000,100000,1000000
+    python -m harness.prewinner --bets 5000000 --tripletas 20000 --repeat 1 --node-heap-mb 8192
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import uuid
+from dataclasses import replace
+from pathlib import Path
+
+from harness.config import ARTIFACTS_DIR
+from harness.database import BACKEND_DIR
+from harness.dataset import DatasetSpec, DatasetTemplate, hot_draws
+from harness.stats import distribution
+
+DEFAULT_REPORT = ARTIFACTS_DIR / "prewinner.json"
+
+DRIVER = "src/scripts/bench-prewinner.js"
+
+# close-draw.job.js closes draws this long before drawTime
+CLOSE_WINDOW_S = 5 * 60
+
+
+async def run_driver(db_url, draws, args):
+    env = {**os.environ, "DATABASE_URL": db_url, "NODE_ENV": "production"}
+    if args.node_heap_mb:
+        env["NODE_OPTIONS"] = f"{env.get('NODE_OPTIONS', '')} --max-old-space-size={args.node_heap_mb}".strip()
+    cmd = ["node", DRIVER, "--repeat", str(args.repeat)]
+    for draw_id in draws.values():
+        cmd += ["--draw", draw_id]
+    process = await asyncio.create_subprocess_exec(
+        *cmd, cwd=BACKEND_DIR, env=env, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+    )
+    records = []
+
+    async def read_stdout():
+        async for raw in process.stdout:
+            line = raw.decode(errors="replace").strip()
+            if line.startswith("PREWINNER "):
+                records.append(json.loads(line[10:]))
+
+    stdout_task = asyncio.create_task(read_stdout())
+    stderr = await process.stderr.read()
+    await stdout_task
+    await process.wait()
+    crash = None
+    if process.returncode != 0:
+        fatal = next((r["error"] for r in records if r["type"] == "fatal"), None)
+        # A heap exhaustion kills the process without a fatal record
+        tail = stderr.decode(errors="replace").strip().splitlines()
+        crash = fatal or (tail[-1] if tail else f"exit code {process.returncode}")
+    return records, crash
+
+
+def summarize_step(bets, draws, records, crash, budget_s):
+    games = {}
+    for slug, draw_id in draws.items():
+        runs = [r for r in records if r["type"] == "selection" and r["drawId"] == draw_id]
+        if not runs:
+            games[slug] = {"error": crash or "no selection recorded"}
+            continue
+        last = runs[-1]
+        worst_s = max(r["wall_ms"] for r in runs) / 1000
+        games[slug] = {
+            "loaded": last["loaded"],
+            "method": last["method"],
+            "valid_candidates": last["valid_candidates"],
+            "cold_ms": runs[0]["wall_ms"],
+            "wall_ms": distribution([r["wall_ms"] for r in runs[1:] or runs]),
+            "queries": last["queries"],
+            "db_ms": last["db_ms"],
+            "peak_rss_mb": max(r["peak_rss_mb"] for r in runs),
+            "phases": last["phases"],
+            "margin_s": round(CLOSE_WINDOW_S - worst_s, 1),
+            "within_budget": worst_s <= budget_s and not any(r["error"] for r in runs),
+            "error": next((r["error"] for r in runs if r["error"]), None),
+        }
+    return {"bets": bets, "games": games, "crash": crash}
+
+
+async def run(args):
+    base = DatasetSpec(
+        seed=args.seed, days=args.days, tickets_per_draw=args.tickets_per_draw,
+        tripletas=args.background_tripletas, **({"end_date": args.end_date} if args.end_date else {}),
+    )
+    steps = []
+    for bets in args.bets:
+        spec = replace(base, hot_draw_bets=bets, hot_tripletas=args.tripletas)
+        template = await DatasetTemplate(spec).ensure()
+        if template.report:
+            print(f"  dataset for {bets:,} bets built: {template.report['rows']:,} rows "
+                  f"in {template.report['load_s']} s")
+        async with template.clone(f"tote_prewinner_{uuid.uuid4().hex[:8]}") as db:
+            draws = await hot_draws(db.url, spec, set(args.games))
+            records, crash = await run_driver(db.url, draws, args)
+        step = summarize_step(bets, draws, records, crash, args.budget_s)
+        steps.append(step)
+        print_step(step)
+    return {
+        "budget_s": args.budget_s,
+        "close_window_s": CLOSE_WINDOW_S,
+        "tripletas": args.tripletas,
+        "repeat": args.repeat,
+        "steps": steps,
+    }
+
+
+def print_step(step):
+    print(f"{step['bets']:>10,} bets per draw")
+    for slug, game in step["games"].items():
+        if "loaded" not in game:
+            print(f"    {slug:<16} ❌ {game['error']}")
+            continue
+        mark = "✅" if game["within_budget"] else "❌"
+        loaded = game["loaded"] or {}
+        print(f"    {slug:<16} {mark} p50 {game['wall_ms'].get('p50', '-')} ms (cold {game['cold_ms']} ms), "
+              f"{game['queries']} queries, {loaded.get('active_tripletas', '-')} tripletas, "
+              f"RSS {game['peak_rss_mb']} MB, margin {game['margin_s']} s")
+        phases = sorted(game["phases"].items(), key=lambda p: -p[1]["wall_ms"])
+        for name, phase in phases[:4]:
+            print(f"        {name:<26} {phase['wall_ms']:>10} ms  {phase['calls']:>6} calls  "
+                  f"{phase['queries']:>7} queries")
+
+
+def _sizes(value):
+    return [int(n) for n in value.split(",")]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prewinner selection benchmark")
+    parser.add_argument("--bets", type=_sizes, default=[10_000, 100_000, 1_000_000],
+                        help="Comma-separated plays on each game's draw under selection")
+    parser.add_argument("--tripletas", type=int, default=5000,
+                        help="ACTIVE tripletas covering the draw under selection")
+    parser.add_argument("--games", nargs="*", default=[], help="Only these game slugs")
+    parser.add_argument("--repeat", type=int, default=3, help="Selections per draw; the first counts as cold")
+    parser.add_argument("--budget-s", type=float, default=60, help="Longest acceptable selection")
+    parser.add_argument("--node-heap-mb", type=int, default=None, help="--max-old-space-size for the driver")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--end-date", default=None, help="YYYY-MM-DD (default: today in Caracas)")
+    parser.add_argument("--tickets-per-draw", type=int, default=500, help="Volume of the other draws")
+    parser.add_argument("--background-tripletas", type=int, default=5000)
+    parser.add_argument("-o", "--output", default=str(DEFAULT_REPORT))
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run(args))
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"→ {output}")
+    failed = [g for step in report["steps"] for g in step["games"].values() if not g.get("within_budget")]
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
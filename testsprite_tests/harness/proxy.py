@@ -0,0 +1,114 @@
+"""Local TCP proxy that can drop the connections passing through it.
+
+Sits between Socket.IO clients and the backend to reproduce a network blip:
+:meth:`TcpProxy.cut` resets every proxied connection, or a fraction of them,
+and :meth:`TcpProxy.outage` also refuses new connections for a while, the way
+clients see it when the link goes down.
+
+    async with TcpProxy(3197, "localhost", 3198) as proxy:
+        ...                                   # clients connect to :3197
+        cut = proxy.cut(fraction=0.5)         # half of them drop at once
+        await proxy.outage(5)                 # reconnects fail for 5 s
+"""
+import asyncio
+import random
+import socket
+import struct
+import time
+
+
+class TcpProxy:
+    def __init__(self, listen_port, target_host, target_port, listen_host="127.0.0.1"):
+        self.listen_host = listen_host
+        self.listen_port = listen_port
+        self.target_host = target_host
+        self.target_port = target_port
+        self.connections = set()  # (client writer, upstream writer)
+        self.accepted = 0
+        self.refused = 0
+        self._down = False
+        self._server = None
+        self._handlers = set()
+
+    async def __aenter__(self):
+        self._server = await asyncio.start_server(self._handle, self.listen_host, self.listen_port)
+        return self
+
+    async def __aexit__(self, *exc):
+        self._server.close()
+        self.cut()
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        await self._server.wait_closed()
+
+    @property
+    def url(self):
+        return f"http://{self.listen_host}:{self.listen_port}"
+
+    async def _handle(self, reader, writer):
+        if self._down:
+            self.refused += 1
+            _reset(writer)
+            return
+        try:
+            upstream_reader, upstream_writer = await asyncio.open_connection(self.target_host, self.target_port)
+        except OSError:
+            self.refused += 1
+            _reset(writer)
+            return
+        self.accepted += 1
+        pair = (writer, upstream_writer)
+        self.connections.add(pair)
+        handler = asyncio.current_task()
+        self._handlers.add(handler)
+        try:
+            await asyncio.gather(_pipe(reader, upstream_writer), _pipe(upstream_reader, writer))
+        finally:
+            self._handlers.discard(handler)
+            self.connections.discard(pair)
+            for w in pair:
+                w.close()
+
+    def cut(self, fraction=1.0, seed=None):
+        """Reset ``fraction`` of the open connections on both sides; returns how many."""
+        pairs = list(self.connections)
+        count = round(len(pairs) * fraction)
+        for client, upstream in random.Random(seed).sample(pairs, count):
+            _reset(client)
+            _reset(upstream)
+            self.connections.discard((client, upstream))
+        return count
+
+    async def outage(self, seconds):
+        """Refuse new connections for ``seconds``."""
+        self._down = True
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            self._down = False
+
+    def stats(self):
+        return {"open": len(self.connections), "accepted": self.accepted, "refused": self.refused,
+                "at": time.time()}
+
+
+async def _pipe(reader, writer):
+    try:
+        while data := await reader.read(65536):
+            writer.write(data)
+            await writer.drain()
+    except (ConnectionError, OSError):
+        pass
+    finally:
+        if not writer.is_closing():
+            writer.close()
+
+
+def _reset(writer):
+    """Close with RST instead of FIN, as a dropped link looks to the peer."""
+    sock = writer.get_extra_info("socket")
+    if sock is not None:
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+        except OSError:
+            pass
+    writer.transport.abort()
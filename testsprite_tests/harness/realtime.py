@@ -0,0 +1,307 @@
+"""Latency budget checks for the real-time Socket.IO updates.
+
+:class:`RealtimeProbe` opens its own Socket.IO client next to the browser,
+joins the ``admin`` and ``game:<slug>`` rooms exposed by
+``backend/src/lib/socket.js`` and timestamps every event it receives. Each
+expected event is matched against the moment its triggering action ran (a UI
+click, an API call, or the cron tick that closes/executes a draw) and the
+latency distribution is written to ``.artifacts/realtime/<test_id>.json``.
+
+    async with RealtimeProbe("TC011", games=["lottopantera"]) as probe:
+        triggered = time.time()
+        await steps.click(elem, label="Generar Sorteos del Día")
+        await probe.expect("draws:generated", triggered_at=triggered)
+    # raises AssertionError if any latency exceeded the budget
+
+The default budget is the PRD's 60 seconds (``TOTE_REALTIME_BUDGET_S``).
+
+:class:`SocketCut` routes the page's own Socket.IO connections through
+Playwright so a test can drop them from the server side and time the
+reconnection (TC017).
+"""
+import asyncio
+import json
+import os
+import re
+import time
+import urllib.request
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import socketio
+
+from harness.config import ARTIFACTS_DIR, DRAW_TIMEZONE, api_url, socket_url
+from harness.runner import time_left
+from harness.stats import distribution
+
+REPORT_DIR = ARTIFACTS_DIR / "realtime"
+
+LATENCY_BUDGET_S = float(os.environ.get("TOTE_REALTIME_BUDGET_S", "60"))
+
+# How long a test may wait for the next cron-driven draw event
+MAX_WAIT_S = float(os.environ.get("TOTE_REALTIME_MAX_WAIT_S", "600"))
+
+# Kept free of the runner's per-test timeout for the test's own teardown
+TEARDOWN_S = 10
+
+# close-draw.job.js closes draws 5 minutes before their drawTime
+CLOSE_LEAD = timedelta(minutes=5)
+
+
+def draw_trigger_time(draw, phase):
+    """Epoch seconds at which the cron job should act on ``draw``.
+
+    ``phase`` is ``"close"`` (drawTime - 5 min) or ``"execute"`` (drawTime);
+    ``draw`` is an API payload with ``drawDate`` and ``drawTime``.
+    """
+    date = draw["drawDate"][:10]
+    clock = draw["drawTime"] if len(draw["drawTime"]) > 5 else f"{draw['drawTime']}:00"
+    at = datetime.fromisoformat(f"{date}T{clock}").replace(tzinfo=ZoneInfo(DRAW_TIMEZONE))
+    if phase == "close":
+        at -= CLOSE_LEAD
+    elif phase != "execute":
+        raise ValueError(f"Unknown draw phase {phase!r}")
+    return at.timestamp()
+
+
+def _fetch_next_draws(limit):
+    with urllib.request.urlopen(f"{api_url()}/public/draws/next?limit={limit}", timeout=10) as response:
+        return json.load(response)["data"]
+
+
+async def next_draws(limit=10):
+    """Upcoming SCHEDULED/CLOSED draws from ``GET /api/public/draws/next``."""
+    return await asyncio.to_thread(_fetch_next_draws, limit)
+
+
+async def next_measurable_draw(max_wait=None, budget_s=LATENCY_BUDGET_S):
+    """First SCHEDULED draw whose close and execute events can both be awaited, or None.
+
+    The ``draw:executed`` broadcast may arrive up to ``budget_s`` after
+    drawTime, and that must fall within ``max_wait`` seconds: by default
+    ``TOTE_REALTIME_MAX_WAIT_S``, capped by what is left of the runner's
+    per-test timeout.
+    """
+    if max_wait is None:
+        left = time_left()
+        max_wait = MAX_WAIT_S if left is None else min(MAX_WAIT_S, left - TEARDOWN_S)
+    now = time.time()
+    for draw in await next_draws():
+        if (draw["status"] == "SCHEDULED" and draw_trigger_time(draw, "close") >= now
+                and draw_trigger_time(draw, "execute") + budget_s - now <= max_wait):
+            return draw
+    return None
+
+
+def _matches(data, match):
+    if not match:
+        return True
+    if not isinstance(data, dict):
+        return False
+    return all(data.get(key) == value for key, value in match.items())
+
+
+class RealtimeProbe:
+    def __init__(self, test_id, games=(), admin=True, budget_s=LATENCY_BUDGET_S, url=None):
+        self.test_id = test_id
+        self.games = list(games)
+        self.admin = admin
+        self.budget_s = budget_s
+        self.url = url or socket_url()
+        self.events = []
+        self.expectations = []
+        self._waiters = []
+        self.client = socketio.AsyncClient(reconnection=True)
+        self.client.on("*", self._on_event)
+        # Rooms are per connection on the server, so join them again on reconnect
+        self.client.on("connect", self._join_rooms)
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+        self.write_report()
+        if exc_type is None:
+            self.assert_within_budget()
+
+    async def connect(self):
+        await self.client.connect(self.url, transports=["websocket"])
+
+    async def _join_rooms(self):
+        if self.admin:
+            await self.client.emit("join:admin")
+        for slug in self.games:
+            await self.client.emit("join:game", slug)
+
+    async def close(self):
+        if self.client.connected:
+            await self.client.disconnect()
+
+    async def _on_event(self, event, *args):
+        received = time.time()
+        data = args[0] if args else None
+        self.events.append({"event": event, "received": received, "data": data})
+        for waiter in list(self._waiters):
+            name, match, future = waiter
+            if name == event and not future.done() and _matches(data, match):
+                future.set_result(received)
+                self._waiters.remove(waiter)
+
+    def _already_received(self, event, match, since):
+        for entry in self.events:
+            if entry["event"] == event and entry["received"] >= since and _matches(entry["data"], match):
+                return entry["received"]
+        return None
+
+    async def expect(self, event, triggered_at, match=None, timeout=None, label=None):
+        """Wait for ``event`` (optionally with payload fields ``match``) and record its latency.
+
+        ``triggered_at`` is the epoch time the causing action ran. Returns the
+        latency in seconds, or None if the event never arrived within ``timeout``
+        (defaults to the budget, counted from ``triggered_at``).
+        """
+        deadline = triggered_at + (timeout if timeout is not None else self.budget_s)
+        expectation = {
+            "label": label or event,
+            "event": event,
+            "match": match,
+            "triggered_at": triggered_at,
+        }
+        self.expectations.append(expectation)
+
+        received = self._already_received(event, match, triggered_at)
+        if received is None:
+            future = asyncio.get_running_loop().create_future()
+            waiter = (event, match, future)
+            self._waiters.append(waiter)
+            try:
+                received = await asyncio.wait_for(future, max(deadline - time.time(), 0))
+            except asyncio.TimeoutError:
+                received = None
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+
+        expectation["received"] = received
+        expectation["latency_s"] = round(received - triggered_at, 3) if received is not None else None
+        return expectation["latency_s"]
+
+    async def expect_draw_phase(self, draw, phase, timeout=None):
+        """Wait for the cron-driven ``draw:closed`` / ``draw:executed`` event of ``draw``."""
+        event = {"close": "draw:closed", "execute": "draw:executed"}[phase]
+        return await self.expect(
+            event,
+            triggered_at=draw_trigger_time(draw, phase),
+            match={"drawId": draw["id"]},
+            timeout=timeout,
+            label=f"{event} {draw['game']['slug']} {draw['drawTime']}",
+        )
+
+    def record(self, label, triggered_at, received):
+        """Log a latency measured outside Socket.IO (e.g. a browser reconnect)."""
+        self.expectations.append({
+            "label": label,
+            "triggered_at": triggered_at,
+            "received": received,
+            "latency_s": round(received - triggered_at, 3) if received is not None else None,
+        })
+
+    def violations(self):
+        return [
+            e for e in self.expectations
+            if e.get("latency_s") is None or e["latency_s"] > self.budget_s
+        ]
+
+    def report(self):
+        latencies = [e["latency_s"] for e in self.expectations if e.get("latency_s") is not None]
+        return {
+            "test_id": self.test_id,
+            "budget_s": self.budget_s,
+            "latency_s": distribution(latencies, digits=3),
+            "missed": sum(1 for e in self.expectations if e.get("latency_s") is None),
+            "expectations": self.expectations,
+            "events": [{"event": e["event"], "received": e["received"]} for e in self.events],
+        }
+
+    def write_report(self):
+        REPORT_DIR.mkdir(parents=True, exist_ok=True)
+        path = REPORT_DIR / f"{self.test_id}.json"
+        path.write_text(json.dumps(self.report(), indent=2, default=str))
+        return path
+
+    def assert_within_budget(self):
+        violations = self.violations()
+        if violations:
+            details = ", ".join(
+                f"{v['label']}: " + ("missed" if v.get("latency_s") is None else f"{v['latency_s']}s")
+                for v in violations
+            )
+            raise AssertionError(
+                f"Real-time updates exceeded the {self.budget_s:.0f}s latency budget: {details}"
+            )
+
+
+class SocketCut:
+    """Drops the page's Socket.IO connections from the server side.
+
+    ``context.set_offline`` leaves an open WebSocket alone in Chromium, so the
+    page's connections are routed through Playwright (install the route before
+    the page connects). :meth:`cut` closes their server side, the way a backend
+    restart would, and refuses new connections until :meth:`restore`.
+
+        cut = SocketCut()
+        await cut.install(context)
+        ...                                    # page.goto
+        await cut.wait_connected()
+        await cut.cut()
+        restored = cut.restore()
+        await cut.wait_connected(since=restored, timeout=LATENCY_BUDGET_S)
+    """
+
+    URL = re.compile(r"/socket\.io/")
+
+    def __init__(self):
+        self.opened = []  # epoch seconds of every connection passed on to the backend
+        self.refused = 0
+        self._servers = []
+        self._down = False
+        self._waiters = []
+
+    async def install(self, context):
+        await context.route_web_socket(self.URL, self._route)
+
+    async def _route(self, ws):
+        if self._down:
+            self.refused += 1
+            await ws.close()
+            return
+        self._servers.append(ws.connect_to_server())
+        opened = time.time()
+        self.opened.append(opened)
+        for future in self._waiters:
+            if not future.done():
+                future.set_result(opened)
+        self._waiters.clear()
+
+    async def wait_connected(self, since=None, timeout=30):
+        """Epoch seconds at which the page opened a connection after ``since``."""
+        for opened in self.opened:
+            if since is None or opened >= since:
+                return opened
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        return await asyncio.wait_for(future, timeout)
+
+    async def cut(self):
+        """Close every routed connection from the server side; new ones are refused."""
+        self._down = True
+        servers, self._servers = self._servers, []
+        await asyncio.gather(*(server.close() for server in servers), return_exceptions=True)
+        return len(servers)
+
+    def restore(self):
+        """Accept connections again; returns the epoch seconds it happened."""
+        self._down = False
+        return time.time()
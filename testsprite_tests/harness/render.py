@@ -0,0 +1,281 @@
+"""Rendering benchmark and regression guard for the result images.
+
+Runs ``backend/src/scripts/bench-images.js``, which calls the
+``lib/imageGenerator.js`` entry points directly: the Ruleta template for every
+lotoanimalito result under every special-date layer, the Animalitos and
+Triple templates for every lottopantera and triple-pantera result, the
+pyramid for each weekday and a handful of recommendation images. Per image it
+gets the render time, output size and peak RSS while rendering; per kind this
+module reports their distributions and the failed cases, plus the driver's
+peak RSS as the OS saw it.
+
+Rendering sits between draw execution and publication, so ``--concurrency``
+renders several images at once the way draws closing in the same minute do.
+Results are compared with ``render_baseline.json``: a kind regresses when its
+p50/p95 time or mean size grows by more than ``--tolerance`` (time also by
+more than ``--min-delta-ms``), when the peak RSS grows by more than
+``--tolerance``, or when a case fails that did not fail in the baseline.
+
+A case that fails because one of its layers is missing from
+``backend/storage/bases`` (e.g. lotoanimalito's 37, seeded by create-games.js
+without a ``bases/1/37.png``) is a finding, not an accepted failure: it never
+goes into the baseline and fails every comparison until the layer exists.
+
+    cd testsprite_tests
+    python -m harness.render                          # compare with the baseline
+    python -m harness.render --update-baseline        # record a new baseline
+    python -m harness.render --concurrency 3 --triple-step 10
+
+Exit codes: 0 within tolerance, 1 regression, 2 no baseline to compare with.
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+from harness.config import ARTIFACTS_DIR, SUITE_DIR
+from harness.database import BACKEND_DIR
+from harness.stats import distribution
+
+BASELINE_PATH = SUITE_DIR / "render_baseline.json"
+DEFAULT_RESULTS = ARTIFACTS_DIR / "render.json"
+
+DRIVER = "src/scripts/bench-images.js"
+
+KINDS = ("ruleta", "animalitos", "triple", "pyramid", "recommendations")
+
+TOLERANCE = float(os.environ.get("TOTE_RENDER_TOLERANCE", "0.2"))
+MIN_DELTA_MS = float(os.environ.get("TOTE_RENDER_MIN_DELTA_MS", "5"))
+
+PERCENTILES = ("p50", "p95")
+
+BASES_DIR = BACKEND_DIR / "storage" / "bases"
+
+# sharp's error for a missing input file, and the layer cache's
+MISSING_LAYER_RE = re.compile(r"(?:Input file is missing|Layer not found): (\S+)")
+
+
+def _children_maxrss():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0
+    return resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+
+
+async def run_driver(args):
+    """The driver's ``RENDER`` records and its peak RSS in MB as reported by the OS."""
+    before = _children_maxrss()
+    process = await asyncio.create_subprocess_exec(
+        "node", DRIVER, "--kinds", ",".join(args.kinds), "--concurrency", str(args.concurrency),
+        "--rounds", str(args.rounds), "--triple-step", str(args.triple_step),
+        "--recommendations", str(args.recommendations),
+        cwd=BACKEND_DIR, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL,
+    )
+    records = []
+    async for raw in process.stdout:
+        line = raw.decode(errors="replace").strip()
+        if line.startswith("RENDER "):
+            records.append(json.loads(line[7:]))
+    await process.wait()
+    if process.returncode != 0:
+        fatal = next((r["error"] for r in records if r["type"] == "fatal"), "no output")
+        raise RuntimeError(f"Render driver failed: {fatal}")
+    after = _children_maxrss()
+    # ru_maxrss is the largest child so far (KB on Linux); only trust it if this run raised it
+    return records, round(after / 1024, 1) if after > before else None
+
+
+def _case(record):
+    return ":".join(str(part) for part in (record["kind"], record["layer"], record["result"]) if part is not None)
+
+
+def _missing_layer(error):
+    match = MISSING_LAYER_RE.search(error or "")
+    if not match:
+        return None
+    layer = Path(match.group(1))
+    return str(layer.relative_to(BASES_DIR)) if layer.is_absolute() and BASES_DIR in layer.parents else str(layer)
+
+
+def summarize(records):
+    images = [r for r in records if r["type"] == "image"]
+    # With --rounds > 1 the later rounds run with sharp's cache warm
+    warm = max((r["round"] for r in images), default=1) > 1
+    kinds = {}
+    for kind in KINDS:
+        rendered = [r for r in images if r["kind"] == kind]
+        if not rendered:
+            continue
+        ok = [r for r in rendered if not r.get("error")]
+        timed = [r for r in ok if r["round"] > 1] if warm else ok
+        entry = {
+            **distribution([r["ms"] for r in timed]),
+            "cold_ms": distribution([r["ms"] for r in ok if r["round"] == 1]) if warm else None,
+            "bytes": distribution([r["bytes"] for r in ok], digits=0),
+            "peak_rss_mb": max(r["peak_rss_mb"] for r in rendered),
+            "failed": sorted({_case(r) for r in rendered if r.get("error") and not _missing_layer(r["error"])}),
+            "errors": sorted({r["error"] for r in rendered if r.get("error")}),
+            "missing_layers": {},
+        }
+        for r in rendered:
+            layer = _missing_layer(r.get("error"))
+            if layer:
+                entry["missing_layers"].setdefault(layer, set()).add(_case(r))
+        entry["missing_layers"] = {layer: sorted(cases) for layer, cases in sorted(entry["missing_layers"].items())}
+        if kind == "ruleta":
+            entry["layers"] = {
+                layer: distribution([r["ms"] for r in timed if r["layer"] == layer])
+                for layer in sorted({r["layer"] for r in rendered})
+            }
+        kinds[kind] = entry
+    return kinds
+
+
+def missing_layers(kinds):
+    """``[(kind, message)]`` for every layer missing from ``storage/bases``."""
+    return [
+        (kind, f"missing layer bases/{layer}: {len(cases)} cases fail ({', '.join(cases[:5])})")
+        for kind, current in kinds.items()
+        for layer, cases in current["missing_layers"].items()
+    ]
+
+
+def compare(kinds, baseline, tolerance, min_delta_ms):
+    """``[(kind, message)]`` for every regression against ``baseline``."""
+    regressions = []
+    for kind, current in kinds.items():
+        before = baseline.get("kinds", {}).get(kind)
+        if not before:
+            continue
+        new_failures = sorted(set(current["failed"]) - set(before.get("failed", [])))
+        if new_failures:
+            regressions.append((kind, f"{len(new_failures)} new failures: {', '.join(new_failures[:5])} "
+                                      f"({'; '.join(current['errors'][:2])})"))
+        if current.get("count"):
+            for pct in PERCENTILES:
+                now, then = current[pct], before.get(pct)
+                if then and now > then * (1 + tolerance) and now - then > min_delta_ms:
+                    regressions.append((kind, f"{pct} {then} → {now} ms (+{(now / then - 1) * 100:.0f}%)"))
+        now, then = current["bytes"].get("mean"), before.get("bytes_mean")
+        if now and then and now > then * (1 + tolerance):
+            regressions.append((kind, f"mean size {then:.0f} → {now:.0f} bytes (+{(now / then - 1) * 100:.0f}%)"))
+        now, then = current["peak_rss_mb"], before.get("peak_rss_mb")
+        if then and now > then * (1 + tolerance):
+            regressions.append((kind, f"peak RSS {then} → {now} MB (+{(now / then - 1) * 100:.0f}%)"))
+    return regressions
+
+
+def load_baseline(path=BASELINE_PATH):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def print_table(kinds, baseline):
+    before = (baseline or {}).get("kinds", {})
+    print(f"{'kind':<16} {'count':>6} {'p50':>8} {'p95':>8} {'max':>8} {'KB':>7} {'RSS MB':>7} {'failed':>6}"
+          f"  baseline p95")
+    for kind, k in kinds.items():
+        kb = round(k["bytes"]["mean"] / 1024) if k["bytes"].get("count") else "-"
+        print(f"{kind:<16} {k['count']:>6} {k.get('p50', '-'):>8} {k.get('p95', '-'):>8} {k.get('max', '-'):>8} "
+              f"{kb:>7} {k['peak_rss_mb']:>7} {len(k['failed']):>6}  {before.get(kind, {}).get('p95', '-')}")
+        for error in k["errors"]:
+            print(f"    ⚠️  {error}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rendering benchmark for the result images")
+    parser.add_argument("kinds", nargs="*", help=f"Only these kinds ({', '.join(KINDS)})")
+    parser.add_argument("-c", "--concurrency", type=int, default=1, help="Images rendered at once")
+    parser.add_argument("--rounds", type=int, default=1,
+                        help="Render every case this many times; with more than one, round 1 counts as cold")
+    parser.add_argument("--triple-step", type=int, default=1, help="Render every Nth triple result")
+    parser.add_argument("--recommendations", type=int, default=10, help="Recommendation images to render")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="Allowed relative growth")
+    parser.add_argument("--min-delta-ms", type=float, default=MIN_DELTA_MS,
+                        help="Time growth below this many ms never counts as a regression")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH))
+    parser.add_argument("--update-baseline", action="store_true", help="Write the results as the new baseline")
+    parser.add_argument("-o", "--output", default=str(DEFAULT_RESULTS))
+    args = parser.parse_args(argv)
+    unknown = set(args.kinds) - set(KINDS)
+    if unknown:
+        parser.error(f"unknown kinds: {', '.join(sorted(unknown))}")
+    args.kinds = args.kinds or list(KINDS)
+
+    records, driver_rss_mb = asyncio.run(run_driver(args))
+    kinds = summarize(records)
+    end = next(r for r in records if r["type"] == "end")
+    run_info = {
+        "concurrency": args.concurrency,
+        "rounds": args.rounds,
+        "triple_step": args.triple_step,
+        "images": end["images"],
+        "images_per_s": round(end["images"] / end["wall_ms"] * 1000, 1) if end["wall_ms"] else None,
+        "max_rss_mb": driver_rss_mb or end["max_rss_mb"],
+        "sharp_concurrency": end["sharp_concurrency"],
+    }
+    baseline_path = Path(args.baseline)
+    baseline = load_baseline(baseline_path)
+    print_table(kinds, baseline)
+    print(f"{run_info['images']} images, {run_info['images_per_s']}/s, peak RSS {run_info['max_rss_mb']} MB")
+
+    findings = missing_layers(kinds)
+    regressions = []
+    if args.update_baseline:
+        baseline_path.write_text(json.dumps({
+            **run_info,
+            "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "kinds": {
+                kind: {
+                    **{pct: k[pct] for pct in PERCENTILES if pct in k},
+                    "bytes_mean": k["bytes"].get("mean"),
+                    "peak_rss_mb": k["peak_rss_mb"],
+                    "failed": k["failed"],
+                }
+                for kind, k in kinds.items()
+            },
+        }, indent=2) + "\n")
+        print(f"Baseline written to {baseline_path}")
+    elif baseline is not None:
+        for key in ("concurrency", "rounds", "triple_step"):
+            if baseline.get(key) != run_info[key]:
+                print(f"⚠️  Baseline was recorded with {key} {baseline.get(key)}, this run used {run_info[key]}",
+                      file=sys.stderr)
+        regressions = compare(kinds, baseline, args.tolerance, args.min_delta_ms)
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        **run_info,
+        "tolerance": args.tolerance,
+        "kinds": kinds,
+        "missing_layers": [{"kind": kind, "detail": detail} for kind, detail in findings],
+        "regressions": [{"kind": kind, "detail": detail} for kind, detail in regressions],
+    }, indent=2))
+    for kind, detail in findings:
+        print(f"❌ {kind}: {detail}")
+    if args.update_baseline:
+        print(f"→ {output}")
+        return 0
+    if baseline is None:
+        print(f"No baseline at {baseline_path}; run with --update-baseline and commit it", file=sys.stderr)
+        return 2
+
+    for kind, detail in regressions:
+        print(f"❌ {kind}: {detail}")
+    if not regressions and not findings:
+        print(f"✅ Every kind within {args.tolerance:.0%} of the baseline")
+    print(f"→ {output}")
+    return 1 if regressions or findings else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
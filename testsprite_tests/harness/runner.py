@@ -0,0 +1,327 @@
+"""Parallel runner for the TC scripts.
+
+Spawns N worker processes; each one keeps a warm :class:`~harness.pool.BrowserPool`
+and runs every test it pulls from the shared queue in its own browser context
+(the scripts' ``run_test(browser)`` entry point, given a pool lease). Results
+and per-worker lease wait times end up in one JSON file.
+
+    cd testsprite_tests
+    python -m harness.runner -j 8
+    python -m harness.runner --plan testsprite_frontend_test_plan.json --shard 1/4
+    python -m harness.runner TC005 TC006
+    python -m harness.runner --compiled -j 4   # the plan's scripts, see harness.executor
+    python -m harness.runner --force           # include tests unchanged since their last green run
+    python -m harness.runner --isolated-db -j 4  # a database clone per slot, see harness.database
+
+A test that raises :class:`unittest.SkipTest` (e.g. TC011 when no draw falls
+within its timeout) is reported as skipped. So are the tests in
+``CRON_TESTS`` under ``--isolated-db``: the slot backends run without the cron
+jobs, which would otherwise publish every draw once per slot.
+"""
+import argparse
+import asyncio
+import contextvars
+import importlib.util
+import json
+import multiprocessing
+import os
+import queue
+import sys
+import time
+import traceback
+from pathlib import Path
+from unittest import SkipTest
+
+from harness.config import ARTIFACTS_DIR, BACKEND_URLS, SUITE_DIR
+from harness.select import record_green
+from harness.select import select as select_changed
+
+DEFAULT_RESULTS = ARTIFACTS_DIR / "results.json"
+DEFAULT_PLAN = SUITE_DIR / "testsprite_frontend_test_plan.json"
+
+# Epoch seconds at which run_one times out the running test
+TEST_DEADLINE = contextvars.ContextVar("test_deadline", default=None)
+
+# Tests that wait on draws the backend's cron jobs create and close (TC006's
+# scheduled draws, TC011's state changes); they need the shared backend
+CRON_TESTS = {"TC006", "TC011"}
+
+
+def time_left():
+    """Seconds left before the running test times out, or None outside the runner."""
+    deadline = TEST_DEADLINE.get()
+    return None if deadline is None else deadline - time.time()
+
+
+def discover(plan=None, only=None):
+    """Return ``[(test_id, path)]`` for the TC scripts, in id order.
+
+    With ``plan`` only the ids listed in the JSON test plan are kept; ``only``
+    further filters by id (``TC005``) or full file stem.
+    """
+    scripts = {path.name[:5]: path for path in sorted(SUITE_DIR.glob("TC[0-9][0-9][0-9]_*.py"))}
+
+    if plan:
+        with open(plan) as f:
+            ids = [entry["id"] for entry in json.load(f)]
+        missing = [test_id for test_id in ids if test_id not in scripts]
+        if missing:
+            print(f"⚠️  Plan entries without a script: {', '.join(missing)}", file=sys.stderr)
+        scripts = {test_id: scripts[test_id] for test_id in ids if test_id in scripts}
+
+    if only:
+        wanted = set(only)
+        scripts = {
+            test_id: path for test_id, path in scripts.items()
+            if test_id in wanted or path.stem in wanted
+        }
+
+    return sorted(scripts.items())
+
+
+def shard(tests, spec):
+    """Keep the ``index/total`` slice of ``tests`` (1-based), e.g. ``"2/4"``."""
+    index, total = (int(part) for part in spec.split("/"))
+    if not 1 <= index <= total:
+        raise ValueError(f"Invalid shard {spec!r}")
+    return tests[index - 1::total]
+
+
+def load_test(path):
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.run_test
+
+
+async def run_one(browser, test_id, path, timeout, run_test=None):
+    """Run one test; ``run_test`` defaults to the script's entry point at ``path``."""
+    started = time.time()
+    result = {"id": test_id, "file": path.name if path else None, "started": started}
+    token = TEST_DEADLINE.set(started + timeout)
+    try:
+        run_test = run_test or load_test(path)
+        await asyncio.wait_for(run_test(browser), timeout)
+        result["status"] = "passed"
+    except SkipTest as e:
+        result["status"] = "skipped"
+        result["reason"] = str(e)
+    except AssertionError as e:
+        result["status"] = "failed"
+        result["error"] = str(e)
+    except asyncio.TimeoutError:
+        result["status"] = "error"
+        result["error"] = f"Timed out after {timeout}s"
+    except Exception as e:
+        result["status"] = "error"
+        result["error"] = f"{type(e).__name__}: {e}"
+        result["traceback"] = traceback.format_exc()
+    finally:
+        TEST_DEADLINE.reset(token)
+    result["duration_s"] = round(time.time() - started, 3)
+    return result
+
+
+async def _worker_main(worker_id, tasks, results, timeout, options):
+    from playwright.async_api import async_playwright
+
+    from harness.pool import BrowserPool
+
+    compiled = None
+    if options.get("compiled"):
+        from harness.executor import compile_plan
+        compiled = compile_plan(options["compiled"])
+
+    consumers = options["browsers"] * options["slots"]
+    databases = []
+
+    async def consume(pool, slot=None):
+        while True:
+            task = await asyncio.to_thread(tasks.get)
+            if task is None:
+                break
+            test_id, path = task
+            async with pool.lease() as browser:
+                token = None
+                if slot:
+                    await slot.reset()
+                    browser = slot.wrap(browser)
+                    token = BACKEND_URLS.set((slot.backend.api_url, slot.backend.origin))
+                try:
+                    result = await run_one(browser, test_id, path, timeout,
+                                            run_test=compiled[test_id] if compiled else None)
+                finally:
+                    if token:
+                        BACKEND_URLS.reset(token)
+            result["worker"] = worker_id
+            results.put(("result", result))
+
+    async def consume_isolated(pool, index):
+        from harness.database import IsolatedSlot
+
+        async with IsolatedSlot(options["isolated_db"], worker_id * consumers + index) as slot:
+            await consume(pool, slot)
+            databases.append(slot.stats())
+
+    async with async_playwright() as pw:
+        async with BrowserPool(pw, size=options["browsers"], slots=options["slots"],
+                               headless=options["headless"]) as pool:
+            if options.get("isolated_db"):
+                await asyncio.gather(*(consume_isolated(pool, i) for i in range(consumers)))
+            else:
+                await asyncio.gather(*(consume(pool) for _ in range(consumers)))
+            stats = pool.stats()
+            if databases:
+                stats["databases"] = databases
+            results.put(("pool", worker_id, stats))
+
+
+def _worker(worker_id, tasks, results, timeout, options):
+    os.chdir(SUITE_DIR)
+    asyncio.run(_worker_main(worker_id, tasks, results, timeout, options))
+
+
+def run(tests, workers, timeout=300, headless=True, browsers=1, slots=1, compiled=None,
+        isolated_db=False):
+    """Run ``tests`` over ``workers`` processes.
+
+    Each worker keeps ``browsers`` warm browsers with ``slots`` concurrent tests
+    per browser. With ``compiled`` (a plan path) the workers run the plan's
+    compiled scripts instead of importing the TC files. With ``isolated_db``
+    every test slot gets its own database clone and backend (see
+    :mod:`harness.database`). Returns ``(results, pool_stats)``.
+    """
+    from harness.session import prepare_storage_state
+
+    # Log in once up front so workers never race on the storage state file
+    asyncio.run(prepare_storage_state(headless=headless))
+
+    template = None
+    if isolated_db:
+        from harness.database import TemplateDatabase
+
+        # Built here so the workers only ever clone it
+        template = asyncio.run(TemplateDatabase().ensure()).name
+
+    ctx = multiprocessing.get_context("spawn")
+    tasks, results = ctx.Queue(), ctx.Queue()
+    for task in tests:
+        tasks.put(task)
+    workers = max(1, min(workers, len(tests)))
+    consumers = browsers * slots
+    for _ in range(workers * consumers):
+        tasks.put(None)
+
+    options = {"headless": headless, "browsers": browsers, "slots": slots,
+               "compiled": str(compiled) if compiled else None, "isolated_db": template}
+    processes = [
+        ctx.Process(target=_worker, args=(i, tasks, results, timeout, options), daemon=True)
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.start()
+
+    collected, pool_stats = [], {}
+    while len(collected) < len(tests) or len(pool_stats) < workers:
+        try:
+            message = results.get(timeout=1)
+        except queue.Empty:
+            if not any(process.is_alive() for process in processes):
+                break
+            continue
+        if message[0] == "pool":
+            pool_stats[message[1]] = message[2]
+            continue
+        result = message[1]
+        collected.append(result)
+        icon = {"passed": "✅", "skipped": "⏭️ "}.get(result["status"], "❌")
+        print(f"{icon} {result['id']} {result['status']} ({result['duration_s']}s, worker {result['worker']})")
+
+    for process in processes:
+        process.join()
+
+    finished = {result["id"] for result in collected}
+    for test_id, path in tests:
+        if test_id not in finished:
+            collected.append({"id": test_id, "file": path.name if path else None, "status": "error", "error": "Worker exited before reporting"})
+
+    return sorted(collected, key=lambda result: result["id"]), pool_stats
+
+
+def write_results(results, path, wall_time, workers, pool_stats=None):
+    summary = {
+        status: sum(1 for r in results if r["status"] == status)
+        for status in ("passed", "failed", "error", "skipped")
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({
+        "wall_time_s": round(wall_time, 3),
+        "workers": workers,
+        "summary": summary,
+        "pool": pool_stats or {},
+        "tests": results,
+    }, indent=2))
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the TC scripts in parallel")
+    parser.add_argument("tests", nargs="*", help="Test ids (TC005) or script names to run")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--plan", nargs="?", const=str(DEFAULT_PLAN), help="Select tests from the JSON test plan")
+    parser.add_argument("--shard", help="Run only slice i/n of the selected tests")
+    parser.add_argument("--timeout", type=float, default=300, help="Per-test timeout in seconds")
+    parser.add_argument("-o", "--output", default=str(DEFAULT_RESULTS), help="Results JSON path")
+    parser.add_argument("--browsers", type=int, default=1, help="Warm browsers per worker")
+    parser.add_argument("--slots", type=int, default=1, help="Concurrent tests per browser")
+    parser.add_argument("--headed", action="store_true")
+    parser.add_argument("--force", action="store_true",
+                        help="Run every selected test, even those unchanged since their last green run")
+    parser.add_argument("--isolated-db", action="store_true",
+                        help="Give every test slot its own database clone and backend")
+    parser.add_argument("--compiled", action="store_true",
+                        help="Run the plan's compiled scripts (harness.executor) instead of the TC files")
+    args = parser.parse_args(argv)
+
+    if args.compiled:
+        from harness.executor import compile_plan
+
+        plan = Path(args.plan or DEFAULT_PLAN)
+        only = set(args.tests)
+        tests = [(test_id, plan) for test_id in sorted(compile_plan(plan)) if not only or test_id in only]
+    else:
+        tests = discover(args.plan, args.tests)
+    if args.shard:
+        tests = shard(tests, args.shard)
+    if not tests:
+        print("No tests selected", file=sys.stderr)
+        return 1
+
+    started = time.time()
+    tests, skipped, hashes = select_changed(tests, args.plan or DEFAULT_PLAN, force=args.force)
+    if args.isolated_db:
+        for test_id, _ in tests:
+            if test_id in CRON_TESTS:
+                skipped[test_id] = "needs the shared backend's cron jobs, run it without --isolated-db"
+        tests = [task for task in tests if task[0] not in CRON_TESTS]
+    for test_id, reason in sorted(skipped.items()):
+        print(f"⏭️  {test_id} skipped ({reason})")
+
+    results, pool_stats = [], {}
+    if tests:
+        results, pool_stats = run(tests, args.workers, args.timeout, headless=not args.headed,
+                                  browsers=args.browsers, slots=args.slots,
+                                  compiled=tests[0][1] if args.compiled else None,
+                                  isolated_db=args.isolated_db)
+        record_green(results, hashes)
+    results += [{"id": test_id, "status": "skipped", "reason": reason} for test_id, reason in skipped.items()]
+    results.sort(key=lambda result: result["id"])
+    summary = write_results(results, Path(args.output), time.time() - started, args.workers, pool_stats)
+
+    print(f"\n{summary['passed']} passed, {summary['failed']} failed, {summary['error']} errors, "
+          f"{summary['skipped']} skipped in {time.time() - started:.1f}s → {args.output}")
+    return 0 if summary["failed"] == summary["error"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,330 @@
+"""Incremental test selection keyed on the source files each TC exercises.
+
+``test_map.json`` lists, per test, the backend API routes and frontend pages
+it touches. It is learned from the step traces (``python -m harness.select
+--learn``): every ``/api/...`` request maps to the route module mounted for it
+in ``backend/src/index.js``, and every page URL to its Next.js
+``app/**/page.js`` plus the layouts above it. Each of those files is expanded
+to its local import closure and hashed together with the test's own inputs
+(its script, its plan entry and the harness).
+
+A test is skipped when that hash matches the one recorded at its last green
+run in ``.artifacts/selection-state.json``. Tests missing from the map always
+run, so nothing is skipped until a map has been learned.
+
+    python -m harness.select                 # which tests would run, and why
+    python -m harness.select --learn         # rebuild test_map.json from .artifacts/traces
+    python -m harness.runner --force         # ignore the state and run everything
+"""
+import argparse
+import hashlib
+import json
+import re
+import sys
+import time
+from functools import lru_cache
+from pathlib import Path
+from urllib.parse import urlparse
+
+from harness.config import ARTIFACTS_DIR, FRONTEND_URL, SUITE_DIR
+
+REPO_DIR = SUITE_DIR.parent
+BACKEND_SRC = REPO_DIR / "backend" / "src"
+FRONTEND_DIR = REPO_DIR / "frontend"
+FRONTEND_APP = FRONTEND_DIR / "app"
+
+MAP_PATH = SUITE_DIR / "test_map.json"
+STATE_PATH = ARTIFACTS_DIR / "selection-state.json"
+
+# Inputs shared by every test on each side of the stack
+BACKEND_COMMON = ["backend/package.json", "backend/prisma/schema.prisma", "backend/src/index.js"]
+FRONTEND_COMMON = ["frontend/package.json", "frontend/next.config.mjs", "frontend/middleware.js"]
+
+_JS_EXTENSIONS = ("", ".js", ".jsx", ".mjs", ".ts", ".tsx", "/index.js", "/index.jsx")
+_IMPORT_RE = re.compile(
+    r"""(?:\bfrom\s*|\bimport\s*\(?\s*|\brequire\s*\(\s*)['"]([^'"]+)['"]"""
+)
+_ROUTE_IMPORT_RE = re.compile(r"""import\s+(\w+)\s+from\s+['"](\./routes/[^'"]+)['"]""")
+_MOUNT_RE = re.compile(r"""app\.use\(\s*['"](/api[^'"]*)['"]\s*,\s*(\w+)\s*\)""")
+
+
+def _rel(path):
+    return path.resolve().relative_to(REPO_DIR.resolve()).as_posix()
+
+
+# -- Import graph -----------------------------------------------------------------
+
+
+def _resolve_import(source, spec):
+    if spec.startswith("@/"):
+        base = FRONTEND_DIR / spec[2:]
+    elif spec.startswith("."):
+        base = source.parent / spec
+    else:
+        return None  # npm package
+    for extension in _JS_EXTENSIONS:
+        candidate = Path(f"{base}{extension}")
+        if candidate.is_file():
+            return candidate.resolve()
+    return None
+
+
+@lru_cache(maxsize=None)
+def _direct_imports(path):
+    try:
+        text = path.read_text(errors="ignore")
+    except OSError:
+        return ()
+    resolved = (_resolve_import(path, spec) for spec in _IMPORT_RE.findall(text))
+    return tuple(sorted({p for p in resolved if p is not None}))
+
+
+def import_closure(paths):
+    """``paths`` plus every local module they import, transitively."""
+    seen = set()
+    stack = [Path(p).resolve() for p in paths]
+    while stack:
+        path = stack.pop()
+        if path in seen or not path.is_file():
+            continue
+        seen.add(path)
+        stack.extend(_direct_imports(path))
+    return seen
+
+
+# -- Routes and pages -------------------------------------------------------------
+
+
+@lru_cache(maxsize=None)
+def backend_mounts():
+    """``[(prefix, route_file)]`` from the ``app.use('/api/...', xRoutes)`` lines, longest prefix first."""
+    index = (BACKEND_SRC / "index.js").read_text()
+    modules = {name: (BACKEND_SRC / path).resolve() for name, path in _ROUTE_IMPORT_RE.findall(index)}
+    mounts = [(prefix, modules[name]) for prefix, name in _MOUNT_RE.findall(index) if name in modules]
+    return sorted(mounts, key=lambda mount: len(mount[0]), reverse=True)
+
+
+def route_files(route):
+    """Route modules serving ``route`` (``/api/draws/:id``); several can share a prefix."""
+    matches = [(prefix, path) for prefix, path in backend_mounts()
+               if route == prefix or route.startswith(prefix.rstrip("/") + "/")]
+    if not matches:
+        return set()
+    longest = len(matches[0][0])
+    return {path for prefix, path in matches if len(prefix) == longest}
+
+
+@lru_cache(maxsize=None)
+def frontend_pages():
+    """``[(regex, page_file)]`` for the Next.js app router, static segments first."""
+    pages = []
+    for page in FRONTEND_APP.rglob("page.js*"):
+        segments = page.parent.relative_to(FRONTEND_APP).parts
+        pattern = "".join(
+            "/[^/]+" if segment.startswith("[") else "/" + re.escape(segment)
+            for segment in segments
+            if not segment.startswith("(")  # route groups do not appear in the URL
+        )
+        pages.append((re.compile(f"^{pattern or '/'}/?$"), page.resolve(), sum(s.startswith("[") for s in segments)))
+    return [(regex, page) for regex, page, _ in sorted(pages, key=lambda p: p[2])]
+
+
+def page_files(path):
+    """``page.js`` serving URL ``path`` plus every ``layout.js`` above it."""
+    for regex, page in frontend_pages():
+        if regex.match(path):
+            files = {page}
+            directory = page.parent
+            while True:
+                files.update(p.resolve() for p in directory.glob("layout.js*"))
+                if directory == FRONTEND_APP:
+                    break
+                directory = directory.parent
+            return files
+    return set()
+
+
+def page_path(url):
+    """Frontend path of ``url``, or None for other origins."""
+    parsed, frontend = urlparse(url), urlparse(FRONTEND_URL)
+    if parsed.netloc != frontend.netloc:
+        return None
+    return parsed.path.rstrip("/") or "/"
+
+
+# -- Learning the map -------------------------------------------------------------
+
+
+def learn(steps_by_test, existing=None):
+    """Build the test map from trace steps; hand-written ``extra`` globs are kept."""
+    test_map = {}
+    for test_id, steps in sorted(steps_by_test.items()):
+        routes, pages = set(), set()
+        for step in steps:
+            for request in step.get("requests", []):
+                routes.add(request["route"])
+            for url in (step.get("url"), step.get("label") if step.get("kind") == "navigate" else None):
+                path = page_path(url) if url else None
+                if path:
+                    pages.add(path)
+        test_map[test_id] = {"routes": sorted(routes), "pages": sorted(pages)}
+        extra = (existing or {}).get(test_id, {}).get("extra")
+        if extra:
+            test_map[test_id]["extra"] = extra
+    return test_map
+
+
+def load_map(path=MAP_PATH):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+# -- Hashing ----------------------------------------------------------------------
+
+
+@lru_cache(maxsize=None)
+def _file_digest(path):
+    try:
+        return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+    except FileNotFoundError:
+        return "missing"
+
+
+def test_inputs(test_id, entry, script=None):
+    """Every source file whose change should re-run ``test_id``."""
+    files = set()
+    for route in entry.get("routes", []):
+        files |= route_files(route)
+    for path in entry.get("pages", []):
+        files |= page_files(path)
+    files = import_closure(files)
+    if entry.get("routes"):
+        files |= {(REPO_DIR / p).resolve() for p in BACKEND_COMMON}
+    if entry.get("pages"):
+        files |= {(REPO_DIR / p).resolve() for p in FRONTEND_COMMON}
+    for pattern in entry.get("extra", []):
+        files |= import_closure(REPO_DIR.glob(pattern))
+    files |= {p.resolve() for p in (SUITE_DIR / "harness").glob("*.py")}
+    if script is not None:
+        files.add(Path(script).resolve())
+    return files
+
+
+def inputs_hash(test_id, entry, script=None, plan_entry=None):
+    digest = hashlib.sha256()
+    for path in sorted(test_inputs(test_id, entry, script), key=_rel):
+        digest.update(f"{_rel(path)}\0{_file_digest(path)}\n".encode())
+    if plan_entry is not None:
+        digest.update(json.dumps(plan_entry, sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+def _plan_entries(plan):
+    try:
+        with open(plan) as f:
+            return {entry["id"]: entry for entry in json.load(f)}
+    except (FileNotFoundError, TypeError):
+        return {}
+
+
+# -- Selection --------------------------------------------------------------------
+
+
+def load_state(path=STATE_PATH):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def select(tests, plan=None, test_map=None, state=None, force=False):
+    """Split ``[(test_id, path)]`` into ``(to_run, skipped, hashes)``.
+
+    ``skipped`` maps each test left out to the reason; ``hashes`` holds the
+    current input hash of every mapped test, for :func:`record_green`.
+    """
+    test_map = load_map() if test_map is None else test_map
+    state = load_state() if state is None else state
+    plan_entries = _plan_entries(plan)
+
+    to_run, skipped, hashes = [], {}, {}
+    for test_id, path in tests:
+        entry = test_map.get(test_id)
+        if entry is None:
+            to_run.append((test_id, path))
+            continue
+        script = path if path and path.suffix == ".py" else None
+        hashes[test_id] = inputs_hash(test_id, entry, script, plan_entries.get(test_id))
+        last_green = state.get(test_id, {}).get("hash")
+        if not force and last_green == hashes[test_id]:
+            skipped[test_id] = f"unchanged since green run at {state[test_id].get('passed_at')}"
+        else:
+            to_run.append((test_id, path))
+    return to_run, skipped, hashes
+
+
+def record_green(results, hashes, path=STATE_PATH):
+    """Remember the input hash of every test that passed; failures are forgotten."""
+    state = load_state(path)
+    now = time.strftime("%Y-%m-%dT%H:%M:%S")
+    for result in results:
+        test_id = result["id"]
+        if result["status"] == "passed" and test_id in hashes:
+            state[test_id] = {"hash": hashes[test_id], "passed_at": now}
+        elif result["status"] != "passed":
+            state.pop(test_id, None)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(state, indent=2, sort_keys=True))
+
+
+def main(argv=None):
+    from harness.runner import DEFAULT_PLAN, discover
+    from harness.trace import load_traces
+
+    parser = argparse.ArgumentParser(description="Incremental test selection")
+    parser.add_argument("tests", nargs="*", help="Only these test ids (TC005)")
+    parser.add_argument("--learn", action="store_true", help="Rebuild test_map.json from the step traces")
+    parser.add_argument("--files", metavar="TC", help="List the input files of one test")
+    parser.add_argument("--force", action="store_true", help="Select every test")
+    args = parser.parse_args(argv)
+
+    if args.learn:
+        steps_by_test = {}
+        for step in load_traces(set(args.tests) or None):
+            steps_by_test.setdefault(step["test_id"], []).append(step)
+        if not steps_by_test:
+            print("No traces to learn from; run the suite first", file=sys.stderr)
+            return 1
+        test_map = load_map()
+        test_map.update(learn(steps_by_test, test_map))
+        MAP_PATH.write_text(json.dumps(dict(sorted(test_map.items())), indent=2) + "\n")
+        print(f"Learned {len(steps_by_test)} test(s) → {MAP_PATH.name}")
+        return 0
+
+    if args.files:
+        entry = load_map().get(args.files)
+        if entry is None:
+            print(f"{args.files} is not in {MAP_PATH.name}", file=sys.stderr)
+            return 1
+        for path in sorted(_rel(p) for p in test_inputs(args.files, entry)):
+            print(path)
+        return 0
+
+    tests = discover(None, args.tests)
+    to_run, skipped, _ = select(tests, DEFAULT_PLAN, force=args.force)
+    mapped = load_map()
+    for test_id, _path in to_run:
+        reason = "changed" if test_id in mapped else "not in test_map.json"
+        print(f"▶️  {test_id} ({reason})")
+    for test_id, reason in sorted(skipped.items()):
+        print(f"⏭️  {test_id} ({reason})")
+    print(f"\n{len(to_run)} to run, {len(skipped)} skipped")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
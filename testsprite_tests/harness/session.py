@@ -0,0 +1,177 @@
+"""Shared authenticated admin session for the testsprite_tests suite.
+
+The admin logs in once per run, either straight against ``POST /api/auth/login``
+(``auth.controller.login``) or through the real /login form, and the resulting
+Playwright storage state is cached under ``.artifacts/``. Every test except
+TC001-TC003 (which exercise the login flow itself) opens its browser context
+from that file instead of typing the credentials again.
+
+Usage inside a TC script::
+
+    from harness.session import new_admin_context
+
+    context = await new_admin_context(browser)
+"""
+import asyncio
+import json
+import os
+import time
+import urllib.error
+import urllib.request
+from urllib.parse import urlparse
+
+from harness.config import (
+    ADMIN_PASSWORD,
+    ADMIN_USERNAME,
+    ARTIFACTS_DIR,
+    FRONTEND_URL,
+    api_url as current_api_url,
+)
+
+STATE_PATH = ARTIFACTS_DIR / "admin-storage-state.json"
+
+# "api" logs in through the backend route, "ui" drives the /login form once
+SESSION_MODE = os.environ.get("TOTE_SESSION_MODE", "api")
+
+# A cached state older than this is considered stale and refreshed. The JWT
+# itself lives 7 days (JWT_EXPIRES_IN), so this only bounds reuse across runs.
+STATE_MAX_AGE = int(os.environ.get("TOTE_SESSION_MAX_AGE", "3600"))
+
+# Cookie lifetime used by the frontend authStore (7 days)
+COOKIE_MAX_AGE = 7 * 24 * 3600
+
+
+def api_login(username=ADMIN_USERNAME, password=ADMIN_PASSWORD, api_url=None):
+    """Call POST /api/auth/login and return its ``data`` payload (user + token)."""
+    api_url = api_url or current_api_url()
+    body = json.dumps({"username": username, "password": password}).encode()
+    request = urllib.request.Request(
+        f"{api_url}/auth/login",
+        data=body,
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            payload = json.load(response)
+    except urllib.error.HTTPError as e:
+        raise RuntimeError(f"Login failed for {username!r}: HTTP {e.code}") from e
+
+    if not payload.get("success"):
+        raise RuntimeError(f"Login failed for {username!r}: {payload.get('error')}")
+    return payload["data"]
+
+
+def build_storage_state(user, token, frontend_url=FRONTEND_URL):
+    """Build a Playwright storage state mirroring what authStore.login() writes.
+
+    The frontend keeps the JWT in localStorage (``accessToken``, ``user`` and the
+    zustand ``auth-storage`` key) and duplicates it into cookies so that the
+    Next.js middleware can authorize /admin routes.
+    """
+    user_json = json.dumps(user, separators=(",", ":"))
+    expires = int(time.time()) + COOKIE_MAX_AGE
+    cookie_defaults = {
+        "domain": urlparse(frontend_url).hostname,
+        "path": "/",
+        "expires": expires,
+        "httpOnly": False,
+        "secure": False,
+        "sameSite": "Lax",
+    }
+    auth_storage = {
+        "state": {"user": user, "token": token, "isAuthenticated": True},
+        "version": 0,
+    }
+    return {
+        "cookies": [
+            {"name": "accessToken", "value": token, **cookie_defaults},
+            {"name": "user", "value": user_json, **cookie_defaults},
+        ],
+        "origins": [
+            {
+                "origin": frontend_url,
+                "localStorage": [
+                    {"name": "accessToken", "value": token},
+                    {"name": "user", "value": user_json},
+                    {"name": "auth-storage", "value": json.dumps(auth_storage)},
+                ],
+            }
+        ],
+    }
+
+
+async def ui_login(browser, username=ADMIN_USERNAME, password=ADMIN_PASSWORD):
+    """Log in through the /login form once and return the captured storage state."""
+    context = await browser.new_context()
+    try:
+        page = await context.new_page()
+        await page.goto(f"{FRONTEND_URL}/login", wait_until="domcontentloaded", timeout=10000)
+        await page.locator('xpath=html/body/div/div/div/div[3]/form/div/div/input').fill(username)
+        await page.locator('xpath=html/body/div/div/div/div[3]/form/div[2]/div/input').fill(password)
+        async with page.expect_response(lambda r: r.url.endswith("/auth/login"), timeout=10000) as info:
+            await page.locator('xpath=html/body/div/div/div/div[3]/form/button').click()
+        response = await info.value
+        if not response.ok:
+            raise RuntimeError(f"Login failed for {username!r}: HTTP {response.status}")
+        await page.wait_for_function("() => !!localStorage.getItem('accessToken')", timeout=10000)
+        return await context.storage_state()
+    finally:
+        await context.close()
+
+
+def _is_fresh(path):
+    try:
+        return time.time() - path.stat().st_mtime < STATE_MAX_AGE
+    except FileNotFoundError:
+        return False
+
+
+def _write_state(state):
+    STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = STATE_PATH.with_suffix(f".{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(state, indent=2))
+    # Atomic so concurrent workers never read a half-written file
+    os.replace(tmp_path, STATE_PATH)
+
+
+async def ensure_storage_state(browser=None, refresh=False):
+    """Return the path of a fresh admin storage state, logging in only if needed.
+
+    ``browser`` is only required when ``TOTE_SESSION_MODE=ui``.
+    """
+    if not refresh and _is_fresh(STATE_PATH):
+        return str(STATE_PATH)
+
+    if SESSION_MODE == "ui":
+        if browser is None:
+            raise ValueError("TOTE_SESSION_MODE=ui needs a browser to log in with")
+        state = await ui_login(browser)
+    else:
+        data = await asyncio.to_thread(api_login)
+        state = build_storage_state(data["user"], data["token"])
+
+    _write_state(state)
+    return str(STATE_PATH)
+
+
+async def prepare_storage_state(headless=True, refresh=False):
+    """:func:`ensure_storage_state` for callers without a browser (the runners'
+    upfront login); launches a short-lived one when ``TOTE_SESSION_MODE=ui``."""
+    if SESSION_MODE != "ui" or (not refresh and _is_fresh(STATE_PATH)):
+        return await ensure_storage_state(refresh=refresh)
+
+    from playwright.async_api import async_playwright
+
+    async with async_playwright() as pw:
+        browser = await pw.chromium.launch(headless=headless)
+        try:
+            return await ensure_storage_state(browser, refresh=refresh)
+        finally:
+            await browser.close()
+
+
+async def new_admin_context(browser, **kwargs):
+    """Open a browser context that is already logged in as the admin user."""
+    storage_state = await ensure_storage_state(browser)
+    return await browser.new_context(storage_state=storage_state, **kwargs)
@@ -0,0 +1,26 @@
+"""Small percentile helpers shared by the traces, pools and benchmarks."""
+import statistics
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of ``values`` (``pct`` in 0-100), or None if empty."""
+    values = sorted(values)
+    if not values:
+        return None
+    index = min(len(values) - 1, max(0, round(pct / 100 * len(values)) - 1))
+    return values[index]
+
+
+def distribution(values, digits=1):
+    """count / mean / p50 / p95 / p99 / max of ``values``."""
+    values = [v for v in values if v is not None]
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "mean": round(statistics.fmean(values), digits),
+        "p50": round(percentile(values, 50), digits),
+        "p95": round(percentile(values, 95), digits),
+        "p99": round(percentile(values, 99), digits),
+        "max": round(max(values), digits),
+    }
@@ -0,0 +1,255 @@
+"""Reconnection storm for the Socket.IO clients (TC017 under load).
+
+Puts a :class:`~harness.proxy.TcpProxy` between a fleet of reconnecting
+Socket.IO clients and ``socket-fanout-server.js`` (see :mod:`harness.fanout`),
+keeps draw events flowing, then cuts every proxied connection, or
+``--fraction`` of them, and refuses new ones for ``--outage`` seconds. The
+clients back off and reconnect like ``socket.io-client`` does in the frontend
+and join their ``game:<slug>`` room again on connect.
+
+The report (``.artifacts/storm.json``) gives:
+
+* how long the fleet took to reconnect (per client and the slowest one), as
+  seen by the clients;
+* how long the server's rooms took to hold every client again (re-join);
+* which draw events each client lost, split into lost while disconnected and
+  lost after reconnecting (the room had not been joined again yet);
+* the server's CPU, event-loop delay and connections per second over time.
+
+    cd testsprite_tests
+    python -m harness.storm --clients 2000 --outage 3
+    python -m harness.storm --clients 5000 --fraction 0.3 --shards 4
+    python -m harness.storm --clients 1000 --no-rejoin   # the frontend does not re-join rooms
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+from harness.config import ARTIFACTS_DIR
+from harness.fanout import DEFAULT_GAMES, ClientShards, FanoutServer, raise_fd_limit
+from harness.proxy import TcpProxy
+from harness.stats import distribution
+
+DEFAULT_REPORT = ARTIFACTS_DIR / "storm.json"
+
+
+async def _emit_until(server, games, interval, stop):
+    seq = 0
+    while not stop.is_set():
+        seq += 1
+        await server.emit_draw(seq, games[seq % len(games)])
+        try:
+            await asyncio.wait_for(stop.wait(), interval)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def _sample(server, proxy, interval, samples, stop):
+    while not stop.is_set():
+        sample = await server.stats()
+        sample["proxy_open"] = proxy.stats()["open"]
+        samples.append(sample)
+        try:
+            await asyncio.wait_for(stop.wait(), interval)
+        except asyncio.TimeoutError:
+            pass
+
+
+def _full(sample, clients, rooms):
+    return sample["clients"] >= clients and all(sample["rooms"].get(slug, 0) >= n for slug, n in rooms.items())
+
+
+async def _wait_rejoined(samples, clients, rooms, cut_at, timeout, poll):
+    """Epoch seconds of the first sample after the cut with every client back in its room."""
+    deadline = cut_at + timeout
+    dipped = False
+    while time.time() < deadline:
+        for sample in samples:
+            at = sample["at"] / 1000
+            if at <= cut_at:
+                continue
+            if not _full(sample, clients, rooms):
+                dipped = True
+            elif dipped or at > cut_at + 2 * poll:
+                # Storms shorter than a poll never show the dip
+                return at
+        await asyncio.sleep(poll / 2)
+    return None
+
+
+def _reconnects(transitions, cut_at):
+    """``{client: (disconnected_at, reconnected_at or None)}`` for clients dropped by the cut."""
+    gaps = {}
+    for client, kind, at in transitions:
+        if at < cut_at:
+            continue
+        if kind == "disconnect" and client not in gaps:
+            gaps[client] = [at, None]
+        elif kind == "connect" and client in gaps and gaps[client][1] is None:
+            gaps[client][1] = at
+    return {client: tuple(gap) for client, gap in gaps.items()}
+
+
+def losses(emitted, received, slugs, gaps):
+    """Deliveries that never arrived, by cause, and the events that lost any."""
+    got = {(client, draw_id, kind) for client, draw_id, kind, _latency in received}
+    lost = {"during_gap": 0, "after_reconnect": 0, "unexplained": 0}
+    per_client = {}
+    lost_events = {}
+    for event in emitted:
+        draw_id, sent_at = f"fanout-{event['seq']}", event["sent_at"] / 1000
+        for client, slug in slugs.items():
+            for kind in ("all", "room") if slug == event["game"] else ("all",):
+                if (client, draw_id, kind) in got:
+                    continue
+                gap = gaps.get(client)
+                if gap and gap[0] <= sent_at and (gap[1] is None or sent_at < gap[1]):
+                    cause = "during_gap"
+                elif gap and gap[1] is not None and sent_at >= gap[1]:
+                    cause = "after_reconnect"
+                else:
+                    cause = "unexplained"
+                lost[cause] += 1
+                per_client[client] = per_client.get(client, 0) + 1
+                lost_events.setdefault(event["seq"], {"game": event["game"], "deliveries": 0})
+                lost_events[event["seq"]]["deliveries"] += 1
+    return {
+        "deliveries": lost,
+        "per_affected_client": distribution(list(per_client.values())),
+        "events": {str(seq): info for seq, info in sorted(lost_events.items())},
+    }
+
+
+def server_load(samples, cut_at):
+    series = []
+    for sample in samples:
+        wall_s = sample["wall_ms"] / 1000 or None
+        series.append({
+            "t_s": round(sample["at"] / 1000 - cut_at, 2),
+            "clients": sample["clients"],
+            "proxy_open": sample["proxy_open"],
+            "connections_per_s": round(sample["connections"] / wall_s, 1) if wall_s else None,
+            "cpu_pct": sample["cpu_pct"],
+            "loop_delay_max_ms": sample["loop_delay_max_ms"],
+            "rss_mb": sample["rss_mb"],
+        })
+    before = [s for s in series if s["t_s"] <= 0]
+    after = [s for s in series if s["t_s"] > 0]
+
+    def peak(rows, key):
+        return max((r[key] for r in rows if r[key] is not None), default=None)
+
+    return {
+        "before": {key: peak(before, key) for key in ("cpu_pct", "loop_delay_max_ms", "rss_mb")},
+        "storm": {key: peak(after, key) for key in ("cpu_pct", "loop_delay_max_ms", "rss_mb", "connections_per_s")},
+        "series": series,
+    }
+
+
+async def run(args):
+    async with FanoutServer(args.port) as server:
+        async with TcpProxy(args.proxy_port, "localhost", args.port) as proxy:
+            with ClientShards(proxy.url, args.shards, reconnect=True, rejoin=args.rejoin) as shards:
+                grown = await shards.grow_to(args.clients, args.games)
+                await asyncio.sleep(args.settle)
+                await shards.collect()
+                rooms, clients = shards.rooms, shards.total
+                first_emitted = len(server.emitted)
+
+                stop, samples = asyncio.Event(), []
+                emitter = asyncio.create_task(_emit_until(server, args.games, args.interval, stop))
+                sampler = asyncio.create_task(_sample(server, proxy, args.poll, samples, stop))
+                await asyncio.sleep(args.before)
+
+                cut_at = time.time()
+                dropped = proxy.cut(args.fraction, seed=args.seed)
+                outage = asyncio.create_task(proxy.outage(args.outage))
+                rejoined_at = await _wait_rejoined(samples, clients, rooms, cut_at, args.timeout, args.poll)
+                await outage
+                await asyncio.sleep(args.after)
+
+                stop.set()
+                await asyncio.gather(emitter, sampler)
+                await asyncio.sleep(args.drain)
+                collected = await shards.collect()
+                emitted = server.emitted[first_emitted:]
+                slugs = dict(shards.slugs)
+
+    gaps = _reconnects(collected["transitions"], cut_at)
+    reconnect_ms = [(back - cut_at) * 1000 for _, back in gaps.values() if back is not None]
+    return {
+        "clients": clients,
+        "connect_failed": grown["failed"],
+        "fraction": args.fraction,
+        "outage_s": args.outage,
+        "rejoin": args.rejoin,
+        "dropped": dropped,
+        "disconnected": len(gaps),
+        "reconnected": len(reconnect_ms),
+        "not_reconnected": len(gaps) - len(reconnect_ms),
+        "reconnect_ms": distribution(reconnect_ms),
+        "fleet_reconnect_ms": round(max(reconnect_ms), 1) if reconnect_ms else None,
+        "rejoin_ms": round((rejoined_at - cut_at) * 1000, 1) if rejoined_at else None,
+        "events": len(emitted),
+        "lost": losses(emitted, collected["received"], slugs, gaps),
+        "server": server_load(samples, cut_at),
+        "refused_during_outage": proxy.refused,
+    }
+
+
+def print_report(report):
+    print(f"{report['dropped']} of {report['clients']} connections cut, outage {report['outage_s']}s")
+    print(f"reconnected {report['reconnected']}/{report['disconnected']}: "
+          f"p50 {report['reconnect_ms'].get('p50', '-')} ms, p95 {report['reconnect_ms'].get('p95', '-')} ms, "
+          f"fleet {report['fleet_reconnect_ms']} ms")
+    rejoin = f"{report['rejoin_ms']} ms" if report["rejoin_ms"] is not None else "never (timed out)"
+    print(f"rooms whole again after {rejoin}")
+    lost = report["lost"]["deliveries"]
+    print(f"lost deliveries: {lost['during_gap']} during the gap, {lost['after_reconnect']} after reconnecting, "
+          f"{lost['unexplained']} unexplained, over {len(report['lost']['events'])} of {report['events']} events")
+    storm, before = report["server"]["storm"], report["server"]["before"]
+    print(f"server: cpu {before['cpu_pct']}% → {storm['cpu_pct']}%, "
+          f"loop delay {before['loop_delay_max_ms']} → {storm['loop_delay_max_ms']} ms, "
+          f"peak {storm['connections_per_s']} connections/s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reconnection storm for the Socket.IO clients")
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--games", type=lambda v: v.split(","), default=DEFAULT_GAMES,
+                        help="Comma-separated game slugs whose rooms the clients join")
+    parser.add_argument("--shards", type=int, default=max(1, min(8, (os.cpu_count() or 2) // 2)),
+                        help="Client processes")
+    parser.add_argument("--fraction", type=float, default=1.0, help="Share of the connections to cut")
+    parser.add_argument("--outage", type=float, default=3, help="Seconds new connections are refused after the cut")
+    parser.add_argument("--no-rejoin", dest="rejoin", action="store_false",
+                        help="Do not join the room again on reconnect, like the frontend's SocketService")
+    parser.add_argument("--interval", type=float, default=0.5, help="Seconds between draw events")
+    parser.add_argument("--poll", type=float, default=0.25, help="Seconds between server samples")
+    parser.add_argument("--settle", type=float, default=2, help="Seconds after connecting before the storm")
+    parser.add_argument("--before", type=float, default=3, help="Seconds of traffic before the cut")
+    parser.add_argument("--after", type=float, default=5, help="Seconds of traffic after the outage")
+    parser.add_argument("--drain", type=float, default=3, help="Seconds to wait for late deliveries")
+    parser.add_argument("--timeout", type=float, default=120, help="Seconds to wait for the rooms to refill")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for choosing the connections to cut")
+    parser.add_argument("--port", type=int, default=3198, help="Port of the fan-out server")
+    parser.add_argument("--proxy-port", type=int, default=3197, help="Port the clients connect to")
+    parser.add_argument("-o", "--output", default=str(DEFAULT_REPORT))
+    args = parser.parse_args(argv)
+
+    raise_fd_limit()
+    report = asyncio.run(run(args))
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print_report(report)
+    print(f"→ {output}")
+    return 0 if report["not_reconnected"] == 0 and report["rejoin_ms"] is not None else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,246 @@
+"""Per-step JSONL traces for the TC scripts, and a suite-wide summarizer.
+
+Every step run through :class:`harness.waits.Steps` (navigate, fill, click,
+assertion, ...) is written as one JSON line with its start/end timestamps and
+the backend requests it triggered. A request belongs to the step that was
+running when it started, or to the last finished step if it started in between
+(the loads a click sets off). Each request carries the client-side timing and
+the ``Server-Timing: app;dur=...`` value the backend adds, so a slow step can
+be split into time spent in the backend and time spent in the browser.
+
+    python -m harness.trace                    # summarize .artifacts/traces/*.jsonl
+    python -m harness.trace --slowest 20 TC019
+"""
+import argparse
+import asyncio
+import json
+import re
+import sys
+from collections import defaultdict
+
+from harness.config import ARTIFACTS_DIR
+from harness.stats import percentile
+
+TRACE_DIR = ARTIFACTS_DIR / "traces"
+
+_SERVER_TIMING_RE = re.compile(r"(?:^|,)\s*app;dur=([\d.]+)")
+_ID_SEGMENT_RE = re.compile(r"/(?:[0-9a-f]{8}-[0-9a-f-]{27}|\d+)(?=/|$)", re.I)
+
+
+def parse_server_timing(header):
+    """Return the ``app`` duration in ms from a Server-Timing header, or None."""
+    if not header:
+        return None
+    match = _SERVER_TIMING_RE.search(header)
+    return float(match.group(1)) if match else None
+
+
+def route_of(url):
+    """``http://host/api/draws/<uuid>?x=1`` → ``/api/draws/:id``."""
+    path = url.split("://", 1)[-1]
+    path = path[path.find("/"):] if "/" in path else "/"
+    return _ID_SEGMENT_RE.sub("/:id", path.split("?", 1)[0])
+
+
+def _covered_ms(intervals, start, end):
+    """Length of the union of ``intervals`` clipped to ``[start, end]`` (seconds in, ms out)."""
+    clipped = sorted((max(s, start), min(e, end)) for s, e in intervals if e > start and s < end)
+    total, cursor = 0.0, start
+    for s, e in clipped:
+        s = max(s, cursor)
+        if e > s:
+            total += e - s
+            cursor = e
+    return total * 1000
+
+
+class Tracer:
+    """Collects steps and backend requests for one test."""
+
+    def __init__(self, page, test_id):
+        self.test_id = test_id
+        self.steps = []
+        self.requests = []
+        self._pending = set()
+        page.on("requestfinished", self._on_finished)
+        page.on("requestfailed", self._on_failed)
+
+    def add_step(self, entry):
+        self.steps.append(entry)
+
+    def _step_index(self, started):
+        # Requests issued before the first step (initial page load) go to it
+        for index in range(len(self.steps) - 1, -1, -1):
+            if self.steps[index]["start"] <= started:
+                return index
+        return 0 if self.steps else None
+
+    def _on_finished(self, request):
+        if "/api/" in request.url:
+            task = asyncio.ensure_future(self._collect(request, failed=False))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+
+    def _on_failed(self, request):
+        if "/api/" in request.url:
+            task = asyncio.ensure_future(self._collect(request, failed=True))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+
+    async def _collect(self, request, failed):
+        timing = request.timing
+        started = timing["startTime"] / 1000
+        duration = timing["responseEnd"] if timing.get("responseEnd", -1) >= 0 else None
+        entry = {
+            "method": request.method,
+            "url": request.url,
+            "route": route_of(request.url),
+            "start": started,
+            "duration_ms": round(duration, 1) if duration is not None else None,
+            "ttfb_ms": round(timing["responseStart"], 1) if timing.get("responseStart", -1) >= 0 else None,
+        }
+        if failed:
+            entry["failure"] = request.failure
+        else:
+            response = await request.response()
+            if response is not None:
+                entry["status"] = response.status
+                entry["server_ms"] = parse_server_timing(await response.header_value("server-timing"))
+        self.requests.append(entry)
+
+    def _attach_requests(self):
+        self.steps.sort(key=lambda step: step["start"])
+        by_step = defaultdict(list)
+        for request in self.requests:
+            index = self._step_index(request["start"])
+            if index is not None:
+                by_step[index].append(request)
+
+        for index, step in enumerate(self.steps):
+            requests = sorted(by_step.get(index, []), key=lambda r: r["start"])
+            intervals = [
+                (r["start"], r["start"] + r["duration_ms"] / 1000)
+                for r in requests if r.get("duration_ms") is not None
+            ]
+            backend_ms = _covered_ms(intervals, step["start"], step["end"])
+            step["requests"] = requests
+            step["backend_ms"] = round(backend_ms, 1)
+            step["frontend_ms"] = round(max(step["duration_ms"] - backend_ms, 0), 1)
+
+    async def flush(self):
+        """Wait for in-flight request bookkeeping before writing."""
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+
+    def write(self):
+        """Write ``.artifacts/traces/<test_id>.jsonl`` (one step per line)."""
+        self._attach_requests()
+        TRACE_DIR.mkdir(parents=True, exist_ok=True)
+        path = TRACE_DIR / f"{self.test_id}.jsonl"
+        with open(path, "w") as f:
+            for index, step in enumerate(self.steps):
+                f.write(json.dumps({"test_id": self.test_id, "step": index, **step}) + "\n")
+        return path
+
+
+# -- Summarizer ---------------------------------------------------------------
+
+
+def load_traces(test_ids=None):
+    steps = []
+    for path in sorted(TRACE_DIR.glob("*.jsonl")):
+        if test_ids and path.stem not in test_ids:
+            continue
+        with open(path) as f:
+            steps.extend(json.loads(line) for line in f if line.strip())
+    return steps
+
+
+def summarize(steps, slowest=10):
+    by_kind = defaultdict(list)
+    by_route = defaultdict(list)
+    for step in steps:
+        by_kind[step["kind"]].append(step)
+        for request in step.get("requests", []):
+            by_route[f"{request['method']} {request['route']}"].append(request)
+
+    kinds = {}
+    for kind, items in sorted(by_kind.items()):
+        durations = [s["duration_ms"] for s in items]
+        kinds[kind] = {
+            "count": len(items),
+            "p50_ms": percentile(durations, 50),
+            "p95_ms": percentile(durations, 95),
+            "backend_p50_ms": percentile([s.get("backend_ms", 0) for s in items], 50),
+            "frontend_p50_ms": percentile([s.get("frontend_ms", s["duration_ms"]) for s in items], 50),
+        }
+
+    routes = {}
+    for route, items in sorted(by_route.items()):
+        client = [r["duration_ms"] for r in items if r.get("duration_ms") is not None]
+        server = [r["server_ms"] for r in items if r.get("server_ms") is not None]
+        routes[route] = {
+            "count": len(items),
+            "p50_ms": percentile(client, 50),
+            "p95_ms": percentile(client, 95),
+            "server_p50_ms": percentile(server, 50),
+            "server_p95_ms": percentile(server, 95),
+        }
+
+    top = sorted(steps, key=lambda s: s["duration_ms"], reverse=True)[:slowest]
+    return {
+        "steps": len(steps),
+        "by_kind": kinds,
+        "by_route": routes,
+        "slowest": [
+            {key: s.get(key) for key in ("test_id", "step", "kind", "label", "duration_ms", "backend_ms", "frontend_ms", "ok")}
+            for s in top
+        ],
+    }
+
+
+def _fmt(value):
+    return "-" if value is None else f"{value:.0f}"
+
+
+def print_summary(summary):
+    print(f"{summary['steps']} steps\n")
+    print(f"{'kind':<12} {'n':>5} {'p50':>8} {'p95':>8} {'backend p50':>12} {'frontend p50':>13}")
+    for kind, s in summary["by_kind"].items():
+        print(f"{kind:<12} {s['count']:>5} {_fmt(s['p50_ms']):>8} {_fmt(s['p95_ms']):>8} "
+              f"{_fmt(s['backend_p50_ms']):>12} {_fmt(s['frontend_p50_ms']):>13}")
+
+    print(f"\n{'route':<50} {'n':>5} {'p50':>8} {'p95':>8} {'srv p50':>8} {'srv p95':>8}")
+    for route, s in summary["by_route"].items():
+        print(f"{route[:50]:<50} {s['count']:>5} {_fmt(s['p50_ms']):>8} {_fmt(s['p95_ms']):>8} "
+              f"{_fmt(s['server_p50_ms']):>8} {_fmt(s['server_p95_ms']):>8}")
+
+    print("\nSlowest steps:")
+    for s in summary["slowest"]:
+        icon = "✅" if s["ok"] else "❌"
+        print(f"  {icon} {s['test_id']}#{s['step']} {s['kind']:<10} {_fmt(s['duration_ms']):>7} ms "
+              f"(backend {_fmt(s['backend_ms'])}, frontend {_fmt(s['frontend_ms'])})  {s['label']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize E2E step traces")
+    parser.add_argument("tests", nargs="*", help="Only these test ids (TC019)")
+    parser.add_argument("--slowest", type=int, default=10)
+    parser.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    args = parser.parse_args(argv)
+
+    steps = load_traces(set(args.tests) or None)
+    if not steps:
+        print(f"No traces in {TRACE_DIR}", file=sys.stderr)
+        return 1
+
+    summary = summarize(steps, args.slowest)
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print_summary(summary)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
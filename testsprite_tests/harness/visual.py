@@ -0,0 +1,252 @@
+"""Visual regression suite for the result images.
+
+Runs ``backend/src/scripts/render-visual-cases.js``, which renders a fixed set
+of draws through ``lib/imageGenerator.js`` (every template, the Ruleta's
+special-date layers, the zero/double-zero and X00 special cases, the Triple's
+own 10-12 hour images, a seeded recommendations image) into
+``.artifacts/visual/rendered``, and compares each image with its golden in
+``visual_goldens/`` across a process pool:
+
+- a pixel diff in NumPy: the share of pixels where any RGBA channel moved by
+  more than ``--pixel-tolerance`` must stay under ``--max-changed``;
+- a 64-bit perceptual hash (DCT of the 32x32 grayscale image): the Hamming
+  distance to the golden's must stay under ``--max-distance``.
+
+The pixel diff catches a wrong date or number; the hash tolerates the
+off-by-one rounding of precomposited layers or a recompressed base while
+catching shifted or swapped layers. For every failing case a diff image
+(golden | rendered | changed pixels in red) goes to ``.artifacts/visual/diffs``.
+
+Goldens are always recorded with ``IMAGE_LAYER_CACHE=false``, the full
+composite of every layer, so they can catch a regression of the layer cache;
+``--layer-cache`` renders the comparison with the cache on. How they were
+recorded (sharp and libvips versions) is kept in ``visual_goldens/goldens.json``
+and a comparison run on other versions warns about it.
+
+    cd testsprite_tests
+    python -m harness.visual --update-goldens     # record them, then commit visual_goldens/
+    python -m harness.visual                      # compare with the goldens
+    python -m harness.visual --layer-cache        # the same, through the layer cache
+    python -m harness.visual --only triple_100,ruleta_navidad_05 -w 4
+
+Exit codes: 0 all match, 1 a case differs or failed to render, 2 no goldens.
+Needs Pillow and NumPy.
+"""
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from harness.config import ARTIFACTS_DIR, SUITE_DIR
+from harness.database import BACKEND_DIR
+
+GOLDENS_DIR = Path(os.environ.get("TOTE_VISUAL_GOLDENS", SUITE_DIR / "visual_goldens"))
+VISUAL_DIR = ARTIFACTS_DIR / "visual"
+DEFAULT_REPORT = ARTIFACTS_DIR / "visual.json"
+
+DRIVER = "src/scripts/render-visual-cases.js"
+
+PIXEL_TOLERANCE = int(os.environ.get("TOTE_VISUAL_PIXEL_TOLERANCE", "8"))
+MAX_CHANGED = float(os.environ.get("TOTE_VISUAL_MAX_CHANGED", "0.001"))
+MAX_DISTANCE = int(os.environ.get("TOTE_VISUAL_MAX_DISTANCE", "4"))
+
+HASH_SIZE = 32  # the DCT runs on a 32x32 thumbnail, the hash keeps its 8x8 low frequencies
+
+
+async def run_driver(out_dir, only=None, layer_cache=False):
+    """The driver's ``VISUAL`` image records and its ``end`` record, with the rendered files in ``out_dir``."""
+    command = ["node", DRIVER, "--out", str(out_dir)]
+    if only:
+        command += ["--only", ",".join(only)]
+    process = await asyncio.create_subprocess_exec(
+        *command, cwd=BACKEND_DIR, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL,
+        env={**os.environ, "IMAGE_LAYER_CACHE": "true" if layer_cache else "false"},
+    )
+    records = []
+    async for raw in process.stdout:
+        line = raw.decode(errors="replace").strip()
+        if line.startswith("VISUAL "):
+            records.append(json.loads(line[7:]))
+    await process.wait()
+    if process.returncode != 0:
+        fatal = next((r["error"] for r in records if r["type"] == "fatal"), "no output")
+        raise RuntimeError(f"Visual driver failed: {fatal}")
+    return [r for r in records if r["type"] == "image"], next(r for r in records if r["type"] == "end")
+
+
+def _dct_matrix(n):
+    import numpy as np
+
+    k = np.arange(n)[:, None]
+    x = np.arange(n)[None, :]
+    matrix = np.cos(np.pi * (2 * x + 1) * k / (2 * n)) * np.sqrt(2 / n)
+    matrix[0] /= np.sqrt(2)
+    return matrix
+
+
+def phash(image):
+    """64-bit perceptual hash of a Pillow image."""
+    import numpy as np
+    from PIL import Image
+
+    gray = np.asarray(image.convert("L").resize((HASH_SIZE, HASH_SIZE), Image.LANCZOS), dtype=np.float64)
+    dct = _dct_matrix(HASH_SIZE)
+    low = (dct @ gray @ dct.T)[:8, :8].flatten()
+    bits = low > np.median(low[1:])  # the DC term would skew the median
+    return int("".join("1" if bit else "0" for bit in bits), 2)
+
+
+def _diff_image(golden, rendered, changed):
+    """Golden, rendered and the changed pixels in red over the dimmed golden, side by side."""
+    import numpy as np
+    from PIL import Image
+
+    heat = (golden[..., :3].mean(axis=2, keepdims=True) * 0.3).repeat(3, axis=2).astype(np.uint8)
+    heat[changed] = (255, 0, 0)
+    return Image.fromarray(np.concatenate([golden[..., :3], rendered[..., :3], heat], axis=1), "RGB")
+
+
+def compare(job):
+    """Result of comparing one rendered image with its golden; writes the diff image when it fails."""
+    import numpy as np
+    from PIL import Image
+
+    name, golden_path, rendered_path, diff_path, pixel_tolerance, max_changed, max_distance = job
+    with Image.open(golden_path) as g, Image.open(rendered_path) as r:
+        golden_hash, rendered_hash = phash(g), phash(r)
+        golden = np.asarray(g.convert("RGBA"))
+        rendered = np.asarray(r.convert("RGBA"))
+    result = {"name": name, "distance": bin(golden_hash ^ rendered_hash).count("1")}
+    if golden.shape != rendered.shape:
+        return {**result, "ok": False, "reason": f"size {rendered.shape[1]}x{rendered.shape[0]}, "
+                                                  f"golden {golden.shape[1]}x{golden.shape[0]}"}
+    delta = np.abs(golden.astype(np.int16) - rendered.astype(np.int16))
+    changed = delta.max(axis=2) > pixel_tolerance
+    result.update(changed=round(float(changed.mean()), 6), max_delta=int(delta.max()))
+    reasons = []
+    if result["changed"] > max_changed:
+        reasons.append(f"{result['changed']:.2%} of pixels changed")
+    if result["distance"] > max_distance:
+        reasons.append(f"perceptual distance {result['distance']}")
+    result["ok"] = not reasons
+    if reasons:
+        result["reason"] = ", ".join(reasons)
+        Path(diff_path).parent.mkdir(parents=True, exist_ok=True)
+        _diff_image(golden, rendered, changed).save(diff_path)
+        result["diff"] = str(diff_path)
+    return result
+
+
+def run_comparisons(records, goldens_dir, args):
+    jobs = [
+        (r["name"], str(goldens_dir / f"{r['name']}.png"), r["path"], str(VISUAL_DIR / "diffs" / f"{r['name']}.png"),
+         args.pixel_tolerance, args.max_changed, args.max_distance)
+        for r in records if not r.get("error") and (goldens_dir / f"{r['name']}.png").exists()
+    ]
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        return list(pool.map(compare, jobs))
+
+
+def load_recording(goldens_dir):
+    try:
+        with open(goldens_dir / "goldens.json") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Visual regression suite for the result images")
+    parser.add_argument("--only", type=lambda v: v.split(","), help="Comma-separated case names")
+    parser.add_argument("--goldens", default=str(GOLDENS_DIR))
+    parser.add_argument("--update-goldens", action="store_true",
+                        help="Write the renders as the new goldens (always without the layer cache)")
+    parser.add_argument("--layer-cache", action="store_true",
+                        help="Render with IMAGE_LAYER_CACHE=true to compare the cached path with the goldens")
+    parser.add_argument("--pixel-tolerance", type=int, default=PIXEL_TOLERANCE,
+                        help="Channel difference (0-255) below which a pixel counts as unchanged")
+    parser.add_argument("--max-changed", type=float, default=MAX_CHANGED, help="Allowed share of changed pixels")
+    parser.add_argument("--max-distance", type=int, default=MAX_DISTANCE, help="Allowed perceptual hash distance")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Processes (default: one per CPU)")
+    parser.add_argument("-o", "--output", default=str(DEFAULT_REPORT))
+    args = parser.parse_args(argv)
+    if args.update_goldens and args.layer_cache:
+        parser.error("goldens are recorded from the full composite; drop --layer-cache")
+
+    rendered_dir = VISUAL_DIR / "rendered"
+    shutil.rmtree(VISUAL_DIR, ignore_errors=True)
+    records, end = asyncio.run(run_driver(rendered_dir, args.only, args.layer_cache))
+    failed = [r for r in records if r.get("error")]
+    for r in failed:
+        print(f"❌ {r['name']}: render failed: {r['error']}")
+    if len(failed) == len(records):
+        # Nothing to compare (or record); a broken renderer is a regression, not missing goldens
+        print(f"No case rendered ({len(failed)} failed{', --only matched none' if not records else ''})",
+              file=sys.stderr)
+        return 1
+
+    goldens_dir = Path(args.goldens)
+    if args.update_goldens:
+        goldens_dir.mkdir(parents=True, exist_ok=True)
+        for r in records:
+            if not r.get("error"):
+                shutil.copyfile(r["path"], goldens_dir / f"{r['name']}.png")
+        (goldens_dir / "goldens.json").write_text(json.dumps({
+            "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "layer_cache": end["layer_cache"],
+            "versions": end["versions"],
+        }, indent=2) + "\n")
+        print(f"{len(records) - len(failed)} goldens written to {goldens_dir}")
+        return 1 if failed else 0
+
+    missing = [r["name"] for r in records if not r.get("error") and not (goldens_dir / f"{r['name']}.png").exists()]
+    if len(missing) == len(records) - len(failed):
+        print(f"No goldens in {goldens_dir}; run with --update-goldens and commit them", file=sys.stderr)
+        return 2
+    for name in missing:
+        print(f"⚠️  {name}: no golden")
+    recorded = load_recording(goldens_dir)
+    if recorded.get("layer_cache"):
+        print("⚠️  These goldens were recorded through the layer cache; record them again without it",
+              file=sys.stderr)
+    for library, version in (recorded.get("versions") or {}).items():
+        if end["versions"].get(library) != version:
+            print(f"⚠️  Goldens were recorded with {library} {version}, this run used {end['versions'].get(library)}",
+                  file=sys.stderr)
+
+    results = run_comparisons(records, goldens_dir, args)
+    print(f"{'case':<28} {'changed':>9} {'max Δ':>6} {'phash':>6}")
+    for result in results:
+        mark = "✅" if result["ok"] else "❌"
+        changed = f"{result['changed']:.3%}" if "changed" in result else "-"
+        print(f"{mark} {result['name']:<26} {changed:>9} {result.get('max_delta', '-'):>6} {result['distance']:>6}"
+              f"  {result.get('reason', '')}")
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        "layer_cache": end["layer_cache"],
+        "versions": end["versions"],
+        "pixel_tolerance": args.pixel_tolerance,
+        "max_changed": args.max_changed,
+        "max_distance": args.max_distance,
+        "render_failed": [{"name": r["name"], "error": r["error"]} for r in failed],
+        "missing_goldens": missing,
+        "cases": results,
+    }, indent=2))
+    regressions = [r for r in results if not r["ok"]]
+    if not regressions and not failed:
+        print(f"✅ {len(results)} images match their goldens")
+    else:
+        print(f"❌ {len(regressions)} differ, {len(failed)} failed to render; diffs in {VISUAL_DIR / 'diffs'}")
+    print(f"→ {output}")
+    return 1 if regressions or failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,208 @@
+"""Event-driven waits for the TC scripts.
+
+Replaces the fixed ``page.wait_for_timeout(3000)`` padding with waits on the
+real condition: the locator being actionable, a response from a named backend
+route, or a Socket.IO frame pushed by ``backend/src/lib/socket.js``. Every step
+gets its own timeout and is timed into a per-test log.
+
+Usage inside a TC script::
+
+    steps = Steps(page, "TC005")
+    await steps.fill(elem, 'Triple Nuevo', label="Input game name")
+    await steps.click(elem, label="Save game", response="/api/games")
+    await steps.socket_event("draw:closed")
+    await steps.write_trace()
+
+Each step is also recorded by :class:`harness.trace.Tracer` together with the
+backend requests it triggered.
+"""
+import asyncio
+import json
+import os
+import re
+import time
+
+from harness.trace import Tracer
+
+# Per-step timeout in milliseconds, matching the scripts' click(timeout=5000)
+STEP_TIMEOUT = int(os.environ.get("TOTE_STEP_TIMEOUT", "5000"))
+
+# Backend routes can be slower than UI actions (draw generation, publication)
+RESPONSE_TIMEOUT = int(os.environ.get("TOTE_RESPONSE_TIMEOUT", "15000"))
+
+# Engine.IO message (4) + Socket.IO event (2), optional namespace and ack id
+_SOCKET_EVENT_RE = re.compile(r"^42(?:/[^,]*,)?\d*(\[.*\])$", re.S)
+
+
+def parse_socket_frame(payload):
+    """Return ``(event, data)`` for a Socket.IO event frame, or None."""
+    if not isinstance(payload, str):
+        return None
+    match = _SOCKET_EVENT_RE.match(payload)
+    if not match:
+        return None
+    try:
+        message = json.loads(match.group(1))
+    except ValueError:
+        return None
+    if not message or not isinstance(message[0], str):
+        return None
+    return message[0], (message[1] if len(message) > 1 else None)
+
+
+def _route_matcher(route, method=None):
+    def matches(response):
+        if method and response.request.method != method.upper():
+            return False
+        return route in response.url
+    return matches
+
+
+class Steps:
+    """Runs the actions of one test and traces how long each one took."""
+
+    def __init__(self, page, test_id, timeout=STEP_TIMEOUT):
+        self.page = page
+        self.test_id = test_id
+        self.timeout = timeout
+        self.trace = Tracer(page, test_id)
+        self._socket_events = []
+        self._socket_waiters = []
+        self._websockets = []
+        self._websocket_waiters = []
+        page.on("websocket", self._on_websocket)
+
+    # -- Socket.IO -------------------------------------------------------
+
+    def _on_websocket(self, ws):
+        self._websockets.append((time.time(), ws))
+        ws.on("framereceived", self._on_frame)
+        for future in self._websocket_waiters:
+            if not future.done():
+                future.set_result(ws)
+        self._websocket_waiters.clear()
+
+    def _on_frame(self, payload):
+        parsed = parse_socket_frame(payload)
+        if parsed is None:
+            return
+        event, data = parsed
+        self._socket_events.append((time.time(), event, data))
+        for waiter in list(self._socket_waiters):
+            name, predicate, future = waiter
+            if name == event and not future.done() and (predicate is None or predicate(data)):
+                future.set_result(data)
+                self._socket_waiters.remove(waiter)
+
+    # -- Tracing ---------------------------------------------------------
+
+    async def record(self, kind, label, awaitable, timeout=None):
+        """Await ``awaitable`` as a traced step (used for navigations and assertions)."""
+        return await self._run(kind, label, timeout, awaitable)
+
+    async def _run(self, kind, label, timeout, awaitable):
+        started = time.time()
+        entry = {"kind": kind, "label": label, "timeout_ms": timeout, "start": started}
+        try:
+            result = await awaitable
+            entry["ok"] = True
+            return result
+        except Exception as e:
+            entry["ok"] = False
+            entry["error"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            entry["end"] = time.time()
+            # Lets harness.select map the step to the frontend page it ran on
+            entry["url"] = self.page.url
+            entry["duration_ms"] = round((entry["end"] - started) * 1000, 1)
+            self.trace.add_step(entry)
+
+    async def write_trace(self):
+        """Write the step trace to ``.artifacts/traces/<test_id>.jsonl``."""
+        await self.trace.flush()
+        return self.trace.write()
+
+    # -- Actions ---------------------------------------------------------
+
+    async def goto(self, url, label=None, timeout=None):
+        """Navigate and wait for DOMContentLoaded instead of a fixed sleep."""
+        timeout = timeout or RESPONSE_TIMEOUT
+        return await self._run(
+            "navigate", label or url, timeout,
+            self.page.goto(url, wait_until="domcontentloaded", timeout=timeout),
+        )
+
+    async def fill(self, locator, value, label=None, timeout=None):
+        """Fill once the locator is visible, enabled and editable."""
+        timeout = timeout or self.timeout
+        return await self._run("fill", label, timeout, locator.fill(value, timeout=timeout))
+
+    async def click(self, locator, label=None, timeout=None, response=None, method=None):
+        """Click once the locator is actionable.
+
+        When ``response`` names a backend route (e.g. ``"/api/draws"``) the step
+        only finishes after a matching response arrives.
+        """
+        timeout = timeout or self.timeout
+        if response is None:
+            return await self._run("click", label, timeout, locator.click(timeout=timeout))
+        return await self._run(
+            "click", label, RESPONSE_TIMEOUT,
+            self._click_and_wait(locator, timeout, response, method),
+        )
+
+    async def _click_and_wait(self, locator, timeout, route, method):
+        async with self.page.expect_response(_route_matcher(route, method), timeout=RESPONSE_TIMEOUT) as info:
+            await locator.click(timeout=timeout)
+        return await info.value
+
+    async def response(self, route, method=None, label=None, timeout=None):
+        """Wait for the next response from ``route`` triggered by anything."""
+        timeout = timeout or RESPONSE_TIMEOUT
+        return await self._run(
+            "response", label or route, timeout,
+            self.page.wait_for_event("response", _route_matcher(route, method), timeout=timeout),
+        )
+
+    async def socket_event(self, event, predicate=None, label=None, timeout=None, since=None):
+        """Wait for a Socket.IO ``event`` frame and return its payload.
+
+        Frames received after ``since`` (epoch seconds) but before this call are
+        matched too, so a fast broadcast racing the wait is not missed.
+        """
+        timeout = timeout or RESPONSE_TIMEOUT
+        if since is not None:
+            for received, name, data in self._socket_events:
+                if received >= since and name == event and (predicate is None or predicate(data)):
+                    return await self._run("socket", label or event, timeout, asyncio.sleep(0, data))
+
+        future = asyncio.get_running_loop().create_future()
+        waiter = (event, predicate, future)
+        self._socket_waiters.append(waiter)
+        try:
+            return await self._run(
+                "socket", label or event, timeout,
+                asyncio.wait_for(future, timeout / 1000),
+            )
+        finally:
+            if waiter in self._socket_waiters:
+                self._socket_waiters.remove(waiter)
+
+    async def websocket(self, since=None, label=None, timeout=None):
+        """Wait for a WebSocket opened by the page after ``since`` (epoch seconds).
+
+        Without ``since`` any connection already open counts. Returns the
+        Playwright ``WebSocket``.
+        """
+        timeout = timeout or RESPONSE_TIMEOUT
+        for opened, ws in reversed(self._websockets):
+            if since is None or opened >= since:
+                return await self._run("socket", label or "websocket", timeout, asyncio.sleep(0, ws))
+
+        future = asyncio.get_running_loop().create_future()
+        self._websocket_waiters.append(future)
+        return await self._run(
+            "socket", label or "websocket", timeout,
+            asyncio.wait_for(future, timeout / 1000),
+        )
@@ -0,0 +1,13 @@
+"""Tools for the image layers in ``backend/storage/bases``.
+
+``lib/imageGenerator.js`` composites the result images from these PNG layers:
+``1/`` for the Ruleta (lotoanimalito), ``2/`` for Animalitos (lottopantera),
+``3/`` for Triple, each with its ``piramide/`` and ``min/`` variants. The
+tools live here rather than next to ``bases/2/test.py`` because Express serves
+``backend/storage`` as static files.
+
+    cd testsprite_tests
+    python -m image_assets.manifest          # incremental manifest of every layer
+    python -m image_assets.layers            # layers that do not fit their canvas
+    python -m image_assets.optimize          # lossless recompression
+"""
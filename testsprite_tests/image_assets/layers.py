@@ -0,0 +1,183 @@
+"""Layer geometry check: every layer against the canvas it is composited onto.
+
+``lib/imageGenerator.js`` stacks each template's layers with ``top: 0,
+left: 0`` over the first one through ``sharp(...).composite(...)``. A layer
+of a different size lands misaligned (larger ones make sharp throw at draw
+time), an overlay without alpha hides everything under it, and a layer in a
+different mode from the canvas is converted on every render. Layers are
+grouped by folder and checked against that folder's canvas (:data:`CANVASES`):
+
+- ``size`` (error): width and height differ from the canvas. Folders in
+  :data:`RESIZED` are resized before compositing and skip this check.
+- ``alpha`` (error): an overlay has no alpha channel or ``tRNS`` chunk.
+  Backgrounds (:data:`BACKGROUND`) may be opaque.
+- ``mode`` (warning): the layer decodes to different bands than the canvas.
+  Palette layers decode to RGB, or RGBA with a ``tRNS`` chunk, so the
+  exact palettes written by :mod:`image_assets.optimize` still match.
+- ``unreadable`` / ``canvas`` (error): the layer, or the folder's canvas,
+  cannot be read.
+
+Reference renders (``ejemplo``) are skipped. Headers come from
+:func:`image_assets.manifest.scan`, reusing the manifest when it is current.
+The report goes to ``.artifacts/layers.json``; ``--format json`` prints it and
+``--format github`` prints workflow annotations.
+
+    cd testsprite_tests
+    python -m image_assets.layers
+    python -m image_assets.layers --format github --strict
+
+Exit codes: 0 no errors, 1 errors (or warnings with ``--strict``).
+"""
+import argparse
+import json
+import re
+import sys
+from collections import Counter
+from pathlib import Path
+
+from harness.config import ARTIFACTS_DIR
+from image_assets.manifest import BASES_DIR, DEFAULT_MANIFEST, folder_of, load, scan
+
+DEFAULT_REPORT = ARTIFACTS_DIR / "layers.json"
+
+# Folder -> the layer its templates are composited onto (relative to the root)
+CANVASES = {
+    "1": "1/fondo_negro.png",
+    "1/piramide": "1/piramide/fondo_azul.png",
+    "2": "2/base.png",
+    "2/piramide": "2/piramide/fondo piramide azul.png",
+    "3/fechas": "3/numeros/fondo.png",  # the Triple's date and hour go over its background
+    "3/numeros": "3/numeros/fondo.png",
+    "3/recomendaciones": "3/recomendaciones/base.png",
+    "3/sugerencias": "3/sugerencias/fondo sugerencias triple pantera.png",
+}
+
+# generatePyramidImage resizes these to 300x300 before placing them
+RESIZED = {"2/min"}
+
+# Layers that are the bottom of a stack and need no transparency
+BACKGROUND = re.compile(r"^(fondo|base|resumen|piramide\d\.png$)", re.IGNORECASE)
+IGNORED = re.compile(r"ejemplo", re.IGNORECASE)
+
+
+def decoded(entry):
+    """The bands a layer decodes to: ``RGBA``, ``RGB``, ``LA``, ``L`` or a 16-bit mode."""
+    mode = {"P": "RGB", "RGBA": "RGB", "LA": "L"}.get(entry["mode"], entry["mode"])
+    return mode + "A" if entry["has_alpha"] and mode in ("RGB", "L") else mode
+
+
+def _shape(entry):
+    return {"width": entry["width"], "height": entry["height"], "mode": entry["mode"]}
+
+
+def canvas_for(folder, files):
+    """Path of ``folder``'s canvas: from :data:`CANVASES`, a ``base``/``fondo`` layer, or the commonest shape."""
+    if folder in CANVASES:
+        return CANVASES[folder]
+    for name in ("base.png", "fondo.png"):
+        path = f"{folder}/{name}"
+        if path in files:
+            return path
+    members = [p for p, e in files.items() if folder_of(p) == folder and "error" not in e]
+    if not members:
+        return None
+    common = Counter((files[p]["width"], files[p]["height"], files[p]["mode"]) for p in members).most_common(1)[0][0]
+    return next(p for p in sorted(members) if (files[p]["width"], files[p]["height"], files[p]["mode"]) == common)
+
+
+def check(files):
+    """``(folders, issues)`` for the manifest entries in ``files``."""
+    grouped = {}
+    for path in files:
+        if not IGNORED.search(path.rsplit("/", 1)[-1]):
+            grouped.setdefault(folder_of(path), []).append(path)
+
+    folders, issues = {}, []
+
+    def issue(path, folder, check_name, severity, expected=None, actual=None, message=""):
+        issues.append({"path": path, "folder": folder, "check": check_name, "severity": severity,
+                       "expected": expected, "actual": actual, "message": message})
+
+    for folder, paths in sorted(grouped.items()):
+        canvas_path = canvas_for(folder, files)
+        canvas = files.get(canvas_path)
+        if canvas is None or "error" in canvas:
+            issue(canvas_path or folder, folder, "canvas", "error",
+                  message=canvas["error"] if canvas else "no canvas to compare with")
+            folders[folder] = {"canvas": canvas_path, "layers": len(paths)}
+            continue
+        folders[folder] = {"canvas": canvas_path, **_shape(canvas), "layers": len(paths),
+                           "resized": folder in RESIZED}
+        for path in sorted(paths):
+            entry = files[path]
+            if "error" in entry:
+                issue(path, folder, "unreadable", "error", message=entry["error"])
+                continue
+            name = path.rsplit("/", 1)[-1]
+            if folder not in RESIZED and (entry["width"], entry["height"]) != (canvas["width"], canvas["height"]):
+                issue(path, folder, "size", "error", f"{canvas['width']}x{canvas['height']}",
+                      f"{entry['width']}x{entry['height']}", "misaligned at top: 0, left: 0")
+            if not entry["has_alpha"] and not BACKGROUND.match(name):
+                issue(path, folder, "alpha", "error", "alpha", entry["mode"], "opaque overlay hides the layers below")
+            if path != canvas_path and decoded(entry) != decoded(canvas):
+                issue(path, folder, "mode", "warning", decoded(canvas), decoded(entry), "converted on every render")
+    for folder in folders:
+        folders[folder]["issues"] = sum(1 for i in issues if i["folder"] == folder)
+    return folders, issues
+
+
+def print_text(folders, issues):
+    print(f"{'folder':<20} {'canvas':<45} {'shape':<16} {'layers':>6} {'issues':>6}")
+    for name, folder in folders.items():
+        shape = f"{folder['width']}x{folder['height']} {folder['mode']}" if "width" in folder else "-"
+        print(f"{name:<20} {str(folder['canvas']):<45} {shape:<16} {folder['layers']:>6} {folder['issues']:>6}")
+    for i in issues:
+        mark = "❌" if i["severity"] == "error" else "⚠️ "
+        detail = f"{i['actual']} (expected {i['expected']})" if i["expected"] else ""
+        print(f"{mark} {i['check']:<10} {i['path']}: {' '.join(filter(None, (detail, i['message'])))}")
+
+
+def print_github(root, issues):
+    for i in issues:
+        detail = f"{i['actual']}, expected {i['expected']}: " if i["expected"] else ""
+        path = Path(root, i["path"])
+        print(f"::{i['severity']} file={path},title=layer {i['check']}::{detail}{i['message']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check every image layer against its folder's canvas")
+    parser.add_argument("--root", default=str(BASES_DIR), help="Folder to check")
+    parser.add_argument("--manifest", default=str(DEFAULT_MANIFEST), help="Manifest to reuse headers from")
+    parser.add_argument("--format", choices=("text", "json", "github"), default="text")
+    parser.add_argument("--strict", action="store_true", help="Fail on warnings too")
+    parser.add_argument("-o", "--output", default=str(DEFAULT_REPORT))
+    args = parser.parse_args(argv)
+
+    manifest = scan(args.root, load(args.manifest, args.root))
+    folders, issues = check(manifest["files"])
+    errors = sum(1 for i in issues if i["severity"] == "error")
+    warnings = len(issues) - errors
+    report = {
+        "root": manifest["root"],
+        "layers": sum(f["layers"] for f in folders.values()),
+        "errors": errors,
+        "warnings": warnings,
+        "folders": folders,
+        "issues": issues,
+    }
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + "\n")
+
+    if args.format == "json":
+        print(json.dumps(report, indent=2))
+    elif args.format == "github":
+        print_github(manifest["root"], issues)
+    else:
+        print_text(folders, issues)
+        print(f"{report['layers']} layers: {errors} errors, {warnings} warnings → {output}")
+    return 1 if errors or (args.strict and warnings) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,206 @@
+"""Incremental manifest of the image layers.
+
+Grows ``backend/storage/bases/2/test.py`` (one folder, one image at a time,
+sizes printed) into a scan of every layer under ``backend/storage/bases``:
+the tree is walked with ``os.scandir``, files whose size and mtime match the
+previous manifest keep their entry, and the rest are inspected across a
+process pool. Inspecting a file reads it once: the bytes go to SHA-256 and
+only the header is parsed for dimensions and mode (the PNG ``IHDR`` and
+``tRNS`` chunks directly; other formats through Pillow's lazy ``open``).
+
+The manifest (``.artifacts/assets_manifest.json`` by default) maps each path
+relative to the root to its ``width``, ``height``, ``mode``, ``bit_depth``,
+``has_alpha``, ``format``, ``bytes``, ``sha256`` and ``mtime_ns``, plus a
+summary per folder. :func:`scan` is what the other ``image_assets`` tools use.
+
+    cd testsprite_tests
+    python -m image_assets.manifest                  # update the manifest
+    python -m image_assets.manifest --full -w 8      # re-inspect everything
+"""
+import argparse
+import hashlib
+import json
+import os
+import struct
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from harness.config import ARTIFACTS_DIR
+from harness.database import BACKEND_DIR
+
+BASES_DIR = BACKEND_DIR / "storage" / "bases"
+DEFAULT_MANIFEST = ARTIFACTS_DIR / "assets_manifest.json"
+
+MANIFEST_VERSION = 1
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".gif", ".tiff", ".webp")
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# PNG color type -> (Pillow-style mode, has alpha channel)
+PNG_COLOR_TYPES = {0: ("L", False), 2: ("RGB", False), 3: ("P", False), 4: ("LA", True), 6: ("RGBA", True)}
+
+# Below this many files to inspect, a process pool costs more than it saves
+POOL_THRESHOLD = 32
+
+
+def _png_header(data):
+    width, height, bit_depth, color_type = struct.unpack(">IIBB", data[16:26])
+    mode, has_alpha = PNG_COLOR_TYPES.get(color_type, (f"color-type-{color_type}", False))
+    if bit_depth == 16 and mode in ("L", "RGB", "RGBA", "LA"):
+        mode = {"L": "I;16", "RGB": "RGB;16", "RGBA": "RGBA;16", "LA": "LA;16"}[mode]
+    # A tRNS chunk before the first IDAT gives P / L / RGB images transparency
+    offset = 8
+    while offset + 8 <= len(data):
+        length, kind = struct.unpack(">I4s", data[offset:offset + 8])
+        if kind == b"tRNS":
+            has_alpha = True
+        if kind in (b"IDAT", b"IEND"):
+            break
+        offset += 12 + length
+    return {"width": width, "height": height, "mode": mode, "bit_depth": bit_depth,
+            "has_alpha": has_alpha, "format": "PNG"}
+
+
+def _pillow_header(path):
+    from PIL import Image
+
+    with Image.open(path) as image:
+        return {"width": image.width, "height": image.height, "mode": image.mode, "bit_depth": None,
+                "has_alpha": image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info,
+                "format": image.format}
+
+
+def inspect(path):
+    """Header fields, size and SHA-256 of the image at ``path``; ``error`` if unreadable."""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        entry = {"bytes": len(data), "sha256": hashlib.sha256(data).hexdigest()}
+        if data.startswith(PNG_SIGNATURE) and data[12:16] == b"IHDR":
+            entry.update(_png_header(data))
+        else:
+            entry.update(_pillow_header(path))
+        return entry
+    except Exception as e:  # a broken layer is reported, not fatal
+        return {"error": f"{type(e).__name__}: {e}"}
+
+
+def walk(root):
+    """``{relative path: (size, mtime_ns)}`` of every image under ``root``."""
+    found = {}
+    pending = [Path(root)]
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(Path(entry.path))
+                elif entry.name.lower().endswith(IMAGE_EXTENSIONS):
+                    stat = entry.stat()
+                    found[Path(entry.path).relative_to(root).as_posix()] = (stat.st_size, stat.st_mtime_ns)
+    return found
+
+
+def _inspect_batch(root, paths, workers):
+    full = [str(Path(root) / p) for p in paths]
+    if len(paths) < POOL_THRESHOLD or workers == 1:
+        return dict(zip(paths, map(inspect, full)))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        chunksize = max(1, len(paths) // ((workers or os.cpu_count() or 1) * 4))
+        return dict(zip(paths, pool.map(inspect, full, chunksize=chunksize)))
+
+
+def load(path=DEFAULT_MANIFEST, root=BASES_DIR):
+    """The manifest at ``path`` if it was built for ``root`` by this version, else None."""
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    if manifest.get("version") != MANIFEST_VERSION or manifest.get("root") != str(Path(root).resolve()):
+        return None
+    return manifest
+
+
+def scan(root=BASES_DIR, previous=None, workers=None):
+    """Manifest of ``root``, reusing ``previous`` entries whose size and mtime did not change."""
+    started = time.perf_counter()
+    found = walk(root)
+    reused = (previous or {}).get("files", {})
+    files = {}
+    changed = []
+    for path, (size, mtime_ns) in found.items():
+        entry = reused.get(path)
+        if entry and entry.get("bytes") == size and entry.get("mtime_ns") == mtime_ns and "error" not in entry:
+            files[path] = entry
+        else:
+            changed.append(path)
+    for path, entry in _inspect_batch(root, changed, workers).items():
+        files[path] = {**entry, "mtime_ns": found[path][1]}
+    return {
+        "version": MANIFEST_VERSION,
+        "root": str(Path(root).resolve()),
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "scan": {
+            "files": len(found),
+            "inspected": len(changed),
+            "unchanged": len(found) - len(changed),
+            "removed": len(set(reused) - set(found)),
+            "seconds": round(time.perf_counter() - started, 3),
+        },
+        "folders": summarize(files),
+        "files": dict(sorted(files.items())),
+    }
+
+
+def folder_of(path):
+    """``1``, ``2/min``, ``3/fechas``: the folder a layer belongs to."""
+    return path.rsplit("/", 1)[0] if "/" in path else "."
+
+
+def summarize(files):
+    folders = {}
+    for path, entry in files.items():
+        folder = folders.setdefault(folder_of(path), {"files": 0, "bytes": 0, "errors": 0, "shapes": {}})
+        folder["files"] += 1
+        if "error" in entry:
+            folder["errors"] += 1
+            continue
+        folder["bytes"] += entry["bytes"]
+        shape = f"{entry['width']}x{entry['height']} {entry['mode']}"
+        folder["shapes"][shape] = folder["shapes"].get(shape, 0) + 1
+    return dict(sorted(folders.items()))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Incremental manifest of the image layers")
+    parser.add_argument("--root", default=str(BASES_DIR), help="Folder to scan")
+    parser.add_argument("-o", "--output", default=str(DEFAULT_MANIFEST))
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Processes (default: one per CPU)")
+    parser.add_argument("--full", action="store_true", help="Ignore the previous manifest")
+    args = parser.parse_args(argv)
+
+    output = Path(args.output)
+    previous = None if args.full else load(output, args.root)
+    manifest = scan(args.root, previous, args.workers)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(manifest, indent=1) + "\n")
+
+    run = manifest["scan"]
+    print(f"{run['files']} images in {run['seconds']} s: {run['inspected']} inspected, "
+          f"{run['unchanged']} unchanged, {run['removed']} removed")
+    print(f"{'folder':<20} {'files':>6} {'MB':>7}  shapes")
+    for name, folder in manifest["folders"].items():
+        shapes = ", ".join(f"{shape} ×{count}" for shape, count in folder["shapes"].items())
+        print(f"{name:<20} {folder['files']:>6} {folder['bytes'] / 1024 / 1024:>7.1f}  {shapes}")
+    errors = {path: entry["error"] for path, entry in manifest["files"].items() if "error" in entry}
+    for path, error in errors.items():
+        print(f"❌ {path}: {error}")
+    print(f"→ {output}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,245 @@
+"""Lossless recompression of the PNG layers.
+
+Sharp decodes every layer again for each result image, so a layer that is
+smaller on disk is also less zlib to inflate per render. For each PNG under
+``backend/storage/bases`` (or only the folders given), a worker tries:
+
+- ``recompress``: the same pixels and mode at zlib level 9 with Pillow's
+  filter search, without metadata (text, time, ``pHYs``, ICC, EXIF).
+- ``palette``: for flat layers with at most 256 distinct RGBA values, an
+  exact palette (plus ``tRNS`` if any pixel is translucent) at the smallest
+  bit depth that holds it. libvips expands it back to the same bands, so the
+  layer still matches its canvas for :mod:`image_assets.layers`.
+
+A candidate is kept only if decoding it with NumPy gives exactly the same
+RGBA array as the original, transparent pixels included, and it is smaller.
+16-bit layers are left alone. Decode time (Pillow, best of ``--repeat``) is
+measured before and after as a stand-in for libpng's inside sharp.
+
+Files are only replaced with ``--write`` (through a temporary file and
+``os.replace``); without it the run is a report. Per folder it gives bytes
+before and after, what was chosen and the decode time saved per render of
+every layer; the full report goes to ``.artifacts/optimize.json``.
+
+    cd testsprite_tests
+    python -m image_assets.optimize                # what would be saved
+    python -m image_assets.optimize 1 2/min --write
+
+Needs Pillow and NumPy.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from harness.config import ARTIFACTS_DIR
+from image_assets.manifest import BASES_DIR, folder_of, walk
+
+DEFAULT_REPORT = ARTIFACTS_DIR / "optimize.json"
+
+REPEAT = 3
+
+# What Pillow needs to write the pixels back; everything else in ``info`` is metadata
+KEPT_INFO = ("transparency",)
+
+
+def _decode(data):
+    from PIL import Image
+
+    image = Image.open(io.BytesIO(data))
+    image.load()
+    return image
+
+
+def _decode_ms(data, repeat):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        _decode(data)
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def _rgba(image):
+    import numpy as np
+
+    return np.asarray(image.convert("RGBA"))
+
+
+def _save(image, **params):
+    buffer = io.BytesIO()
+    image.save(buffer, "PNG", optimize=True, **params)
+    return buffer.getvalue()
+
+
+def _recompressed(image):
+    image.info = {key: image.info[key] for key in KEPT_INFO if key in image.info}
+    return _save(image)
+
+
+def _palette(pixels):
+    """The RGBA ``pixels`` as an exact palette PNG, or None if they have more than 256 values."""
+    import numpy as np
+    from PIL import Image
+
+    packed = np.ascontiguousarray(pixels).view(np.uint32).reshape(pixels.shape[:2])
+    values, indices = np.unique(packed, return_inverse=True)
+    if len(values) > 256:
+        return None
+    colors = values.view(np.uint8).reshape(-1, 4)
+    image = Image.fromarray(indices.reshape(packed.shape).astype(np.uint8), "P")
+    image.putpalette(colors[:, :3].tobytes())
+    params = {}
+    if (colors[:, 3] < 255).any():
+        params["transparency"] = colors[:, 3].tobytes()
+    # Pillow writes 1, 2 or 4 bits per pixel when the palette fits
+    return _save(image, bits=max(1, (len(values) - 1).bit_length()), **params)
+
+
+def optimize(path, reduce=True, repeat=REPEAT, write=False):
+    """What recompressing the PNG at ``path`` saves; replaces it when ``write`` and it is smaller."""
+    import numpy as np
+
+    try:
+        original = Path(path).read_bytes()
+        image = _decode(original)
+        entry = {"bytes": len(original), "mode": image.mode, "chosen": None, "rejected": []}
+        # Pillow silently narrows 16-bit RGB(A) to 8 bits, so go by the IHDR bit depth
+        if image.mode in ("I", "I;16") or original[24] == 16:
+            entry["skipped"] = "16-bit"
+            return entry
+        pixels = _rgba(image)
+        candidates = {"recompress": _recompressed(image)}
+        if reduce:
+            candidates["palette"] = _palette(pixels)
+        best = None
+        for name, data in candidates.items():
+            if data is None or len(data) >= len(original):
+                continue
+            # Exactly the original pixels, or the candidate is dropped
+            if not np.array_equal(_rgba(_decode(data)), pixels):
+                entry["rejected"].append(name)
+                continue
+            if best is None or len(data) < len(best[1]):
+                best = (name, data)
+        entry["decode_ms"] = round(_decode_ms(original, repeat), 2)
+        if best is None:
+            entry.update(optimized_bytes=len(original), optimized_decode_ms=entry["decode_ms"])
+            return entry
+        name, data = best
+        entry.update(chosen=name, optimized_bytes=len(data), optimized_mode=_decode(data).mode,
+                     optimized_decode_ms=round(_decode_ms(data, repeat), 2))
+        if write:
+            temporary = f"{path}.tmp"
+            try:
+                with open(temporary, "wb") as f:
+                    f.write(data)
+                os.replace(temporary, path)
+            except OSError:
+                # Same as getCachedComposite: no half-written file left behind
+                with contextlib.suppress(OSError):
+                    os.unlink(temporary)
+                raise
+        return entry
+    except Exception as e:  # one bad layer does not stop the run
+        return {"error": f"{type(e).__name__}: {e}"}
+
+
+def _task(job):
+    return optimize(*job)
+
+
+def run(root, folders, reduce, repeat, write, workers):
+    paths = sorted(
+        path for path in walk(root)
+        if path.lower().endswith(".png") and (not folders or folder_of(path) in folders)
+    )
+    jobs = [(str(Path(root) / path), reduce, repeat, write) for path in paths]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        chunksize = max(1, len(jobs) // ((workers or os.cpu_count() or 1) * 4))
+        return dict(zip(paths, pool.map(_task, jobs, chunksize=chunksize)))
+
+
+def summarize(files):
+    folders = {}
+    for path, entry in files.items():
+        folder = folders.setdefault(folder_of(path), {
+            "files": 0, "bytes": 0, "optimized_bytes": 0, "decode_ms": 0.0, "optimized_decode_ms": 0.0,
+            "chosen": {}, "rejected": 0, "skipped": 0, "errors": 0,
+        })
+        folder["files"] += 1
+        if "error" in entry:
+            folder["errors"] += 1
+            continue
+        if "skipped" in entry:
+            folder["skipped"] += 1
+            continue
+        folder["bytes"] += entry["bytes"]
+        folder["optimized_bytes"] += entry["optimized_bytes"]
+        folder["decode_ms"] += entry["decode_ms"]
+        folder["optimized_decode_ms"] += entry["optimized_decode_ms"]
+        chosen = entry["chosen"] or "unchanged"
+        folder["chosen"][chosen] = folder["chosen"].get(chosen, 0) + 1
+        folder["rejected"] += len(entry["rejected"])
+    for folder in folders.values():
+        folder["saved_bytes"] = folder["bytes"] - folder["optimized_bytes"]
+        folder["saved_pct"] = round(folder["saved_bytes"] / folder["bytes"] * 100, 1) if folder["bytes"] else 0
+        folder["decode_ms"] = round(folder["decode_ms"], 1)
+        folder["optimized_decode_ms"] = round(folder["optimized_decode_ms"], 1)
+        folder["saved_decode_ms"] = round(folder["decode_ms"] - folder["optimized_decode_ms"], 1)
+    return dict(sorted(folders.items()))
+
+
+def print_table(folders):
+    print(f"{'folder':<20} {'files':>6} {'MB':>7} {'→ MB':>7} {'saved':>7} {'decode ms':>10} {'→ ms':>8}  chosen")
+    for name, f in folders.items():
+        chosen = ", ".join(f"{k} ×{v}" for k, v in f["chosen"].items())
+        print(f"{name:<20} {f['files']:>6} {f['bytes'] / 1024 / 1024:>7.1f} {f['optimized_bytes'] / 1024 / 1024:>7.1f} "
+              f"{f['saved_pct']:>6}% {f['decode_ms']:>10} {f['optimized_decode_ms']:>8}  {chosen}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Lossless recompression of the PNG layers")
+    parser.add_argument("folders", nargs="*", help="Only these folders (e.g. 1 2/min 3/numeros)")
+    parser.add_argument("--root", default=str(BASES_DIR))
+    parser.add_argument("--write", action="store_true", help="Replace the layers that got smaller")
+    parser.add_argument("--no-reduce", dest="reduce", action="store_false", help="Do not try palettes")
+    parser.add_argument("--repeat", type=int, default=REPEAT, help="Decodes timed per layer (best counts)")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Processes (default: one per CPU)")
+    parser.add_argument("-o", "--output", default=str(DEFAULT_REPORT))
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    files = run(args.root, set(args.folders), args.reduce, args.repeat, args.write, args.workers)
+    folders = summarize(files)
+    total = {key: sum(f[key] for f in folders.values()) for key in ("bytes", "optimized_bytes", "saved_bytes")}
+    report = {
+        "root": str(Path(args.root).resolve()),
+        "written": args.write,
+        "seconds": round(time.perf_counter() - started, 1),
+        **total,
+        "folders": folders,
+        "files": files,
+    }
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=1) + "\n")
+
+    print_table(folders)
+    errors = {path: entry["error"] for path, entry in files.items() if "error" in entry}
+    for path, error in errors.items():
+        print(f"❌ {path}: {error}")
+    action = "saved" if args.write else "would save (run with --write to replace)"
+    print(f"{len(files)} layers in {report['seconds']} s: {action} "
+          f"{total['saved_bytes'] / 1024 / 1024:.1f} of {total['bytes'] / 1024 / 1024:.1f} MB → {output}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())